@@ -112,6 +112,223 @@ ALTER TABLE departamentos
 ADD CONSTRAINT FK_GERENTE_RESPONSABLE 
 FOREIGN KEY (idGerenteResponsable) REFERENCES empleados(idEmpleado);
 
+-- =====================
+-- PASO 3: SECUENCIAS PARA LOS IDs
+-- (reemplaza el cálculo SELECT MAX(id)+1 desde la aplicación)
+-- =====================
+-- Este bloque también sirve como MIGRACIÓN sobre una base ya poblada:
+-- cada secuencia parte desde MAX(id)+1 y queda como DEFAULT de su columna,
+-- por lo que los INSERT pueden omitir el ID y leerlo con RETURNING ... INTO.
+-- Se puede ejecutar más de una vez sin error.
+-- (registros.idRegistro ya es IDENTITY; usuarios.idUsuario es el RUT)
+
+DECLARE
+    PROCEDURE crear_secuencia(p_tabla VARCHAR2, p_columna VARCHAR2, p_secuencia VARCHAR2) IS
+        v_inicio NUMBER;
+        v_existe NUMBER;
+    BEGIN
+        SELECT COUNT(*) INTO v_existe FROM user_sequences WHERE sequence_name = UPPER(p_secuencia);
+
+        IF v_existe = 0 THEN
+            EXECUTE IMMEDIATE 'SELECT NVL(MAX(' || p_columna || '), 0) + 1 FROM ' || p_tabla INTO v_inicio;
+            EXECUTE IMMEDIATE 'CREATE SEQUENCE ' || p_secuencia || ' START WITH ' || v_inicio || ' INCREMENT BY 1 CACHE 20';
+        END IF;
+
+        EXECUTE IMMEDIATE 'ALTER TABLE ' || p_tabla || ' MODIFY ' || p_columna || ' DEFAULT ' || p_secuencia || '.NEXTVAL';
+    END;
+BEGIN
+    crear_secuencia('empleados', 'idEmpleado', 'seq_empleados');
+    crear_secuencia('departamentos', 'idDepartamento', 'seq_departamentos');
+    crear_secuencia('proyectos', 'idProyecto', 'seq_proyectos');
+    crear_secuencia('administradores', 'idAdmin', 'seq_administradores');
+    crear_secuencia('indicadores_registrados', 'idIndicadorRegistro', 'seq_indicadores');
+END;
+/
+
+-- =====================
+-- PASO 4: ÍNDICES PARA LAS CONSULTAS FRECUENTES
+-- =====================
+-- Oracle solo indexa automáticamente PK y UNIQUE; las FK y los filtros
+-- usados por la aplicación hacían full scan. Igual que el PASO 3, sirve
+-- como migración sobre una base existente y se puede ejecutar más de una vez.
+--   registros(idEmpleado, fechaRegistro)   horas por empleado / rango de fechas
+--   registros(idProyecto, fechaRegistro)   db_eliminar_proyecto, horas por proyecto
+--   registros(fechaRegistro, ...)          reportes.py (cubre las columnas sumadas)
+--   empleados(idDepartamento)              empleados de un departamento
+--   empleados(idUsuario)                   db_buscar_id_empleado_por_rut
+--   administradores(idEmpleado)            db_obtener_id_admin_por_id_empleado
+--   proyecto_empleados(idProyecto)         la PK empieza por idEmpleado
+--   indicadores_registrados(nombre_indicador, fecha_consulta)
+--                                          db_obtener_ultimo_valor_indicador
+--   indicadores_registrados(fecha_consulta, idIndicadorRegistro)
+--                                          db_obtener_historial_indicadores
+
+DECLARE
+    PROCEDURE crear_indice(p_indice VARCHAR2, p_definicion VARCHAR2) IS
+        v_existe NUMBER;
+    BEGIN
+        SELECT COUNT(*) INTO v_existe FROM user_indexes WHERE index_name = UPPER(p_indice);
+
+        IF v_existe = 0 THEN
+            EXECUTE IMMEDIATE 'CREATE INDEX ' || p_indice || ' ON ' || p_definicion;
+        END IF;
+    END;
+BEGIN
+    crear_indice('idx_registros_empleado', 'registros (idEmpleado, fechaRegistro)');
+    crear_indice('idx_registros_proyecto', 'registros (idProyecto, fechaRegistro)');
+    -- Reportes por rango de fechas: el índice cubre todas las columnas que suman
+    crear_indice('idx_registros_fecha', 'registros (fechaRegistro, idEmpleado, idProyecto, horasTrabajadas)');
+    crear_indice('idx_empleados_departamento', 'empleados (idDepartamento)');
+    crear_indice('idx_empleados_usuario', 'empleados (idUsuario)');
+    crear_indice('idx_administradores_empleado', 'administradores (idEmpleado)');
+    crear_indice('idx_proyecto_empleados_proy', 'proyecto_empleados (idProyecto, idEmpleado)');
+    crear_indice('idx_indicadores_nombre_fecha', 'indicadores_registrados (nombre_indicador, fecha_consulta)');
+    crear_indice('idx_indicadores_fecha', 'indicadores_registrados (fecha_consulta, idIndicadorRegistro)');
+END;
+/
+
+-- =====================
+-- PASO 5: RESUMEN DE COSTO POR PROYECTO
+-- =====================
+-- costo_proyecto_empleado guarda, por proyecto y empleado, las horas
+-- acumuladas y su costo (horas x salario / 180, el salario es mensual).
+-- Los triggers lo mantienen al día fila a fila: al insertar o borrar
+-- registros se suma/resta solo lo de esa fila, y al cambiar un salario se
+-- recalculan solo las filas de ese empleado. db_costo_proyecto lee de aquí
+-- en vez de recorrer toda la tabla registros.
+-- Se puede ejecutar más de una vez: al final reconstruye el resumen desde
+-- los registros existentes.
+
+DECLARE
+    v_existe NUMBER;
+BEGIN
+    SELECT COUNT(*) INTO v_existe FROM user_tables WHERE table_name = 'COSTO_PROYECTO_EMPLEADO';
+
+    IF v_existe = 0 THEN
+        EXECUTE IMMEDIATE '
+            CREATE TABLE costo_proyecto_empleado
+            (
+                idProyecto INT NOT NULL,
+                idEmpleado INT NOT NULL,
+                horas FLOAT DEFAULT 0 NOT NULL,
+                costo FLOAT DEFAULT 0 NOT NULL,
+                cantidad INT DEFAULT 0 NOT NULL,  -- registros sumados (en 0 se borra la fila)
+                CONSTRAINT PK_COSTO_PROYECTO_EMPLEADO PRIMARY KEY (idProyecto, idEmpleado)
+            )';
+        -- Para el trigger de salario, que busca por empleado
+        EXECUTE IMMEDIATE 'CREATE INDEX idx_costo_empleado ON costo_proyecto_empleado (idEmpleado)';
+    END IF;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_registros_costo
+AFTER INSERT OR UPDATE OF horasTrabajadas, idEmpleado, idProyecto OR DELETE ON registros
+FOR EACH ROW
+DECLARE
+    v_salario empleados.salario%TYPE;
+BEGIN
+    -- Restar la fila anterior (DELETE / UPDATE)
+    IF DELETING OR UPDATING THEN
+        SELECT NVL(MAX(salario), 0) INTO v_salario FROM empleados WHERE idEmpleado = :OLD.idEmpleado;
+
+        UPDATE costo_proyecto_empleado
+        SET horas = horas - :OLD.horasTrabajadas,
+            costo = costo - :OLD.horasTrabajadas * v_salario / 180,
+            cantidad = cantidad - 1
+        WHERE idProyecto = :OLD.idProyecto AND idEmpleado = :OLD.idEmpleado;
+
+        DELETE FROM costo_proyecto_empleado
+        WHERE idProyecto = :OLD.idProyecto AND idEmpleado = :OLD.idEmpleado AND cantidad <= 0;
+    END IF;
+
+    -- Sumar la fila nueva (INSERT / UPDATE)
+    IF (INSERTING OR UPDATING) AND :NEW.idProyecto IS NOT NULL AND :NEW.idEmpleado IS NOT NULL THEN
+        SELECT NVL(MAX(salario), 0) INTO v_salario FROM empleados WHERE idEmpleado = :NEW.idEmpleado;
+
+        MERGE INTO costo_proyecto_empleado c
+        USING (SELECT :NEW.idProyecto AS idProyecto, :NEW.idEmpleado AS idEmpleado FROM dual) n
+        ON (c.idProyecto = n.idProyecto AND c.idEmpleado = n.idEmpleado)
+        WHEN MATCHED THEN UPDATE SET
+            c.horas = c.horas + :NEW.horasTrabajadas,
+            c.costo = c.costo + :NEW.horasTrabajadas * v_salario / 180,
+            c.cantidad = c.cantidad + 1
+        WHEN NOT MATCHED THEN INSERT (idProyecto, idEmpleado, horas, costo, cantidad)
+            VALUES (n.idProyecto, n.idEmpleado, :NEW.horasTrabajadas, :NEW.horasTrabajadas * v_salario / 180, 1);
+    END IF;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_empleados_salario_costo
+AFTER UPDATE OF salario ON empleados
+FOR EACH ROW
+WHEN (NVL(OLD.salario, -1) <> NVL(NEW.salario, -1))
+BEGIN
+    UPDATE costo_proyecto_empleado
+    SET costo = horas * NVL(:NEW.salario, 0) / 180
+    WHERE idEmpleado = :NEW.idEmpleado;
+END;
+/
+
+-- Reconstrucción completa desde los registros existentes
+DELETE FROM costo_proyecto_empleado;
+
+INSERT INTO costo_proyecto_empleado (idProyecto, idEmpleado, horas, costo, cantidad)
+SELECT r.idProyecto, r.idEmpleado,
+       SUM(r.horasTrabajadas),
+       SUM(r.horasTrabajadas) * NVL(MAX(e.salario), 0) / 180,
+       COUNT(*)
+FROM registros r
+JOIN empleados e ON e.idEmpleado = r.idEmpleado
+WHERE r.idProyecto IS NOT NULL
+GROUP BY r.idProyecto, r.idEmpleado;
+
+-- =====================
+-- PASO 6: CLAVE DE IDEMPOTENCIA DE REGISTROS
+-- =====================
+-- cola_registros.py guarda las horas en una cola local y las envía por
+-- lotes. Cada registro lleva una clave única: si un lote se reenvía tras
+-- una confirmación perdida, las filas repetidas se rechazan (ORA-00001)
+-- en vez de duplicarse. Los registros ingresados de otra forma la dejan
+-- en NULL (el índice único no incluye las claves nulas).
+-- Se puede ejecutar más de una vez.
+
+DECLARE
+    v_existe NUMBER;
+BEGIN
+    SELECT COUNT(*) INTO v_existe FROM user_tab_columns
+    WHERE table_name = 'REGISTROS' AND column_name = 'CLAVEIDEMPOTENCIA';
+
+    IF v_existe = 0 THEN
+        EXECUTE IMMEDIATE 'ALTER TABLE registros ADD claveIdempotencia VARCHAR2(36)';
+        EXECUTE IMMEDIATE 'CREATE UNIQUE INDEX idx_registros_clave ON registros (claveIdempotencia)';
+    END IF;
+END;
+/
+
+-- =====================
+-- PASO 7: VERSIÓN DEL ESQUEMA
+-- =====================
+-- migraciones.py anota aquí cada migración aplicada (p. ej. la creación
+-- del admin por defecto). Al iniciar, la aplicación solo lee MAX(version)
+-- y aplica las que falten; si la tabla no existe, la crea ella misma.
+-- Se puede ejecutar más de una vez.
+
+DECLARE
+    v_existe NUMBER;
+BEGIN
+    SELECT COUNT(*) INTO v_existe FROM user_tables WHERE table_name = 'SCHEMA_VERSION';
+
+    IF v_existe = 0 THEN
+        EXECUTE IMMEDIATE '
+            CREATE TABLE schema_version (
+                version NUMBER PRIMARY KEY,
+                descripcion VARCHAR2(200) NOT NULL,
+                aplicada DATE DEFAULT SYSDATE NOT NULL
+            )';
+    END IF;
+END;
+/
+
 -- =====================
 -- FIN DEL SCRIPT
 -- =====================
@@ -1,14 +1,25 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 import datetime
 
 # --- Importaciones de Módulos Propios ---
 # Asegúrate de que estos archivos existan en tu carpeta
-import database as dbFunciones
 from departamento import Departamento
 from proyecto import Proyecto
 from empleado import Empleado
-from api_indicador import obtener_indicadores, Mindicador
+from ejecutor import EjecutorTareas
+from tabla_virtual import TablaVirtual, Columna
+from carga_diferida import ModuloDiferido, FrameDiferido
+import instrumentacion
+
+# Se importan en su primer uso (ver carga_diferida.py): oracledb, bcrypt y
+# requests no se cargan antes de mostrar la ventana
+dbFunciones = ModuloDiferido("database")
+api_indicador = ModuloDiferido("api_indicador")
+reportes = ModuloDiferido("reportes")
+cola_registros = ModuloDiferido("cola_registros")
+autenticacion = ModuloDiferido("autenticacion")
+migraciones = ModuloDiferido("migraciones")
 
 # =============================================================================
 # --- CONFIGURACIÓN DE ESTILOS Y CONSTANTES ---
@@ -34,6 +45,9 @@ PADDING_ESTANDAR = 10      # Separación vertical estándar
 admin_logeado = None
 obj_depto_actual = None
 obj_proy_actual = None
+lector_reporte = None   # LectorPaginado del reporte de horas en pantalla
+tabla_masiva = None     # TablaVirtual de empleados de la asignación masiva
+frame_origen_masiva = None
 
 
 # =============================================================================
@@ -62,6 +76,9 @@ def cambiar_frame(frame_destino, frame_origen=None, funcion_limpieza=None):
     Oculta el frame actual y muestra el destino.
     Ejecuta una función de limpieza si se proporciona.
     """
+    if isinstance(frame_destino, FrameDiferido):
+        frame_destino.obtener()  # La limpieza puede usar sus widgets: se construye antes
+
     if frame_origen:
         frame_origen.pack_forget()
     
@@ -70,47 +87,136 @@ def cambiar_frame(frame_destino, frame_origen=None, funcion_limpieza=None):
         
     frame_destino.pack(fill="both", expand=True, padx=20, pady=20)
 
-def crear_popup_lista(titulo, datos, encabezado):
+def crear_popup_lista(titulo, columnas, filas=None, cargar_pagina=None, texto_vacio="No hay datos para mostrar."):
     """
-    Genera una ventana emergente genérica para mostrar listas.
-    Usa fuente monoespaciada para alinear columnas.
+    Genera una ventana emergente genérica con una TablaVirtual.
+    Solo se dibujan las filas visibles y un clic en el encabezado ordena.
+
+    Si se entrega cargar_pagina (ver crear_cargador_paginas), las filas se
+    piden por páginas en segundo plano a medida que se hace scroll.
     """
     popup = tk.Toplevel(ventana)
     popup.title(titulo)
-    popup.geometry("600x450")
+    popup.geometry("650x450")
     popup.grab_set() # Bloquea la ventana principal
 
-    frame_lista = tk.Frame(popup)
-    frame_lista.pack(pady=10, padx=10, fill="both", expand=True)
-
-    # Scrollbars vertical y horizontal
-    scrollbar_y = tk.Scrollbar(frame_lista, orient="vertical")
-    scrollbar_x = tk.Scrollbar(frame_lista, orient="horizontal")
-    
-    # Usar fuente monoespaciada (Consolas) para alinear columnas
-    lista_widget = tk.Listbox(frame_lista, 
-                               yscrollcommand=scrollbar_y.set,
-                               xscrollcommand=scrollbar_x.set,
-                               font=("Consolas", 10),
-                               width=70)
-    
-    scrollbar_y.config(command=lista_widget.yview)
-    scrollbar_x.config(command=lista_widget.xview)
-    
-    scrollbar_y.pack(side="right", fill="y")
-    scrollbar_x.pack(side="bottom", fill="x")
-    lista_widget.pack(side="left", fill="both", expand=True)
-
-    lista_widget.insert(tk.END, encabezado)
-    lista_widget.insert(tk.END, "-" * 70)
-
-    if not datos:
-        lista_widget.insert(tk.END, "No hay datos para mostrar.")
-    else:
-        for item in datos:
-            lista_widget.insert(tk.END, item)
+    tabla = TablaVirtual(popup, columnas, filas=filas, cargar_pagina=cargar_pagina,
+                         ejecutor=ejecutor, texto_vacio=texto_vacio)
+    tabla.pack(pady=10, padx=10, fill="both", expand=True)
 
     tk.Button(popup, text="Cerrar", font=FONT_BOTON, command=popup.destroy).pack(pady=10)
+    return tabla
+
+def crear_cargador_paginas(funcion_pagina, campo_id, tamano=100, primer_id=0):
+    """
+    Retorna una función para crear_popup_lista que en cada llamada trae la
+    página siguiente (paginación por clave sobre `campo_id`).
+    Corre en el hilo del ejecutor y retorna (filas, hay_mas).
+    """
+    ultimo = {'id': primer_id}
+
+    def cargar():
+        filas = funcion_pagina(ultimo['id'], tamano)
+        if filas:
+            ultimo['id'] = filas[-1][campo_id]
+        return filas, len(filas) == tamano
+
+    return cargar
+
+def formato_moneda(valor):
+    return f"${valor:,.0f}" if valor else "N/A"
+
+def formato_fecha(valor):
+    return valor.strftime("%d/%m/%Y") if valor else "N/A"
+
+# Columnas de cada listado (clave del diccionario, título, ancho en px)
+COLUMNAS_EMPLEADOS = [
+    Columna('idEmpleado', "ID", 60, alinear="e"),
+    Columna('nombre', "Nombre", 160),
+    Columna('correo', "Correo", 180),
+    Columna('salario', "Salario", 100, formato=formato_moneda, alinear="e"),
+    Columna('departamento', "Depto", 120),
+]
+COLUMNAS_DEPARTAMENTOS = [
+    Columna('idDepartamento', "ID", 60, alinear="e"),
+    Columna('nombre', "Nombre", 220),
+    Columna('gerente', "Gerente", 200),
+]
+COLUMNAS_PROYECTOS = [
+    Columna('idProyecto', "ID", 60, alinear="e"),
+    Columna('nombre', "Nombre", 220),
+    Columna('fechaInicio', "Fecha", 100),
+    Columna('numEmpleados', "#Emp", 60, alinear="e"),
+]
+COLUMNAS_ADMINS = [
+    Columna('idAdmin', "ID", 60, alinear="e"),
+    Columna('usuario', "Usuario", 160),
+    Columna('nombreEmpleado', "Empleado Asociado", 220),
+]
+COLUMNAS_MIEMBROS = [
+    Columna('idEmpleado', "ID", 60, alinear="e"),
+    Columna('nombre', "Nombre", 200),
+    Columna('correo', "Correo", 220),
+]
+COLUMNAS_HISTORIAL = [
+    Columna('fecha_consulta', "Consulta", 90, formato=formato_fecha),
+    Columna('nombre', "Indicador", 240),
+    Columna('valor', "Valor", 110, formato=lambda v: f"${v:,.2f}" if v else "N/A", alinear="e"),
+    Columna('fecha_valor', "Fecha Valor", 90, formato=formato_fecha),
+    Columna('admin', "Admin", 90),
+]
+
+COLUMNAS_REPORTE = [
+    Columna('grupo', "Grupo", 250),
+    Columna('horas', "Horas", 100, formato=lambda v: f"{v:,.1f}", alinear="e"),
+    Columna('registros', "Registros", 90, alinear="e"),
+]
+
+COLUMNAS_MASIVA = [
+    Columna('idEmpleado', "ID", 60, alinear="e"),
+    Columna('nombre', "Nombre", 200),
+    Columna('departamento', "Depto", 160),
+]
+COLUMNAS_ERRORES_ASIGNACION = [
+    Columna('idEmpleado', "ID Empleado", 100, alinear="e"),
+    Columna('mensaje', "Motivo", 400),
+]
+
+def formato_ms(segundos):
+    return "N/A" if segundos is None else f"{segundos * 1000:,.1f}"
+
+# Diagnóstico de BD: tiempos en milisegundos
+COLUMNAS_DIAG_FUNCIONES = [
+    Columna('funcion', "Función", 230),
+    Columna('llamadas', "Llamadas", 70, alinear="e"),
+    Columna('p50', "p50 ms", 70, formato=formato_ms, alinear="e"),
+    Columna('p95', "p95 ms", 70, formato=formato_ms, alinear="e"),
+    Columna('p99', "p99 ms", 70, formato=formato_ms, alinear="e"),
+    Columna('p95_bd', "p95 BD ms", 80, formato=formato_ms, alinear="e"),
+    Columna('filas', "Filas", 70, alinear="e"),
+    Columna('viajes', "Viajes", 60, alinear="e"),
+    Columna('errores', "Errores", 60, alinear="e"),
+]
+COLUMNAS_DIAG_LENTAS = [
+    Columna('funcion', "Función", 200),
+    Columna('segundos', "Total ms", 80, formato=formato_ms, alinear="e"),
+    Columna('segundos_bd', "BD ms", 80, formato=formato_ms, alinear="e"),
+    Columna('filas', "Filas", 60, alinear="e"),
+    Columna('viajes', "Viajes", 60, alinear="e"),
+    Columna('sql', "SQL", 500, formato=lambda sentencias: " | ".join(sentencias) or "N/A"),
+]
+COLUMNAS_RECHAZADOS = [
+    Columna('fecha', "Fecha", 90),
+    Columna('id_empleado', "ID Empleado", 80, alinear="e"),
+    Columna('id_proyecto', "ID Proyecto", 80, alinear="e"),
+    Columna('horas', "Horas", 60, alinear="e"),
+    Columna('descripcion', "Descripción", 220),
+    Columna('error', "Error", 300),
+]
+
+def filas_miembros(empleados):
+    """Convierte objetos Empleado en filas para COLUMNAS_MIEMBROS"""
+    return [{'idEmpleado': emp.idEmpleado, 'nombre': emp.nombre, 'correo': emp.correo} for emp in empleados]
 
 # --- Constructores de UI (Para no repetir código) ---
 
@@ -141,25 +247,38 @@ def crear_label_mensaje(padre):
 # --- LÓGICA DE NEGOCIO (Controladores) ---
 # =============================================================================
 
+# Todas las llamadas a dbFunciones y a la API pasan por `ejecutor` (ver ejecutor.py):
+# corren en un hilo aparte y el callback `al_terminar` actualiza la interfaz
+# en el hilo de Tkinter, así la ventana no se congela durante las consultas.
+
 # --- Admin ---
 
 def procesar_login_admin():
-    global admin_logeado
     usuario = entry_login_usuario.get()
     clave = entry_login_clave.get()
-    
-    resultado = dbFunciones.db_login_admin(usuario, clave)
-    
-    if resultado:
-        admin_logeado = dbFunciones.db_buscar_admin_completo(resultado)
-        if admin_logeado:
-            lbl_bienvenida_admin.config(text=f"¡Bienvenido, {admin_logeado.nombre}!")
+
+    def al_terminar(resultado):
+        global admin_logeado
+        admin, mensaje = resultado
+
+        if admin:
+            admin_logeado = admin
             cambiar_frame(frame_panel_admin, frame_login_admin)
+            lbl_bienvenida_admin.config(text=f"¡Bienvenido, {admin_logeado.nombre}!")
             lbl_mensaje_login_admin.config(text="")
         else:
-            lbl_mensaje_login_admin.config(text="Error: Datos de admin corruptos", fg=COLOR_TEXTO_ERROR)
-    else:
-        lbl_mensaje_login_admin.config(text="Credenciales incorrectas", fg=COLOR_TEXTO_ERROR)
+            lbl_mensaje_login_admin.config(text=mensaje, fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(autenticacion.iniciar_sesion, usuario, clave, al_terminar=al_terminar, clave="login_admin",
+                      etiqueta=lbl_mensaje_login_admin, texto_espera="Verificando credenciales...")
+
+
+def cerrar_sesion_admin():
+    """Cancela las tareas en curso y vuelve al inicio"""
+    global admin_logeado
+    ejecutor.cancelar_todas()
+    admin_logeado = None
+    cambiar_frame(frame_inicio, frame_panel_admin, lambda: limpiar_formulario([entry_login_usuario, entry_login_clave, lbl_mensaje_login_admin]))
 
 
 def accion_cambiar_clave():
@@ -167,119 +286,125 @@ def accion_cambiar_clave():
     clave_actual = entry_cambiar_clave_actual.get()
     clave_nueva = entry_cambiar_clave_nueva.get()
     clave_confirmar = entry_cambiar_clave_confirmar.get()
-    
+
     # Validaciones
     if not admin_logeado:
         lbl_msg_cambiar_clave.config(text="Error: No hay sesión activa", fg=COLOR_TEXTO_ERROR)
         return
-    
+
     if not clave_actual or not clave_nueva or not clave_confirmar:
         lbl_msg_cambiar_clave.config(text="Todos los campos son obligatorios", fg=COLOR_TEXTO_ERROR)
         return
-    
+
     if clave_nueva != clave_confirmar:
         lbl_msg_cambiar_clave.config(text="Las contraseñas nuevas no coinciden", fg=COLOR_TEXTO_ERROR)
         return
-    
+
     if len(clave_nueva) < 6:
         lbl_msg_cambiar_clave.config(text="La contraseña debe tener al menos 6 caracteres", fg=COLOR_TEXTO_ERROR)
         return
-    
-    # Obtener el usuario del admin logueado
-    usuario_admin = dbFunciones.db_obtener_usuario_admin_por_id_empleado(admin_logeado.idEmpleado)
-    
-    if not usuario_admin:
-        lbl_msg_cambiar_clave.config(text="Error: No se encontró el usuario", fg=COLOR_TEXTO_ERROR)
-        return
-    
-    resultado = dbFunciones.db_cambiar_clave_admin(usuario_admin, clave_actual, clave_nueva)
-    
-    if resultado is True:
-        lbl_msg_cambiar_clave.config(text="¡Contraseña cambiada exitosamente!", fg=COLOR_TEXTO_EXITO)
-        limpiar_formulario([entry_cambiar_clave_actual, entry_cambiar_clave_nueva, entry_cambiar_clave_confirmar])
-    else:
-        lbl_msg_cambiar_clave.config(text=str(resultado), fg=COLOR_TEXTO_ERROR)
+
+    id_empleado = admin_logeado.idEmpleado
+
+    def cambiar():
+        # Obtener el usuario del admin logueado
+        usuario_admin = dbFunciones.db_obtener_usuario_admin_por_id_empleado(id_empleado)
+        if not usuario_admin:
+            return "Error: No se encontró el usuario"
+        return autenticacion.cambiar_clave(usuario_admin, clave_actual, clave_nueva)
+
+    def al_terminar(resultado):
+        if resultado is True:
+            lbl_msg_cambiar_clave.config(text="¡Contraseña cambiada exitosamente!", fg=COLOR_TEXTO_EXITO)
+            limpiar_formulario([entry_cambiar_clave_actual, entry_cambiar_clave_nueva, entry_cambiar_clave_confirmar])
+        else:
+            lbl_msg_cambiar_clave.config(text=str(resultado), fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(cambiar, al_terminar=al_terminar, clave="cambiar_clave", etiqueta=lbl_msg_cambiar_clave)
 
 
 def accion_crear_nuevo_admin():
     """Procesa la creación de un nuevo administrador"""
     try:
-        id_admin = int(entry_nuevo_admin_id.get())
         usuario = entry_nuevo_admin_usuario.get()
         clave = entry_nuevo_admin_clave.get()
         clave_confirmar = entry_nuevo_admin_clave_confirm.get()
         id_empleado = int(entry_nuevo_admin_id_emp.get())
-        
+
         # Validaciones
         if not usuario or not clave:
             lbl_msg_crear_admin.config(text="Usuario y contraseña son obligatorios", fg=COLOR_TEXTO_ERROR)
             return
-        
+
         if clave != clave_confirmar:
             lbl_msg_crear_admin.config(text="Las contraseñas no coinciden", fg=COLOR_TEXTO_ERROR)
             return
-        
+
         if len(clave) < 6:
             lbl_msg_crear_admin.config(text="La contraseña debe tener al menos 6 caracteres", fg=COLOR_TEXTO_ERROR)
             return
-        
+
         if len(usuario) < 3:
             lbl_msg_crear_admin.config(text="El usuario debe tener al menos 3 caracteres", fg=COLOR_TEXTO_ERROR)
             return
-        
-        resultado = dbFunciones.db_crear_nuevo_admin(id_admin, usuario, clave, id_empleado)
-        
+
+    except ValueError:
+        lbl_msg_crear_admin.config(text="El ID Empleado debe ser un número", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(resultado):
         if resultado is True:
             lbl_msg_crear_admin.config(text=f"¡Admin '{usuario}' creado exitosamente!", fg=COLOR_TEXTO_EXITO)
-            limpiar_formulario([entry_nuevo_admin_id, entry_nuevo_admin_usuario, 
-                              entry_nuevo_admin_clave, entry_nuevo_admin_clave_confirm, 
+            limpiar_formulario([entry_nuevo_admin_usuario,
+                              entry_nuevo_admin_clave, entry_nuevo_admin_clave_confirm,
                               entry_nuevo_admin_id_emp])
-            # Actualizar el ID sugerido
-            nuevo_id = dbFunciones.db_obtener_siguiente_id_admin()
-            entry_nuevo_admin_id.insert(0, str(nuevo_id))
         else:
             lbl_msg_crear_admin.config(text=str(resultado), fg=COLOR_TEXTO_ERROR)
-            
-    except ValueError:
-        lbl_msg_crear_admin.config(text="ID Admin e ID Empleado deben ser números", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_crear_nuevo_admin, usuario, clave, id_empleado,
+                      al_terminar=al_terminar, clave="crear_admin", etiqueta=lbl_msg_crear_admin)
 
 
 def ver_lista_admins_popup():
     """Muestra un popup con la lista de administradores"""
-    admins = dbFunciones.db_listar_administradores()
-    datos = []
-    
-    if admins:
-        for admin in admins:
-            datos.append(f"ID: {admin['idAdmin']} | Usuario: {admin['usuario']} | Empleado: {admin['nombreEmpleado']}")
-    else:
-        datos.append("No hay administradores registrados.")
-    
-    crear_popup_lista("Lista de Administradores", datos, "ID | Usuario | Empleado Asociado")
+    def al_terminar(admins):
+        crear_popup_lista("Lista de Administradores", COLUMNAS_ADMINS, admins,
+                          texto_vacio="No hay administradores registrados.")
+
+    ejecutor.ejecutar(dbFunciones.db_listar_administradores, al_terminar=al_terminar, clave="popup_admins")
 
 
 # --- Indicadores Económicos ---
 
-def accion_consultar_indicadores():
-    """Consulta los indicadores desde la API y los muestra"""
-    lbl_msg_indicadores.config(text="Consultando API...", fg="blue")
-    ventana.update()
-    
-    indicadores = obtener_indicadores()
-    
-    if not indicadores:
-        lbl_msg_indicadores.config(text="Error al consultar la API", fg=COLOR_TEXTO_ERROR)
-        return
-    
-    # Limpiar el listbox
-    listbox_indicadores.delete(0, tk.END)
-    
-    # Mostrar los indicadores
-    for nombre, ind in indicadores.items():
-        valor_formateado = f"${ind.valor:,.2f}" if ind.valor else "N/A"
-        listbox_indicadores.insert(tk.END, f"{ind.nombre}: {valor_formateado}")
-    
-    lbl_msg_indicadores.config(text=f"Se encontraron {len(indicadores)} indicadores", fg=COLOR_TEXTO_EXITO)
+def accion_consultar_indicadores(forzar=False):
+    """
+    Muestra los indicadores. Usa el caché de api_indicador salvo que
+    forzar=True, en cuyo caso se vuelve a consultar la API.
+    """
+    def consultar():
+        indicadores = api_indicador.refrescar_indicadores() if forzar else api_indicador.obtener_indicadores()
+        return indicadores, api_indicador.fecha_actualizacion_indicadores()
+
+    def al_terminar(resultado):
+        indicadores, actualizado = resultado
+
+        if not indicadores:
+            lbl_msg_indicadores.config(text="Error al consultar la API", fg=COLOR_TEXTO_ERROR)
+            return
+
+        # Limpiar el listbox
+        listbox_indicadores.delete(0, tk.END)
+
+        # Mostrar los indicadores
+        for nombre, ind in indicadores.items():
+            valor_formateado = f"${ind.valor:,.2f}" if ind.valor else "N/A"
+            listbox_indicadores.insert(tk.END, f"{ind.nombre}: {valor_formateado}")
+
+        hora = actualizado.strftime("%d/%m/%Y %H:%M") if actualizado else "N/A"
+        lbl_msg_indicadores.config(text=f"Se encontraron {len(indicadores)} indicadores (actualizados {hora})", fg=COLOR_TEXTO_EXITO)
+
+    ejecutor.ejecutar(consultar, al_terminar=al_terminar, clave="indicadores",
+                      etiqueta=lbl_msg_indicadores, texto_espera="Consultando API...")
 
 
 def accion_guardar_indicadores():
@@ -287,117 +412,217 @@ def accion_guardar_indicadores():
     if not admin_logeado:
         lbl_msg_indicadores.config(text="Error: No hay sesión activa", fg=COLOR_TEXTO_ERROR)
         return
-    
+
     # Verificar si hay indicadores en el listbox
     if listbox_indicadores.size() == 0:
         lbl_msg_indicadores.config(text="Primero debe consultar los indicadores", fg=COLOR_TEXTO_ERROR)
         return
-    
-    lbl_msg_indicadores.config(text="Guardando indicadores...", fg="blue")
-    ventana.update()
-    
-    # Obtener indicadores de la API
-    indicadores = obtener_indicadores()
-    
-    if not indicadores:
-        lbl_msg_indicadores.config(text="Error al consultar la API", fg=COLOR_TEXTO_ERROR)
+
+    id_empleado = admin_logeado.idEmpleado
+
+    def guardar():
+        # Los mismos indicadores que se mostraron (vienen del caché, sin nueva consulta)
+        indicadores = api_indicador.obtener_indicadores()
+        if not indicadores:
+            return "Error al consultar la API"
+
+        # Obtener el ID del admin
+        id_admin = dbFunciones.db_obtener_id_admin_por_id_empleado(id_empleado)
+        if not id_admin:
+            return "Error: No se encontró el ID del admin"
+
+        # Guardar los indicadores
+        return dbFunciones.db_registrar_multiples_indicadores(indicadores, id_admin)
+
+    def al_terminar(resultados):
+        if isinstance(resultados, str):
+            lbl_msg_indicadores.config(text=resultados, fg=COLOR_TEXTO_ERROR)
+        elif resultados['exitosos'] > 0:
+            lbl_msg_indicadores.config(
+                text=f"Guardados: {resultados['exitosos']} | Fallidos: {resultados['fallidos']}",
+                fg=COLOR_TEXTO_EXITO
+            )
+        else:
+            lbl_msg_indicadores.config(text="Error al guardar los indicadores", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(guardar, al_terminar=al_terminar, clave="indicadores",
+                      etiqueta=lbl_msg_indicadores, texto_espera="Guardando indicadores...")
+
+
+def ver_historial_indicadores_popup():
+    """Muestra el historial de indicadores guardados (más recientes primero, cargado por páginas)"""
+    cargar = crear_cargador_paginas(dbFunciones.db_obtener_historial_indicadores_pagina, 'id', primer_id=None)
+    crear_popup_lista("Historial de Indicadores", COLUMNAS_HISTORIAL, cargar_pagina=cargar,
+                      texto_vacio="No hay indicadores registrados.")
+
+
+# --- Reportes de Horas ---
+
+def leer_fecha(entry, nombre):
+    """Retorna la fecha del Entry (YYYY-MM-DD) o lanza ValueError con un mensaje para el usuario"""
+    try:
+        return datetime.datetime.strptime(entry.get().strip(), "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Error: Fecha '{nombre}' inválida (use YYYY-MM-DD)")
+
+def cerrar_reporte():
+    """Quita la tabla del reporte anterior y cierra su lector"""
+    global lector_reporte
+    for widget in frame_tabla_reporte.winfo_children():
+        widget.destroy()
+    if lector_reporte is not None:
+        # Si hay una página en curso, cerrar() la espera: se hace fuera del hilo de Tkinter
+        ejecutor.ejecutar(lector_reporte.cerrar)
+        lector_reporte = None
+
+def accion_generar_reporte():
+    """
+    Ejecuta el reporte de horas para el rango de fechas. Oracle agrupa y suma;
+    a la tabla solo llegan los totales, por páginas a medida que se hace scroll.
+    """
+    global lector_reporte
+    try:
+        desde = leer_fecha(entry_reporte_desde, "Desde")
+        hasta = leer_fecha(entry_reporte_hasta, "Hasta")
+    except ValueError as e:
+        lbl_msg_reporte.config(text=str(e), fg=COLOR_TEXTO_ERROR)
         return
-    
-    # Obtener el ID del admin
-    id_admin = dbFunciones.db_obtener_id_admin_por_id_empleado(admin_logeado.idEmpleado)
-    
-    if not id_admin:
-        lbl_msg_indicadores.config(text="Error: No se encontró el ID del admin", fg=COLOR_TEXTO_ERROR)
+    if desde > hasta:
+        lbl_msg_reporte.config(text="Error: 'Desde' es posterior a 'Hasta'", fg=COLOR_TEXTO_ERROR)
         return
-    
-    # Guardar los indicadores
-    resultados = dbFunciones.db_registrar_multiples_indicadores(indicadores, id_admin)
-    
-    if resultados['exitosos'] > 0:
-        lbl_msg_indicadores.config(
-            text=f"Guardados: {resultados['exitosos']} | Fallidos: {resultados['fallidos']}", 
-            fg=COLOR_TEXTO_EXITO
-        )
-    else:
-        lbl_msg_indicadores.config(text="Error al guardar los indicadores", fg=COLOR_TEXTO_ERROR)
 
+    agrupacion = var_agrupacion_reporte.get()
+    cerrar_reporte()
 
-def ver_historial_indicadores_popup():
-    """Muestra el historial de indicadores guardados en un popup con tabla ordenada"""
-    historial = dbFunciones.db_obtener_historial_indicadores(100)
-    
-    # Crear ventana popup
+    lector_reporte = reportes.LectorPaginado(reportes.reporte_horas(agrupacion, desde, hasta))
+    tabla = TablaVirtual(frame_tabla_reporte, COLUMNAS_REPORTE, cargar_pagina=lector_reporte.siguiente_pagina,
+                         ejecutor=ejecutor, texto_vacio="No hay horas registradas en el rango.")
+    tabla.pack(fill="both", expand=True)
+    lbl_msg_reporte.config(
+        text=f"Horas por {agrupacion} del {desde:%d/%m/%Y} al {hasta:%d/%m/%Y}", fg=COLOR_TEXTO_EXITO
+    )
+
+
+# --- Diagnóstico de BD ---
+
+def abrir_diagnostico_bd():
+    """
+    Ventana con las métricas de instrumentacion.py: las funciones db_*
+    ordenadas por p95 y las llamadas individuales más lentas con su SQL.
+    Los datos están en memoria, se leen directo en el hilo de Tkinter.
+    """
     popup = tk.Toplevel(ventana)
-    popup.title("Historial de Indicadores")
-    popup.geometry("700x500")
-    popup.grab_set()
-    popup.config(bg=COLOR_FONDO)
-    
-    # Título
-    tk.Label(popup, text="Historial de Indicadores Económicos", 
-             font=FONT_TITULO, bg=COLOR_FONDO).pack(pady=10)
-    
-    # Frame para la tabla con scrollbar
-    frame_tabla = tk.Frame(popup, bg=COLOR_FONDO)
-    frame_tabla.pack(pady=10, padx=15, fill="both", expand=True)
-    
-    # Scrollbars
-    scroll_y = tk.Scrollbar(frame_tabla, orient="vertical")
-    scroll_x = tk.Scrollbar(frame_tabla, orient="horizontal")
-    
-    # Listbox con fuente monoespaciada para alineación
-    lista = tk.Listbox(frame_tabla, 
-                       yscrollcommand=scroll_y.set,
-                       xscrollcommand=scroll_x.set,
-                       font=("Consolas", 10),
-                       width=80,
-                       height=18)
-    
-    scroll_y.config(command=lista.yview)
-    scroll_x.config(command=lista.xview)
-    
-    scroll_y.pack(side="right", fill="y")
-    scroll_x.pack(side="bottom", fill="x")
-    lista.pack(side="left", fill="both", expand=True)
-    
-    if historial:
-        # Agrupar por fecha de consulta
-        fecha_consulta_actual = None
-        
-        for ind in historial:
-            fecha_consulta = ind['fecha_consulta'].strftime("%d/%m/%Y") if ind['fecha_consulta'] else "N/A"
-            
-            # Si cambia la fecha de consulta, agregar separador
-            if fecha_consulta != fecha_consulta_actual:
-                if fecha_consulta_actual is not None:
-                    lista.insert(tk.END, "")
-                    lista.insert(tk.END, "─" * 75)
-                    lista.insert(tk.END, "")
-                
-                # Encabezado de la consulta
-                lista.insert(tk.END, f"📅 Consulta del {fecha_consulta}")
-                lista.insert(tk.END, f"{'Indicador':<35} {'Valor':>15} {'Fecha Valor':>12} {'Admin':>10}")
-                lista.insert(tk.END, "─" * 75)
-                fecha_consulta_actual = fecha_consulta
-            
-            fecha_val = ind['fecha_valor'].strftime("%d/%m/%Y") if ind['fecha_valor'] else "N/A"
-            valor_fmt = f"${ind['valor']:>,.2f}" if ind['valor'] else "N/A"
-            nombre = ind['nombre'][:33] + ".." if len(ind['nombre']) > 35 else ind['nombre']
-            admin = ind['admin'][:8] + ".." if len(ind['admin']) > 10 else ind['admin']
-            
-            linea = f"{nombre:<35} {valor_fmt:>15} {fecha_val:>12} {admin:>10}"
-            lista.insert(tk.END, linea)
-    else:
-        lista.insert(tk.END, "")
-        lista.insert(tk.END, "      No hay indicadores registrados.")
-    
-    # Información adicional
-    tk.Label(popup, text=f"Total de registros: {len(historial)}", 
-             font=FONT_TEXTO, bg=COLOR_FONDO, fg="gray").pack(pady=5)
-    
-    # Botón cerrar
-    tk.Button(popup, text="Cerrar", font=FONT_BOTON, width=15,
-              command=popup.destroy, bg=COLOR_BOTON).pack(pady=10)
+    popup.title("Diagnóstico de Base de Datos")
+    popup.geometry("950x650")
+
+    lbl_pool = tk.Label(popup, text="", font=FONT_TEXTO)
+    lbl_pool.pack(pady=5)
+    lbl_cola = tk.Label(popup, text="", font=FONT_TEXTO)
+    lbl_cola.pack()
+    frame_tablas = tk.Frame(popup)
+    frame_tablas.pack(fill="both", expand=True, padx=10)
+    lbl_msg = tk.Label(popup, text="", font=FONT_TEXTO)
+    lbl_msg.pack()
+
+    def actualizar():
+        for widget in frame_tablas.winfo_children():
+            widget.destroy()
+
+        pool = dbFunciones.db_estadisticas_pool()
+        prestadas = dbFunciones.db_sesiones_prestadas()
+        lbl_pool.config(text=f"{pool['backend']} - Pool: {pool['ocupadas']} de {pool['abiertas']} sesiones ocupadas (máx. {pool['max']}), "
+                             f"{pool['esperas']} esperas ({pool['tiempo_espera']:.2f} s) - "
+                             f"Sesiones sin devolver: {len(prestadas)}",
+                        fg=COLOR_TEXTO_ERROR if prestadas else "black")
+
+        cola = cola_registros.estado_cola()
+        texto_cola = f"Cola de horas: {cola['pendientes']} pendientes, {cola['rechazados']} rechazados"
+        if cola['ultimo_error']:
+            texto_cola += f" - Último error: {cola['ultimo_error']}"
+        lbl_cola.config(text=texto_cola,
+                        fg=COLOR_TEXTO_ERROR if cola['rechazados'] or cola['ultimo_error'] else "black")
+
+        tk.Label(frame_tablas, text="Funciones (de mayor a menor p95)", font=FONT_SUBTITULO).pack()
+        TablaVirtual(frame_tablas, COLUMNAS_DIAG_FUNCIONES, filas=instrumentacion.resumen(),
+                     texto_vacio="Aún no hay llamadas registradas.").pack(fill="both", expand=True, pady=5)
+        tk.Label(frame_tablas, text="Llamadas más lentas", font=FONT_SUBTITULO).pack()
+        TablaVirtual(frame_tablas, COLUMNAS_DIAG_LENTAS, filas=instrumentacion.llamadas_lentas(),
+                     texto_vacio="Aún no hay llamadas registradas.").pack(fill="both", expand=True, pady=5)
+
+    def exportar(extension, descripcion):
+        ruta = filedialog.asksaveasfilename(parent=popup, defaultextension=extension,
+                                            initialfile=f"metricas_bd{extension}",
+                                            filetypes=[(descripcion, f"*{extension}")])
+        if not ruta:
+            return
+        try:
+            instrumentacion.exportar(ruta)
+            lbl_msg.config(text=f"Métricas guardadas en {ruta}", fg=COLOR_TEXTO_EXITO)
+        except OSError as e:
+            lbl_msg.config(text=f"Error al guardar: {e}", fg=COLOR_TEXTO_ERROR)
+
+    def reiniciar():
+        if messagebox.askyesno("Confirmar", "¿Descartar todas las métricas registradas?", parent=popup):
+            instrumentacion.reiniciar()
+            actualizar()
+
+    frame_botones = tk.Frame(popup)
+    frame_botones.pack(pady=10)
+    tk.Button(frame_botones, text="Actualizar", font=FONT_BOTON, command=actualizar).pack(side="left", padx=5)
+    tk.Button(frame_botones, text="Registros rechazados", font=FONT_BOTON,
+              command=lambda: abrir_registros_rechazados(popup, al_cambiar=actualizar)).pack(side="left", padx=5)
+    tk.Button(frame_botones, text="Exportar JSON", font=FONT_BOTON,
+              command=lambda: exportar(".json", "JSON")).pack(side="left", padx=5)
+    tk.Button(frame_botones, text="Exportar Prometheus", font=FONT_BOTON,
+              command=lambda: exportar(".prom", "Prometheus")).pack(side="left", padx=5)
+    tk.Button(frame_botones, text="Reiniciar", font=FONT_BOTON, command=reiniciar).pack(side="left", padx=5)
+    tk.Button(frame_botones, text="Cerrar", font=FONT_BOTON, command=popup.destroy).pack(side="left", padx=5)
+
+    actualizar()
+
+
+def abrir_registros_rechazados(padre, al_cambiar=None):
+    """
+    Registros de horas que la BD rechazó al sincronizar la cola (p. ej.
+    proyecto eliminado). Se pueden reintentar, tras corregir la causa, o
+    descartar. El diario es local: se lee directo en el hilo de Tkinter.
+    """
+    popup = tk.Toplevel(padre)
+    popup.title("Registros de horas rechazados")
+    popup.geometry("900x450")
+
+    frame_tabla = tk.Frame(popup)
+    frame_tabla.pack(fill="both", expand=True, padx=10, pady=5)
+    lbl_msg = tk.Label(popup, text="", font=FONT_TEXTO)
+    lbl_msg.pack()
+
+    def actualizar():
+        for widget in frame_tabla.winfo_children():
+            widget.destroy()
+        TablaVirtual(frame_tabla, COLUMNAS_RECHAZADOS, filas=cola_registros.registros_rechazados(),
+                     texto_vacio="No hay registros rechazados.").pack(fill="both", expand=True)
+        if al_cambiar:
+            al_cambiar()
+
+    def reintentar():
+        cantidad = cola_registros.reintentar_rechazados()
+        lbl_msg.config(text=f"{cantidad} registros vuelven a la cola para reenviarse", fg=COLOR_TEXTO_EXITO)
+        actualizar()
+
+    def descartar():
+        if messagebox.askyesno("Confirmar", "¿Descartar los registros rechazados? No se podrán recuperar.",
+                               parent=popup):
+            cantidad = cola_registros.descartar_rechazados()
+            lbl_msg.config(text=f"{cantidad} registros descartados", fg=COLOR_TEXTO_EXITO)
+            actualizar()
+
+    frame_botones = tk.Frame(popup)
+    frame_botones.pack(pady=10)
+    tk.Button(frame_botones, text="Reintentar", font=FONT_BOTON, command=reintentar).pack(side="left", padx=5)
+    tk.Button(frame_botones, text="Descartar", font=FONT_BOTON, command=descartar).pack(side="left", padx=5)
+    tk.Button(frame_botones, text="Cerrar", font=FONT_BOTON, command=popup.destroy).pack(side="left", padx=5)
+
+    actualizar()
 
 
 # --- Empleado ---
@@ -405,116 +630,136 @@ def ver_historial_indicadores_popup():
 def procesar_ingreso_empleado():
     """Valida el RUT y lleva al panel de registro de horas"""
     rut = entry_login_rut_empleado.get()
-    
+
     if not rut:
         lbl_mensaje_login_emp.config(text="Debe ingresar un RUT", fg=COLOR_TEXTO_ERROR)
         return
 
-    empleado_obj = dbFunciones.db_buscar_id_empleado_por_rut(rut)
-    
-    if isinstance(empleado_obj, Empleado):
-        # Pre-llenar formulario de horas
-        entry_horas_id_emp.config(state='normal')
-        entry_horas_id_emp.delete(0, tk.END)
-        entry_horas_id_emp.insert(0, str(empleado_obj.idEmpleado))
-        entry_horas_id_emp.config(state='disabled')
-        
-        fecha_hoy = datetime.datetime.now().strftime("%Y-%m-%d")
-        entry_horas_fecha.config(state='normal')
-        entry_horas_fecha.delete(0, tk.END)
-        entry_horas_fecha.insert(0, fecha_hoy)
-        entry_horas_fecha.config(state='disabled')
-        
-        cambiar_frame(frame_registrar_horas, frame_login_empleado)
-        entry_login_rut_empleado.delete(0, tk.END)
-    else:
-        lbl_mensaje_login_emp.config(text="RUT no encontrado", fg=COLOR_TEXTO_ERROR)
+    def al_terminar(empleado_obj):
+        if isinstance(empleado_obj, Empleado):
+            cambiar_frame(frame_registrar_horas, frame_login_empleado)
+
+            # Pre-llenar formulario de horas
+            entry_horas_id_emp.config(state='normal')
+            entry_horas_id_emp.delete(0, tk.END)
+            entry_horas_id_emp.insert(0, str(empleado_obj.idEmpleado))
+            entry_horas_id_emp.config(state='disabled')
+
+            fecha_hoy = datetime.datetime.now().strftime("%Y-%m-%d")
+            entry_horas_fecha.config(state='normal')
+            entry_horas_fecha.delete(0, tk.END)
+            entry_horas_fecha.insert(0, fecha_hoy)
+            entry_horas_fecha.config(state='disabled')
+
+            entry_login_rut_empleado.delete(0, tk.END)
+        else:
+            lbl_mensaje_login_emp.config(text="RUT no encontrado", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_buscar_id_empleado_por_rut, rut, al_terminar=al_terminar,
+                      clave="login_empleado", etiqueta=lbl_mensaje_login_emp, texto_espera="Buscando RUT...")
 
 def procesar_busqueda_editar_empleado():
     """Busca empleado por RUT para llenar el formulario de edición"""
     rut = entry_editar_rut_busqueda.get()
-    
+
     if not rut:
         lbl_mensaje_editar_busqueda.config(text="Ingrese RUT", fg=COLOR_TEXTO_ERROR)
         return
-        
-    empleado_obj = dbFunciones.db_buscar_id_empleado_por_rut(rut)
-    
-    if isinstance(empleado_obj, Empleado):
-        # Llenar campos
-        campos_map = {
-            entry_ed_rut: rut,
-            entry_ed_nombre: empleado_obj.nombre,
-            entry_ed_direccion: empleado_obj.direccion,
-            entry_ed_telefono: empleado_obj.telefono,
-            entry_ed_correo: empleado_obj.correo,
-            entry_ed_salario: str(empleado_obj.salario),
-            entry_ed_id_emp: str(empleado_obj.idEmpleado),
-            entry_ed_fecha: empleado_obj.fechaInicioContrato
-        }
-        
-        # ID Depto es especial porque puede ser None
-        id_depto = str(empleado_obj.departamento.idDepartamento) if empleado_obj.departamento else ""
-        campos_map[entry_ed_id_depto] = id_depto
 
-        for widget, valor in campos_map.items():
-            widget.config(state='normal')
-            widget.delete(0, tk.END)
-            widget.insert(0, valor)
-            
-        # Bloquear campos que no deben editarse
-        entry_ed_rut.config(state='disabled')
-        entry_ed_id_emp.config(state='disabled')
-        entry_ed_fecha.config(state='disabled')
-        entry_ed_id_depto.config(state='disabled')
-        
-        cambiar_frame(frame_form_editar_empleado, frame_editar_busqueda_empleado)
-    else:
-        lbl_mensaje_editar_busqueda.config(text="Empleado no encontrado", fg=COLOR_TEXTO_ERROR)
+    def al_terminar(empleado_obj):
+        if isinstance(empleado_obj, Empleado):
+            cambiar_frame(frame_form_editar_empleado, frame_editar_busqueda_empleado)
+
+            # Llenar campos
+            campos_map = {
+                entry_ed_rut: rut,
+                entry_ed_nombre: empleado_obj.nombre,
+                entry_ed_direccion: empleado_obj.direccion,
+                entry_ed_telefono: empleado_obj.telefono,
+                entry_ed_correo: empleado_obj.correo,
+                entry_ed_salario: str(empleado_obj.salario),
+                entry_ed_id_emp: str(empleado_obj.idEmpleado),
+                entry_ed_fecha: empleado_obj.fechaInicioContrato
+            }
+
+            # ID Depto es especial porque puede ser None
+            id_depto = str(empleado_obj.departamento.idDepartamento) if empleado_obj.departamento else ""
+            campos_map[entry_ed_id_depto] = id_depto
+
+            for widget, valor in campos_map.items():
+                widget.config(state='normal')
+                widget.delete(0, tk.END)
+                widget.insert(0, valor)
+
+            # Bloquear campos que no deben editarse
+            entry_ed_rut.config(state='disabled')
+            entry_ed_id_emp.config(state='disabled')
+            entry_ed_fecha.config(state='disabled')
+            entry_ed_id_depto.config(state='disabled')
+        else:
+            lbl_mensaje_editar_busqueda.config(text="Empleado no encontrado", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_buscar_id_empleado_por_rut, rut, al_terminar=al_terminar,
+                      clave="buscar_editar_empleado", etiqueta=lbl_mensaje_editar_busqueda, texto_espera="Buscando...")
 
 # --- Departamentos ---
 
 def accion_crear_departamento():
-    id_str = entry_crear_depto_id.get().strip()
     nombre = entry_crear_depto_nombre.get().strip()
     id_gerente_str = entry_crear_depto_gerente.get().strip()
 
-    if not (id_str and nombre):
-        lbl_msg_crear_depto.config(text="ID y Nombre son obligatorios", fg=COLOR_TEXTO_ERROR)
+    if not nombre:
+        lbl_msg_crear_depto.config(text="El Nombre es obligatorio", fg=COLOR_TEXTO_ERROR)
+        return
+
+    if admin_logeado is None:
+        lbl_msg_crear_depto.config(text="Error: No hay sesión activa", fg=COLOR_TEXTO_ERROR)
         return
 
     try:
-        id_d = int(id_str)
-        
         # Gerente es opcional
+        id_g = int(id_gerente_str) if id_gerente_str else None
+    except ValueError:
+        lbl_msg_crear_depto.config(text="IDs deben ser números", fg=COLOR_TEXTO_ERROR)
+        return
+
+    admin = admin_logeado
+
+    def crear():
         gerente = None
-        if id_gerente_str:
-            id_g = int(id_gerente_str)
+        if id_g is not None:
             gerente = dbFunciones.db_buscar_empleado_por_id(id_g)
             if not gerente:
-                lbl_msg_crear_depto.config(text="El gerente especificado no existe", fg=COLOR_TEXTO_ERROR)
-                return
-        
-        if admin_logeado is not None:
-            if admin_logeado.crearDepartamento(id_d, nombre, gerente):
-                msg = "Departamento Creado" if gerente else "Departamento Creado (sin gerente)"
-                lbl_msg_crear_depto.config(text=msg, fg=COLOR_TEXTO_EXITO)
-                limpiar_formulario([entry_crear_depto_id, entry_crear_depto_nombre, entry_crear_depto_gerente])
-            else:
-                lbl_msg_crear_depto.config(text="Error al crear (¿ID Duplicado?)", fg=COLOR_TEXTO_ERROR)
+                return "El gerente especificado no existe"
+        return admin.crearDepartamento(nombre, gerente)
+
+    def al_terminar(depto):
+        if isinstance(depto, str):
+            lbl_msg_crear_depto.config(text=depto, fg=COLOR_TEXTO_ERROR)
+        elif depto:
+            msg = f"Departamento Creado (ID {depto.idDepartamento})"
+            if not depto.gerente:
+                msg += " sin gerente"
+            lbl_msg_crear_depto.config(text=msg, fg=COLOR_TEXTO_EXITO)
+            limpiar_formulario([entry_crear_depto_nombre, entry_crear_depto_gerente])
         else:
-            lbl_msg_crear_depto.config(text="Error: No hay sesión activa", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_crear_depto.config(text="IDs deben ser números", fg=COLOR_TEXTO_ERROR)
-    except Exception as e:
+            lbl_msg_crear_depto.config(text="Error al crear el departamento", fg=COLOR_TEXTO_ERROR)
+
+    def al_error(e):
         lbl_msg_crear_depto.config(text=f"Error: {e}", fg=COLOR_TEXTO_ERROR)
 
+    ejecutor.ejecutar(crear, al_terminar=al_terminar, al_error=al_error,
+                      clave="crear_depto", etiqueta=lbl_msg_crear_depto)
+
 def accion_buscar_departamento():
-    global obj_depto_actual
     try:
         id_d = int(entry_buscar_depto_id.get())
-        depto = dbFunciones.db_buscar_departamento_por_id(id_d)
-        
+    except ValueError:
+        lbl_msg_buscar_depto.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(depto):
+        global obj_depto_actual
         if depto:
             nombre_gerente = depto.gerente.nombre if depto.gerente else "Sin Asignar"
             lbl_res_depto_nombre.config(text=f"Departamento: {depto.nombre}")
@@ -524,264 +769,392 @@ def accion_buscar_departamento():
         else:
             lbl_msg_buscar_depto.config(text="No encontrado", fg=COLOR_TEXTO_ERROR)
             obj_depto_actual = None
-    except ValueError:
-        lbl_msg_buscar_depto.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+
+    # Los empleados del departamento se consultan recién al pedir "Ver Empleados"
+    ejecutor.ejecutar(dbFunciones.db_buscar_departamento_por_id, id_d, False, al_terminar=al_terminar,
+                      clave="buscar_depto", etiqueta=lbl_msg_buscar_depto, texto_espera="Buscando...")
 
 def ver_empleados_depto_popup():
-    datos = []
-    if obj_depto_actual and obj_depto_actual.empleados:
-        for emp in obj_depto_actual.empleados:
-            # Formateo con anchos fijos para alineación
-            id_fmt = str(emp.idEmpleado).ljust(5)
-            nombre_fmt = emp.nombre[:20].ljust(20)
-            correo_fmt = (emp.correo or "N/A")[:25].ljust(25)
-            datos.append(f"{id_fmt} | {nombre_fmt} | {correo_fmt}")
-    elif not obj_depto_actual:
-        datos.append("Seleccione un departamento primero.")
-    else:
-        datos.append("Este departamento no tiene empleados.")
-    
-    crear_popup_lista("Empleados del Departamento", datos, f"{'ID':<5} | {'Nombre':<20} | {'Correo':<25}")
+    if not obj_depto_actual:
+        crear_popup_lista("Empleados del Departamento", COLUMNAS_MIEMBROS,
+                          texto_vacio="Seleccione un departamento primero.")
+        return
+
+    def al_terminar(empleados):
+        crear_popup_lista("Empleados del Departamento", COLUMNAS_MIEMBROS, filas_miembros(empleados),
+                          texto_vacio="Este departamento no tiene empleados.")
+
+    # La primera vez se consultan a la BD (carga perezosa); después quedan en el objeto
+    depto = obj_depto_actual
+    ejecutor.ejecutar(lambda: depto.empleados, al_terminar=al_terminar, clave="popup_miembros_depto",
+                      etiqueta=lbl_msg_buscar_depto, texto_espera="Cargando empleados...")
 
 def ver_todos_departamentos_popup():
-    """Muestra un popup con la lista de todos los departamentos"""
-    try:
-        departamentos = dbFunciones.db_listar_todos_departamentos()
-        datos = []
-        
-        if departamentos and len(departamentos) > 0:
-            for depto in departamentos:
-                # Formateo con anchos fijos para alineación
-                id_fmt = str(depto['idDepartamento']).ljust(5)
-                nombre_fmt = depto['nombre'][:25].ljust(25)
-                gerente_fmt = depto['gerente'][:20].ljust(20)
-                datos.append(f"{id_fmt} | {nombre_fmt} | {gerente_fmt}")
-        else:
-            datos.append("No hay departamentos registrados.")
-        
-        crear_popup_lista("Todos los Departamentos", datos, f"{'ID':<5} | {'Nombre':<25} | {'Gerente':<20}")
-    except Exception as e:
-        crear_popup_lista("Error", [f"Error al cargar departamentos: {str(e)}"], "Error")
+    """Muestra un popup con los departamentos, cargados por páginas"""
+    cargar = crear_cargador_paginas(dbFunciones.db_listar_departamentos_pagina, 'idDepartamento')
+    crear_popup_lista("Todos los Departamentos", COLUMNAS_DEPARTAMENTOS, cargar_pagina=cargar,
+                      texto_vacio="No hay departamentos registrados.")
 
 def ver_todos_empleados_popup():
-    """Muestra un popup con la lista de todos los empleados"""
-    try:
-        empleados = dbFunciones.db_listar_todos_empleados()
-        datos = []
-        
-        if empleados and len(empleados) > 0:
-            for emp in empleados:
-                # Formateo con anchos fijos para alineación
-                id_fmt = str(emp['idEmpleado']).ljust(5)
-                nombre_fmt = emp['nombre'][:18].ljust(18)
-                correo_fmt = (emp['correo'] or "N/A")[:20].ljust(20)
-                salario_fmt = f"${emp['salario']:>10,.0f}" if emp['salario'] else "N/A".rjust(11)
-                depto_fmt = emp['departamento'][:12].ljust(12)
-                datos.append(f"{id_fmt} | {nombre_fmt} | {correo_fmt} | {salario_fmt} | {depto_fmt}")
-        else:
-            datos.append("No hay empleados registrados.")
-        
-        crear_popup_lista("Todos los Empleados", datos, f"{'ID':<5} | {'Nombre':<18} | {'Correo':<20} | {'Salario':>11} | {'Depto':<12}")
-    except Exception as e:
-        crear_popup_lista("Error", [f"Error al cargar empleados: {str(e)}"], "Error")
+    """Muestra un popup con los empleados, cargados por páginas"""
+    cargar = crear_cargador_paginas(dbFunciones.db_listar_empleados_pagina, 'idEmpleado')
+    crear_popup_lista("Todos los Empleados", COLUMNAS_EMPLEADOS, cargar_pagina=cargar,
+                      texto_vacio="No hay empleados registrados.")
 
 def ver_todos_proyectos_popup():
-    """Muestra un popup con la lista de todos los proyectos"""
-    try:
-        proyectos = dbFunciones.db_listar_todos_proyectos()
-        datos = []
-        
-        if proyectos and len(proyectos) > 0:
-            for proy in proyectos:
-                # Formateo con anchos fijos para alineación
-                id_fmt = str(proy['idProyecto']).ljust(5)
-                nombre_fmt = proy['nombre'][:25].ljust(25)
-                fecha_fmt = proy['fechaInicio'].ljust(12)
-                emp_fmt = str(proy['numEmpleados']).rjust(3)
-                datos.append(f"{id_fmt} | {nombre_fmt} | {fecha_fmt} | {emp_fmt}")
-        else:
-            datos.append("No hay proyectos registrados.")
-        
-        crear_popup_lista("Todos los Proyectos", datos, f"{'ID':<5} | {'Nombre':<25} | {'Fecha':<12} | {'#Emp':>3}")
-    except Exception as e:
-        crear_popup_lista("Error", [f"Error al cargar proyectos: {str(e)}"], "Error")
+    """Muestra un popup con los proyectos, cargados por páginas"""
+    cargar = crear_cargador_paginas(dbFunciones.db_listar_proyectos_pagina, 'idProyecto')
+    crear_popup_lista("Todos los Proyectos", COLUMNAS_PROYECTOS, cargar_pagina=cargar,
+                      texto_vacio="No hay proyectos registrados.")
 
 def accion_editar_departamento():
     try:
         id_d = int(entry_edit_depto_id.get())
         nom = entry_edit_depto_nom.get()
         id_g = int(entry_edit_depto_ger.get())
-        
+
         if not nom: raise ValueError("Falta nombre")
-        
+    except ValueError:
+        lbl_msg_edit_depto.config(text="Datos inválidos", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def editar():
         gerente = dbFunciones.db_buscar_empleado_por_id(id_g)
         if not gerente:
-             lbl_msg_edit_depto.config(text="Gerente no existe", fg=COLOR_TEXTO_ERROR)
-             return
+            return "Gerente no existe"
+        return dbFunciones.db_actualizar_departamento(id_d, nom, id_g)
 
-        if dbFunciones.db_actualizar_departamento(id_d, nom, id_g):
+    def al_terminar(resultado):
+        if resultado is True:
             lbl_msg_edit_depto.config(text="Actualizado correctamente", fg=COLOR_TEXTO_EXITO)
             limpiar_formulario([entry_edit_depto_id, entry_edit_depto_nom, entry_edit_depto_ger])
+        elif isinstance(resultado, str):
+            lbl_msg_edit_depto.config(text=resultado, fg=COLOR_TEXTO_ERROR)
         else:
             lbl_msg_edit_depto.config(text="Error al actualizar", fg=COLOR_TEXTO_ERROR)
-            
-    except ValueError:
-        lbl_msg_edit_depto.config(text="Datos inválidos", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(editar, al_terminar=al_terminar, clave="editar_depto", etiqueta=lbl_msg_edit_depto)
 
 def accion_eliminar_departamento():
     try:
         id_d = int(entry_elim_depto_id.get())
-        if dbFunciones.db_eliminar_departamento(id_d):
+    except ValueError:
+        lbl_msg_elim_depto.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(resultado):
+        if resultado:
             lbl_msg_elim_depto.config(text="Eliminado correctamente", fg=COLOR_TEXTO_EXITO)
             limpiar_formulario([entry_elim_depto_id])
         else:
             lbl_msg_elim_depto.config(text="No se pudo eliminar", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_elim_depto.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_eliminar_departamento, id_d, al_terminar=al_terminar,
+                      clave="eliminar_depto", etiqueta=lbl_msg_elim_depto)
 
 # --- Proyectos ---
 
 def accion_crear_proyecto():
-    try:
-        id_p = int(entry_crear_proy_id.get())
-        nom = entry_crear_proy_nom.get()
-        fec = entry_crear_proy_fec.get()
-        desc = entry_crear_proy_desc.get()
+    nom = entry_crear_proy_nom.get()
+    fec = entry_crear_proy_fec.get()
+    desc = entry_crear_proy_desc.get()
 
-        if admin_logeado is not None:
+    if admin_logeado is None:
+        return
 
-            if admin_logeado.crearProyecto(id_p, nom, fec, desc):
-                lbl_msg_crear_proy.config(text="Proyecto Creado", fg=COLOR_TEXTO_EXITO)
-                limpiar_formulario([entry_crear_proy_id, entry_crear_proy_nom, entry_crear_proy_fec, entry_crear_proy_desc])
-            else:
-                lbl_msg_crear_proy.config(text="Error al crear", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_crear_proy.config(text="Datos inválidos", fg=COLOR_TEXTO_ERROR)
+    def al_terminar(proy):
+        if proy:
+            lbl_msg_crear_proy.config(text=f"Proyecto Creado (ID {proy.idProyecto})", fg=COLOR_TEXTO_EXITO)
+            limpiar_formulario([entry_crear_proy_nom, entry_crear_proy_fec, entry_crear_proy_desc])
+        else:
+            lbl_msg_crear_proy.config(text="Error al crear", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(admin_logeado.crearProyecto, nom, fec, desc, al_terminar=al_terminar,
+                      clave="crear_proyecto", etiqueta=lbl_msg_crear_proy)
 
 def accion_buscar_proyecto():
-    global obj_proy_actual
     try:
         id_p = int(entry_buscar_proy_id.get())
+    except ValueError:
+        lbl_msg_buscar_proy.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def buscar():
         proy = dbFunciones.db_buscar_proyecto_por_id(id_p)
-        
+        costo = dbFunciones.db_costo_proyecto(id_p) if proy else None
+        return proy, costo
+
+    def al_terminar(resultado):
+        global obj_proy_actual
+        proy, costo = resultado
         if proy:
             lbl_res_proy_nombre.config(text=f"Proyecto: {proy.nombre}")
             lbl_res_proy_fecha.config(text=f"Inicio: {proy.fechaInicioProyecto}")
             lbl_res_proy_desc.config(text=f"Desc: {proy.descripcion}")
+            if costo:
+                lbl_res_proy_costo.config(
+                    text=f"Horas: {costo['horas']:,.1f} | Costo: ${costo['costo']:,.0f} ({costo['empleados']} empleados)"
+                )
+            else:
+                lbl_res_proy_costo.config(text="Costo: N/A")
             obj_proy_actual = proy
             lbl_msg_buscar_proy.config(text="")
         else:
             lbl_msg_buscar_proy.config(text="No encontrado", fg=COLOR_TEXTO_ERROR)
             obj_proy_actual = None
-    except ValueError:
-        lbl_msg_buscar_proy.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(buscar, al_terminar=al_terminar,
+                      clave="buscar_proyecto", etiqueta=lbl_msg_buscar_proy, texto_espera="Buscando...")
 
 def ver_empleados_proy_popup():
-    datos = []
-    if obj_proy_actual and hasattr(obj_proy_actual, 'empleados') and obj_proy_actual.empleados:
-        for emp in obj_proy_actual.empleados:
-            datos.append(f"{emp.idEmpleado} | {emp.nombre} | {emp.correo}")
-    elif not obj_proy_actual:
-        datos.append("Seleccione un proyecto primero.")
-    else:
-        datos.append("Sin empleados asignados.")
-        
-    crear_popup_lista("Equipo del Proyecto", datos, "ID | Nombre | Correo")
+    if not obj_proy_actual:
+        crear_popup_lista("Equipo del Proyecto", COLUMNAS_MIEMBROS, texto_vacio="Seleccione un proyecto primero.")
+        return
+
+    empleados = getattr(obj_proy_actual, 'empleados', None) or []
+    crear_popup_lista("Equipo del Proyecto", COLUMNAS_MIEMBROS, filas_miembros(empleados),
+                      texto_vacio="Sin empleados asignados.")
 
 def accion_editar_proyecto():
     try:
         id_p = int(entry_edit_proy_id.get())
-        if dbFunciones.db_actualizar_proyecto(id_p, entry_edit_proy_nom.get(), entry_edit_proy_fec.get(), entry_edit_proy_desc.get()):
+    except ValueError:
+        lbl_msg_edit_proy.config(text="Datos inválidos", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(resultado):
+        if resultado:
             lbl_msg_edit_proy.config(text="Actualizado", fg=COLOR_TEXTO_EXITO)
         else:
             lbl_msg_edit_proy.config(text="Error al actualizar", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_edit_proy.config(text="Datos inválidos", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_actualizar_proyecto, id_p, entry_edit_proy_nom.get(),
+                      entry_edit_proy_fec.get(), entry_edit_proy_desc.get(),
+                      al_terminar=al_terminar, clave="editar_proyecto", etiqueta=lbl_msg_edit_proy)
 
 def accion_eliminar_proyecto():
+    """Elimina un proyecto, o varios si se ingresan IDs separados por coma (en una sola transacción)"""
     try:
-        if dbFunciones.db_eliminar_proyecto(int(entry_elim_proy_id.get())):
+        ids = [int(parte) for parte in entry_elim_proy_id.get().split(",") if parte.strip()]
+    except ValueError:
+        lbl_msg_elim_proy.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+        return
+    if not ids:
+        lbl_msg_elim_proy.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(resultado):
+        if len(ids) > 1 and resultado:
+            texto = f"Eliminados: {len(resultado['eliminados'])}"
+            if resultado['no_encontrados']:
+                texto += f" | No existen: {', '.join(map(str, resultado['no_encontrados']))}"
+            lbl_msg_elim_proy.config(text=texto, fg=COLOR_TEXTO_EXITO if resultado['eliminados'] else COLOR_TEXTO_ERROR)
+        elif resultado is True:
             lbl_msg_elim_proy.config(text="Eliminado", fg=COLOR_TEXTO_EXITO)
         else:
             lbl_msg_elim_proy.config(text="Error al eliminar", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_elim_proy.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+
+    if len(ids) > 1:
+        ejecutor.ejecutar(dbFunciones.db_eliminar_proyectos, ids, al_terminar=al_terminar,
+                          clave="eliminar_proyecto", etiqueta=lbl_msg_elim_proy)
+    else:
+        ejecutor.ejecutar(dbFunciones.db_eliminar_proyecto, ids[0], al_terminar=al_terminar,
+                          clave="eliminar_proyecto", etiqueta=lbl_msg_elim_proy)
 
 # --- Relaciones (Asignaciones) ---
 
 def accion_asignar_empleado_proyecto():
     try:
-        res = dbFunciones.db_asignar_proyecto_empleado(int(entry_asig_ep_idemp.get()), int(entry_asig_ep_idproy.get()))
+        id_e = int(entry_asig_ep_idemp.get())
+        id_p = int(entry_asig_ep_idproy.get())
+    except ValueError:
+        lbl_msg_asig_ep.config(text="Datos numéricos requeridos", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(res):
         if res is True:
              lbl_msg_asig_ep.config(text="Asignado correctamente", fg=COLOR_TEXTO_EXITO)
         else:
              lbl_msg_asig_ep.config(text=str(res), fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_asig_ep.config(text="Datos numéricos requeridos", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_asignar_proyecto_empleado, id_e, id_p, al_terminar=al_terminar,
+                      clave="asignar_proyecto", etiqueta=lbl_msg_asig_ep)
 
 def accion_eliminar_empleado_proyecto():
     try:
-        if dbFunciones.db_eliminar_proyecto_empleado(int(entry_elim_ep_idproy.get()), int(entry_elim_ep_idemp.get())):
+        id_p = int(entry_elim_ep_idproy.get())
+        id_e = int(entry_elim_ep_idemp.get())
+    except ValueError:
+        lbl_msg_elim_ep.config(text="Datos numéricos requeridos", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(res):
+        if res:
              lbl_msg_elim_ep.config(text="Desvinculado correctamente", fg=COLOR_TEXTO_EXITO)
         else:
              lbl_msg_elim_ep.config(text="No existe relación", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_elim_ep.config(text="Datos numéricos requeridos", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_eliminar_proyecto_empleado, id_p, id_e, al_terminar=al_terminar,
+                      clave="quitar_proyecto", etiqueta=lbl_msg_elim_ep)
 
 def accion_asignar_empleado_depto():
     try:
         id_e = int(entry_asig_ed_idemp.get())
         id_d = int(entry_asig_ed_iddepto.get())
-        
+    except ValueError:
+        lbl_msg_asig_ed.config(text="Datos numéricos requeridos", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def asignar():
         if dbFunciones.db_verificar_empleado_en_depto(id_e, id_d):
+            return None  # Ya pertenece
+        return dbFunciones.db_asignar_departamento_empleado(id_e, id_d)
+
+    def al_terminar(res):
+        if res is None:
              lbl_msg_asig_ed.config(text="Ya pertenece al depto", fg="orange")
-             return
-             
-        if dbFunciones.db_asignar_departamento_empleado(id_e, id_d) is True:
+        elif res is True:
              lbl_msg_asig_ed.config(text="Asignado correctamente", fg=COLOR_TEXTO_EXITO)
         else:
              lbl_msg_asig_ed.config(text="Error al asignar", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-         lbl_msg_asig_ed.config(text="Datos numéricos requeridos", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(asignar, al_terminar=al_terminar, clave="asignar_depto", etiqueta=lbl_msg_asig_ed)
 
 def accion_eliminar_empleado_depto():
     try:
-        res = dbFunciones.db_eliminar_departamento_empleado(int(entry_elim_ed_idemp.get()))
+        id_e = int(entry_elim_ed_idemp.get())
+    except ValueError:
+        lbl_msg_elim_ed.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(res):
         if res is True:
             lbl_msg_elim_ed.config(text="Eliminado del depto", fg=COLOR_TEXTO_EXITO)
         else:
             lbl_msg_elim_ed.config(text=str(res), fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_eliminar_departamento_empleado, id_e, al_terminar=al_terminar,
+                      clave="quitar_depto", etiqueta=lbl_msg_elim_ed)
+
+# --- Asignación Masiva ---
+
+# Destino -> (función asignar, función quitar) de dbFunciones
+FUNCIONES_MASIVAS = {
+    "Proyecto": ("db_asignar_proyecto_empleados", "db_quitar_proyecto_empleados"),
+    "Departamento": ("db_asignar_departamento_empleados", "db_quitar_departamento_empleados"),
+}
+
+def abrir_asignacion_masiva(destino, frame_origen):
+    """Muestra la pantalla de asignación masiva y carga la lista de empleados"""
+    global frame_origen_masiva
+    frame_origen_masiva = frame_origen
+    cambiar_frame(frame_asig_masiva, frame_origen)
+    var_destino_masiva.set(destino)
+    cargar_empleados_masiva()
+
+def cargar_empleados_masiva():
+    """Crea la tabla de empleados; se cargan por páginas a medida que se hace scroll"""
+    global tabla_masiva
+    if tabla_masiva is not None:
+        tabla_masiva.destroy()
+    cargar = crear_cargador_paginas(dbFunciones.db_listar_empleados_pagina, 'idEmpleado')
+    tabla_masiva = TablaVirtual(frame_lista_masiva, COLUMNAS_MASIVA, cargar_pagina=cargar, ejecutor=ejecutor,
+                                clave_seleccion='idEmpleado', texto_vacio="No hay empleados registrados.")
+    tabla_masiva.pack(fill="both", expand=True)
+
+def actualizar_depto_masiva(ids, nombre_depto):
+    """Cambia el departamento mostrado en las filas ya cargadas, sin volver a consultar la lista"""
+    if tabla_masiva is None:
+        return  # Se salió de la pantalla antes de la respuesta
+    ids = set(ids)
+    for fila in tabla_masiva.filas():
+        if fila['idEmpleado'] in ids:
+            fila['departamento'] = nombre_depto
+    tabla_masiva.refrescar()
+
+def accion_asignacion_masiva(quitar=False):
+    """Asigna (o quita) todos los empleados seleccionados en una sola llamada a la BD"""
+    try:
+        id_destino = int(entry_masiva_id.get())
     except ValueError:
-        lbl_msg_elim_ed.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+        lbl_msg_masiva.config(text="ID de destino inválido", fg=COLOR_TEXTO_ERROR)
+        return
+
+    ids = tabla_masiva.seleccionados()
+    if not ids:
+        lbl_msg_masiva.config(text="Seleccione al menos un empleado", fg=COLOR_TEXTO_ERROR)
+        return
+
+    destino = var_destino_masiva.get()
+    funcion = getattr(dbFunciones, FUNCIONES_MASIVAS[destino][1 if quitar else 0])
+
+    def al_terminar(resultados):
+        exitosos, errores = resultados['exitosos'], resultados['errores']
+        accion = "Quitados" if quitar else "Asignados"
+        lbl_msg_masiva.config(text=f"{accion}: {len(exitosos)} | Rechazados: {len(errores)}",
+                              fg=COLOR_TEXTO_EXITO if exitosos else COLOR_TEXTO_ERROR)
+        if errores:
+            filas = [{'idEmpleado': id_e, 'mensaje': mensaje} for id_e, mensaje in errores]
+            crear_popup_lista("Empleados Rechazados", COLUMNAS_ERRORES_ASIGNACION, filas)
+        if not exitosos or destino != "Departamento":
+            return
+        # La lista muestra el departamento de cada empleado: solo se actualizan las filas asignadas
+        if quitar:
+            actualizar_depto_masiva(exitosos, "Sin Depto")
+        else:
+            ejecutor.ejecutar(dbFunciones.db_buscar_departamento_por_id, id_destino, False,
+                              al_terminar=lambda depto: actualizar_depto_masiva(
+                                  exitosos, depto.nombre if depto else f"ID {id_destino}"))
+
+    ejecutor.ejecutar(funcion, id_destino, ids, al_terminar=al_terminar,
+                      clave="asignacion_masiva", etiqueta=lbl_msg_masiva)
+
+def volver_desde_asignacion_masiva():
+    global tabla_masiva
+    if tabla_masiva is not None:
+        tabla_masiva.destroy()  # Cancela también la carga de páginas en curso
+        tabla_masiva = None
+    cambiar_frame(frame_origen_masiva or frame_panel_admin, frame_asig_masiva,
+                  lambda: limpiar_formulario([entry_masiva_id, lbl_msg_masiva]))
 
 # --- Empleados CRUD ---
 
 def accion_crear_empleado():
     try:
         nuevo = Empleado(
-            entry_crear_emp_nom.get(), 
-            entry_crear_emp_dir.get(), 
+            entry_crear_emp_nom.get(),
+            entry_crear_emp_dir.get(),
             entry_crear_emp_tel.get(),
             entry_crear_emp_cor.get(),
-            int(entry_crear_emp_id.get()),
+            None,  # El ID de ficha lo asigna la base de datos
             entry_crear_emp_fec.get(),
             int(entry_crear_emp_sal.get())
         )
         # Departamento es opcional - si está vacío, usar None
         depto_str = entry_crear_emp_depto.get().strip()
         id_depto = int(depto_str) if depto_str else None
-        
-        if dbFunciones.db_crear_empleado(entry_crear_emp_rut.get(), nuevo, id_depto):
-            lbl_msg_crear_emp.config(text="Empleado Creado", fg=COLOR_TEXTO_EXITO)
+    except ValueError:
+        lbl_msg_crear_emp.config(text="Verifique los datos numéricos", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(resultado):
+        if resultado:
+            lbl_msg_crear_emp.config(text=f"Empleado Creado (ID Ficha {nuevo.idEmpleado})", fg=COLOR_TEXTO_EXITO)
             # Limpiar campos aquí si se desea
         else:
             lbl_msg_crear_emp.config(text="Error al crear", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_crear_emp.config(text="Verifique los datos numéricos", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_crear_empleado, entry_crear_emp_rut.get(), nuevo, id_depto,
+                      al_terminar=al_terminar, clave="crear_empleado", etiqueta=lbl_msg_crear_emp)
 
 def accion_buscar_empleado():
     try:
-        emp = dbFunciones.db_buscar_empleado_por_id(int(entry_buscar_emp_id.get()))
+        id_e = int(entry_buscar_emp_id.get())
+    except ValueError:
+         lbl_msg_buscar_emp.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+         return
+
+    def al_terminar(emp):
         if emp:
             lbl_res_emp_nombre.config(text=f"Nombre: {emp.nombre}")
             lbl_res_emp_correo.config(text=f"Correo: {emp.correo}")
@@ -791,18 +1164,19 @@ def accion_buscar_empleado():
             lbl_msg_buscar_emp.config(text="")
         else:
              lbl_msg_buscar_emp.config(text="No encontrado", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-         lbl_msg_buscar_emp.config(text="ID inválido", fg=COLOR_TEXTO_ERROR)
+
+    ejecutor.ejecutar(dbFunciones.db_buscar_empleado_por_id, id_e, al_terminar=al_terminar,
+                      clave="buscar_empleado", etiqueta=lbl_msg_buscar_emp, texto_espera="Buscando...")
 
 def accion_actualizar_empleado():
+    rut = entry_ed_rut.get()
+
+    if not rut or rut == "None":
+        lbl_msg_ed_emp.config(text="Error: No se encontró el RUT del usuario", fg=COLOR_TEXTO_ERROR)
+        return
+
     try:
-        rut = entry_ed_rut.get()
-        
-        if not rut or rut == "None":
-            lbl_msg_ed_emp.config(text="Error: No se encontró el RUT del usuario", fg=COLOR_TEXTO_ERROR)
-            return
-        
-        exito = dbFunciones.db_actualizar_empleado(
+        datos = (
             int(entry_ed_id_emp.get()),
             entry_ed_nombre.get(),
             entry_ed_direccion.get(),
@@ -811,33 +1185,48 @@ def accion_actualizar_empleado():
             float(entry_ed_salario.get()),
             rut
         )
+    except ValueError as e:
+        lbl_msg_ed_emp.config(text=f"Datos inválidos: {str(e)}", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(exito):
         if exito:
             lbl_msg_ed_emp.config(text="Datos actualizados correctamente", fg=COLOR_TEXTO_EXITO)
             # Esperar un momento antes de volver a la búsqueda
-            ventana.after(1500, lambda: cambiar_frame(frame_editar_busqueda_empleado, frame_form_editar_empleado, 
+            ventana.after(1500, lambda: cambiar_frame(frame_editar_busqueda_empleado, frame_form_editar_empleado,
                                                        lambda: limpiar_formulario([entry_editar_rut_busqueda, lbl_mensaje_editar_busqueda, lbl_msg_ed_emp])))
         else:
             lbl_msg_ed_emp.config(text="Error al actualizar", fg=COLOR_TEXTO_ERROR)
-    except ValueError as e:
-        lbl_msg_ed_emp.config(text=f"Datos inválidos: {str(e)}", fg=COLOR_TEXTO_ERROR)
-    except Exception as e:
+
+    def al_error(e):
         lbl_msg_ed_emp.config(text=f"Error: {str(e)}", fg=COLOR_TEXTO_ERROR)
 
+    ejecutor.ejecutar(dbFunciones.db_actualizar_empleado, *datos, al_terminar=al_terminar,
+                      al_error=al_error, clave="actualizar_empleado", etiqueta=lbl_msg_ed_emp)
+
 def accion_registrar_horas():
     try:
-        res = dbFunciones.db_registrar_horas(
+        datos = (
             int(entry_horas_id_emp.get()),
             int(entry_horas_id_proy.get()),
             entry_horas_fecha.get(),
             int(entry_horas_cant.get()),
             entry_horas_desc.get()
         )
+    except ValueError:
+        lbl_msg_horas.config(text="Datos numéricos inválidos", fg=COLOR_TEXTO_ERROR)
+        return
+
+    def al_terminar(res):
         if res is True:
-            lbl_msg_horas.config(text="Horas registradas", fg=COLOR_TEXTO_EXITO)
+            lbl_msg_horas.config(text="Horas guardadas en la cola; se enviarán a la base de datos",
+                                 fg=COLOR_TEXTO_EXITO)
         else:
             lbl_msg_horas.config(text=f"Error: {res}", fg=COLOR_TEXTO_ERROR)
-    except ValueError:
-        lbl_msg_horas.config(text="Datos numéricos inválidos", fg=COLOR_TEXTO_ERROR)
+
+    # Se guarda en la cola local; el sincronizador lo envía a la BD (ver cola_registros.py)
+    ejecutor.ejecutar(cola_registros.encolar_horas, *datos, al_terminar=al_terminar,
+                      clave="registrar_horas", etiqueta=lbl_msg_horas)
 
 
 # =============================================================================
@@ -849,6 +1238,9 @@ ventana.title("Sistema de Gestión Empresarial")
 ventana.geometry("550x800")
 ventana.config(bg=COLOR_FONDO)
 
+# Hilos para las consultas a la BD y a la API (ver ejecutor.py)
+ejecutor = EjecutorTareas(ventana, color_espera="blue", color_error=COLOR_TEXTO_ERROR)
+
 # -----------------------------------------------------------------------------
 # 1. FRAME INICIO
 # -----------------------------------------------------------------------------
@@ -861,57 +1253,49 @@ frame_inicio.pack(fill="both", expand=True, padx=20, pady=20)
 # -----------------------------------------------------------------------------
 # 2. FRAME LOGIN ADMIN
 # -----------------------------------------------------------------------------
-frame_login_admin = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_login_admin, "Acceso Administrativo")
-entry_login_usuario = crear_input(frame_login_admin, "Usuario:")
-entry_login_clave = crear_input(frame_login_admin, "Contraseña:")
-entry_login_clave.config(show="*")
-lbl_mensaje_login_admin = crear_label_mensaje(frame_login_admin)
+def construir_login_admin(frame):
+    global entry_login_usuario, entry_login_clave, lbl_mensaje_login_admin
+    crear_titulo(frame, "Acceso Administrativo")
+    entry_login_usuario = crear_input(frame, "Usuario:")
+    entry_login_clave = crear_input(frame, "Contraseña:")
+    entry_login_clave.config(show="*")
+    lbl_mensaje_login_admin = crear_label_mensaje(frame)
+
+    crear_boton(frame, "Ingresar", procesar_login_admin)
+    crear_boton(frame, "Volver", 
+                lambda: cambiar_frame(frame_inicio, frame_login_admin, lambda: limpiar_formulario([entry_login_usuario, entry_login_clave, lbl_mensaje_login_admin])))
 
-crear_boton(frame_login_admin, "Ingresar", procesar_login_admin)
-crear_boton(frame_login_admin, "Volver", 
-            lambda: cambiar_frame(frame_inicio, frame_login_admin, lambda: limpiar_formulario([entry_login_usuario, entry_login_clave, lbl_mensaje_login_admin])))
+frame_login_admin = FrameDiferido(ventana, construir_login_admin, bg=COLOR_FONDO)
 
 # -----------------------------------------------------------------------------
 # 3. FRAME PANEL ADMIN PRINCIPAL
 # -----------------------------------------------------------------------------
-frame_panel_admin = tk.Frame(ventana, bg=COLOR_FONDO)
-lbl_bienvenida_admin = tk.Label(frame_panel_admin, text="Bienvenido Admin", font=FONT_TITULO, bg=COLOR_FONDO)
-lbl_bienvenida_admin.pack(pady=20)
-
-crear_boton(frame_panel_admin, "Gestión de Departamentos", lambda: cambiar_frame(frame_gest_deptos, frame_panel_admin))
-crear_boton(frame_panel_admin, "Gestión de Proyectos", lambda: cambiar_frame(frame_gest_proyectos, frame_panel_admin))
-crear_boton(frame_panel_admin, "Gestión de Empleados", lambda: cambiar_frame(frame_gest_empleados, frame_panel_admin))
-crear_boton(frame_panel_admin, "Gestión de Administradores", lambda: cambiar_frame(frame_gest_admins, frame_panel_admin))
-crear_boton(frame_panel_admin, "Indicadores Económicos", lambda: cambiar_frame(frame_indicadores, frame_panel_admin))
-crear_boton(frame_panel_admin, "Cambiar mi Contraseña", lambda: cambiar_frame(frame_cambiar_clave, frame_panel_admin))
-crear_boton(frame_panel_admin, "Cerrar Sesión", lambda: cambiar_frame(frame_inicio, frame_panel_admin, lambda: limpiar_formulario([entry_login_usuario, entry_login_clave, lbl_mensaje_login_admin])), color_texto=COLOR_TEXTO_ERROR)
+def construir_panel_admin(frame):
+    global lbl_bienvenida_admin
+    lbl_bienvenida_admin = tk.Label(frame, text="Bienvenido Admin", font=FONT_TITULO, bg=COLOR_FONDO)
+    lbl_bienvenida_admin.pack(pady=20)
+
+    crear_boton(frame, "Gestión de Departamentos", lambda: cambiar_frame(frame_gest_deptos, frame_panel_admin))
+    crear_boton(frame, "Gestión de Proyectos", lambda: cambiar_frame(frame_gest_proyectos, frame_panel_admin))
+    crear_boton(frame, "Gestión de Empleados", lambda: cambiar_frame(frame_gest_empleados, frame_panel_admin))
+    crear_boton(frame, "Gestión de Administradores", lambda: cambiar_frame(frame_gest_admins, frame_panel_admin))
+    crear_boton(frame, "Indicadores Económicos", lambda: cambiar_frame(frame_indicadores, frame_panel_admin))
+    crear_boton(frame, "Reportes de Horas", lambda: cambiar_frame(frame_reportes, frame_panel_admin))
+    crear_boton(frame, "Diagnóstico de BD", abrir_diagnostico_bd)
+    crear_boton(frame, "Cambiar mi Contraseña", lambda: cambiar_frame(frame_cambiar_clave, frame_panel_admin))
+    crear_boton(frame, "Cerrar Sesión", cerrar_sesion_admin, color_texto=COLOR_TEXTO_ERROR)
+
+frame_panel_admin = FrameDiferido(ventana, construir_panel_admin, bg=COLOR_FONDO)
 
 # -----------------------------------------------------------------------------
 # 3.1 FRAME INDICADORES ECONÓMICOS
 # -----------------------------------------------------------------------------
-frame_indicadores = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_indicadores, "Indicadores Económicos")
-
-tk.Label(frame_indicadores, text="Datos desde mindicador.cl", font=FONT_SUBTITULO, bg=COLOR_FONDO).pack(pady=5)
-
-# Frame para el listbox con scrollbar
-frame_lista_ind = tk.Frame(frame_indicadores, bg=COLOR_FONDO)
-frame_lista_ind.pack(pady=10, padx=20, fill="both", expand=True)
-
-scrollbar_ind = tk.Scrollbar(frame_lista_ind, orient="vertical")
-listbox_indicadores = tk.Listbox(frame_lista_ind, yscrollcommand=scrollbar_ind.set, font=FONT_TEXTO, height=10, width=50)
-scrollbar_ind.config(command=listbox_indicadores.yview)
-scrollbar_ind.pack(side="right", fill="y")
-listbox_indicadores.pack(side="left", fill="both", expand=True)
-
-lbl_msg_indicadores = crear_label_mensaje(frame_indicadores)
-
 def limpiar_indicadores():
     """Limpia el listbox y el mensaje de indicadores"""
+    ejecutor.cancelar("indicadores")
     listbox_indicadores.delete(0, tk.END)
     lbl_msg_indicadores.config(text="")
-    ventana.update()
+
 
 def accion_limpiar_historial():
     """Limpia todo el historial de indicadores de la base de datos"""
@@ -919,335 +1303,525 @@ def accion_limpiar_historial():
         "Confirmar", 
         "¿Está seguro de que desea eliminar TODO el historial de indicadores?\n\nEsta acción no se puede deshacer."
     )
-    if respuesta:
-        resultado = dbFunciones.db_limpiar_historial_indicadores()
+    if not respuesta:
+        return
+
+    def al_terminar(resultado):
         if resultado is True:
             lbl_msg_indicadores.config(text="Historial limpiado correctamente", fg=COLOR_TEXTO_EXITO)
         else:
             lbl_msg_indicadores.config(text=str(resultado), fg=COLOR_TEXTO_ERROR)
 
-crear_boton(frame_indicadores, "Consultar Indicadores (API)", accion_consultar_indicadores)
-crear_boton(frame_indicadores, "Guardar en Base de Datos", accion_guardar_indicadores)
-crear_boton(frame_indicadores, "Ver Historial Guardado", ver_historial_indicadores_popup)
-crear_boton(frame_indicadores, "Limpiar Historial", accion_limpiar_historial, color_texto=COLOR_TEXTO_ERROR)
+    ejecutor.ejecutar(dbFunciones.db_limpiar_historial_indicadores, al_terminar=al_terminar,
+                      clave="limpiar_historial", etiqueta=lbl_msg_indicadores)
+
 
 def volver_panel_desde_indicadores():
     limpiar_indicadores()
     cambiar_frame(frame_panel_admin, frame_indicadores)
 
-crear_boton(frame_indicadores, "Volver al Panel", volver_panel_desde_indicadores)
+
+def construir_indicadores(frame):
+    global listbox_indicadores, lbl_msg_indicadores
+    crear_titulo(frame, "Indicadores Económicos")
+
+    tk.Label(frame, text="Datos desde mindicador.cl", font=FONT_SUBTITULO, bg=COLOR_FONDO).pack(pady=5)
+
+    # Frame para el listbox con scrollbar
+    frame_lista_ind = tk.Frame(frame, bg=COLOR_FONDO)
+    frame_lista_ind.pack(pady=10, padx=20, fill="both", expand=True)
+
+    scrollbar_ind = tk.Scrollbar(frame_lista_ind, orient="vertical")
+    listbox_indicadores = tk.Listbox(frame_lista_ind, yscrollcommand=scrollbar_ind.set, font=FONT_TEXTO, height=10, width=50)
+    scrollbar_ind.config(command=listbox_indicadores.yview)
+    scrollbar_ind.pack(side="right", fill="y")
+    listbox_indicadores.pack(side="left", fill="both", expand=True)
+
+    lbl_msg_indicadores = crear_label_mensaje(frame)
+
+    crear_boton(frame, "Consultar Indicadores (API)", accion_consultar_indicadores)
+    crear_boton(frame, "Forzar Actualización desde API", lambda: accion_consultar_indicadores(forzar=True))
+    crear_boton(frame, "Guardar en Base de Datos", accion_guardar_indicadores)
+    crear_boton(frame, "Ver Historial Guardado", ver_historial_indicadores_popup)
+    crear_boton(frame, "Limpiar Historial", accion_limpiar_historial, color_texto=COLOR_TEXTO_ERROR)
+
+    crear_boton(frame, "Volver al Panel", volver_panel_desde_indicadores)
+
+frame_indicadores = FrameDiferido(ventana, construir_indicadores, bg=COLOR_FONDO)
+
+# -----------------------------------------------------------------------------
+# 3.4 FRAME REPORTES DE HORAS
+# -----------------------------------------------------------------------------
+def volver_panel_desde_reportes():
+    cerrar_reporte()
+    lbl_msg_reporte.config(text="")
+    cambiar_frame(frame_panel_admin, frame_reportes)
+
+
+def construir_reportes(frame):
+    global entry_reporte_desde, entry_reporte_hasta, var_agrupacion_reporte, lbl_msg_reporte
+    global frame_tabla_reporte
+    crear_titulo(frame, "Reportes de Horas")
+
+    hoy = datetime.date.today()
+    entry_reporte_desde = crear_input(frame, "Desde (YYYY-MM-DD):")
+    entry_reporte_desde.insert(0, hoy.replace(day=1).strftime("%Y-%m-%d"))
+    entry_reporte_hasta = crear_input(frame, "Hasta (YYYY-MM-DD):")
+    entry_reporte_hasta.insert(0, hoy.strftime("%Y-%m-%d"))
+
+    tk.Label(frame, text="Agrupar por:", font=FONT_TEXTO, bg=COLOR_FONDO).pack(pady=(5, 0))
+    var_agrupacion_reporte = tk.StringVar(value=reportes.AGRUPACIONES[0])
+    menu_agrupacion = tk.OptionMenu(frame, var_agrupacion_reporte, *reportes.AGRUPACIONES)
+    menu_agrupacion.config(font=FONT_TEXTO, width=20, bg=COLOR_BOTON)
+    menu_agrupacion.pack(pady=5)
+
+    crear_boton(frame, "Generar Reporte", accion_generar_reporte)
+    lbl_msg_reporte = crear_label_mensaje(frame)
+
+    # Aquí se coloca la TablaVirtual de cada reporte
+    frame_tabla_reporte = tk.Frame(frame, bg=COLOR_FONDO)
+    frame_tabla_reporte.pack(pady=5, fill="both", expand=True)
+
+    crear_boton(frame, "Volver al Panel", volver_panel_desde_reportes)
+
+frame_reportes = FrameDiferido(ventana, construir_reportes, bg=COLOR_FONDO)
 
 # -----------------------------------------------------------------------------
 # 3.2 FRAME CAMBIAR CONTRASEÑA
 # -----------------------------------------------------------------------------
-frame_cambiar_clave = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_cambiar_clave, "Cambiar Contraseña")
-
-entry_cambiar_clave_actual = crear_input(frame_cambiar_clave, "Contraseña Actual:")
-entry_cambiar_clave_actual.config(show="*")
-entry_cambiar_clave_nueva = crear_input(frame_cambiar_clave, "Nueva Contraseña:")
-entry_cambiar_clave_nueva.config(show="*")
-entry_cambiar_clave_confirmar = crear_input(frame_cambiar_clave, "Confirmar Nueva Contraseña:")
-entry_cambiar_clave_confirmar.config(show="*")
-
-lbl_msg_cambiar_clave = crear_label_mensaje(frame_cambiar_clave)
-crear_boton(frame_cambiar_clave, "Cambiar Contraseña", accion_cambiar_clave)
-crear_boton(frame_cambiar_clave, "Volver", lambda: cambiar_frame(frame_panel_admin, frame_cambiar_clave, 
-            lambda: limpiar_formulario([entry_cambiar_clave_actual, entry_cambiar_clave_nueva, 
-                                        entry_cambiar_clave_confirmar, lbl_msg_cambiar_clave])))
+def construir_cambiar_clave(frame):
+    global entry_cambiar_clave_actual, entry_cambiar_clave_nueva, entry_cambiar_clave_confirmar
+    global lbl_msg_cambiar_clave
+    crear_titulo(frame, "Cambiar Contraseña")
+
+    entry_cambiar_clave_actual = crear_input(frame, "Contraseña Actual:")
+    entry_cambiar_clave_actual.config(show="*")
+    entry_cambiar_clave_nueva = crear_input(frame, "Nueva Contraseña:")
+    entry_cambiar_clave_nueva.config(show="*")
+    entry_cambiar_clave_confirmar = crear_input(frame, "Confirmar Nueva Contraseña:")
+    entry_cambiar_clave_confirmar.config(show="*")
+
+    lbl_msg_cambiar_clave = crear_label_mensaje(frame)
+    crear_boton(frame, "Cambiar Contraseña", accion_cambiar_clave)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_panel_admin, frame_cambiar_clave, 
+                lambda: limpiar_formulario([entry_cambiar_clave_actual, entry_cambiar_clave_nueva, 
+                                            entry_cambiar_clave_confirmar, lbl_msg_cambiar_clave])))
+
+frame_cambiar_clave = FrameDiferido(ventana, construir_cambiar_clave, bg=COLOR_FONDO)
 
 # -----------------------------------------------------------------------------
 # 3.3 FRAME GESTIÓN DE ADMINISTRADORES
 # -----------------------------------------------------------------------------
-frame_gest_admins = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_gest_admins, "Gestión de Administradores")
+def ir_a_crear_admin():
+    """Prepara el formulario de creación de admin (el ID lo asigna la BD)"""
+    cambiar_frame(frame_crear_admin, frame_gest_admins,
+                  lambda: limpiar_formulario([entry_nuevo_admin_usuario,
+                                              entry_nuevo_admin_clave, entry_nuevo_admin_clave_confirm,
+                                              entry_nuevo_admin_id_emp, lbl_msg_crear_admin]))
 
-crear_boton(frame_gest_admins, "Crear Nuevo Administrador", lambda: ir_a_crear_admin())
-crear_boton(frame_gest_admins, "Ver Lista de Administradores", ver_lista_admins_popup)
-crear_boton(frame_gest_admins, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_admins))
 
-def ir_a_crear_admin():
-    """Prepara el formulario de creación de admin con el siguiente ID"""
-    limpiar_formulario([entry_nuevo_admin_id, entry_nuevo_admin_usuario, 
-                       entry_nuevo_admin_clave, entry_nuevo_admin_clave_confirm, 
-                       entry_nuevo_admin_id_emp, lbl_msg_crear_admin])
-    nuevo_id = dbFunciones.db_obtener_siguiente_id_admin()
-    entry_nuevo_admin_id.insert(0, str(nuevo_id))
-    cambiar_frame(frame_crear_admin, frame_gest_admins)
+def construir_gest_admins(frame):
+    crear_titulo(frame, "Gestión de Administradores")
+
+    crear_boton(frame, "Crear Nuevo Administrador", lambda: ir_a_crear_admin())
+    crear_boton(frame, "Ver Lista de Administradores", ver_lista_admins_popup)
+    crear_boton(frame, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_admins))
+
+frame_gest_admins = FrameDiferido(ventana, construir_gest_admins, bg=COLOR_FONDO)
 
 # Frame Crear Nuevo Admin
-frame_crear_admin = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_crear_admin, "Crear Nuevo Administrador")
-
-entry_nuevo_admin_id = crear_input(frame_crear_admin, "ID Admin (sugerido):")
-entry_nuevo_admin_usuario = crear_input(frame_crear_admin, "Nombre de Usuario:")
-entry_nuevo_admin_clave = crear_input(frame_crear_admin, "Contraseña:")
-entry_nuevo_admin_clave.config(show="*")
-entry_nuevo_admin_clave_confirm = crear_input(frame_crear_admin, "Confirmar Contraseña:")
-entry_nuevo_admin_clave_confirm.config(show="*")
-entry_nuevo_admin_id_emp = crear_input(frame_crear_admin, "ID Empleado Asociado:")
-
-lbl_msg_crear_admin = crear_label_mensaje(frame_crear_admin)
-crear_boton(frame_crear_admin, "Crear Administrador", accion_crear_nuevo_admin)
-crear_boton(frame_crear_admin, "Volver", lambda: cambiar_frame(frame_gest_admins, frame_crear_admin, 
-            lambda: limpiar_formulario([entry_nuevo_admin_id, entry_nuevo_admin_usuario, 
-                                        entry_nuevo_admin_clave, entry_nuevo_admin_clave_confirm, 
-                                        entry_nuevo_admin_id_emp, lbl_msg_crear_admin])))
+def construir_crear_admin(frame):
+    global entry_nuevo_admin_usuario, entry_nuevo_admin_clave, entry_nuevo_admin_clave_confirm
+    global entry_nuevo_admin_id_emp, lbl_msg_crear_admin
+    crear_titulo(frame, "Crear Nuevo Administrador")
+
+    entry_nuevo_admin_usuario = crear_input(frame, "Nombre de Usuario:")
+    entry_nuevo_admin_clave = crear_input(frame, "Contraseña:")
+    entry_nuevo_admin_clave.config(show="*")
+    entry_nuevo_admin_clave_confirm = crear_input(frame, "Confirmar Contraseña:")
+    entry_nuevo_admin_clave_confirm.config(show="*")
+    entry_nuevo_admin_id_emp = crear_input(frame, "ID Empleado Asociado:")
+
+    lbl_msg_crear_admin = crear_label_mensaje(frame)
+    crear_boton(frame, "Crear Administrador", accion_crear_nuevo_admin)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_admins, frame_crear_admin, 
+                lambda: limpiar_formulario([entry_nuevo_admin_usuario, 
+                                            entry_nuevo_admin_clave, entry_nuevo_admin_clave_confirm, 
+                                            entry_nuevo_admin_id_emp, lbl_msg_crear_admin])))
+
+frame_crear_admin = FrameDiferido(ventana, construir_crear_admin, bg=COLOR_FONDO)
 
 # -----------------------------------------------------------------------------
 # 4. SUB-MENU: GESTIÓN DEPARTAMENTOS
 # -----------------------------------------------------------------------------
-frame_gest_deptos = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_gest_deptos, "Menú Departamentos")
-
-crear_boton(frame_gest_deptos, "Ver Todos los Departamentos", ver_todos_departamentos_popup)
-crear_boton(frame_gest_deptos, "Crear Departamento", 
-            lambda: cambiar_frame(frame_crear_depto, frame_gest_deptos))
-crear_boton(frame_gest_deptos, "Buscar / Ver Departamento", 
-            lambda: cambiar_frame(frame_buscar_depto, frame_gest_deptos))
-crear_boton(frame_gest_deptos, "Editar Departamento", 
-            lambda: cambiar_frame(frame_editar_depto, frame_gest_deptos))
-crear_boton(frame_gest_deptos, "Eliminar Departamento", 
-            lambda: cambiar_frame(frame_eliminar_depto, frame_gest_deptos))
-crear_boton(frame_gest_deptos, "Asignar Empleado a Depto", 
-            lambda: cambiar_frame(frame_asig_emp_depto, frame_gest_deptos))
-crear_boton(frame_gest_deptos, "Quitar Empleado de Depto", 
-            lambda: cambiar_frame(frame_elim_emp_depto, frame_gest_deptos))
-
-crear_boton(frame_gest_deptos, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_deptos))
+def construir_gest_deptos(frame):
+    crear_titulo(frame, "Menú Departamentos")
+
+    crear_boton(frame, "Ver Todos los Departamentos", ver_todos_departamentos_popup)
+    crear_boton(frame, "Crear Departamento", 
+                lambda: cambiar_frame(frame_crear_depto, frame_gest_deptos))
+    crear_boton(frame, "Buscar / Ver Departamento", 
+                lambda: cambiar_frame(frame_buscar_depto, frame_gest_deptos))
+    crear_boton(frame, "Editar Departamento", 
+                lambda: cambiar_frame(frame_editar_depto, frame_gest_deptos))
+    crear_boton(frame, "Eliminar Departamento", 
+                lambda: cambiar_frame(frame_eliminar_depto, frame_gest_deptos))
+    crear_boton(frame, "Asignar Empleado a Depto", 
+                lambda: cambiar_frame(frame_asig_emp_depto, frame_gest_deptos))
+    crear_boton(frame, "Quitar Empleado de Depto", 
+                lambda: cambiar_frame(frame_elim_emp_depto, frame_gest_deptos))
+    crear_boton(frame, "Asignación Masiva", 
+                lambda: abrir_asignacion_masiva("Departamento", frame_gest_deptos))
+
+    crear_boton(frame, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_deptos))
+
+frame_gest_deptos = FrameDiferido(ventana, construir_gest_deptos, bg=COLOR_FONDO)
 
 # --- Formularios Depto ---
 
 # Crear
-frame_crear_depto = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_crear_depto, "Crear Departamento")
-entry_crear_depto_id = crear_input(frame_crear_depto, "ID Departamento:")
-entry_crear_depto_nombre = crear_input(frame_crear_depto, "Nombre:")
-entry_crear_depto_gerente = crear_input(frame_crear_depto, "ID Gerente (opcional):")
-tk.Label(frame_crear_depto, text="* Si no se coloca gerente, se asignará como nulo", 
-         font=("Segoe UI", 9, "italic"), fg="gray", bg=COLOR_FONDO).pack(pady=(0, 5))
-lbl_msg_crear_depto = crear_label_mensaje(frame_crear_depto)
-crear_boton(frame_crear_depto, "Guardar", accion_crear_departamento)
-crear_boton(frame_crear_depto, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_crear_depto, lambda: limpiar_formulario([entry_crear_depto_id, entry_crear_depto_nombre, entry_crear_depto_gerente, lbl_msg_crear_depto])))
+def construir_crear_depto(frame):
+    global entry_crear_depto_nombre, entry_crear_depto_gerente, lbl_msg_crear_depto
+    crear_titulo(frame, "Crear Departamento")
+    entry_crear_depto_nombre = crear_input(frame, "Nombre:")
+    entry_crear_depto_gerente = crear_input(frame, "ID Gerente (opcional):")
+    tk.Label(frame, text="* Si no se coloca gerente, se asignará como nulo", 
+             font=("Segoe UI", 9, "italic"), fg="gray", bg=COLOR_FONDO).pack(pady=(0, 5))
+    lbl_msg_crear_depto = crear_label_mensaje(frame)
+    crear_boton(frame, "Guardar", accion_crear_departamento)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_crear_depto, lambda: limpiar_formulario([entry_crear_depto_nombre, entry_crear_depto_gerente, lbl_msg_crear_depto])))
+
+frame_crear_depto = FrameDiferido(ventana, construir_crear_depto, bg=COLOR_FONDO)
 
 # Buscar
-frame_buscar_depto = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_buscar_depto, "Buscar Departamento")
-entry_buscar_depto_id = crear_input(frame_buscar_depto, "ID Departamento:")
-crear_boton(frame_buscar_depto, "Buscar", accion_buscar_departamento)
-lbl_msg_buscar_depto = crear_label_mensaje(frame_buscar_depto)
-# Resultados
-lbl_res_depto_nombre = tk.Label(frame_buscar_depto, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_depto_nombre.pack()
-lbl_res_depto_gerente = tk.Label(frame_buscar_depto, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_depto_gerente.pack()
-crear_boton(frame_buscar_depto, "Ver Lista Empleados", ver_empleados_depto_popup)
-crear_boton(frame_buscar_depto, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_buscar_depto, lambda: limpiar_formulario([entry_buscar_depto_id, lbl_msg_buscar_depto, lbl_res_depto_nombre, lbl_res_depto_gerente])))
+def construir_buscar_depto(frame):
+    global entry_buscar_depto_id, lbl_msg_buscar_depto, lbl_res_depto_nombre, lbl_res_depto_gerente
+    crear_titulo(frame, "Buscar Departamento")
+    entry_buscar_depto_id = crear_input(frame, "ID Departamento:")
+    crear_boton(frame, "Buscar", accion_buscar_departamento)
+    lbl_msg_buscar_depto = crear_label_mensaje(frame)
+    # Resultados
+    lbl_res_depto_nombre = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_depto_nombre.pack()
+    lbl_res_depto_gerente = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_depto_gerente.pack()
+    crear_boton(frame, "Ver Lista Empleados", ver_empleados_depto_popup)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_buscar_depto, lambda: limpiar_formulario([entry_buscar_depto_id, lbl_msg_buscar_depto, lbl_res_depto_nombre, lbl_res_depto_gerente])))
+
+frame_buscar_depto = FrameDiferido(ventana, construir_buscar_depto, bg=COLOR_FONDO)
 
 # Editar
-frame_editar_depto = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_editar_depto, "Editar Departamento")
-entry_edit_depto_id = crear_input(frame_editar_depto, "ID Departamento (Original):")
-entry_edit_depto_nom = crear_input(frame_editar_depto, "Nuevo Nombre:")
-entry_edit_depto_ger = crear_input(frame_editar_depto, "Nuevo ID Gerente:")
-lbl_msg_edit_depto = crear_label_mensaje(frame_editar_depto)
-crear_boton(frame_editar_depto, "Actualizar", accion_editar_departamento)
-crear_boton(frame_editar_depto, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_editar_depto, lambda: limpiar_formulario([entry_edit_depto_id, entry_edit_depto_nom, entry_edit_depto_ger, lbl_msg_edit_depto])))
+def construir_editar_depto(frame):
+    global entry_edit_depto_id, entry_edit_depto_nom, entry_edit_depto_ger, lbl_msg_edit_depto
+    crear_titulo(frame, "Editar Departamento")
+    entry_edit_depto_id = crear_input(frame, "ID Departamento (Original):")
+    entry_edit_depto_nom = crear_input(frame, "Nuevo Nombre:")
+    entry_edit_depto_ger = crear_input(frame, "Nuevo ID Gerente:")
+    lbl_msg_edit_depto = crear_label_mensaje(frame)
+    crear_boton(frame, "Actualizar", accion_editar_departamento)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_editar_depto, lambda: limpiar_formulario([entry_edit_depto_id, entry_edit_depto_nom, entry_edit_depto_ger, lbl_msg_edit_depto])))
+
+frame_editar_depto = FrameDiferido(ventana, construir_editar_depto, bg=COLOR_FONDO)
 
 # Eliminar
-frame_eliminar_depto = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_eliminar_depto, "Eliminar Departamento")
-entry_elim_depto_id = crear_input(frame_eliminar_depto, "ID Departamento:")
-lbl_msg_elim_depto = crear_label_mensaje(frame_eliminar_depto)
-crear_boton(frame_eliminar_depto, "Eliminar Definitivamente", accion_eliminar_departamento)
-crear_boton(frame_eliminar_depto, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_eliminar_depto, lambda: limpiar_formulario([entry_elim_depto_id, lbl_msg_elim_depto])))
+def construir_eliminar_depto(frame):
+    global entry_elim_depto_id, lbl_msg_elim_depto
+    crear_titulo(frame, "Eliminar Departamento")
+    entry_elim_depto_id = crear_input(frame, "ID Departamento:")
+    lbl_msg_elim_depto = crear_label_mensaje(frame)
+    crear_boton(frame, "Eliminar Definitivamente", accion_eliminar_departamento)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_eliminar_depto, lambda: limpiar_formulario([entry_elim_depto_id, lbl_msg_elim_depto])))
+
+frame_eliminar_depto = FrameDiferido(ventana, construir_eliminar_depto, bg=COLOR_FONDO)
 
 # Asignar Empleado a Depto
-frame_asig_emp_depto = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_asig_emp_depto, "Agregar Empleado a Depto")
-entry_asig_ed_idemp = crear_input(frame_asig_emp_depto, "ID Empleado:")
-entry_asig_ed_iddepto = crear_input(frame_asig_emp_depto, "ID Departamento:")
-lbl_msg_asig_ed = crear_label_mensaje(frame_asig_emp_depto)
-crear_boton(frame_asig_emp_depto, "Asignar", accion_asignar_empleado_depto)
-crear_boton(frame_asig_emp_depto, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_asig_emp_depto, lambda: limpiar_formulario([entry_asig_ed_idemp, entry_asig_ed_iddepto, lbl_msg_asig_ed])))
+def construir_asig_emp_depto(frame):
+    global entry_asig_ed_idemp, entry_asig_ed_iddepto, lbl_msg_asig_ed
+    crear_titulo(frame, "Agregar Empleado a Depto")
+    entry_asig_ed_idemp = crear_input(frame, "ID Empleado:")
+    entry_asig_ed_iddepto = crear_input(frame, "ID Departamento:")
+    lbl_msg_asig_ed = crear_label_mensaje(frame)
+    crear_boton(frame, "Asignar", accion_asignar_empleado_depto)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_asig_emp_depto, lambda: limpiar_formulario([entry_asig_ed_idemp, entry_asig_ed_iddepto, lbl_msg_asig_ed])))
+
+frame_asig_emp_depto = FrameDiferido(ventana, construir_asig_emp_depto, bg=COLOR_FONDO)
 
 # Eliminar Empleado de Depto
-frame_elim_emp_depto = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_elim_emp_depto, "Quitar Empleado de Depto")
-entry_elim_ed_idemp = crear_input(frame_elim_emp_depto, "ID Empleado:")
-lbl_msg_elim_ed = crear_label_mensaje(frame_elim_emp_depto)
-crear_boton(frame_elim_emp_depto, "Desvincular", accion_eliminar_empleado_depto)
-crear_boton(frame_elim_emp_depto, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_elim_emp_depto, lambda: limpiar_formulario([entry_elim_ed_idemp, lbl_msg_elim_ed])))
+def construir_elim_emp_depto(frame):
+    global entry_elim_ed_idemp, lbl_msg_elim_ed
+    crear_titulo(frame, "Quitar Empleado de Depto")
+    entry_elim_ed_idemp = crear_input(frame, "ID Empleado:")
+    lbl_msg_elim_ed = crear_label_mensaje(frame)
+    crear_boton(frame, "Desvincular", accion_eliminar_empleado_depto)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_deptos, frame_elim_emp_depto, lambda: limpiar_formulario([entry_elim_ed_idemp, lbl_msg_elim_ed])))
+
+frame_elim_emp_depto = FrameDiferido(ventana, construir_elim_emp_depto, bg=COLOR_FONDO)
 
 
 # -----------------------------------------------------------------------------
 # 5. SUB-MENU: GESTIÓN PROYECTOS
 # -----------------------------------------------------------------------------
-frame_gest_proyectos = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_gest_proyectos, "Menú Proyectos")
-crear_boton(frame_gest_proyectos, "Ver Todos los Proyectos", ver_todos_proyectos_popup)
-crear_boton(frame_gest_proyectos, "Crear Proyecto", lambda: cambiar_frame(frame_crear_proy, frame_gest_proyectos))
-crear_boton(frame_gest_proyectos, "Buscar / Ver Proyecto", lambda: cambiar_frame(frame_buscar_proy, frame_gest_proyectos))
-crear_boton(frame_gest_proyectos, "Editar Proyecto", lambda: cambiar_frame(frame_editar_proy, frame_gest_proyectos))
-crear_boton(frame_gest_proyectos, "Eliminar Proyecto", lambda: cambiar_frame(frame_eliminar_proy, frame_gest_proyectos))
-crear_boton(frame_gest_proyectos, "Asignar Empleado a Proyecto", lambda: cambiar_frame(frame_asig_emp_proy, frame_gest_proyectos))
-crear_boton(frame_gest_proyectos, "Quitar Empleado de Proyecto", lambda: cambiar_frame(frame_elim_emp_proy, frame_gest_proyectos))
-crear_boton(frame_gest_proyectos, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_proyectos))
+def construir_gest_proyectos(frame):
+    crear_titulo(frame, "Menú Proyectos")
+    crear_boton(frame, "Ver Todos los Proyectos", ver_todos_proyectos_popup)
+    crear_boton(frame, "Crear Proyecto", lambda: cambiar_frame(frame_crear_proy, frame_gest_proyectos))
+    crear_boton(frame, "Buscar / Ver Proyecto", lambda: cambiar_frame(frame_buscar_proy, frame_gest_proyectos))
+    crear_boton(frame, "Editar Proyecto", lambda: cambiar_frame(frame_editar_proy, frame_gest_proyectos))
+    crear_boton(frame, "Eliminar Proyecto", lambda: cambiar_frame(frame_eliminar_proy, frame_gest_proyectos))
+    crear_boton(frame, "Asignar Empleado a Proyecto", lambda: cambiar_frame(frame_asig_emp_proy, frame_gest_proyectos))
+    crear_boton(frame, "Quitar Empleado de Proyecto", lambda: cambiar_frame(frame_elim_emp_proy, frame_gest_proyectos))
+    crear_boton(frame, "Asignación Masiva", lambda: abrir_asignacion_masiva("Proyecto", frame_gest_proyectos))
+    crear_boton(frame, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_proyectos))
+
+frame_gest_proyectos = FrameDiferido(ventana, construir_gest_proyectos, bg=COLOR_FONDO)
 
 # --- Formularios Proyecto ---
 
 # Crear
-frame_crear_proy = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_crear_proy, "Crear Proyecto")
-entry_crear_proy_id = crear_input(frame_crear_proy, "ID Proyecto:")
-entry_crear_proy_nom = crear_input(frame_crear_proy, "Nombre:")
-entry_crear_proy_fec = crear_input(frame_crear_proy, "Fecha Inicio:")
-entry_crear_proy_desc = crear_input(frame_crear_proy, "Descripción:")
-lbl_msg_crear_proy = crear_label_mensaje(frame_crear_proy)
-crear_boton(frame_crear_proy, "Guardar", accion_crear_proyecto)
-crear_boton(frame_crear_proy, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_crear_proy, lambda: limpiar_formulario([entry_crear_proy_id, entry_crear_proy_nom, entry_crear_proy_fec, entry_crear_proy_desc, lbl_msg_crear_proy])))
+def construir_crear_proy(frame):
+    global entry_crear_proy_nom, entry_crear_proy_fec, entry_crear_proy_desc, lbl_msg_crear_proy
+    crear_titulo(frame, "Crear Proyecto")
+    entry_crear_proy_nom = crear_input(frame, "Nombre:")
+    entry_crear_proy_fec = crear_input(frame, "Fecha Inicio:")
+    entry_crear_proy_desc = crear_input(frame, "Descripción:")
+    lbl_msg_crear_proy = crear_label_mensaje(frame)
+    crear_boton(frame, "Guardar", accion_crear_proyecto)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_crear_proy, lambda: limpiar_formulario([entry_crear_proy_nom, entry_crear_proy_fec, entry_crear_proy_desc, lbl_msg_crear_proy])))
+
+frame_crear_proy = FrameDiferido(ventana, construir_crear_proy, bg=COLOR_FONDO)
 
 # Buscar
-frame_buscar_proy = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_buscar_proy, "Buscar Proyecto")
-entry_buscar_proy_id = crear_input(frame_buscar_proy, "ID Proyecto:")
-crear_boton(frame_buscar_proy, "Buscar", accion_buscar_proyecto)
-lbl_msg_buscar_proy = crear_label_mensaje(frame_buscar_proy)
-lbl_res_proy_nombre = tk.Label(frame_buscar_proy, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_proy_nombre.pack()
-lbl_res_proy_fecha = tk.Label(frame_buscar_proy, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_proy_fecha.pack()
-lbl_res_proy_desc = tk.Label(frame_buscar_proy, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_proy_desc.pack()
-crear_boton(frame_buscar_proy, "Ver Equipo Asignado", ver_empleados_proy_popup)
-crear_boton(frame_buscar_proy, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_buscar_proy, lambda: limpiar_formulario([entry_buscar_proy_id, lbl_msg_buscar_proy, lbl_res_proy_nombre, lbl_res_proy_fecha, lbl_res_proy_desc])))
+def construir_buscar_proy(frame):
+    global entry_buscar_proy_id, lbl_msg_buscar_proy, lbl_res_proy_nombre, lbl_res_proy_fecha
+    global lbl_res_proy_desc, lbl_res_proy_costo
+    crear_titulo(frame, "Buscar Proyecto")
+    entry_buscar_proy_id = crear_input(frame, "ID Proyecto:")
+    crear_boton(frame, "Buscar", accion_buscar_proyecto)
+    lbl_msg_buscar_proy = crear_label_mensaje(frame)
+    lbl_res_proy_nombre = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_proy_nombre.pack()
+    lbl_res_proy_fecha = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_proy_fecha.pack()
+    lbl_res_proy_desc = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_proy_desc.pack()
+    lbl_res_proy_costo = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_proy_costo.pack()
+    crear_boton(frame, "Ver Equipo Asignado", ver_empleados_proy_popup)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_buscar_proy, lambda: limpiar_formulario([entry_buscar_proy_id, lbl_msg_buscar_proy, lbl_res_proy_nombre, lbl_res_proy_fecha, lbl_res_proy_desc, lbl_res_proy_costo])))
+
+frame_buscar_proy = FrameDiferido(ventana, construir_buscar_proy, bg=COLOR_FONDO)
 
 # Editar
-frame_editar_proy = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_editar_proy, "Editar Proyecto")
-entry_edit_proy_id = crear_input(frame_editar_proy, "ID Proyecto (Original):")
-entry_edit_proy_nom = crear_input(frame_editar_proy, "Nuevo Nombre:")
-entry_edit_proy_fec = crear_input(frame_editar_proy, "Nueva Fecha:")
-entry_edit_proy_desc = crear_input(frame_editar_proy, "Nueva Descripción:")
-lbl_msg_edit_proy = crear_label_mensaje(frame_editar_proy)
-crear_boton(frame_editar_proy, "Actualizar", accion_editar_proyecto)
-crear_boton(frame_editar_proy, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_editar_proy, lambda: limpiar_formulario([entry_edit_proy_id, entry_edit_proy_nom, entry_edit_proy_fec, entry_edit_proy_desc, lbl_msg_edit_proy])))
+def construir_editar_proy(frame):
+    global entry_edit_proy_id, entry_edit_proy_nom, entry_edit_proy_fec, entry_edit_proy_desc
+    global lbl_msg_edit_proy
+    crear_titulo(frame, "Editar Proyecto")
+    entry_edit_proy_id = crear_input(frame, "ID Proyecto (Original):")
+    entry_edit_proy_nom = crear_input(frame, "Nuevo Nombre:")
+    entry_edit_proy_fec = crear_input(frame, "Nueva Fecha:")
+    entry_edit_proy_desc = crear_input(frame, "Nueva Descripción:")
+    lbl_msg_edit_proy = crear_label_mensaje(frame)
+    crear_boton(frame, "Actualizar", accion_editar_proyecto)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_editar_proy, lambda: limpiar_formulario([entry_edit_proy_id, entry_edit_proy_nom, entry_edit_proy_fec, entry_edit_proy_desc, lbl_msg_edit_proy])))
+
+frame_editar_proy = FrameDiferido(ventana, construir_editar_proy, bg=COLOR_FONDO)
 
 # Eliminar
-frame_eliminar_proy = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_eliminar_proy, "Eliminar Proyecto")
-entry_elim_proy_id = crear_input(frame_eliminar_proy, "ID Proyecto:")
-lbl_msg_elim_proy = crear_label_mensaje(frame_eliminar_proy)
-crear_boton(frame_eliminar_proy, "Eliminar", accion_eliminar_proyecto)
-crear_boton(frame_eliminar_proy, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_eliminar_proy, lambda: limpiar_formulario([entry_elim_proy_id, lbl_msg_elim_proy])))
+def construir_eliminar_proy(frame):
+    global entry_elim_proy_id, lbl_msg_elim_proy
+    crear_titulo(frame, "Eliminar Proyecto")
+    entry_elim_proy_id = crear_input(frame, "ID Proyecto (varios separados por coma):")
+    lbl_msg_elim_proy = crear_label_mensaje(frame)
+    crear_boton(frame, "Eliminar", accion_eliminar_proyecto)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_eliminar_proy, lambda: limpiar_formulario([entry_elim_proy_id, lbl_msg_elim_proy])))
+
+frame_eliminar_proy = FrameDiferido(ventana, construir_eliminar_proy, bg=COLOR_FONDO)
 
 # Asignaciones Proyectos
-frame_asig_emp_proy = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_asig_emp_proy, "Asignar a Proyecto")
-entry_asig_ep_idproy = crear_input(frame_asig_emp_proy, "ID Proyecto:")
-entry_asig_ep_idemp = crear_input(frame_asig_emp_proy, "ID Empleado:")
-lbl_msg_asig_ep = crear_label_mensaje(frame_asig_emp_proy)
-crear_boton(frame_asig_emp_proy, "Asignar", accion_asignar_empleado_proyecto)
-crear_boton(frame_asig_emp_proy, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_asig_emp_proy, lambda: limpiar_formulario([entry_asig_ep_idproy, entry_asig_ep_idemp, lbl_msg_asig_ep])))
-
-frame_elim_emp_proy = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_elim_emp_proy, "Desvincular de Proyecto")
-entry_elim_ep_idproy = crear_input(frame_elim_emp_proy, "ID Proyecto:")
-entry_elim_ep_idemp = crear_input(frame_elim_emp_proy, "ID Empleado:")
-lbl_msg_elim_ep = crear_label_mensaje(frame_elim_emp_proy)
-crear_boton(frame_elim_emp_proy, "Eliminar Relación", accion_eliminar_empleado_proyecto)
-crear_boton(frame_elim_emp_proy, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_elim_emp_proy, lambda: limpiar_formulario([entry_elim_ep_idproy, entry_elim_ep_idemp, lbl_msg_elim_ep])))
+def construir_asig_emp_proy(frame):
+    global entry_asig_ep_idproy, entry_asig_ep_idemp, lbl_msg_asig_ep
+    crear_titulo(frame, "Asignar a Proyecto")
+    entry_asig_ep_idproy = crear_input(frame, "ID Proyecto:")
+    entry_asig_ep_idemp = crear_input(frame, "ID Empleado:")
+    lbl_msg_asig_ep = crear_label_mensaje(frame)
+    crear_boton(frame, "Asignar", accion_asignar_empleado_proyecto)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_asig_emp_proy, lambda: limpiar_formulario([entry_asig_ep_idproy, entry_asig_ep_idemp, lbl_msg_asig_ep])))
+
+frame_asig_emp_proy = FrameDiferido(ventana, construir_asig_emp_proy, bg=COLOR_FONDO)
+
+def construir_elim_emp_proy(frame):
+    global entry_elim_ep_idproy, entry_elim_ep_idemp, lbl_msg_elim_ep
+    crear_titulo(frame, "Desvincular de Proyecto")
+    entry_elim_ep_idproy = crear_input(frame, "ID Proyecto:")
+    entry_elim_ep_idemp = crear_input(frame, "ID Empleado:")
+    lbl_msg_elim_ep = crear_label_mensaje(frame)
+    crear_boton(frame, "Eliminar Relación", accion_eliminar_empleado_proyecto)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_proyectos, frame_elim_emp_proy, lambda: limpiar_formulario([entry_elim_ep_idproy, entry_elim_ep_idemp, lbl_msg_elim_ep])))
+
+frame_elim_emp_proy = FrameDiferido(ventana, construir_elim_emp_proy, bg=COLOR_FONDO)
+
+# -----------------------------------------------------------------------------
+# 5.1 ASIGNACIÓN MASIVA (Proyectos y Departamentos)
+# -----------------------------------------------------------------------------
+def construir_asig_masiva(frame):
+    global var_destino_masiva, entry_masiva_id, frame_lista_masiva, lbl_msg_masiva
+    crear_titulo(frame, "Asignación Masiva")
+
+    tk.Label(frame, text="Destino:", font=FONT_TEXTO, bg=COLOR_FONDO).pack(pady=(5, 0))
+    var_destino_masiva = tk.StringVar(value="Proyecto")
+    menu_destino_masiva = tk.OptionMenu(frame, var_destino_masiva, *FUNCIONES_MASIVAS)
+    menu_destino_masiva.config(font=FONT_TEXTO, width=20, bg=COLOR_BOTON)
+    menu_destino_masiva.pack(pady=5)
+
+    entry_masiva_id = crear_input(frame, "ID Proyecto / Departamento:")
+
+    tk.Label(frame, text="Empleados (Ctrl/Shift para seleccionar varios):",
+             font=FONT_TEXTO, bg=COLOR_FONDO).pack(pady=(5, 0))
+    # La TablaVirtual se crea al abrir la pantalla (cargar_empleados_masiva)
+    frame_lista_masiva = tk.Frame(frame, bg=COLOR_FONDO, height=260)
+    frame_lista_masiva.pack(pady=5, padx=20, fill="both", expand=True)
+
+    lbl_msg_masiva = crear_label_mensaje(frame)
+    crear_boton(frame, "Asignar Seleccionados", accion_asignacion_masiva)
+    crear_boton(frame, "Quitar Seleccionados", lambda: accion_asignacion_masiva(quitar=True),
+                color_texto=COLOR_TEXTO_ERROR)
+    crear_boton(frame, "Volver", volver_desde_asignacion_masiva)
+
+frame_asig_masiva = FrameDiferido(ventana, construir_asig_masiva, bg=COLOR_FONDO)
 
 # -----------------------------------------------------------------------------
 # 6. SUB-MENU: GESTIÓN EMPLEADOS (CRUD)
 # -----------------------------------------------------------------------------
-frame_gest_empleados = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_gest_empleados, "Menú Empleados")
-crear_boton(frame_gest_empleados, "Ver Todos los Empleados", ver_todos_empleados_popup)
-crear_boton(frame_gest_empleados, "Crear Nuevo Empleado", lambda: cambiar_frame(frame_crear_empleado, frame_gest_empleados))
-crear_boton(frame_gest_empleados, "Buscar Empleado", lambda: cambiar_frame(frame_buscar_empleado, frame_gest_empleados))
-crear_boton(frame_gest_empleados, "Editar Empleado", lambda: cambiar_frame(frame_editar_busqueda_empleado, frame_gest_empleados))
-crear_boton(frame_gest_empleados, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_empleados))
+def construir_gest_empleados(frame):
+    crear_titulo(frame, "Menú Empleados")
+    crear_boton(frame, "Ver Todos los Empleados", ver_todos_empleados_popup)
+    crear_boton(frame, "Crear Nuevo Empleado", lambda: cambiar_frame(frame_crear_empleado, frame_gest_empleados))
+    crear_boton(frame, "Buscar Empleado", lambda: cambiar_frame(frame_buscar_empleado, frame_gest_empleados))
+    crear_boton(frame, "Editar Empleado", lambda: cambiar_frame(frame_editar_busqueda_empleado, frame_gest_empleados))
+    crear_boton(frame, "Volver al Panel", lambda: cambiar_frame(frame_panel_admin, frame_gest_empleados))
+
+frame_gest_empleados = FrameDiferido(ventana, construir_gest_empleados, bg=COLOR_FONDO)
 
 # Crear Empleado
-frame_crear_empleado = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_crear_empleado, "Crear Empleado")
-entry_crear_emp_rut = crear_input(frame_crear_empleado, "RUT (ID Usuario):")
-entry_crear_emp_nom = crear_input(frame_crear_empleado, "Nombre:")
-entry_crear_emp_dir = crear_input(frame_crear_empleado, "Dirección:")
-entry_crear_emp_tel = crear_input(frame_crear_empleado, "Teléfono:")
-entry_crear_emp_cor = crear_input(frame_crear_empleado, "Correo:")
-entry_crear_emp_id = crear_input(frame_crear_empleado, "ID Ficha Empleado:")
-entry_crear_emp_sal = crear_input(frame_crear_empleado, "Salario:")
-entry_crear_emp_fec = crear_input(frame_crear_empleado, "Fecha Contrato:")
-entry_crear_emp_depto = crear_input(frame_crear_empleado, "ID Depto Inicial (opcional):")
-tk.Label(frame_crear_empleado, text="* Si no se coloca departamento, se asignará como nulo", 
-         font=("Segoe UI", 9, "italic"), fg="gray", bg=COLOR_FONDO).pack(pady=(0, 5))
-lbl_msg_crear_emp = crear_label_mensaje(frame_crear_empleado)
-crear_boton(frame_crear_empleado, "Guardar", accion_crear_empleado)
-crear_boton(frame_crear_empleado, "Volver", lambda: cambiar_frame(frame_gest_empleados, frame_crear_empleado, lambda: limpiar_formulario([lbl_msg_crear_emp, entry_crear_emp_rut, entry_crear_emp_nom, entry_crear_emp_dir, entry_crear_emp_tel, entry_crear_emp_cor, entry_crear_emp_id, entry_crear_emp_sal, entry_crear_emp_fec, entry_crear_emp_depto])))
+def construir_crear_empleado(frame):
+    global entry_crear_emp_rut, entry_crear_emp_nom, entry_crear_emp_dir, entry_crear_emp_tel
+    global entry_crear_emp_cor, entry_crear_emp_sal, entry_crear_emp_fec, entry_crear_emp_depto
+    global lbl_msg_crear_emp
+    crear_titulo(frame, "Crear Empleado")
+    entry_crear_emp_rut = crear_input(frame, "RUT (ID Usuario):")
+    entry_crear_emp_nom = crear_input(frame, "Nombre:")
+    entry_crear_emp_dir = crear_input(frame, "Dirección:")
+    entry_crear_emp_tel = crear_input(frame, "Teléfono:")
+    entry_crear_emp_cor = crear_input(frame, "Correo:")
+    entry_crear_emp_sal = crear_input(frame, "Salario:")
+    entry_crear_emp_fec = crear_input(frame, "Fecha Contrato:")
+    entry_crear_emp_depto = crear_input(frame, "ID Depto Inicial (opcional):")
+    tk.Label(frame, text="* Si no se coloca departamento, se asignará como nulo", 
+             font=("Segoe UI", 9, "italic"), fg="gray", bg=COLOR_FONDO).pack(pady=(0, 5))
+    lbl_msg_crear_emp = crear_label_mensaje(frame)
+    crear_boton(frame, "Guardar", accion_crear_empleado)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_empleados, frame_crear_empleado, lambda: limpiar_formulario([lbl_msg_crear_emp, entry_crear_emp_rut, entry_crear_emp_nom, entry_crear_emp_dir, entry_crear_emp_tel, entry_crear_emp_cor, entry_crear_emp_sal, entry_crear_emp_fec, entry_crear_emp_depto])))
+
+frame_crear_empleado = FrameDiferido(ventana, construir_crear_empleado, bg=COLOR_FONDO)
 
 # Buscar Empleado
-frame_buscar_empleado = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_buscar_empleado, "Buscar Empleado")
-entry_buscar_emp_id = crear_input(frame_buscar_empleado, "ID Ficha Empleado:")
-crear_boton(frame_buscar_empleado, "Buscar", accion_buscar_empleado)
-lbl_msg_buscar_emp = crear_label_mensaje(frame_buscar_empleado)
-# Resultados
-lbl_res_emp_nombre = tk.Label(frame_buscar_empleado, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_nombre.pack()
-lbl_res_emp_correo = tk.Label(frame_buscar_empleado, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_correo.pack()
-lbl_res_emp_salario = tk.Label(frame_buscar_empleado, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_salario.pack()
-lbl_res_emp_depto = tk.Label(frame_buscar_empleado, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_depto.pack()
-crear_boton(frame_buscar_empleado, "Volver", lambda: cambiar_frame(frame_gest_empleados, frame_buscar_empleado, lambda: limpiar_formulario([entry_buscar_emp_id, lbl_msg_buscar_emp, lbl_res_emp_nombre, lbl_res_emp_correo])))
+def construir_buscar_empleado(frame):
+    global entry_buscar_emp_id, lbl_msg_buscar_emp, lbl_res_emp_nombre, lbl_res_emp_correo
+    global lbl_res_emp_salario, lbl_res_emp_depto
+    crear_titulo(frame, "Buscar Empleado")
+    entry_buscar_emp_id = crear_input(frame, "ID Ficha Empleado:")
+    crear_boton(frame, "Buscar", accion_buscar_empleado)
+    lbl_msg_buscar_emp = crear_label_mensaje(frame)
+    # Resultados
+    lbl_res_emp_nombre = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_nombre.pack()
+    lbl_res_emp_correo = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_correo.pack()
+    lbl_res_emp_salario = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_salario.pack()
+    lbl_res_emp_depto = tk.Label(frame, text="", font=FONT_TEXTO, bg=COLOR_FONDO); lbl_res_emp_depto.pack()
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_empleados, frame_buscar_empleado, lambda: limpiar_formulario([entry_buscar_emp_id, lbl_msg_buscar_emp, lbl_res_emp_nombre, lbl_res_emp_correo])))
+
+frame_buscar_empleado = FrameDiferido(ventana, construir_buscar_empleado, bg=COLOR_FONDO)
 
 # Editar Empleado (Paso 1: Busqueda por RUT)
-frame_editar_busqueda_empleado = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_editar_busqueda_empleado, "Editar Empleado - Paso 1")
-entry_editar_rut_busqueda = crear_input(frame_editar_busqueda_empleado, "Ingrese RUT del Empleado:")
-lbl_mensaje_editar_busqueda = crear_label_mensaje(frame_editar_busqueda_empleado)
-crear_boton(frame_editar_busqueda_empleado, "Buscar y Editar", procesar_busqueda_editar_empleado)
-crear_boton(frame_editar_busqueda_empleado, "Volver", lambda: cambiar_frame(frame_gest_empleados, frame_editar_busqueda_empleado, lambda: limpiar_formulario([entry_editar_rut_busqueda, lbl_mensaje_editar_busqueda])))
+def construir_editar_busqueda_empleado(frame):
+    global entry_editar_rut_busqueda, lbl_mensaje_editar_busqueda
+    crear_titulo(frame, "Editar Empleado - Paso 1")
+    entry_editar_rut_busqueda = crear_input(frame, "Ingrese RUT del Empleado:")
+    lbl_mensaje_editar_busqueda = crear_label_mensaje(frame)
+    crear_boton(frame, "Buscar y Editar", procesar_busqueda_editar_empleado)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_gest_empleados, frame_editar_busqueda_empleado, lambda: limpiar_formulario([entry_editar_rut_busqueda, lbl_mensaje_editar_busqueda])))
+
+frame_editar_busqueda_empleado = FrameDiferido(ventana, construir_editar_busqueda_empleado, bg=COLOR_FONDO)
 
 # Editar Empleado (Paso 2: Formulario)
-frame_form_editar_empleado = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_form_editar_empleado, "Editando Datos")
-entry_ed_rut = crear_input(frame_form_editar_empleado, "RUT (Bloqueado):")
-entry_ed_nombre = crear_input(frame_form_editar_empleado, "Nombre:")
-entry_ed_direccion = crear_input(frame_form_editar_empleado, "Dirección:")
-entry_ed_telefono = crear_input(frame_form_editar_empleado, "Teléfono:")
-entry_ed_correo = crear_input(frame_form_editar_empleado, "Correo:")
-entry_ed_id_emp = crear_input(frame_form_editar_empleado, "ID Ficha (Bloqueado):")
-entry_ed_salario = crear_input(frame_form_editar_empleado, "Salario:")
-entry_ed_fecha = crear_input(frame_form_editar_empleado, "Fecha (Bloqueado):")
-entry_ed_id_depto = crear_input(frame_form_editar_empleado, "ID Depto (Bloqueado):")
-lbl_msg_ed_emp = crear_label_mensaje(frame_form_editar_empleado)
-crear_boton(frame_form_editar_empleado, "Guardar Cambios", accion_actualizar_empleado)
-crear_boton(frame_form_editar_empleado, "Volver", lambda: cambiar_frame(frame_editar_busqueda_empleado, frame_form_editar_empleado, lambda: limpiar_formulario([lbl_msg_ed_emp, entry_editar_rut_busqueda, lbl_mensaje_editar_busqueda])))
+def construir_form_editar_empleado(frame):
+    global entry_ed_rut, entry_ed_nombre, entry_ed_direccion, entry_ed_telefono, entry_ed_correo
+    global entry_ed_id_emp, entry_ed_salario, entry_ed_fecha, entry_ed_id_depto, lbl_msg_ed_emp
+    crear_titulo(frame, "Editando Datos")
+    entry_ed_rut = crear_input(frame, "RUT (Bloqueado):")
+    entry_ed_nombre = crear_input(frame, "Nombre:")
+    entry_ed_direccion = crear_input(frame, "Dirección:")
+    entry_ed_telefono = crear_input(frame, "Teléfono:")
+    entry_ed_correo = crear_input(frame, "Correo:")
+    entry_ed_id_emp = crear_input(frame, "ID Ficha (Bloqueado):")
+    entry_ed_salario = crear_input(frame, "Salario:")
+    entry_ed_fecha = crear_input(frame, "Fecha (Bloqueado):")
+    entry_ed_id_depto = crear_input(frame, "ID Depto (Bloqueado):")
+    lbl_msg_ed_emp = crear_label_mensaje(frame)
+    crear_boton(frame, "Guardar Cambios", accion_actualizar_empleado)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_editar_busqueda_empleado, frame_form_editar_empleado, lambda: limpiar_formulario([lbl_msg_ed_emp, entry_editar_rut_busqueda, lbl_mensaje_editar_busqueda])))
+
+frame_form_editar_empleado = FrameDiferido(ventana, construir_form_editar_empleado, bg=COLOR_FONDO)
 
 # -----------------------------------------------------------------------------
 # 7. LOGIN EMPLEADO Y REGISTRO HORAS
 # -----------------------------------------------------------------------------
-frame_login_empleado = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_login_empleado, "Acceso Empleado")
-entry_login_rut_empleado = crear_input(frame_login_empleado, "Ingrese su RUT:")
-lbl_mensaje_login_emp = crear_label_mensaje(frame_login_empleado)
-crear_boton(frame_login_empleado, "Ingresar", procesar_ingreso_empleado)
-crear_boton(frame_login_empleado, "Volver", lambda: cambiar_frame(frame_inicio, frame_login_empleado, lambda: limpiar_formulario([entry_login_rut_empleado, lbl_mensaje_login_emp])))
+def construir_login_empleado(frame):
+    global entry_login_rut_empleado, lbl_mensaje_login_emp
+    crear_titulo(frame, "Acceso Empleado")
+    entry_login_rut_empleado = crear_input(frame, "Ingrese su RUT:")
+    lbl_mensaje_login_emp = crear_label_mensaje(frame)
+    crear_boton(frame, "Ingresar", procesar_ingreso_empleado)
+    crear_boton(frame, "Volver", lambda: cambiar_frame(frame_inicio, frame_login_empleado, lambda: limpiar_formulario([entry_login_rut_empleado, lbl_mensaje_login_emp])))
+
+frame_login_empleado = FrameDiferido(ventana, construir_login_empleado, bg=COLOR_FONDO)
 
 # Registro Horas
-frame_registrar_horas = tk.Frame(ventana, bg=COLOR_FONDO)
-crear_titulo(frame_registrar_horas, "Registro de Actividades")
-entry_horas_id_emp = crear_input(frame_registrar_horas, "ID Empleado:")
-entry_horas_id_proy = crear_input(frame_registrar_horas, "ID Proyecto:")
-entry_horas_fecha = crear_input(frame_registrar_horas, "Fecha:")
-entry_horas_cant = crear_input(frame_registrar_horas, "Cantidad Horas:")
-entry_horas_desc = crear_input(frame_registrar_horas, "Descripción Actividad:")
-lbl_msg_horas = crear_label_mensaje(frame_registrar_horas)
-crear_boton(frame_registrar_horas, "Registrar", accion_registrar_horas)
-crear_boton(frame_registrar_horas, "Salir", lambda: cambiar_frame(frame_login_empleado, frame_registrar_horas, lambda: limpiar_formulario([entry_horas_id_proy, entry_horas_cant, entry_horas_desc, lbl_msg_horas])))
+def construir_registrar_horas(frame):
+    global entry_horas_id_emp, entry_horas_id_proy, entry_horas_fecha, entry_horas_cant, entry_horas_desc
+    global lbl_msg_horas
+    crear_titulo(frame, "Registro de Actividades")
+    entry_horas_id_emp = crear_input(frame, "ID Empleado:")
+    entry_horas_id_proy = crear_input(frame, "ID Proyecto:")
+    entry_horas_fecha = crear_input(frame, "Fecha:")
+    entry_horas_cant = crear_input(frame, "Cantidad Horas:")
+    entry_horas_desc = crear_input(frame, "Descripción Actividad:")
+    lbl_msg_horas = crear_label_mensaje(frame)
+    crear_boton(frame, "Registrar", accion_registrar_horas)
+    crear_boton(frame, "Salir", lambda: cambiar_frame(frame_login_empleado, frame_registrar_horas, lambda: limpiar_formulario([entry_horas_id_proy, entry_horas_cant, entry_horas_desc, lbl_msg_horas])))
+
+frame_registrar_horas = FrameDiferido(ventana, construir_registrar_horas, bg=COLOR_FONDO)
 
 # =============================================================================
 # --- ARRANQUE ---
 # =============================================================================
 
-# Inicializar admin por defecto si no existe ninguno
-dbFunciones.inicializar_admin_por_defecto()
+def iniciar_servicios():
+    """
+    Corre en el ejecutor, después de dibujar la primera pantalla: importa
+    database, aplica las migraciones pendientes (entre ellas el admin por
+    defecto) e inicia el envío de la cola de horas (también la de sesiones
+    anteriores).
+    """
+    migraciones.aplicar_migraciones()
+    cola_registros.iniciar_sincronizador()
+
+def cerrar_aplicacion():
+    """Detiene las tareas pendientes antes de cerrar la ventana"""
+    ejecutor.cerrar()
+    if cola_registros.cargado:
+        cola_registros.detener_sincronizador()
+    ventana.destroy()
+
+ventana.protocol("WM_DELETE_WINDOW", cerrar_aplicacion)
 
 # Iniciar en frame inicio
 frame_inicio.pack(fill="both", expand=True, padx=20, pady=20)
+
+# after_idle corre cuando Tkinter terminó de dibujar lo pendiente: la ventana
+# aparece sin esperar a la BD
+ventana.after_idle(lambda: ejecutor.ejecutar(iniciar_servicios, clave="arranque"))
 ventana.mainloop()
\ No newline at end of file
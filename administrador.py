@@ -6,12 +6,22 @@ import bcrypt
 
 
 class Administrador(Empleado):
+    __slots__ = ('idAdmin', 'usuario', 'clave_hash')
+
     def __init__(self, nombre:str, direccion:str, telefono:str, correo:str, idEmpleado:int, fechaInicioContrato:str, salario:float, idAdmin:int,usuario:str,clave:str):
         super().__init__(nombre, direccion, telefono, correo, idEmpleado, fechaInicioContrato, salario)
 
         self.idAdmin = idAdmin
         self.usuario = usuario
         self.clave_hash = clave
+
+    @classmethod
+    def desde_fila(cls, fila) -> 'Administrador':
+        """
+        fila en el orden de __init__: nombre, direccion, telefono, correo,
+        idEmpleado, fechaInicioContrato, salario, idAdmin, usuario, clave (hash)
+        """
+        return cls(*fila)
     #crear hash
     
     
@@ -21,24 +31,28 @@ class Administrador(Empleado):
 
 
     # Metodos Proyecto
-    def crearProyecto(self, idProyecto:int, nombre:str, fechaInicioProyecto:str, descripcion:str):
-        temp = Proyecto(idProyecto, nombre, fechaInicioProyecto, descripcion)
+    def crearProyecto(self, nombre:str, fechaInicioProyecto:str, descripcion:str):
+        # El ID lo asigna la base de datos al insertar
+        temp = Proyecto(None, nombre, fechaInicioProyecto, descripcion)
         
         
         try:
-            dbFunciones.db_crear_proyecto(temp.idProyecto, temp)
-            return temp
+            if dbFunciones.db_crear_proyecto(temp):
+                return temp
+            return None
         except Exception as e:
             print(f"No se puedo crear el proyecto en la BD :{e}")
             return None
     
     # Metodo Departamento
-    def crearDepartamento(self, idDepartamento:int, nombre:str, gerente:'Empleado|None' = None, empleados:list[Empleado] = []):
-        temp = Departamento(idDepartamento, nombre, gerente, empleados)
+    def crearDepartamento(self, nombre:str, gerente:'Empleado|None' = None, empleados:'list[Empleado]|None' = None):
+        # El ID lo asigna la base de datos al insertar
+        temp = Departamento(None, nombre, gerente, empleados)
 
         try:
-            dbFunciones.db_crear_departamento(temp.idDepartamento, temp)
-            return temp
+            if dbFunciones.db_crear_departamento(temp):
+                return temp
+            return None
         except Exception as e:
             print(f"No se puedo crear el departamento en la BD :{e}")
             return None
@@ -0,0 +1,398 @@
+"""
+Motores de almacenamiento de database.py.
+
+Las funciones db_* de database.py son el repositorio de la aplicación
+(usuarios, empleados, departamentos, proyectos, registros, administradores
+e indicadores): APP.py y los demás módulos solo hablan con ellas. Están
+escritas contra la API de python-oracledb y el SQL del proyecto; lo que
+cambia según el motor queda detrás de la interfaz Almacenamiento:
+
+    driver                      módulo con la API de oracledb (errores, tipos, pool)
+    crear_pool(...)             pool de sesiones, creando el esquema si hace falta
+    eliminar_proyecto(...)      borrados en cascada (PL/SQL en Oracle)
+    eliminar_proyectos(...)
+    crear_tabla_versiones(...)  schema_version de migraciones.py
+    bloquear_versiones(...)     un solo cliente aplica las migraciones a la vez
+    dias_desde_epoch(columna)   expresión SQL con una fecha como número de días
+    soporta_rollup              si reportes.py puede usar GROUP BY ROLLUP
+
+DB_BACKEND elige la implementación:
+    oracle  (por defecto) servidor Oracle: DB_USER, DB_PASSWORD y DB_DSN
+    sqlite  archivo local en modo WAL (DB_SQLITE_RUTA), sin ir a la red.
+            El esquema (tablas, índices y triggers de costo) se crea solo.
+"""
+import os
+import sqlite3
+
+BACKENDS = ('oracle', 'sqlite')
+
+# Archivo por defecto del backend SQLite (DB_SQLITE_RUTA lo cambia)
+RUTA_SQLITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'empresa.sqlite')
+
+
+class Almacenamiento:
+    """Interfaz de un motor de almacenamiento."""
+
+    nombre = ""
+    soporta_rollup = True
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def crear_pool(self, usuario, clave, dsn, minimo: int, maximo: int, incremento: int):
+        """Retorna un pool con la API de oracledb (acquire, busy, opened, min, max, close)."""
+        raise NotImplementedError
+
+    def eliminar_proyecto(self, cursor, id_proyecto: int):
+        """Borra el proyecto con sus registros y asignaciones, y confirma. Retorna cuántos proyectos borró (0 o 1)."""
+        raise NotImplementedError
+
+    def eliminar_proyectos(self, cursor, ids: list):
+        """Como eliminar_proyecto, para varios IDs en una transacción. Retorna los IDs borrados."""
+        raise NotImplementedError
+
+    def crear_tabla_versiones(self, cursor):
+        """Crea schema_version en una base anterior a migraciones.py (si otro cliente la creó, no falla)."""
+        raise NotImplementedError
+
+    def bloquear_versiones(self, cursor):
+        """Bloquea schema_version hasta el fin de la transacción del cursor."""
+        raise NotImplementedError
+
+    def dias_desde_epoch(self, columna: str) -> str:
+        """Expresión SQL con los días (con fracción) entre 1970-01-01 y la columna DATE."""
+        raise NotImplementedError
+
+    def descripcion(self):
+        """Texto para mostrar en el diagnóstico (motor y destino)."""
+        return self.nombre
+
+
+# =============================================================================
+# --- ORACLE ---
+# =============================================================================
+
+# Borrado en cascada en un solo bloque PL/SQL: un round-trip y una transacción.
+# Si algo falla, Oracle deshace todo el bloque (no queda un proyecto a medio borrar).
+SQL_ELIMINAR_PROYECTO = """
+    BEGIN
+        DELETE FROM registros WHERE idProyecto = :id;
+        DELETE FROM proyecto_empleados WHERE idProyecto = :id;
+        DELETE FROM proyectos WHERE idProyecto = :id;
+        :eliminados := SQL%ROWCOUNT;
+        COMMIT;
+    END;
+"""
+
+# Variante masiva: los IDs viajan como una colección SQL (SYS.ODCINUMBERLIST)
+SQL_ELIMINAR_PROYECTOS = """
+    DECLARE
+        v_eliminados SYS.ODCINUMBERLIST;
+    BEGIN
+        DELETE FROM registros WHERE idProyecto IN (SELECT COLUMN_VALUE FROM TABLE(:ids));
+        DELETE FROM proyecto_empleados WHERE idProyecto IN (SELECT COLUMN_VALUE FROM TABLE(:ids));
+        DELETE FROM proyectos WHERE idProyecto IN (SELECT COLUMN_VALUE FROM TABLE(:ids))
+        RETURNING idProyecto BULK COLLECT INTO v_eliminados;
+        :eliminados := v_eliminados;
+        COMMIT;
+    END;
+"""
+
+
+SQL_CREAR_TABLA_VERSIONES = """
+    CREATE TABLE schema_version (
+        version NUMBER PRIMARY KEY,
+        descripcion VARCHAR2(200) NOT NULL,
+        aplicada DATE DEFAULT SYSDATE NOT NULL
+    )
+"""
+
+ORA_NOMBRE_EN_USO = 955
+
+
+class AlmacenamientoOracle(Almacenamiento):
+    nombre = "oracle"
+
+    def __init__(self):
+        import oracledb
+        super().__init__(oracledb)
+        self._dsn = None
+
+    def crear_pool(self, usuario, clave, dsn, minimo, maximo, incremento):
+        self._dsn = dsn
+        return self.driver.create_pool(
+            user=usuario,
+            password=clave,
+            dsn=dsn,
+            min=minimo,
+            max=maximo,
+            increment=incremento,
+            getmode=self.driver.POOL_GETMODE_WAIT
+        )
+
+    def eliminar_proyecto(self, cursor, id_proyecto):
+        # El COMMIT va dentro del bloque PL/SQL
+        eliminados = cursor.var(int)
+        cursor.execute(SQL_ELIMINAR_PROYECTO, id=id_proyecto, eliminados=eliminados)
+        return eliminados.getvalue() or 0
+
+    def eliminar_proyectos(self, cursor, ids):
+        tipo_lista = cursor.connection.gettype("SYS.ODCINUMBERLIST")
+        eliminados = cursor.var(tipo_lista)
+        cursor.execute(SQL_ELIMINAR_PROYECTOS, ids=tipo_lista.newobject(ids), eliminados=eliminados)
+
+        lista = eliminados.getvalue()
+        return [int(i) for i in lista.aslist()] if lista is not None else []
+
+    def crear_tabla_versiones(self, cursor):
+        try:
+            cursor.execute(SQL_CREAR_TABLA_VERSIONES)
+        except self.driver.DatabaseError as e:
+            error, = e.args
+            if error.code != ORA_NOMBRE_EN_USO:  # Otro cliente la creó primero
+                raise
+
+    def bloquear_versiones(self, cursor):
+        # Un segundo cliente espera aquí hasta que el primero confirme sus migraciones
+        cursor.execute("LOCK TABLE schema_version IN EXCLUSIVE MODE")
+
+    def dias_desde_epoch(self, columna: str) -> str:
+        # DATE - DATE es un NUMBER de días
+        return f"({columna} - DATE '1970-01-01')"
+
+    def descripcion(self):
+        return f"Oracle ({self._dsn})" if self._dsn else "Oracle"
+
+
+# =============================================================================
+# --- SQLITE ---
+# =============================================================================
+# Mismo esquema que "ADMIN CONEXION BASE.sql": tablas, índices del PASO 4,
+# triggers de costo del PASO 5 y schema_version del PASO 7. Las columnas con secuencia en Oracle usan
+# AUTOINCREMENT, que tampoco reutiliza IDs borrados.
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    idUsuario INTEGER PRIMARY KEY,
+    nombre VARCHAR(50),
+    direccion VARCHAR(50),
+    telefono VARCHAR(50) UNIQUE,
+    correo VARCHAR(50) UNIQUE
+);
+CREATE TABLE IF NOT EXISTS departamentos (
+    idDepartamento INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre VARCHAR(100),
+    idGerenteResponsable INTEGER REFERENCES empleados(idEmpleado)
+);
+CREATE TABLE IF NOT EXISTS empleados (
+    idEmpleado INTEGER PRIMARY KEY AUTOINCREMENT,
+    fechaInicioContrato DATE,
+    salario FLOAT,
+    idUsuario INTEGER REFERENCES usuarios(idUsuario),
+    idDepartamento INTEGER REFERENCES departamentos(idDepartamento)
+);
+CREATE TABLE IF NOT EXISTS proyectos (
+    idProyecto INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre VARCHAR(50),
+    fechaInicioProyecto DATE,
+    descripcion VARCHAR(50)
+);
+CREATE TABLE IF NOT EXISTS proyecto_empleados (
+    idEmpleado INTEGER REFERENCES empleados(idEmpleado),
+    idProyecto INTEGER REFERENCES proyectos(idProyecto),
+    PRIMARY KEY (idEmpleado, idProyecto)
+);
+CREATE TABLE IF NOT EXISTS registros (
+    idRegistro INTEGER PRIMARY KEY AUTOINCREMENT,
+    fechaRegistro DATE NOT NULL,
+    horasTrabajadas FLOAT NOT NULL,
+    descripcionTrabajo VARCHAR(200) NOT NULL,
+    idEmpleado INTEGER REFERENCES empleados(idEmpleado),
+    idProyecto INTEGER REFERENCES proyectos(idProyecto),
+    claveIdempotencia VARCHAR(36)
+);
+CREATE TABLE IF NOT EXISTS administradores (
+    idAdmin INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario VARCHAR(50) UNIQUE,
+    clave VARCHAR(255),
+    idEmpleado INTEGER REFERENCES empleados(idEmpleado)
+);
+CREATE TABLE IF NOT EXISTS indicadores_registrados (
+    idIndicadorRegistro INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre_indicador VARCHAR(50) NOT NULL,
+    valor_indicador FLOAT,
+    fecha_valor DATE,
+    fecha_consulta DATE,
+    sitio_proveedor VARCHAR(100),
+    id_admin_consulta INTEGER REFERENCES administradores(idAdmin)
+);
+CREATE TABLE IF NOT EXISTS costo_proyecto_empleado (
+    idProyecto INTEGER NOT NULL,
+    idEmpleado INTEGER NOT NULL,
+    horas FLOAT DEFAULT 0 NOT NULL,
+    costo FLOAT DEFAULT 0 NOT NULL,
+    cantidad INTEGER DEFAULT 0 NOT NULL,
+    PRIMARY KEY (idProyecto, idEmpleado)
+);
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    descripcion VARCHAR(200) NOT NULL,
+    aplicada DATE DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_registros_empleado ON registros (idEmpleado, fechaRegistro);
+CREATE INDEX IF NOT EXISTS idx_registros_proyecto ON registros (idProyecto, fechaRegistro);
+CREATE INDEX IF NOT EXISTS idx_registros_fecha ON registros (fechaRegistro, idEmpleado, idProyecto, horasTrabajadas);
+CREATE INDEX IF NOT EXISTS idx_empleados_departamento ON empleados (idDepartamento);
+CREATE INDEX IF NOT EXISTS idx_empleados_usuario ON empleados (idUsuario);
+CREATE INDEX IF NOT EXISTS idx_administradores_empleado ON administradores (idEmpleado);
+CREATE INDEX IF NOT EXISTS idx_proyecto_empleados_proy ON proyecto_empleados (idProyecto, idEmpleado);
+CREATE INDEX IF NOT EXISTS idx_indicadores_nombre_fecha ON indicadores_registrados (nombre_indicador, fecha_consulta);
+CREATE INDEX IF NOT EXISTS idx_indicadores_fecha ON indicadores_registrados (fecha_consulta, idIndicadorRegistro);
+CREATE INDEX IF NOT EXISTS idx_costo_empleado ON costo_proyecto_empleado (idEmpleado);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_registros_clave ON registros (claveIdempotencia);
+
+-- trg_registros_costo de Oracle, separado por evento (SQLite no tiene INSERTING/DELETING)
+CREATE TRIGGER IF NOT EXISTS trg_registros_costo_ins AFTER INSERT ON registros
+WHEN NEW.idProyecto IS NOT NULL AND NEW.idEmpleado IS NOT NULL
+BEGIN
+    INSERT INTO costo_proyecto_empleado (idProyecto, idEmpleado, horas, costo, cantidad)
+    VALUES (NEW.idProyecto, NEW.idEmpleado, NEW.horasTrabajadas,
+            NEW.horasTrabajadas * IFNULL((SELECT salario FROM empleados WHERE idEmpleado = NEW.idEmpleado), 0) / 180, 1)
+    ON CONFLICT (idProyecto, idEmpleado) DO UPDATE SET
+        horas = horas + excluded.horas,
+        costo = costo + excluded.costo,
+        cantidad = cantidad + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registros_costo_del AFTER DELETE ON registros
+BEGIN
+    UPDATE costo_proyecto_empleado
+    SET horas = horas - OLD.horasTrabajadas,
+        costo = costo - OLD.horasTrabajadas * IFNULL((SELECT salario FROM empleados WHERE idEmpleado = OLD.idEmpleado), 0) / 180,
+        cantidad = cantidad - 1
+    WHERE idProyecto = OLD.idProyecto AND idEmpleado = OLD.idEmpleado;
+
+    DELETE FROM costo_proyecto_empleado
+    WHERE idProyecto = OLD.idProyecto AND idEmpleado = OLD.idEmpleado AND cantidad <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_registros_costo_upd
+AFTER UPDATE OF horasTrabajadas, idEmpleado, idProyecto ON registros
+BEGIN
+    UPDATE costo_proyecto_empleado
+    SET horas = horas - OLD.horasTrabajadas,
+        costo = costo - OLD.horasTrabajadas * IFNULL((SELECT salario FROM empleados WHERE idEmpleado = OLD.idEmpleado), 0) / 180,
+        cantidad = cantidad - 1
+    WHERE idProyecto = OLD.idProyecto AND idEmpleado = OLD.idEmpleado;
+
+    DELETE FROM costo_proyecto_empleado
+    WHERE idProyecto = OLD.idProyecto AND idEmpleado = OLD.idEmpleado AND cantidad <= 0;
+
+    INSERT INTO costo_proyecto_empleado (idProyecto, idEmpleado, horas, costo, cantidad)
+    SELECT NEW.idProyecto, NEW.idEmpleado, NEW.horasTrabajadas,
+           NEW.horasTrabajadas * IFNULL((SELECT salario FROM empleados WHERE idEmpleado = NEW.idEmpleado), 0) / 180, 1
+    WHERE NEW.idProyecto IS NOT NULL AND NEW.idEmpleado IS NOT NULL
+    ON CONFLICT (idProyecto, idEmpleado) DO UPDATE SET
+        horas = horas + excluded.horas,
+        costo = costo + excluded.costo,
+        cantidad = cantidad + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_empleados_salario_costo AFTER UPDATE OF salario ON empleados
+WHEN IFNULL(OLD.salario, -1) <> IFNULL(NEW.salario, -1)
+BEGIN
+    UPDATE costo_proyecto_empleado
+    SET costo = horas * IFNULL(NEW.salario, 0) / 180
+    WHERE idEmpleado = NEW.idEmpleado;
+END;
+"""
+
+
+# Columnas agregadas después de la primera versión del esquema (tabla, columna, tipo).
+# En un archivo ya creado, CREATE TABLE IF NOT EXISTS no las agrega.
+COLUMNAS_AGREGADAS_SQLITE = (
+    ('registros', 'claveIdempotencia', 'VARCHAR(36)'),  # PASO 6
+)
+
+
+def crear_esquema_sqlite(ruta: str):
+    """Crea (si no existen) las tablas, índices y triggers en el archivo SQLite."""
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+
+    conn = sqlite3.connect(ruta)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        for tabla, columna, tipo in COLUMNAS_AGREGADAS_SQLITE:
+            columnas = {fila[1].lower() for fila in conn.execute(f"PRAGMA table_info({tabla})")}
+            if columnas and columna.lower() not in columnas:
+                conn.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}")
+        conn.executescript(ESQUEMA_SQLITE)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class AlmacenamientoSQLite(Almacenamiento):
+    nombre = "sqlite"
+    soporta_rollup = False
+
+    def __init__(self, ruta: str = None):
+        import motor_sqlite
+        super().__init__(motor_sqlite)
+        self.ruta = ruta or os.getenv('DB_SQLITE_RUTA', RUTA_SQLITE)
+
+    def crear_pool(self, usuario, clave, dsn, minimo, maximo, incremento):
+        # DB_USER / DB_PASSWORD / DB_DSN son del servidor Oracle: aquí no se usan
+        try:
+            crear_esquema_sqlite(self.ruta)
+        except (sqlite3.Error, OSError) as e:
+            raise self.driver.DatabaseError(self.driver._Error(20000, f"No se pudo abrir {self.ruta}: {e}")) from None
+        return self.driver.create_pool(dsn=self.ruta, min=minimo, max=maximo, increment=incremento)
+
+    def eliminar_proyecto(self, cursor, id_proyecto):
+        cursor.execute("DELETE FROM registros WHERE idProyecto = :1", (id_proyecto,))
+        cursor.execute("DELETE FROM proyecto_empleados WHERE idProyecto = :1", (id_proyecto,))
+        cursor.execute("DELETE FROM proyectos WHERE idProyecto = :1", (id_proyecto,))
+        eliminados = cursor.rowcount
+        cursor.connection.commit()
+        return eliminados
+
+    def eliminar_proyectos(self, cursor, ids):
+        marcas = ", ".join(f":{i}" for i in range(1, len(ids) + 1))
+        cursor.execute(f"DELETE FROM registros WHERE idProyecto IN ({marcas})", ids)
+        cursor.execute(f"DELETE FROM proyecto_empleados WHERE idProyecto IN ({marcas})", ids)
+        cursor.execute(f"DELETE FROM proyectos WHERE idProyecto IN ({marcas}) RETURNING idProyecto", ids)
+        eliminados = [int(fila[0]) for fila in cursor.fetchall()]
+        cursor.connection.commit()
+        return eliminados
+
+    def crear_tabla_versiones(self, cursor):
+        pass  # Es parte de ESQUEMA_SQLITE: crear_pool ya la creó
+
+    def bloquear_versiones(self, cursor):
+        # Cualquier escritura toma el lock de escritura del archivo hasta el commit
+        cursor.execute("UPDATE schema_version SET version = version WHERE 1 = 0")
+
+    def dias_desde_epoch(self, columna: str) -> str:
+        # Las fechas son texto: julianday las convierte (2440587.5 = 1970-01-01)
+        return f"(julianday({columna}) - 2440587.5)"
+
+    def descripcion(self):
+        return f"SQLite ({self.ruta})"
+
+
+def crear_almacenamiento(nombre: str = None):
+    """
+    Retorna el Almacenamiento indicado (por defecto, el de DB_BACKEND).
+
+    Raises:
+        ValueError: si el backend no existe
+    """
+    nombre = (nombre or os.getenv('DB_BACKEND', 'oracle')).strip().lower()
+    if nombre == 'oracle':
+        return AlmacenamientoOracle()
+    if nombre == 'sqlite':
+        return AlmacenamientoSQLite()
+    raise ValueError(f"DB_BACKEND desconocido: {nombre} (opciones: {', '.join(BACKENDS)})")
@@ -1,7 +1,30 @@
 import json
+import os
+import threading
+import time
 import requests
 from datetime import datetime
 
+URL_API = "https://mindicador.cl/api"
+
+# Los valores de los indicadores cambian una vez al día, así que se cachean.
+# INDICADORES_TTL: segundos que se considera vigente la última respuesta
+# INDICADORES_TIMEOUT: segundos máximos de espera por la API
+# INDICADORES_CACHE: archivo donde se persiste la última respuesta
+CACHE_TTL = int(os.getenv('INDICADORES_TTL', str(6 * 3600)))
+TIMEOUT_API = float(os.getenv('INDICADORES_TIMEOUT', '10'))
+RUTA_CACHE = os.getenv(
+    'INDICADORES_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indicadores_cache.json')
+)
+
+# Estado del caché: respuesta cruda de la API, momento en que se obtuvo
+# y cabeceras para la consulta condicional (ETag / Last-Modified)
+_cache = {'datos': None, 'obtenido': 0.0, 'etag': None, 'modificado': None}
+_cache_cargado = False
+_cache_lock = threading.Lock()
+
+
 class Mindicador:
     def __init__(self, indicador_data):
         self.codigo = indicador_data.get("codigo")
@@ -11,19 +34,108 @@ class Mindicador:
         self.valor = indicador_data.get("valor")
 
 
-def obtener_indicadores():
-    url = "https://mindicador.cl/api"
+def _parsear_indicadores(data):
+    indicadores = {}
+    for key, value in data.items():
+        if isinstance(value, dict) and "codigo" in value:
+            indicadores[key] = Mindicador(value)
+    return indicadores
+
+
+def _cargar_snapshot():
+    """Carga (una sola vez) la última respuesta guardada en disco."""
+    global _cache_cargado
+    if _cache_cargado:
+        return
+    _cache_cargado = True
+
+    try:
+        with open(RUTA_CACHE, encoding='utf-8') as archivo:
+            snapshot = json.load(archivo)
+        _cache.update({
+            'datos': snapshot['datos'],
+            'obtenido': snapshot['obtenido'],
+            'etag': snapshot.get('etag'),
+            'modificado': snapshot.get('modificado')
+        })
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        print(f"No se pudo leer el caché de indicadores: {e}")
+
+
+def _guardar_snapshot():
+    """Guarda la respuesta actual en disco (escritura atómica)."""
+    temporal = RUTA_CACHE + ".tmp"
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Lanza un error si la respuesta no es 200
-        data = json.loads(response.text.encode('utf-8'))
-        
-        indicadores = {}
-        for key, value in data.items():
-            if isinstance(value, dict) and "codigo" in value:
-                indicadores[key] = Mindicador(value)
-        
-        return indicadores
-    except requests.RequestException as e:
-        print(f"Error al obtener los indicadores: {e}")
-        return {}
\ No newline at end of file
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(_cache, archivo, ensure_ascii=False)
+        os.replace(temporal, RUTA_CACHE)
+    except OSError as e:
+        print(f"No se pudo guardar el caché de indicadores: {e}")
+
+
+def obtener_indicadores(forzar: bool = False):
+    """
+    Retorna un diccionario {codigo: Mindicador}.
+
+    Si la última respuesta (en memoria o en disco) tiene menos de CACHE_TTL
+    segundos se usa sin ir a la red. Si venció, o si forzar=True, se consulta
+    la API de forma condicional: un 304 renueva el caché sin volver a descargarlo.
+    Si la API falla se retorna el último valor conocido (o {} si no hay).
+    """
+    with _cache_lock:
+        _cargar_snapshot()
+
+        vigente = _cache['datos'] is not None and time.time() - _cache['obtenido'] < CACHE_TTL
+        if vigente and not forzar:
+            return _parsear_indicadores(_cache['datos'])
+
+        cabeceras = {}
+        if _cache['datos'] is not None:
+            if _cache['etag']:
+                cabeceras['If-None-Match'] = _cache['etag']
+            if _cache['modificado']:
+                cabeceras['If-Modified-Since'] = _cache['modificado']
+
+        try:
+            response = requests.get(URL_API, headers=cabeceras, timeout=TIMEOUT_API)
+
+            if response.status_code == 304:
+                # Sin cambios desde la última consulta
+                _cache['obtenido'] = time.time()
+                _guardar_snapshot()
+                return _parsear_indicadores(_cache['datos'])
+
+            response.raise_for_status()  # Lanza un error si la respuesta no es 200
+            data = json.loads(response.text.encode('utf-8'))
+
+            _cache.update({
+                'datos': data,
+                'obtenido': time.time(),
+                'etag': response.headers.get('ETag'),
+                'modificado': response.headers.get('Last-Modified')
+            })
+            _guardar_snapshot()
+
+            return _parsear_indicadores(data)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error al obtener los indicadores: {e}")
+            if _cache['datos'] is not None:
+                print("Se usarán los últimos indicadores guardados.")
+                return _parsear_indicadores(_cache['datos'])
+            return {}
+
+
+def refrescar_indicadores():
+    """Ignora el TTL y vuelve a consultar la API."""
+    return obtener_indicadores(forzar=True)
+
+
+def fecha_actualizacion_indicadores():
+    """Retorna el datetime de la última respuesta de la API, o None si no hay."""
+    with _cache_lock:
+        _cargar_snapshot()
+        if _cache['datos'] is None:
+            return None
+        return datetime.fromtimestamp(_cache['obtenido'])
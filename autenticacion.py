@@ -0,0 +1,278 @@
+"""
+Servicio de autenticación de administradores.
+
+iniciar_sesion() trae en una sola consulta el admin completo y el hash de
+su clave (db_buscar_admin_para_login) y verifica la clave con bcrypt en un
+pool propio de pocos hilos:
+
+- bcrypt libera el GIL mientras calcula, así que la verificación no frena
+  al resto de la aplicación; el pool acota cuántas corren a la vez y cuántas
+  pueden esperar turno (AUTH_HILOS, AUTH_MAX_PENDIENTES). Si se llena, el
+  intento se rechaza sin calcular nada.
+- Tras AUTH_MAX_FALLOS claves erradas seguidas para un mismo usuario (dentro
+  de AUTH_VENTANA_SEG), ese usuario queda bloqueado AUTH_BLOQUEO_SEG
+  segundos, y el bloqueo se duplica con cada fallo posterior hasta
+  AUTH_BLOQUEO_MAX_SEG. Mientras dura el bloqueo no se ejecuta bcrypt.
+- Si el hash guardado tiene un costo distinto de BCRYPT_COSTO, al iniciar
+  sesión se vuelve a calcular con el costo actual: subir o bajar el costo
+  se aplica a cada admin en su siguiente login, sin migrar claves.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+import database as dbFunciones
+
+HILOS = int(os.getenv('AUTH_HILOS', '2'))
+MAX_PENDIENTES = int(os.getenv('AUTH_MAX_PENDIENTES', '8'))  # Verificaciones en curso + en espera
+MAX_FALLOS = int(os.getenv('AUTH_MAX_FALLOS', '5'))
+VENTANA_SEG = float(os.getenv('AUTH_VENTANA_SEG', '300'))
+BLOQUEO_SEG = float(os.getenv('AUTH_BLOQUEO_SEG', '30'))
+BLOQUEO_MAX_SEG = float(os.getenv('AUTH_BLOQUEO_MAX_SEG', '900'))
+
+MENSAJE_CREDENCIALES = "Credenciales incorrectas"
+MENSAJE_OCUPADO = "Demasiados intentos en curso, intente nuevamente"
+
+
+class ServicioOcupado(Exception):
+    """El pool de bcrypt tiene AUTH_MAX_PENDIENTES verificaciones pendientes."""
+
+
+class LimitadorIntentos:
+    """
+    Cuenta los fallos seguidos de cada usuario y calcula su bloqueo.
+    Un acierto o una ventana sin fallos reinicia la cuenta.
+    """
+
+    def __init__(self, max_fallos: int, ventana_seg: float, bloqueo_seg: float,
+                 bloqueo_max_seg: float, reloj=time.monotonic):
+        self.max_fallos = max_fallos
+        self.ventana_seg = ventana_seg
+        self.bloqueo_seg = bloqueo_seg
+        self.bloqueo_max_seg = bloqueo_max_seg
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self._usuarios = {}  # usuario -> {'fallos', 'ultimo', 'hasta'}
+
+    def segundos_bloqueado(self, usuario: str) -> float:
+        """Segundos que faltan para que el usuario pueda volver a intentar (0 si puede)."""
+        with self._lock:
+            estado = self._usuarios.get(usuario)
+            if estado is None:
+                return 0.0
+            return max(0.0, estado['hasta'] - self._reloj())
+
+    def registrar_fallo(self, usuario: str):
+        ahora = self._reloj()
+        with self._lock:
+            self._purgar(ahora)
+            estado = self._usuarios.setdefault(usuario, {'fallos': 0, 'ultimo': ahora, 'hasta': 0.0})
+            estado['fallos'] += 1
+            estado['ultimo'] = ahora
+            exceso = estado['fallos'] - self.max_fallos
+            if exceso >= 0:
+                bloqueo = min(self.bloqueo_seg * 2 ** min(exceso, 32), self.bloqueo_max_seg)
+                estado['hasta'] = ahora + bloqueo
+
+    def registrar_exito(self, usuario: str):
+        with self._lock:
+            self._usuarios.pop(usuario, None)
+
+    def bloqueados(self) -> int:
+        ahora = self._reloj()
+        with self._lock:
+            return sum(1 for estado in self._usuarios.values() if estado['hasta'] > ahora)
+
+    def _purgar(self, ahora: float):
+        """Olvida a los usuarios sin fallos recientes ni bloqueo vigente (llamar con _lock tomado)."""
+        vencidos = [usuario for usuario, estado in self._usuarios.items()
+                    if estado['hasta'] <= ahora and ahora - estado['ultimo'] > self.ventana_seg]
+        for usuario in vencidos:
+            del self._usuarios[usuario]
+
+
+_limitador = LimitadorIntentos(MAX_FALLOS, VENTANA_SEG, BLOQUEO_SEG, BLOQUEO_MAX_SEG)
+_pool_bcrypt = ThreadPoolExecutor(max_workers=HILOS, thread_name_prefix="bcrypt")
+_cupos = threading.BoundedSemaphore(MAX_PENDIENTES)
+_lock_estado = threading.Lock()
+_estado = {'verificaciones': 0, 'fallidas': 0, 'bloqueadas': 0, 'rechazadas_ocupado': 0, 'rehash': 0}
+_hash_ficticio = None
+_lock_hash_ficticio = threading.Lock()
+
+
+def _contar(clave: str):
+    with _lock_estado:
+        _estado[clave] += 1
+
+
+def _en_pool_bcrypt(funcion, *args):
+    """Ejecuta funcion en el pool de bcrypt y espera su resultado."""
+    if not _cupos.acquire(blocking=False):
+        _contar('rechazadas_ocupado')
+        raise ServicioOcupado()
+    try:
+        return _pool_bcrypt.submit(funcion, *args).result()
+    finally:
+        _cupos.release()
+
+
+def verificar_clave(clave_plana: str, clave_hash: str) -> bool:
+    """bcrypt.checkpw en el pool acotado. Lanza ServicioOcupado si está lleno."""
+    _contar('verificaciones')
+    return _en_pool_bcrypt(bcrypt.checkpw, clave_plana.encode('utf-8'), clave_hash.encode('utf-8'))
+
+
+def generar_hash(clave_plana: str) -> str:
+    """Hash con el costo BCRYPT_COSTO, calculado en el pool acotado."""
+    return _en_pool_bcrypt(dbFunciones.generar_hash_clave, clave_plana)
+
+
+def costo_hash(clave_hash: str):
+    """Costo de un hash bcrypt ('$2b$12$...' -> 12), o None si no tiene ese formato."""
+    partes = clave_hash.split('$')
+    if len(partes) < 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+def necesita_rehash(clave_hash: str) -> bool:
+    return costo_hash(clave_hash) != dbFunciones.BCRYPT_COSTO
+
+
+def _hash_para_usuario_inexistente():
+    """
+    Hash contra el que se verifica cuando el usuario no existe: la respuesta
+    tarda lo mismo que con un usuario real y no delata qué usuarios existen.
+
+    Se calcula una sola vez, en el pool de bcrypt y con el lock tomado: los
+    logins concurrentes esperan ese hash en vez de calcular uno cada uno.
+    Lanza ServicioOcupado si el pool está lleno.
+    """
+    global _hash_ficticio
+    with _lock_hash_ficticio:
+        if _hash_ficticio is None or necesita_rehash(_hash_ficticio):
+            _hash_ficticio = generar_hash(os.urandom(16).hex())
+        return _hash_ficticio
+
+
+def _mensaje_bloqueo(usuario: str):
+    """Mensaje para mostrar si el usuario está bloqueado, o None."""
+    espera = _limitador.segundos_bloqueado(usuario.strip().lower())
+    if espera <= 0:
+        return None
+    _contar('bloqueadas')
+    return f"Demasiados intentos fallidos. Intente en {math.ceil(espera)} s"
+
+
+def _verificar_con_limite(usuario: str, clave_plana: str, admin):
+    """
+    Verifica la clave de admin (o contra el hash ficticio si admin es None)
+    respetando el bloqueo del usuario.
+
+    Returns:
+        None si la clave es correcta, o str con el mensaje para mostrar
+    """
+    bloqueo = _mensaje_bloqueo(usuario)
+    if bloqueo:
+        return bloqueo
+
+    clave_limite = usuario.strip().lower()
+    try:
+        clave_hash = admin.clave_hash if admin is not None else _hash_para_usuario_inexistente()
+        correcta = verificar_clave(clave_plana, clave_hash)
+    except ServicioOcupado:
+        return MENSAJE_OCUPADO
+
+    if admin is None or not correcta:
+        _contar('fallidas')
+        _limitador.registrar_fallo(clave_limite)
+        return MENSAJE_CREDENCIALES
+
+    _limitador.registrar_exito(clave_limite)
+    return None
+
+
+def _rehacer_hash(admin, clave_plana: str):
+    """Guarda la clave con el costo actual. Si falla, el login sigue válido."""
+    try:
+        nuevo_hash = generar_hash(clave_plana)
+    except ServicioOcupado:
+        return  # Se reintenta en el próximo login
+    if dbFunciones.db_actualizar_clave_admin(admin.idAdmin, admin.clave_hash, nuevo_hash) is True:
+        admin.clave_hash = nuevo_hash
+        _contar('rehash')
+
+
+def iniciar_sesion(usuario: str, clave_plana: str):
+    """
+    Autentica a un administrador.
+
+    Returns:
+        (Administrador, None) si las credenciales son correctas
+        (None, str) con el mensaje para mostrar si no
+    """
+    # Bloqueado: no se consulta la BD ni se calcula bcrypt
+    bloqueo = _mensaje_bloqueo(usuario)
+    if bloqueo:
+        return None, bloqueo
+
+    admin = dbFunciones.db_buscar_admin_para_login(usuario)
+    if isinstance(admin, str):
+        return None, admin
+
+    error = _verificar_con_limite(usuario, clave_plana, admin)
+    if error:
+        return None, error
+
+    if necesita_rehash(admin.clave_hash):
+        _rehacer_hash(admin, clave_plana)
+    return admin, None
+
+
+def cambiar_clave(usuario: str, clave_actual: str, clave_nueva: str):
+    """
+    Cambia la contraseña de un administrador tras verificar la actual, con
+    el mismo límite de intentos que el login.
+
+    Returns:
+        True si el cambio fue exitoso
+        str con mensaje de error si falla
+    """
+    admin = dbFunciones.db_buscar_admin_para_login(usuario)
+    if isinstance(admin, str):
+        return admin
+    if admin is None:
+        return "Usuario no encontrado"
+
+    error = _verificar_con_limite(usuario, clave_actual, admin)
+    if error == MENSAJE_CREDENCIALES:
+        return "La contraseña actual es incorrecta"
+    if error:
+        return error
+
+    try:
+        nuevo_hash = generar_hash(clave_nueva)
+    except ServicioOcupado:
+        return MENSAJE_OCUPADO
+
+    actualizado = dbFunciones.db_actualizar_clave_admin(admin.idAdmin, admin.clave_hash, nuevo_hash)
+    if actualizado is False:
+        return "La contraseña cambió mientras se verificaba, intente nuevamente"
+    return actualizado
+
+
+def estado_autenticacion():
+    """
+    Returns:
+        dict con: 'verificaciones' (bcrypt ejecutados), 'fallidas', 'bloqueadas'
+        (intentos rechazados por bloqueo), 'rechazadas_ocupado', 'rehash' y
+        'usuarios_bloqueados' (ahora)
+    """
+    with _lock_estado:
+        estado = dict(_estado)
+    estado['usuarios_bloqueados'] = _limitador.bloqueados()
+    return estado
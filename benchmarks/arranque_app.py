@@ -0,0 +1,144 @@
+"""
+Tiempo hasta la primera ventana de APP.py.
+
+Cada medición corre en un proceso nuevo que importa APP con Tk.mainloop
+reemplazado: al llegar a mainloop se dibuja la ventana (update), se anota
+el tiempo desde el inicio del import y se cierra la aplicación. También se
+anota qué módulos pesados ya estaban cargados en ese momento.
+
+Modos:
+    diferido  el arranque actual (módulos, frames y migraciones diferidos)
+    ansioso   reproduce el arranque anterior: importa database y api_indicador
+              antes que APP, construye todos los frames y aplica las
+              migraciones antes de mostrar la ventana
+
+La base es un SQLite temporal (DB_BACKEND=sqlite): el arranque no depende de
+la red. Requiere una pantalla (DISPLAY; en un servidor, por ejemplo xvfb-run).
+
+Uso:
+    python benchmarks/arranque_app.py                      # ambos modos
+    python benchmarks/arranque_app.py --modo diferido --repeticiones 30
+    python benchmarks/arranque_app.py --json arranque.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.join(DIRECTORIO, '..')
+sys.path.insert(0, RAIZ)
+
+MODOS = ('diferido', 'ansioso')
+MODULOS_PESADOS = ('database', 'oracledb', 'bcrypt', 'dotenv', 'api_indicador', 'requests')
+
+
+def medir_en_este_proceso(modo: str):
+    """Corre en el proceso hijo: importa APP y retorna el resultado de la medición."""
+    inicio = time.perf_counter()
+    import tkinter as tk
+    from carga_diferida import FrameDiferido
+
+    resultado = {}
+
+    def mainloop(ventana, n=0):
+        app = sys.modules['APP']
+        if modo == 'ansioso':
+            for valor in list(vars(app).values()):
+                if isinstance(valor, FrameDiferido):
+                    valor.obtener()
+            app.migraciones.aplicar_migraciones()
+            app.cola_registros.iniciar_sincronizador()
+        ventana.update()
+        resultado['ventana_s'] = time.perf_counter() - inicio
+        resultado['modulos'] = [m for m in MODULOS_PESADOS if m in sys.modules]
+        app.cerrar_aplicacion()
+
+    tk.Tk.mainloop = mainloop
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if modo == 'ansioso':
+                import database, api_indicador  # noqa: F401
+            import APP  # noqa: F401
+    except tk.TclError as e:
+        return {'error': f"No se pudo abrir la ventana: {e}"}
+    return resultado
+
+
+def medir(modo: str, entorno: dict):
+    """Lanza un proceso hijo y retorna su resultado."""
+    proceso = subprocess.run([sys.executable, os.path.abspath(__file__), '--hijo', modo],
+                             cwd=RAIZ, env=entorno, capture_output=True, text=True, timeout=120)
+    lineas = proceso.stdout.strip().splitlines()
+    if proceso.returncode != 0 or not lineas:
+        return {'error': proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else "sin salida"}
+    return json.loads(lineas[-1])
+
+
+def resumir(tiempos: list):
+    return {
+        'mediana_ms': statistics.median(tiempos) * 1000,
+        'p95_ms': sorted(tiempos)[max(0, int(len(tiempos) * 0.95) - 1)] * 1000,
+        'min_ms': min(tiempos) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo hasta la primera ventana de APP.py.")
+    parser.add_argument('--modo', choices=MODOS + ('ambos',), default='ambos')
+    parser.add_argument('--repeticiones', type=int, default=10)
+    parser.add_argument('--calentamiento', type=int, default=1,
+                        help="ejecuciones previas descartadas por modo (caché de .pyc, migraciones)")
+    parser.add_argument('--json', help="guardar también los resultados en este archivo")
+    parser.add_argument('--hijo', choices=MODOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo:
+        print(json.dumps(medir_en_este_proceso(args.hijo)))
+        return
+
+    import almacenamiento
+
+    directorio = tempfile.mkdtemp(prefix="bench_arranque_")
+    ruta_bd = os.path.join(directorio, 'empresa.sqlite')
+    almacenamiento.crear_esquema_sqlite(ruta_bd)
+    entorno = dict(os.environ, DB_BACKEND='sqlite', DB_SQLITE_RUTA=ruta_bd,
+                   COLA_REGISTROS_RUTA=os.path.join(directorio, 'cola.sqlite'))
+    entorno.pop('DB_METRICAS_ARCHIVO', None)
+
+    modos = MODOS if args.modo == 'ambos' else (args.modo,)
+    resultados = {}
+    for modo in modos:
+        tiempos, modulos = [], []
+        for i in range(args.calentamiento + args.repeticiones):
+            medicion = medir(modo, entorno)
+            if 'error' in medicion:
+                print(f"{modo}: {medicion['error']}")
+                sys.exit(2)
+            if i >= args.calentamiento:
+                tiempos.append(medicion['ventana_s'])
+                modulos = medicion['modulos']
+        resultados[modo] = {**resumir(tiempos), 'modulos_cargados': modulos}
+        print(f"  {modo:<10} mediana {resultados[modo]['mediana_ms']:9.1f} ms   "
+              f"p95 {resultados[modo]['p95_ms']:9.1f} ms   "
+              f"cargados: {', '.join(modulos) or '-'}")
+
+    if len(resultados) == 2:
+        ahorro = resultados['ansioso']['mediana_ms'] - resultados['diferido']['mediana_ms']
+        print(f"\nLa ventana aparece {ahorro:.1f} ms antes con el arranque diferido "
+              f"({ahorro / resultados['ansioso']['mediana_ms']:.0%}).")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump({'repeticiones': args.repeticiones, 'resultados': resultados},
+                      archivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Horas por proyecto y estadísticas de indicadores: filas vs columnas.
+
+Siembra la empresa sintética de suite_bd.py en un SQLite temporal (por
+defecto 1.000.000 de registros) y compara, para las mismas consultas:
+
+    filas   el estilo de las funciones db_*: un dict por fila y la suma en Python
+    array   columnar.py con array.array (sin NumPy)
+    numpy   columnar.py con NumPy (si está instalado)
+
+Se mide el tiempo (mediana) y el pico de memoria con tracemalloc.
+
+Uso:
+    python benchmarks/columnar_bd.py
+    python benchmarks/columnar_bd.py --registros 5000000 --repeticiones 3 --json columnar.json
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DIRECTORIO, '..'))
+sys.path.insert(0, DIRECTORIO)
+
+from suite_bd import sembrar
+
+INDICADOR = "Dólar observado"
+
+
+def horas_con_filas(db):
+    """Lo que haría una función db_*: lista de dicts y acumulación por proyecto."""
+    with db.sesion() as cursor:
+        cursor.execute("SELECT idProyecto, horasTrabajadas FROM registros WHERE idProyecto IS NOT NULL")
+        filas = [{'idProyecto': fila[0], 'horas': fila[1]} for fila in cursor.fetchall()]
+    horas = {}
+    for fila in filas:
+        horas[fila['idProyecto']] = horas.get(fila['idProyecto'], 0.0) + fila['horas']
+    return horas
+
+
+def indicador_con_filas(db):
+    with db.sesion() as cursor:
+        cursor.execute("SELECT fecha_valor, valor_indicador FROM indicadores_registrados "
+                       "WHERE nombre_indicador = :1 ORDER BY fecha_valor", (INDICADOR,))
+        filas = [{'fecha': fila[0], 'valor': fila[1]} for fila in cursor.fetchall()]
+    valores = [fila['valor'] for fila in filas]
+    return {'n': len(valores), 'promedio': sum(valores) / len(valores)}
+
+
+def medir(funcion, repeticiones: int):
+    """Retorna (mediana en ms, pico de memoria en MB)."""
+    gc.collect()
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000, pico / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregaciones con filas vs columnas (columnar.py) sobre SQLite.")
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    parser.add_argument('--indicadores', type=int, default=200_000)
+    parser.add_argument('--empleados', type=int, default=2000)
+    parser.add_argument('--proyectos', type=int, default=200)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--json', help="guardar también los resultados en este archivo")
+    args = parser.parse_args()
+    args.departamentos, args.equipo = 20, 8
+
+    directorio = tempfile.mkdtemp(prefix="bench_columnar_")
+    ruta = os.path.join(directorio, "empresa.sqlite")
+    print(f"Sembrando {args.registros} registros y {args.indicadores} indicadores...")
+    sembrar(ruta, args)
+
+    os.environ['DB_BACKEND'] = 'sqlite'
+    os.environ['DB_SQLITE_RUTA'] = ruta
+    os.environ.setdefault('DB_INSTRUMENTACION', '0')
+    import database as db
+    import columnar
+
+    variantes = {
+        'horas_por_proyecto': {
+            'filas': lambda: horas_con_filas(db),
+            'array': lambda: columnar.horas_por_proyecto(usar_numpy=False),
+            'numpy': lambda: columnar.horas_por_proyecto(usar_numpy=True),
+        },
+        'estadisticas_indicador': {
+            'filas': lambda: indicador_con_filas(db),
+            'array': lambda: columnar.estadisticas_indicador(INDICADOR, usar_numpy=False),
+            'numpy': lambda: columnar.estadisticas_indicador(INDICADOR, usar_numpy=True),
+        },
+    }
+    if not columnar.numpy_disponible():
+        print("NumPy no está instalado: se omite la variante numpy.")
+
+    resultados = {}
+    for consulta, funciones in variantes.items():
+        print(f"\n{consulta}")
+        resultados[consulta] = {}
+        for variante, funcion in funciones.items():
+            if variante == 'numpy' and not columnar.numpy_disponible():
+                continue
+            mediana_ms, pico_mb = medir(funcion, args.repeticiones)
+            resultados[consulta][variante] = {'mediana_ms': mediana_ms, 'pico_mb': pico_mb}
+            print(f"  {variante:<6} mediana {mediana_ms:9.1f} ms   pico {pico_mb:8.1f} MB")
+    db.cerrar_pool()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump({'registros': args.registros, 'indicadores': args.indicadores, 'resultados': resultados},
+                      archivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
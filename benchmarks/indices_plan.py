@@ -0,0 +1,262 @@
+"""
+Benchmark de los índices del PASO 4 de "ADMIN CONEXION BASE.sql".
+
+Siembra datos de prueba (por defecto 1.000.000 de registros de horas y
+1.000.000 de indicadores), y para cada consulta frecuente muestra el plan
+de ejecución (EXPLAIN PLAN + DBMS_XPLAN) y el tiempo promedio, primero sin
+los índices y luego con ellos.
+
+¡Ejecutar solo en un esquema de pruebas! Borra y vuelve a crear los índices.
+
+Uso:
+    python benchmarks/indices_plan.py --sembrar 1000000
+    python benchmarks/indices_plan.py                  # usa los datos ya sembrados
+    python benchmarks/indices_plan.py --limpiar        # borra los datos sembrados
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import oracledb
+import database as dbFunciones
+
+RUTA_SCRIPT_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', "ADMIN CONEXION BASE.sql")
+
+
+def leer_indices(ruta: str = RUTA_SCRIPT_SQL):
+    """Los (nombre, definición) de las llamadas crear_indice del PASO 4 del script SQL."""
+    with open(ruta, encoding='utf-8') as archivo:
+        return re.findall(r"crear_indice\('(\w+)',\s*'([^']+)'\)", archivo.read())
+
+
+# Se leen del script para que el benchmark mida siempre los mismos índices que se instalan
+INDICES = leer_indices()
+
+TABLAS = ['registros', 'empleados', 'usuarios', 'departamentos', 'proyectos',
+          'proyecto_empleados', 'administradores', 'indicadores_registrados']
+
+# Marcas para reconocer (y poder borrar) los datos sembrados
+MARCA = 'BENCH'
+RUT_BASE = 900000000
+
+N_DEPARTAMENTOS = 100
+N_EMPLEADOS = 10000
+N_PROYECTOS = 1000
+
+# (nombre, sentencia, binds). Las sentencias DML solo se explican, no se ejecutan.
+CONSULTAS = [
+    ("Horas de un empleado",
+     "SELECT COUNT(*), SUM(horasTrabajadas) FROM registros WHERE idEmpleado = :id_emp", 'id_emp'),
+    ("Horas por empleado en un mes (reporte_horas)",
+     """SELECT idEmpleado, SUM(horasTrabajadas), COUNT(*) FROM registros
+        WHERE fechaRegistro >= DATE '2024-03-01' AND fechaRegistro < DATE '2024-04-01'
+        GROUP BY idEmpleado""", None),
+    ("Borrar registros de un proyecto (db_eliminar_proyecto)",
+     "DELETE FROM registros WHERE idProyecto = :id_proy", 'id_proy'),
+    ("Empleados de un departamento",
+     """SELECT e.idEmpleado, u.nombre FROM empleados e JOIN usuarios u ON e.idUsuario = u.idUsuario
+        WHERE e.idDepartamento = :id_depto""", 'id_depto'),
+    ("Empleado por RUT",
+     "SELECT idEmpleado FROM empleados WHERE idUsuario = :rut", 'rut'),
+    ("Admin por empleado",
+     "SELECT idAdmin FROM administradores WHERE idEmpleado = :id_emp", 'id_emp'),
+    ("Equipo de un proyecto",
+     "SELECT idEmpleado FROM proyecto_empleados WHERE idProyecto = :id_proy", 'id_proy'),
+    ("Último valor de un indicador",
+     """SELECT valor_indicador, fecha_valor, fecha_consulta FROM indicadores_registrados
+        WHERE nombre_indicador = :indicador ORDER BY fecha_consulta DESC FETCH FIRST 1 ROWS ONLY""", 'indicador'),
+    ("Historial de indicadores (100 más recientes)",
+     """SELECT i.idIndicadorRegistro, i.nombre_indicador, i.valor_indicador FROM indicadores_registrados i
+        ORDER BY i.fecha_consulta DESC, i.idIndicadorRegistro DESC FETCH FIRST 100 ROWS ONLY""", None),
+]
+
+
+def sembrar(cursor, n_filas: int):
+    """Genera los datos en el servidor con INSERT ... SELECT ... CONNECT BY."""
+    print(f"Sembrando {N_DEPARTAMENTOS} departamentos, {N_EMPLEADOS} empleados, {N_PROYECTOS} proyectos...")
+    cursor.execute(f"""
+        INSERT INTO departamentos (nombre)
+        SELECT '{MARCA} ' || LEVEL FROM dual CONNECT BY LEVEL <= {N_DEPARTAMENTOS}
+    """)
+    cursor.execute(f"""
+        INSERT INTO usuarios (idUsuario, nombre, direccion, telefono, correo)
+        SELECT {RUT_BASE} + LEVEL, '{MARCA} ' || LEVEL, 'Calle ' || LEVEL,
+               'B' || LEVEL, 'bench' || LEVEL || '@bench.cl'
+        FROM dual CONNECT BY LEVEL <= {N_EMPLEADOS}
+    """)
+    cursor.execute(f"""
+        INSERT INTO empleados (fechaInicioContrato, salario, idUsuario, idDepartamento)
+        SELECT DATE '2020-01-01' + MOD(u.n, 1500), 500000 + MOD(u.n, 50) * 20000, u.idUsuario, d.idDepartamento
+        FROM (SELECT idUsuario, idUsuario - {RUT_BASE} AS n FROM usuarios
+              WHERE idUsuario > {RUT_BASE}) u
+        JOIN (SELECT idDepartamento, ROW_NUMBER() OVER (ORDER BY idDepartamento) - 1 AS n
+              FROM departamentos WHERE nombre LIKE '{MARCA} %') d
+          ON MOD(u.n, {N_DEPARTAMENTOS}) = d.n
+    """)
+    cursor.execute(f"""
+        INSERT INTO proyectos (nombre, fechaInicioProyecto, descripcion)
+        SELECT '{MARCA} ' || LEVEL, DATE '2023-01-01' + LEVEL, 'Proyecto de prueba'
+        FROM dual CONNECT BY LEVEL <= {N_PROYECTOS}
+    """)
+    cursor.execute(f"""
+        INSERT INTO proyecto_empleados (idEmpleado, idProyecto)
+        SELECT e.idEmpleado, p.idProyecto
+        FROM (SELECT e.idEmpleado, ROW_NUMBER() OVER (ORDER BY e.idEmpleado) - 1 AS n
+              FROM empleados e WHERE e.idUsuario > {RUT_BASE}) e
+        JOIN (SELECT idProyecto, ROW_NUMBER() OVER (ORDER BY idProyecto) - 1 AS n
+              FROM proyectos WHERE nombre LIKE '{MARCA} %') p
+          ON MOD(e.n, {N_PROYECTOS}) = p.n
+    """)
+
+    print(f"Sembrando {n_filas} registros de horas...")
+    cursor.execute(f"""
+        INSERT /*+ APPEND */ INTO registros (fechaRegistro, horasTrabajadas, descripcionTrabajo, idEmpleado, idProyecto)
+        SELECT DATE '2024-01-01' + MOD(g.n, 730), 1 + MOD(g.n, 8), '{MARCA}', e.idEmpleado, p.idProyecto
+        FROM (SELECT LEVEL AS n FROM dual CONNECT BY LEVEL <= :n) g
+        JOIN (SELECT e.idEmpleado, ROW_NUMBER() OVER (ORDER BY e.idEmpleado) - 1 AS n
+              FROM empleados e WHERE e.idUsuario > {RUT_BASE}) e
+          ON MOD(g.n, {N_EMPLEADOS}) = e.n
+        JOIN (SELECT idProyecto, ROW_NUMBER() OVER (ORDER BY idProyecto) - 1 AS n
+              FROM proyectos WHERE nombre LIKE '{MARCA} %') p
+          ON MOD(g.n, {N_PROYECTOS}) = p.n
+    """, n=n_filas)
+    cursor.connection.commit()
+
+    print(f"Sembrando {n_filas} indicadores...")
+    cursor.execute("""
+        INSERT /*+ APPEND */ INTO indicadores_registrados
+            (nombre_indicador, valor_indicador, fecha_valor, fecha_consulta, sitio_proveedor)
+        SELECT 'BENCH ' || MOD(LEVEL, 12), 1000 + MOD(LEVEL, 997),
+               DATE '2020-01-01' + MOD(LEVEL, 2000), DATE '2020-01-01' + MOD(LEVEL, 2000), 'benchmark'
+        FROM dual CONNECT BY LEVEL <= :n
+    """, n=n_filas)
+    cursor.connection.commit()
+
+
+def limpiar(cursor):
+    print("Borrando los datos sembrados...")
+    cursor.execute(f"DELETE FROM registros WHERE descripcionTrabajo = '{MARCA}'")
+    cursor.execute("DELETE FROM indicadores_registrados WHERE sitio_proveedor = 'benchmark'")
+    cursor.execute(f"""DELETE FROM proyecto_empleados WHERE idProyecto IN
+                       (SELECT idProyecto FROM proyectos WHERE nombre LIKE '{MARCA} %')""")
+    cursor.execute(f"DELETE FROM proyectos WHERE nombre LIKE '{MARCA} %'")
+    cursor.execute(f"DELETE FROM empleados WHERE idUsuario > {RUT_BASE}")
+    cursor.execute(f"DELETE FROM usuarios WHERE idUsuario > {RUT_BASE}")
+    cursor.execute(f"DELETE FROM departamentos WHERE nombre LIKE '{MARCA} %'")
+    cursor.connection.commit()
+
+
+def recolectar_estadisticas(cursor):
+    for tabla in TABLAS:
+        cursor.callproc("DBMS_STATS.GATHER_TABLE_STATS", [None, tabla.upper()], {'cascade': True})
+
+
+def borrar_indices(cursor):
+    for nombre, _ in INDICES:
+        try:
+            cursor.execute(f"DROP INDEX {nombre}")
+        except oracledb.DatabaseError:
+            pass  # No existía
+
+
+def crear_indices(cursor):
+    for nombre, definicion in INDICES:
+        try:
+            cursor.execute(f"CREATE INDEX {nombre} ON {definicion}")
+        except oracledb.DatabaseError as e:
+            print(f"  {nombre}: {e}")
+
+
+def valores_de_prueba(cursor):
+    """Elige binds representativos dentro de los datos sembrados."""
+    cursor.execute(f"SELECT MIN(idEmpleado) FROM empleados WHERE idUsuario > {RUT_BASE}")
+    id_emp = cursor.fetchone()[0]
+    cursor.execute(f"SELECT MIN(idProyecto) FROM proyectos WHERE nombre LIKE '{MARCA} %'")
+    id_proy = cursor.fetchone()[0]
+    cursor.execute(f"SELECT MIN(idDepartamento) FROM departamentos WHERE nombre LIKE '{MARCA} %'")
+    id_depto = cursor.fetchone()[0]
+    return {'id_emp': id_emp, 'id_proy': id_proy, 'id_depto': id_depto,
+            'rut': RUT_BASE + N_EMPLEADOS // 2, 'indicador': 'BENCH 7'}
+
+
+def explicar(cursor, sql, binds, etiqueta):
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{etiqueta}' FOR {sql}", binds)
+    cursor.execute("SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY(NULL, :id, 'BASIC +COST +ROWS'))",
+                   id=etiqueta)
+    plan = [fila[0] for fila in cursor]
+    cursor.execute("DELETE FROM plan_table WHERE statement_id = :id", id=etiqueta)
+    return plan
+
+
+def cronometrar(cursor, sql, binds, repeticiones):
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        cursor.execute(sql, binds)
+        cursor.fetchall()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def medir(cursor, valores, fase, repeticiones):
+    resultados = {}
+    for nombre, sql, bind in CONSULTAS:
+        binds = {bind: valores[bind]} if bind else {}
+        plan = explicar(cursor, sql, binds, f"{fase}_{len(resultados)}")
+        ms = cronometrar(cursor, sql, binds, repeticiones)
+        resultados[nombre] = (plan, ms)
+
+        print(f"\n--- [{fase}] {nombre} ---")
+        for linea in plan:
+            print(linea)
+        if ms is not None:
+            print(f"Tiempo promedio: {ms:.2f} ms")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara planes de ejecución con y sin los índices del PASO 4.")
+    parser.add_argument('--sembrar', type=int, metavar='N', help="sembrar N registros de horas e indicadores")
+    parser.add_argument('--limpiar', action='store_true', help="borrar los datos sembrados y salir")
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        with dbFunciones.sesion() as cursor:
+            if args.limpiar:
+                limpiar(cursor)
+                return
+
+            if args.sembrar:
+                # Sin índices la carga es más rápida; se recrean en la segunda fase
+                borrar_indices(cursor)
+                sembrar(cursor, args.sembrar)
+
+            valores = valores_de_prueba(cursor)
+
+            borrar_indices(cursor)
+            recolectar_estadisticas(cursor)
+            antes = medir(cursor, valores, "sin_indices", args.repeticiones)
+
+            crear_indices(cursor)
+            recolectar_estadisticas(cursor)
+            despues = medir(cursor, valores, "con_indices", args.repeticiones)
+
+            print("\n| Consulta | Sin índices (ms) | Con índices (ms) |")
+            print("|---|---:|---:|")
+            for nombre, _, _ in CONSULTAS:
+                ms_antes, ms_despues = antes[nombre][1], despues[nombre][1]
+                if ms_antes is None:
+                    print(f"| {nombre} | (solo plan) | (solo plan) |")
+                else:
+                    print(f"| {nombre} | {ms_antes:.2f} | {ms_despues:.2f} |")
+    except dbFunciones.ErrorConexion:
+        sys.exit("No se pudo conectar a la base de datos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Memoria y tiempo de carga de los objetos del modelo.
+
+Arma --empleados objetos Empleado (100.000 por defecto) desde filas con la
+forma que entrega el cursor (idEmpleado, fechaInicioContrato, salario,
+nombre, direccion, telefono, correo) y los reúne en un Departamento, como
+db_buscar_departamento_por_id. Mide con tracemalloc los bytes que agregan
+los objetos (las filas se crean antes: sus strings no se cuentan) y el
+tiempo de construcción.
+
+Variantes:
+    con_dict     las clases anteriores, con un __dict__ por instancia
+    slots        Empleado(...) actual con __slots__, pasando por __init__
+    desde_fila   Empleado.desde_fila(fila), sin __init__ ni argumentos por nombre
+
+No usa la base de datos.
+
+Uso:
+    python benchmarks/memoria_modelos.py
+    python benchmarks/memoria_modelos.py --empleados 500000 --json memoria.json
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DIRECTORIO, '..'))
+
+from departamento import Departamento
+from empleado import Empleado
+
+
+# Las clases como eran antes de __slots__, para comparar
+class UsuarioConDict:
+    def __init__(self, nombre, direccion, telefono, correo, rut=None):
+        self.rut = rut
+        self.nombre = nombre
+        self.direccion = direccion
+        self.telefono = telefono
+        self.correo = correo
+
+
+class EmpleadoConDict(UsuarioConDict):
+    def __init__(self, nombre, direccion, telefono, correo, idEmpleado, fechaInicioContrato, salario,
+                 departamento=None, rut=None):
+        super().__init__(nombre, direccion, telefono, correo, rut=rut)
+        self.idEmpleado = idEmpleado
+        self.fechaInicioContrato = fechaInicioContrato
+        self.salario = salario
+        self.departamento = departamento
+
+
+class DepartamentoConDict:
+    def __init__(self, idDepartamento, nombre, gerente=None, empleados=None):
+        self.idDepartamento = idDepartamento
+        self.nombre = nombre
+        self.gerente = gerente
+        self._empleados = empleados
+        self._cargar_empleados = None
+
+
+def _por_nombre(clase):
+    def construir(fila):
+        idEmp, fecha, salario, nombre, direccion, telefono, correo = fila
+        return clase(nombre=nombre, direccion=direccion, telefono=telefono, correo=correo,
+                     idEmpleado=idEmp, fechaInicioContrato=fecha, salario=salario)
+    return construir
+
+
+VARIANTES = {
+    'con_dict': (_por_nombre(EmpleadoConDict), DepartamentoConDict),
+    'slots': (_por_nombre(Empleado), Departamento),
+    'desde_fila': (Empleado.desde_fila, Departamento),
+}
+
+
+def generar_filas(n: int):
+    """Filas como las del cursor; strings distintos por empleado, igual que desde la BD."""
+    return [(i, f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", 800_000.0 + i % 1000 * 1000,
+             f"Empleado {i}", f"Calle {i % 500} #{i}", f"9{i:08d}", f"empleado{i}@empresa.cl")
+            for i in range(1, n + 1)]
+
+
+def medir(variante: str, filas: list):
+    """Retorna (bytes asignados por los objetos, segundos de construcción)."""
+    construir, clase_depto = VARIANTES[variante]
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    depto = clase_depto(1, "Departamento bench", None, [construir(fila) for fila in filas])
+    segundos = time.perf_counter() - inicio
+    asignados = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    del depto
+    return asignados, segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria y tiempo de carga de los objetos del modelo.")
+    parser.add_argument('--empleados', type=int, default=100_000)
+    parser.add_argument('--repeticiones', type=int, default=5, help="mediciones de tiempo por variante")
+    parser.add_argument('--json', help="guardar también los resultados en este archivo")
+    args = parser.parse_args()
+
+    filas = generar_filas(args.empleados)
+    resultados = {}
+    for variante in VARIANTES:
+        asignados, _ = medir(variante, filas)
+        # tracemalloc hace más lenta la construcción: el tiempo se mide aparte
+        construir, clase_depto = VARIANTES[variante]
+        tiempos = []
+        for _ in range(args.repeticiones):
+            gc.collect()
+            inicio = time.perf_counter()
+            depto = clase_depto(1, "Departamento bench", None, [construir(fila) for fila in filas])
+            tiempos.append(time.perf_counter() - inicio)
+            del depto
+        resultados[variante] = {
+            'bytes_por_empleado': asignados / args.empleados,
+            'total_mb': asignados / 1024 ** 2,
+            'mediana_ms': statistics.median(tiempos) * 1000,
+        }
+        print(f"  {variante:<11} {resultados[variante]['bytes_por_empleado']:7.1f} B/empleado   "
+              f"{resultados[variante]['total_mb']:7.1f} MB   "
+              f"carga {resultados[variante]['mediana_ms']:8.1f} ms")
+
+    base = resultados['con_dict']
+    for variante in ('slots', 'desde_fila'):
+        r = resultados[variante]
+        print(f"\n{variante}: {1 - r['total_mb'] / base['total_mb']:.0%} menos memoria, "
+              f"carga {base['mediana_ms'] / r['mediana_ms']:.1f}x respecto de con_dict.", end="")
+    print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump({'empleados': args.empleados, 'python': sys.version.split()[0], 'resultados': resultados},
+                      archivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,568 @@
+"""
+Benchmark reproducible de las funciones db_* sin una instancia de Oracle.
+
+Siembra una empresa sintética en un archivo SQLite (datos deterministas a
+partir de --semilla), carga database.py con DB_BACKEND=sqlite y mide cada
+función pública db_* más el camino de parseo de obtener_indicadores (sin
+red). El resultado se compara con una línea base guardada para detectar
+regresiones.
+
+Los tiempos absolutos no son los de Oracle (no hay red ni optimizador de
+Oracle): sirven para comparar versiones de database.py entre sí, en la
+misma máquina y con los mismos parámetros.
+
+Uso:
+    python benchmarks/suite_bd.py --guardar-base          # mide y guarda la línea base
+    python benchmarks/suite_bd.py                         # mide y compara con la línea base
+    python benchmarks/suite_bd.py --empleados 5000 --registros 500000 --solo db_buscar
+    python benchmarks/suite_bd.py --json resultados.json  # además guarda los resultados
+
+Sale con código 1 si alguna función es más lenta que la línea base por
+sobre la tolerancia (--tolerancia, por defecto 25%).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DIRECTORIO, '..'))
+
+import almacenamiento
+import motor_sqlite
+
+RUTA_BASE = os.path.join(DIRECTORIO, 'linea_base_bd.json')
+MINIMO_REGRESION_MS = 0.05  # Diferencias menores son ruido de medición
+CLAVE_ADMIN = "bench123"
+USUARIO_ADMIN = "bench"
+
+# Funciones db_* que no van a la BD: no se miden
+SIN_BD = {'db_limpiar_cache', 'db_estadisticas_cache', 'db_estadisticas_pool', 'db_sesiones_prestadas'}
+
+NOMBRES_INDICADORES = ["Unidad de fomento (UF)", "Dólar observado", "Euro", "Índice de valor promedio (IVP)",
+                       "Unidad tributaria mensual (UTM)", "Imacec", "Tasa Política Monetaria (TPM)",
+                       "Libra de Cobre", "Tasa de desempleo", "Bitcoin", "Índice de Precios al Consumidor (IPC)",
+                       "Dólar acuerdo"]
+
+# =============================================================================
+# --- SIEMBRA ---
+# =============================================================================
+
+def _fecha(dt):
+    return dt.strftime(motor_sqlite.FORMATO_FECHA)
+
+
+def sembrar(ruta: str, args):
+    """Crea el esquema del backend SQLite y siembra la empresa sintética. Retorna un dict con los IDs útiles."""
+    azar = random.Random(args.semilla)
+    inicio = datetime(2024, 1, 1)
+    almacenamiento.crear_esquema_sqlite(ruta)
+    conn = sqlite3.connect(ruta)
+
+    n_emp, n_depto, n_proy = args.empleados, args.departamentos, args.proyectos
+    rut_base = 10_000_000
+
+    conn.executemany(
+        "INSERT INTO usuarios VALUES (?, ?, ?, ?, ?)",
+        ((rut_base + i, f"Empleado {i}", f"Calle {i}", f"9{i:08d}", f"empleado{i}@empresa.cl")
+         for i in range(1, n_emp + 1))
+    )
+    conn.executemany(
+        "INSERT INTO departamentos VALUES (?, ?, NULL)",
+        ((d, f"Departamento {d}") for d in range(1, n_depto + 1))
+    )
+    conn.executemany(
+        "INSERT INTO empleados VALUES (?, ?, ?, ?, ?)",
+        ((i, _fecha(inicio - timedelta(days=azar.randrange(3000))), azar.randrange(600_000, 4_000_000, 1000),
+          rut_base + i, azar.randint(1, n_depto)) for i in range(1, n_emp + 1))
+    )
+    conn.executemany(
+        "UPDATE departamentos SET idGerenteResponsable = ? WHERE idDepartamento = ?",
+        ((azar.randint(1, n_emp), d) for d in range(1, n_depto + 1))
+    )
+    conn.executemany(
+        "INSERT INTO proyectos VALUES (?, ?, ?, ?)",
+        ((p, f"Proyecto {p}", _fecha(inicio + timedelta(days=azar.randrange(365))), f"Descripción {p}")
+         for p in range(1, n_proy + 1))
+    )
+    asignaciones = {(azar.randint(1, n_emp), p) for p in range(1, n_proy + 1) for _ in range(args.equipo)}
+    conn.executemany("INSERT INTO proyecto_empleados VALUES (?, ?)", sorted(asignaciones))
+
+    # Los triggers de costo mantienen costo_proyecto_empleado
+    conn.executemany(
+        "INSERT INTO registros (fechaRegistro, horasTrabajadas, descripcionTrabajo, idEmpleado, idProyecto) "
+        "VALUES (?, ?, ?, ?, ?)",
+        ((_fecha(inicio + timedelta(days=azar.randrange(365))), azar.choice((2, 4, 6, 8)), "Trabajo sembrado",
+          azar.randint(1, n_emp), azar.randint(1, n_proy)) for _ in range(args.registros))
+    )
+
+    import bcrypt
+    clave_hash = bcrypt.hashpw(CLAVE_ADMIN.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    conn.execute("INSERT INTO administradores VALUES (1, ?, ?, 1)", (USUARIO_ADMIN, clave_hash))
+
+    conn.executemany(
+        "INSERT INTO indicadores_registrados (nombre_indicador, valor_indicador, fecha_valor, fecha_consulta, "
+        "sitio_proveedor, id_admin_consulta) VALUES (?, ?, ?, ?, 'mindicador.cl', 1)",
+        ((azar.choice(NOMBRES_INDICADORES), round(azar.uniform(1, 40000), 2),
+          _fecha(inicio + timedelta(days=i % 365)), _fecha(inicio + timedelta(days=i % 365)))
+         for i in range(args.indicadores))
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    return {'rut_base': rut_base, 'id_admin': 1, 'id_empleado_admin': 1}
+
+
+# =============================================================================
+# --- CASOS ---
+# =============================================================================
+
+class Datos:
+    """IDs y contadores que usan los casos para armar sus argumentos."""
+
+    def __init__(self, ruta: str, args, ids: dict):
+        self.ruta = ruta
+        self.args = args
+        self.azar = random.Random(args.semilla + 1)
+        self.rut_base = ids['rut_base']
+        self.id_admin = ids['id_admin']
+        self.id_empleado_admin = ids['id_empleado_admin']
+        self._siguiente_rut = self.rut_base + args.empleados + 1
+        self._siguiente_admin = 2
+        self._conn = sqlite3.connect(ruta, timeout=30)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def empleado(self):
+        return self.azar.randint(2, self.args.empleados)
+
+    def depto(self):
+        return self.azar.randint(1, self.args.departamentos)
+
+    def proyecto(self):
+        return self.azar.randint(1, self.args.proyectos)
+
+    def rut(self, id_empleado=None):
+        return self.rut_base + (id_empleado or self.empleado())
+
+    def empleados(self, n: int = 50):
+        return self.azar.sample(range(2, self.args.empleados + 1), min(n, self.args.empleados - 1))
+
+    def nuevo_rut(self):
+        self._siguiente_rut += 1
+        return self._siguiente_rut
+
+    def nuevo_usuario_admin(self):
+        self._siguiente_admin += 1
+        return f"bench{self._siguiente_admin}", self._siguiente_admin
+
+    def sql(self, sentencia: str, parametros=()):
+        """Preparación fuera de la medición, directo sobre SQLite."""
+        if parametros and isinstance(parametros, list) and isinstance(parametros[0], (tuple, list)):
+            self._conn.executemany(sentencia, parametros)
+        else:
+            self._conn.execute(sentencia, parametros)
+        self._conn.commit()
+
+    def uno(self, sentencia: str, parametros=()):
+        return self._conn.execute(sentencia, parametros).fetchone()[0]
+
+    def proyecto_desechable(self, registros: int = 50):
+        """Crea un proyecto con equipo y horas para los casos que eliminan."""
+        cur = self._conn.execute("INSERT INTO proyectos (nombre, fechaInicioProyecto, descripcion) "
+                                 "VALUES ('Desechable', '2025-01-01 00:00:00', 'bench')")
+        id_proyecto = cur.lastrowid
+        equipo = self.empleados(5)
+        self._conn.executemany("INSERT INTO proyecto_empleados VALUES (?, ?)", [(e, id_proyecto) for e in equipo])
+        self._conn.executemany(
+            "INSERT INTO registros (fechaRegistro, horasTrabajadas, descripcionTrabajo, idEmpleado, idProyecto) "
+            "VALUES ('2025-01-01 00:00:00', 8, 'bench', ?, ?)",
+            [(equipo[i % len(equipo)], id_proyecto) for i in range(registros)]
+        )
+        self._conn.commit()
+        return id_proyecto
+
+    def depto_desechable(self, empleados: int = 5):
+        cur = self._conn.execute("INSERT INTO departamentos (nombre) VALUES ('Desechable')")
+        id_depto = cur.lastrowid
+        self._conn.executemany("UPDATE empleados SET idDepartamento = ? WHERE idEmpleado = ?",
+                               [(id_depto, e) for e in self.empleados(empleados)])
+        self._conn.commit()
+        return id_depto
+
+    def cerrar(self):
+        self._conn.close()
+
+
+class Caso:
+    """
+    Args:
+        argumentos: funcion(datos) -> tupla de argumentos (se arma fuera de la medición)
+        preparar: funcion(datos, argumentos) que deja la BD lista (fuera de la medición)
+    """
+
+    def __init__(self, nombre: str, funcion, argumentos=lambda d: (), preparar=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.argumentos = argumentos
+        self.preparar = preparar
+
+
+def _payload_indicadores(n_extra: int = 0):
+    datos = {"version": "1.7.0", "autor": "mindicador.cl", "fecha": "2025-12-03T03:00:00.000Z"}
+    for i, nombre in enumerate(NOMBRES_INDICADORES + [f"Indicador {k}" for k in range(n_extra)]):
+        codigo = f"ind{i}"
+        datos[codigo] = {"codigo": codigo, "nombre": nombre, "unidad_medida": "Pesos",
+                         "fecha": "2025-12-03T03:00:00.000Z", "valor": 1000.0 + i}
+    return datos
+
+
+def crear_casos(db, api_indicador):
+    from empleado import Empleado
+    from proyecto import Proyecto
+    from departamento import Departamento
+
+    def nuevo_empleado(d):
+        rut = d.nuevo_rut()
+        emp = Empleado(f"Nuevo {rut}", "Calle Bench", f"8{rut}", f"nuevo{rut}@empresa.cl", None, "01/03/2025", 1_200_000)
+        return rut, emp, d.depto()
+
+    def hash_admin_actual(d):
+        # Reescribe el mismo hash: la fila cumple la condición y el login no cambia
+        clave_hash = db.db_buscar_admin_para_login(USUARIO_ADMIN).clave_hash
+        return d.id_admin, clave_hash, clave_hash
+
+    def nuevo_admin(d):
+        usuario, id_empleado = d.nuevo_usuario_admin()
+        return usuario, CLAVE_ADMIN, id_empleado
+
+    def par_libre(d):
+        id_emp, id_proy = d.empleado(), d.proyecto()
+        d.sql("DELETE FROM proyecto_empleados WHERE idEmpleado = ? AND idProyecto = ?", (id_emp, id_proy))
+        return id_emp, id_proy
+
+    def par_asignado(d):
+        id_emp, id_proy = d.empleado(), d.proyecto()
+        d.sql("INSERT OR IGNORE INTO proyecto_empleados VALUES (?, ?)", (id_emp, id_proy))
+        return id_proy, id_emp
+
+    def equipo_libre(d):
+        id_proy, ids = d.proyecto(), d.empleados()
+        d.sql("DELETE FROM proyecto_empleados WHERE idProyecto = ?", (id_proy,))
+        return id_proy, ids
+
+    def equipo_asignado(d):
+        id_proy, ids = d.proyecto(), d.empleados()
+        d.sql("INSERT OR IGNORE INTO proyecto_empleados VALUES (?, ?)", [(e, id_proy) for e in ids])
+        return id_proy, ids
+
+    def depto_con_empleados(d):
+        id_depto, ids = d.depto(), d.empleados()
+        d.sql("UPDATE empleados SET idDepartamento = ? WHERE idEmpleado = ?", [(id_depto, e) for e in ids])
+        return id_depto, ids
+
+    def empleado_con_depto(d):
+        id_emp = d.empleado()
+        d.sql("UPDATE empleados SET idDepartamento = ? WHERE idEmpleado = ?", (d.depto(), id_emp))
+        return (id_emp,)
+
+    def lote_horas(d):
+        return ([(datetime(2025, 1, 1) + timedelta(days=i % 28), 8, "Lote bench", d.empleado(), d.proyecto())
+                 for i in range(500)],)
+
+    def lote_idempotente(d):
+        return ([(datetime(2025, 1, 1) + timedelta(days=i % 28), 8, "Cola bench", d.empleado(), d.proyecto(),
+                  str(uuid.uuid4())) for i in range(200)],)
+
+    def historial_lleno(d, _):
+        if d.uno("SELECT COUNT(*) FROM indicadores_registrados") < 1000:
+            d.sql("INSERT INTO indicadores_registrados (nombre_indicador, valor_indicador, fecha_valor, "
+                  "fecha_consulta, sitio_proveedor, id_admin_consulta) VALUES (?, 1, ?, ?, 'mindicador.cl', 1)",
+                  [(NOMBRES_INDICADORES[i % 12], '2025-01-01 00:00:00', '2025-01-01 00:00:00') for i in range(1000)])
+
+    indicadores = api_indicador._parsear_indicadores(_payload_indicadores())
+    texto_api = json.dumps(_payload_indicadores(), ensure_ascii=False)
+
+    def obtener_indicadores_sin_red():
+        respuesta = type('Respuesta', (), {
+            'status_code': 200, 'text': texto_api, 'headers': {},
+            'raise_for_status': lambda self: None
+        })()
+        original = api_indicador.requests.get
+        api_indicador.requests.get = lambda *a, **k: respuesta
+        try:
+            return api_indicador.obtener_indicadores(forzar=True)
+        finally:
+            api_indicador.requests.get = original
+
+    return [
+        # Autenticación y administradores
+        Caso("db_login_admin", db.db_login_admin, lambda d: (USUARIO_ADMIN, CLAVE_ADMIN)),
+        Caso("db_cambiar_clave_admin", db.db_cambiar_clave_admin, lambda d: (USUARIO_ADMIN, CLAVE_ADMIN, CLAVE_ADMIN)),
+        Caso("db_crear_nuevo_admin", db.db_crear_nuevo_admin, nuevo_admin),
+        Caso("db_obtener_usuario_admin_por_id_empleado", db.db_obtener_usuario_admin_por_id_empleado,
+             lambda d: (d.id_empleado_admin,)),
+        Caso("db_obtener_id_admin_por_id_empleado", db.db_obtener_id_admin_por_id_empleado,
+             lambda d: (d.id_empleado_admin,)),
+        Caso("db_buscar_admin_completo", db.db_buscar_admin_completo, lambda d: (d.id_empleado_admin,)),
+        Caso("db_buscar_admin_para_login", db.db_buscar_admin_para_login, lambda d: (USUARIO_ADMIN,)),
+        Caso("db_actualizar_clave_admin", db.db_actualizar_clave_admin, hash_admin_actual),
+        Caso("db_listar_administradores", db.db_listar_administradores),
+
+        # Listados
+        Caso("db_listar_departamentos_pagina", db.db_listar_departamentos_pagina, lambda d: (0, 100)),
+        Caso("db_listar_empleados_pagina", db.db_listar_empleados_pagina,
+             lambda d: (d.empleado() // 2, 100)),
+        Caso("db_listar_proyectos_pagina", db.db_listar_proyectos_pagina, lambda d: (d.proyecto() // 2, 100)),
+        Caso("db_iterar_departamentos", db.db_iterar_departamentos),
+        Caso("db_iterar_empleados", db.db_iterar_empleados),
+        Caso("db_iterar_proyectos", db.db_iterar_proyectos),
+        Caso("db_listar_todos_departamentos", db.db_listar_todos_departamentos),
+        Caso("db_listar_todos_empleados", db.db_listar_todos_empleados),
+        Caso("db_listar_todos_proyectos", db.db_listar_todos_proyectos),
+        Caso("db_ids_empleados", db.db_ids_empleados),
+        Caso("db_ids_proyectos", db.db_ids_proyectos),
+
+        # Búsquedas
+        Caso("db_buscar_empleado_por_id", db.db_buscar_empleado_por_id, lambda d: (d.empleado(),)),
+        Caso("db_buscar_id_empleado_por_rut", db.db_buscar_id_empleado_por_rut, lambda d: (d.rut(),)),
+        Caso("db_buscar_usuario_por_id", db.db_buscar_usuario_por_id, lambda d: (d.rut(),)),
+        Caso("db_buscar_departamento_por_id", db.db_buscar_departamento_por_id, lambda d: (d.depto(),)),
+        Caso("db_listar_empleados_departamento", db.db_listar_empleados_departamento, lambda d: (d.depto(),)),
+        Caso("db_buscar_proyecto_por_id", db.db_buscar_proyecto_por_id, lambda d: (d.proyecto(),)),
+        Caso("db_costo_proyecto", db.db_costo_proyecto, lambda d: (d.proyecto(),)),
+        Caso("db_verificar_empleado_en_depto", db.db_verificar_empleado_en_depto,
+             lambda d: (d.empleado(), d.depto())),
+
+        # Altas y actualizaciones
+        Caso("db_crear_empleado", db.db_crear_empleado, nuevo_empleado),
+        Caso("db_crear_proyecto", db.db_crear_proyecto,
+             lambda d: (Proyecto(None, "Proyecto bench", "01/03/2025", "Creado por el benchmark"),)),
+        Caso("db_crear_departamento", db.db_crear_departamento,
+             lambda d: (Departamento(None, "Depto bench"),)),
+        Caso("db_actualizar_empleado", db.db_actualizar_empleado,
+             lambda d: (lambda e: (e, f"Empleado {e}", f"Calle {e}", f"9{e:08d}", f"empleado{e}@empresa.cl",
+                                   d.azar.randrange(600_000, 4_000_000, 1000), d.rut(e)))(d.empleado())),
+        Caso("db_actualizar_departamento", db.db_actualizar_departamento,
+             lambda d: (d.depto(), "Departamento renombrado", d.empleado())),
+        Caso("db_actualizar_proyecto", db.db_actualizar_proyecto,
+             lambda d: (d.proyecto(), "Proyecto renombrado", "01/02/2025", "Descripción nueva")),
+
+        # Horas
+        Caso("db_registrar_horas", db.db_registrar_horas,
+             lambda d: (d.empleado(), d.proyecto(), "2025-03-01", 8, "Horas bench")),
+        Caso("db_registrar_horas_lote", db.db_registrar_horas_lote, lote_horas),
+        Caso("db_registrar_horas_idempotente", db.db_registrar_horas_idempotente, lote_idempotente),
+        Caso("db_verificar_ids_registro", db.db_verificar_ids_registro,
+             lambda d: (d.empleado(), d.proyecto())),
+
+        # Asignaciones
+        Caso("db_asignar_proyecto_empleado", db.db_asignar_proyecto_empleado, par_libre),
+        Caso("db_eliminar_proyecto_empleado", db.db_eliminar_proyecto_empleado, par_asignado),
+        Caso("db_asignar_departamento_empleado", db.db_asignar_departamento_empleado,
+             lambda d: (d.empleado(), d.depto())),
+        Caso("db_eliminar_departamento_empleado", db.db_eliminar_departamento_empleado, empleado_con_depto),
+        Caso("db_asignar_proyecto_empleados", db.db_asignar_proyecto_empleados, equipo_libre),
+        Caso("db_quitar_proyecto_empleados", db.db_quitar_proyecto_empleados, equipo_asignado),
+        Caso("db_asignar_departamento_empleados", db.db_asignar_departamento_empleados,
+             lambda d: (d.depto(), d.empleados())),
+        Caso("db_quitar_departamento_empleados", db.db_quitar_departamento_empleados, depto_con_empleados),
+
+        # Eliminaciones (cada repetición elimina algo recién creado)
+        Caso("db_eliminar_proyecto", db.db_eliminar_proyecto, lambda d: (d.proyecto_desechable(),)),
+        Caso("db_eliminar_proyectos", db.db_eliminar_proyectos,
+             lambda d: ([d.proyecto_desechable() for _ in range(10)],)),
+        Caso("db_eliminar_departamento", db.db_eliminar_departamento, lambda d: (d.depto_desechable(),)),
+
+        # Indicadores
+        Caso("db_registrar_indicador", db.db_registrar_indicador,
+             lambda d: ("Dólar observado", 950.5, "2025-12-03T03:00:00.000Z", d.id_admin)),
+        Caso("db_registrar_multiples_indicadores", db.db_registrar_multiples_indicadores,
+             lambda d: (indicadores, d.id_admin)),
+        Caso("db_obtener_historial_indicadores", db.db_obtener_historial_indicadores, lambda d: (50,)),
+        Caso("db_obtener_historial_indicadores_pagina", db.db_obtener_historial_indicadores_pagina,
+             lambda d: (None, 100)),
+        Caso("db_obtener_ultimo_valor_indicador", db.db_obtener_ultimo_valor_indicador,
+             lambda d: (d.azar.choice(NOMBRES_INDICADORES),)),
+        Caso("db_limpiar_historial_indicadores", db.db_limpiar_historial_indicadores, preparar=historial_lleno),
+
+        # API de indicadores (sin red)
+        Caso("api._parsear_indicadores", api_indicador._parsear_indicadores,
+             lambda d: (json.loads(texto_api),)),
+        Caso("api.obtener_indicadores (respuesta nueva)", obtener_indicadores_sin_red),
+        Caso("api.obtener_indicadores (caché vigente)", api_indicador.obtener_indicadores),
+    ]
+
+
+# =============================================================================
+# --- MEDICIÓN ---
+# =============================================================================
+
+def medir(caso: Caso, datos: Datos, repeticiones: int):
+    """
+    Mide `repeticiones` llamadas, más una de calentamiento.
+    Retorna (tiempos en segundos, primera línea de error impresa o None).
+    """
+    tiempos, error = [], None
+    for i in range(repeticiones + 1):
+        argumentos = caso.argumentos(datos)
+        if caso.preparar:
+            caso.preparar(datos, argumentos)
+
+        # Los print de database.py no se miden, pero se revisan: un caso que falla no es un caso rápido
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            inicio = time.perf_counter()
+            resultado = caso.funcion(*argumentos)
+            if hasattr(resultado, '__next__'):
+                for _ in resultado:
+                    pass
+            tiempo = time.perf_counter() - inicio
+        if i:  # La primera es calentamiento
+            tiempos.append(tiempo)
+        if error is None:
+            error = next((linea for linea in salida.getvalue().splitlines() if 'Error' in linea), None)
+    return tiempos, error
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def resumir(tiempos: list):
+    return {
+        'mediana_ms': statistics.median(tiempos) * 1000,
+        'p95_ms': _percentil(tiempos, 95) * 1000,
+        'min_ms': min(tiempos) * 1000
+    }
+
+
+def comparar(actual: dict, base: dict, tolerancia: float):
+    """Retorna (lista de filas para mostrar, lista de regresiones)."""
+    filas, regresiones = [], []
+    for nombre, medida in actual['resultados'].items():
+        anterior = base['resultados'].get(nombre)
+        if anterior is None:
+            filas.append((nombre, medida['mediana_ms'], None, None, "nuevo"))
+            continue
+        cambio = medida['mediana_ms'] / anterior['mediana_ms'] - 1 if anterior['mediana_ms'] else 0.0
+        estado = ""
+        if cambio > tolerancia and medida['mediana_ms'] - anterior['mediana_ms'] > MINIMO_REGRESION_MS:
+            estado = "REGRESIÓN"
+            regresiones.append(nombre)
+        elif cambio < -tolerancia:
+            estado = "mejora"
+        filas.append((nombre, medida['mediana_ms'], anterior['mediana_ms'], cambio, estado))
+    return filas, regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las funciones db_* sobre SQLite.")
+    parser.add_argument('--empleados', type=int, default=2000)
+    parser.add_argument('--departamentos', type=int, default=20)
+    parser.add_argument('--proyectos', type=int, default=200)
+    parser.add_argument('--equipo', type=int, default=8, help="empleados asignados por proyecto")
+    parser.add_argument('--registros', type=int, default=100_000)
+    parser.add_argument('--indicadores', type=int, default=20_000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--solo', help="medir solo los casos cuyo nombre contiene este texto")
+    parser.add_argument('--base', default=RUTA_BASE, help="archivo de línea base (default %(default)s)")
+    parser.add_argument('--guardar-base', action='store_true', help="guardar los resultados como línea base")
+    parser.add_argument('--tolerancia', type=float, default=0.25, help="aumento de la mediana tolerado (0.25 = 25%%)")
+    parser.add_argument('--json', help="guardar también los resultados en este archivo")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix="bench_bd_")
+    ruta = os.path.join(directorio, "empresa.sqlite")
+
+    print(f"Sembrando {args.empleados} empleados, {args.departamentos} departamentos, {args.proyectos} proyectos, "
+          f"{args.registros} registros y {args.indicadores} indicadores...")
+    inicio = time.perf_counter()
+    ids = sembrar(ruta, args)
+    print(f"Siembra lista en {time.perf_counter() - inicio:.1f} s")
+
+    # Sin caché de objetos, cada búsqueda va a la BD
+    os.environ['DB_BACKEND'] = 'sqlite'
+    os.environ['DB_SQLITE_RUTA'] = ruta
+    os.environ.setdefault('DB_CACHE_MAX', '0')
+    os.environ['INDICADORES_CACHE'] = os.path.join(directorio, "indicadores_cache.json")
+    import database as db
+    import api_indicador
+
+    casos = crear_casos(db, api_indicador)
+    medidas = {c.nombre for c in casos}
+    sin_caso = sorted(n for n in dir(db)
+                      if n.startswith('db_') and callable(getattr(db, n)) and n not in SIN_BD and n not in medidas)
+    if sin_caso:
+        print(f"Aviso: funciones db_* sin caso en el benchmark: {', '.join(sin_caso)}")
+    if args.solo:
+        casos = [c for c in casos if args.solo in c.nombre]
+
+    datos = Datos(ruta, args, ids)
+    resultados, con_errores = {}, []
+    for caso in casos:
+        tiempos, error = medir(caso, datos, args.repeticiones)
+        resultados[caso.nombre] = r = resumir(tiempos)
+        print(f"  {caso.nombre:<48} mediana {r['mediana_ms']:9.3f} ms   p95 {r['p95_ms']:9.3f} ms")
+        if error:
+            con_errores.append(caso.nombre)
+            print(f"    ! {error}")
+    datos.cerrar()
+    db.cerrar_pool()
+
+    actual = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'parametros': {k: getattr(args, k) for k in ('empleados', 'departamentos', 'proyectos', 'equipo',
+                                                     'registros', 'indicadores', 'repeticiones', 'semilla')},
+        'entorno': {'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+                    'maquina': platform.machine(),
+                    'instrumentacion': os.getenv('DB_INSTRUMENTACION', '1') != '0'},
+        'resultados': resultados
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, ensure_ascii=False, indent=2)
+
+    codigo_salida = 0
+    if con_errores:
+        print(f"\nAviso: {len(con_errores)} caso(s) imprimieron errores; sus tiempos no son comparables.")
+    if args.guardar_base:
+        with open(args.base, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, ensure_ascii=False, indent=2)
+        print(f"\nLínea base guardada en {args.base}")
+    elif os.path.exists(args.base):
+        with open(args.base, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        if base.get('parametros') != actual['parametros']:
+            print("\nAviso: la línea base se midió con otros parámetros; la comparación no es directa.")
+
+        filas, regresiones = comparar(actual, base, args.tolerancia)
+        print("\n| Caso | Actual (ms) | Base (ms) | Cambio | |")
+        print("|---|---:|---:|---:|---|")
+        for nombre, ms, ms_base, cambio, estado in filas:
+            texto_base = "-" if ms_base is None else f"{ms_base:.3f}"
+            texto_cambio = "-" if cambio is None else f"{cambio:+.0%}"
+            print(f"| {nombre} | {ms:.3f} | {texto_base} | {texto_cambio} | {estado} |")
+        if regresiones:
+            print(f"\n{len(regresiones)} regresión(es) sobre {args.tolerancia:.0%}: {', '.join(regresiones)}")
+            codigo_salida = 1
+    else:
+        print(f"\nNo hay línea base en {args.base}; use --guardar-base para crearla.")
+
+    sys.exit(codigo_salida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Mapa de identidad para los objetos cargados desde la BD.
+
+Cada entidad (Empleado, Departamento, Proyecto) se guarda por su ID: una
+segunda búsqueda del mismo ID devuelve el mismo objeto sin ir a la base de
+datos. Los objetos menos usados se descartan al superar la capacidad (LRU)
+y las funciones que modifican datos invalidan las entradas afectadas.
+"""
+import threading
+from collections import OrderedDict
+
+
+class MapaIdentidad:
+    def __init__(self, nombre: str, capacidad: int = 1000):
+        self.nombre = nombre
+        self.capacidad = capacidad
+        self._objetos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        """Retorna el objeto guardado para la clave, o None si no está."""
+        with self._lock:
+            obj = self._objetos.get(clave)
+            if obj is None:
+                self.fallos += 1
+                return None
+            self._objetos.move_to_end(clave)
+            self.aciertos += 1
+            return obj
+
+    def guardar(self, clave, obj):
+        """
+        Guarda el objeto y lo retorna. Si otro hilo guardó la misma clave
+        mientras tanto, se conserva y retorna ese (un solo objeto por ID).
+        """
+        if obj is None or self.capacidad <= 0:
+            return obj
+        with self._lock:
+            existente = self._objetos.get(clave)
+            if existente is not None:
+                self._objetos.move_to_end(clave)
+                return existente
+            self._objetos[clave] = obj
+            while len(self._objetos) > self.capacidad:
+                self._objetos.popitem(last=False)
+            return obj
+
+    def invalidar(self, *claves):
+        with self._lock:
+            for clave in claves:
+                self._objetos.pop(clave, None)
+
+    def invalidar_si(self, condicion):
+        """Invalida todas las entradas cuyo objeto cumple condicion(obj)."""
+        with self._lock:
+            for clave in [c for c, obj in self._objetos.items() if condicion(obj)]:
+                del self._objetos[clave]
+
+    def limpiar(self):
+        with self._lock:
+            self._objetos.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                'entidad': self.nombre,
+                'objetos': len(self._objetos),
+                'capacidad': self.capacidad,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos
+            }
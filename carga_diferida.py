@@ -0,0 +1,75 @@
+"""
+Carga diferida para el arranque de la aplicación.
+
+ModuloDiferido importa un módulo recién cuando se usa uno de sus atributos:
+database (oracledb, bcrypt, dotenv) y api_indicador (requests) no se cargan
+antes de mostrar la ventana. FrameDiferido construye los widgets de una
+pantalla la primera vez que se muestra, en vez de armarlas todas al inicio.
+"""
+import importlib
+import sys
+import tkinter as tk
+
+
+class ModuloDiferido:
+    """
+    Se usa igual que el módulo `nombre` (modulo.funcion(...)); el import real
+    ocurre en el primer acceso a un atributo, en el hilo que lo haga.
+    importlib serializa los imports simultáneos del mismo módulo.
+    """
+
+    def __init__(self, nombre: str):
+        self._nombre = nombre
+        self._modulo = None
+
+    @property
+    def cargado(self) -> bool:
+        """True si el módulo ya se importó (aquí o desde otro módulo)."""
+        return self._modulo is not None or self._nombre in sys.modules
+
+    def __getattr__(self, atributo):
+        modulo = self._modulo
+        if modulo is None:
+            modulo = self._modulo = importlib.import_module(self._nombre)
+        return getattr(modulo, atributo)
+
+    def __repr__(self):
+        estado = "cargado" if self.cargado else "sin cargar"
+        return f"<ModuloDiferido {self._nombre!r} ({estado})>"
+
+
+class FrameDiferido:
+    """
+    Frame que se construye al mostrarse por primera vez (pack) o cuando se
+    pide con obtener(). construir(frame) recibe el tk.Frame vacío y le agrega
+    sus widgets; **opciones se pasan a tk.Frame.
+    """
+
+    def __init__(self, padre, construir, **opciones):
+        self._padre = padre
+        self._construir = construir
+        self._opciones = opciones
+        self._frame = None
+
+    @property
+    def construido(self) -> bool:
+        return self._frame is not None
+
+    def obtener(self) -> tk.Frame:
+        """El tk.Frame real, construyéndolo si todavía no existe."""
+        if self._frame is None:
+            frame = tk.Frame(self._padre, **self._opciones)
+            self._construir(frame)
+            self._frame = frame
+        return self._frame
+
+    def pack(self, **opciones):
+        self.obtener().pack(**opciones)
+
+    def pack_forget(self):
+        # Un frame que nunca se mostró no tiene nada que ocultar
+        if self._frame is not None:
+            self._frame.pack_forget()
+
+    def __getattr__(self, atributo):
+        return getattr(self.obtener(), atributo)
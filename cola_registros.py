@@ -0,0 +1,299 @@
+"""
+Cola local de registros de horas (write-behind).
+
+encolar_horas() guarda el registro en un diario SQLite local y retorna de
+inmediato: registrar horas cuesta una escritura a disco, no un viaje a la
+BD, y si la BD no responde el registro no se pierde. Un hilo sincronizador
+los envía a la BD por lotes con db_registrar_horas_idempotente.
+
+Antes de encolar se verifica que existan el empleado y el proyecto
+(db_verificar_ids_registro) si la BD responde; los IDs confirmados quedan
+en memoria y los siguientes registros con ellos no consultan la BD. Sin
+conexión el registro se encola igual y, si un ID no existe, la BD lo
+rechaza al sincronizar.
+
+Cada registro lleva una clave de idempotencia (UUID) que se guarda en la
+columna registros.claveIdempotencia (UNIQUE). Si un lote llegó a la BD
+pero la confirmación se perdió (p. ej. se cortó la red tras el commit),
+al reenviarlo la BD rechaza las claves repetidas y se dan por
+sincronizadas: cada registro se inserta una sola vez.
+
+Estados en el diario:
+    pendiente   espera su envío (se reintenta hasta que la BD responda)
+    rechazado   la BD lo rechazó (p. ej. empleado o proyecto inexistente);
+                queda guardado con el error para revisarlo
+Los registros sincronizados se borran del diario.
+"""
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+import database as dbFunciones
+
+RUTA_COLA = os.getenv(
+    'COLA_REGISTROS_RUTA',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cola_registros.sqlite')
+)
+TAMANO_LOTE = int(os.getenv('COLA_LOTE', '200'))
+INTERVALO_SEG = float(os.getenv('COLA_INTERVALO_SEG', '5'))       # Revisión periódica
+ESPERA_MAX_SEG = float(os.getenv('COLA_ESPERA_MAX_SEG', '60'))    # Tope del reintento sin BD
+
+MAX_DESCRIPCION = 200  # registros.descripcionTrabajo VARCHAR2(200)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cola_registros (
+    orden INTEGER PRIMARY KEY AUTOINCREMENT,
+    clave TEXT NOT NULL UNIQUE,
+    fecha TEXT NOT NULL,
+    horas REAL NOT NULL,
+    descripcion TEXT NOT NULL,
+    id_empleado INTEGER NOT NULL,
+    id_proyecto INTEGER NOT NULL,
+    creado TEXT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cola_estado ON cola_registros (estado, orden);
+"""
+
+_lock = threading.Lock()            # Acceso al diario
+_lock_sincronizar = threading.Lock()  # Un solo envío a la vez
+_conn = None
+_estado = {'sincronizados': 0, 'ultimo_error': None, 'ultima_sincronizacion': None}
+_ids_confirmados = {'empleados': set(), 'proyectos': set()}  # Protegido por _lock
+
+_despertar = threading.Event()
+_detener = threading.Event()
+_hilo = None
+
+
+def _diario():
+    """Conexión al diario, creada la primera vez (llamar con _lock tomado)."""
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(RUTA_COLA, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        # FULL: el registro está en disco cuando encolar_horas retorna
+        conn.execute("PRAGMA synchronous = FULL")
+        conn.executescript(_ESQUEMA)
+        _conn = conn
+    return _conn
+
+
+def _validar(id_empleado, id_proyecto, fecha, horas, descripcion):
+    """Retorna None si los datos sirven, o el mensaje de error."""
+    try:
+        datetime.strptime(fecha, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return "Fecha inválida (use AAAA-MM-DD)"
+    if not isinstance(id_empleado, int) or not isinstance(id_proyecto, int):
+        return "IDs de empleado y proyecto inválidos"
+    if horas is None or horas <= 0:
+        return "Las horas deben ser mayores que 0"
+    descripcion = (descripcion or "").strip()
+    if not descripcion:
+        return "Falta la descripción"
+    if len(descripcion) > MAX_DESCRIPCION:
+        return f"La descripción supera {MAX_DESCRIPCION} caracteres"
+    return None
+
+
+def _verificar_ids(id_empleado: int, id_proyecto: int):
+    """Retorna None si los IDs existen o no se pudo consultar la BD, o el mensaje de error."""
+    with _lock:
+        if id_empleado in _ids_confirmados['empleados'] and id_proyecto in _ids_confirmados['proyectos']:
+            return None
+
+    resultado = dbFunciones.db_verificar_ids_registro(id_empleado, id_proyecto)
+    if isinstance(resultado, str):
+        return resultado
+    if resultado is True:
+        with _lock:
+            _ids_confirmados['empleados'].add(id_empleado)
+            _ids_confirmados['proyectos'].add(id_proyecto)
+    return None
+
+
+def encolar_horas(id_empleado, id_proyecto, fecha, horas, descripcion):
+    """
+    Guarda un registro de horas en la cola local; el sincronizador lo envía a la BD.
+    Mismos argumentos y retorno que db_registrar_horas (fecha 'YYYY-MM-DD').
+
+    Returns:
+        True si quedó guardado, o str con el error de validación (datos o
+        IDs inexistentes). Si la cola local no se puede escribir, se intenta
+        directo en la BD.
+    """
+    error = (_validar(id_empleado, id_proyecto, fecha, horas, descripcion)
+             or _verificar_ids(id_empleado, id_proyecto))
+    if error:
+        return error
+
+    fila = (str(uuid.uuid4()), fecha, horas, descripcion.strip(), id_empleado, id_proyecto,
+            datetime.now().isoformat(timespec='seconds'))
+    try:
+        with _lock:
+            conn = _diario()
+            conn.execute("""
+                INSERT INTO cola_registros (clave, fecha, horas, descripcion, id_empleado, id_proyecto, creado)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, fila)
+            conn.commit()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error al guardar en la cola local de horas ({e}); se registra directo en la BD")
+        return dbFunciones.db_registrar_horas(id_empleado, id_proyecto, fecha, horas, descripcion)
+
+    _despertar.set()
+    return True
+
+
+def _leer_pendientes(limite: int):
+    with _lock:
+        filas = _diario().execute("""
+            SELECT clave, fecha, horas, descripcion, id_empleado, id_proyecto
+            FROM cola_registros WHERE estado = 'pendiente'
+            ORDER BY orden LIMIT ?
+        """, (limite,)).fetchall()
+    return [(datetime.strptime(fecha, "%Y-%m-%d"), horas, descripcion, id_empleado, id_proyecto, clave)
+            for clave, fecha, horas, descripcion, id_empleado, id_proyecto in filas]
+
+
+def _anotar_resultado(filas: list, resultado: dict):
+    with _lock:
+        conn = _diario()
+        if resultado['error']:
+            conn.executemany("UPDATE cola_registros SET intentos = intentos + 1, error = ? WHERE clave = ?",
+                             [(resultado['error'], fila[5]) for fila in filas])
+        else:
+            conn.executemany("DELETE FROM cola_registros WHERE clave = ?",
+                             [(clave,) for clave in resultado['aplicados'] + resultado['duplicados']])
+            conn.executemany("""
+                UPDATE cola_registros SET estado = 'rechazado', intentos = intentos + 1, error = ?
+                WHERE clave = ?
+            """, [(mensaje, clave) for clave, mensaje in resultado['rechazados']])
+        conn.commit()
+
+
+def sincronizar_ahora():
+    """
+    Envía a la BD los registros pendientes, de a TAMANO_LOTE, hasta vaciar la cola
+    o hasta que un lote falle por conexión.
+
+    Returns:
+        dict con: 'aplicados', 'duplicados', 'rechazados' (cantidades) y 'error'
+        (str si un lote no se pudo enviar; sus registros siguen pendientes)
+    """
+    totales = {'aplicados': 0, 'duplicados': 0, 'rechazados': 0, 'error': None}
+    with _lock_sincronizar:
+        while True:
+            filas = _leer_pendientes(TAMANO_LOTE)
+            if not filas:
+                break
+
+            resultado = dbFunciones.db_registrar_horas_idempotente(filas)
+            _anotar_resultado(filas, resultado)
+            if resultado['error']:
+                totales['error'] = resultado['error']
+                break
+
+            for clave in ('aplicados', 'duplicados', 'rechazados'):
+                totales[clave] += len(resultado[clave])
+            if len(filas) < TAMANO_LOTE:
+                break
+
+    with _lock:
+        _estado['sincronizados'] += totales['aplicados'] + totales['duplicados']
+        _estado['ultimo_error'] = totales['error']
+        if totales['error'] is None:
+            _estado['ultima_sincronizacion'] = datetime.now()
+    return totales
+
+
+def _bucle_sincronizador():
+    espera = INTERVALO_SEG
+    while not _detener.is_set():
+        _despertar.clear()
+        try:
+            resultado = sincronizar_ahora()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error al leer la cola local de horas: {e}")
+            resultado = {'error': str(e)}
+
+        if resultado['error']:
+            # Sin BD: se reintenta cada vez más espaciado y no con cada registro nuevo
+            espera = min(espera * 2, ESPERA_MAX_SEG)
+            _detener.wait(espera)
+        else:
+            espera = INTERVALO_SEG
+            _despertar.wait(espera)
+
+
+def iniciar_sincronizador():
+    """Inicia el hilo que envía la cola a la BD (si no está corriendo)."""
+    global _hilo
+    if _hilo is not None and _hilo.is_alive():
+        return
+    _detener.clear()
+    _hilo = threading.Thread(target=_bucle_sincronizador, name="sincronizador-horas", daemon=True)
+    _hilo.start()
+
+
+def detener_sincronizador(espera: float = 5):
+    """
+    Detiene el hilo sincronizador. Lo pendiente queda en el diario y se
+    envía la próxima vez que se inicie.
+    """
+    global _hilo
+    _detener.set()
+    _despertar.set()
+    if _hilo is not None:
+        _hilo.join(espera)
+        _hilo = None
+
+
+def estado_cola():
+    """
+    Returns:
+        dict con: 'pendientes', 'rechazados', 'sincronizados' (en esta sesión),
+        'ultimo_error' y 'ultima_sincronizacion' (datetime o None)
+    """
+    with _lock:
+        conteos = dict(_diario().execute(
+            "SELECT estado, COUNT(*) FROM cola_registros GROUP BY estado"
+        ).fetchall())
+        estado = dict(_estado)
+    return {'pendientes': conteos.get('pendiente', 0), 'rechazados': conteos.get('rechazado', 0), **estado}
+
+
+def registros_rechazados(limite: int = 100):
+    """Registros que la BD rechazó, del más antiguo al más reciente, con su error."""
+    with _lock:
+        filas = _diario().execute("""
+            SELECT clave, fecha, horas, descripcion, id_empleado, id_proyecto, creado, error
+            FROM cola_registros WHERE estado = 'rechazado'
+            ORDER BY orden LIMIT ?
+        """, (limite,)).fetchall()
+    columnas = ('clave', 'fecha', 'horas', 'descripcion', 'id_empleado', 'id_proyecto', 'creado', 'error')
+    return [dict(zip(columnas, fila)) for fila in filas]
+
+
+def reintentar_rechazados():
+    """Vuelve a dejar pendientes los rechazados (p. ej. tras crear el proyecto que faltaba)."""
+    with _lock:
+        conn = _diario()
+        cantidad = conn.execute("UPDATE cola_registros SET estado = 'pendiente' WHERE estado = 'rechazado'").rowcount
+        conn.commit()
+    _despertar.set()
+    return cantidad
+
+
+def descartar_rechazados():
+    """Borra del diario los registros rechazados. Retorna cuántos se borraron."""
+    with _lock:
+        conn = _diario()
+        cantidad = conn.execute("DELETE FROM cola_registros WHERE estado = 'rechazado'").rowcount
+        conn.commit()
+    return cantidad
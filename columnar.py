@@ -0,0 +1,325 @@
+"""
+Resultados en columnas para análisis sobre registros e indicadores.
+
+Las funciones db_* arman un diccionario u objeto por fila: para sumar o
+promediar millones de registros eso es un objeto de Python por fila solo
+para leerlo una vez. leer_columnas() lee el resultado de a TAMANO_LOTE filas
+y lo guarda directamente en un arreglo tipado por columna:
+
+- Sin dependencias extra: array.array ('d' = float64, 'q' = int64).
+- Con NumPy instalado: los mismos datos como ndarray (np.frombuffer, sin copia).
+- Con NumPy y pyarrow, en Oracle: Connection.fetch_df_all de oracledb trae
+  el resultado en formato Arrow y las columnas pasan a NumPy sin crear una
+  tupla por fila (COLUMNAR_ARROW=0 lo desactiva).
+
+Sobre esas columnas, horas_por_proyecto() y estadisticas_indicador()
+agregan con operaciones vectoriales (NumPy) o, sin NumPy, en una sola
+pasada sobre los arreglos.
+
+Variables de entorno:
+    COLUMNAR_LOTE    filas por fetchmany / arraysize (por defecto 10000)
+    COLUMNAR_ARROW   '0' desactiva la lectura Arrow de oracledb
+"""
+import array
+import math
+import os
+from datetime import date, datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+import database as dbFunciones
+import instrumentacion
+
+TAMANO_LOTE = int(os.getenv('COLUMNAR_LOTE', '10000'))
+USAR_ARROW = os.getenv('COLUMNAR_ARROW', '1') != '0'
+
+# Código de tipo de cada columna: 'd' float64 (NULL -> NaN), 'q' int64 (sin NULL),
+# 'O' objetos de Python (texto, fechas) en una lista
+TIPOS = ('d', 'q', 'O')
+_DTYPES = {'d': 'float64', 'q': 'int64'}
+
+EPOCH = date(1970, 1, 1)
+
+
+def numpy_disponible() -> bool:
+    return np is not None
+
+
+def _usa_numpy(usar_numpy):
+    if usar_numpy and np is None:
+        raise RuntimeError("usar_numpy=True requiere NumPy (pip install numpy)")
+    return np is not None if usar_numpy is None else usar_numpy
+
+
+def _validar_tipos(tipos, n_columnas: int):
+    tipos = tipos or 'd' * n_columnas
+    if len(tipos) != n_columnas or set(tipos) - set(TIPOS):
+        raise ValueError(f"tipos debe tener un código de {TIPOS} por columna")
+    return tipos
+
+
+def _leer_arrow(conexion, sql: str, parametros, tipos, tamano_lote: int):
+    """Columnas NumPy desde el DataFrame Arrow de oracledb."""
+    tabla = pyarrow.table(conexion.fetch_df_all(sql, parametros, arraysize=tamano_lote))
+    tipos = _validar_tipos(tipos, tabla.num_columns)
+    columnas = {}
+    for nombre, tipo, columna in zip(tabla.column_names, tipos, tabla.columns):
+        if tipo == 'd':
+            columna = columna.cast(pyarrow.float64()).fill_null(math.nan)
+        elif tipo == 'q':
+            if columna.null_count:
+                raise ValueError(f"La columna entera {nombre} tiene NULL (use NVL en el SQL)")
+            columna = columna.cast(pyarrow.int64())
+        columnas[nombre.lower()] = columna.to_numpy()
+    return columnas
+
+
+def _leer_cursor(cursor, tipos: str, tamano_lote: int, usar_numpy: bool):
+    """Columnas desde fetchmany: cada lote se vuelca a los arreglos y se descarta."""
+    nombres = [d[0].lower() for d in cursor.description]
+    destinos = [array.array(tipo) if tipo in _DTYPES else [] for tipo in tipos]
+    while True:
+        filas = cursor.fetchmany(tamano_lote)
+        if not filas:
+            break
+        for nombre, tipo, destino, valores in zip(nombres, tipos, destinos, zip(*filas)):
+            if None in valores and tipo in _DTYPES:
+                if tipo == 'q':
+                    raise ValueError(f"La columna entera {nombre} tiene NULL (use NVL en el SQL)")
+                valores = [math.nan if v is None else v for v in valores]
+            if tipo in _DTYPES:
+                destino.fromlist(list(valores))  # Más rápido que extend(tupla)
+            else:
+                destino.extend(valores)
+
+    if usar_numpy:
+        destinos = [np.frombuffer(d, dtype=_DTYPES[t]) if t in _DTYPES else np.array(d, dtype=object)
+                    for t, d in zip(tipos, destinos)]
+    return dict(zip(nombres, destinos))
+
+
+def _leer(cursor, sql: str, parametros=None, tipos: str = None, tamano_lote: int = TAMANO_LOTE,
+          usar_numpy=None):
+    usar_numpy = _usa_numpy(usar_numpy)
+    parametros = parametros or {}
+    conexion = getattr(cursor, 'connection', None)
+    if usar_numpy and USAR_ARROW and pyarrow is not None and hasattr(conexion, 'fetch_df_all'):
+        return _leer_arrow(conexion, sql, parametros, tipos, tamano_lote)
+
+    cursor.arraysize = tamano_lote
+    cursor.prefetchrows = tamano_lote
+    cursor.execute(sql, parametros)
+    tipos = _validar_tipos(tipos, len(cursor.description))
+    return _leer_cursor(cursor, tipos, tamano_lote, usar_numpy)
+
+
+@instrumentacion.instrumentar(nombre="columnar.leer_columnas")
+def leer_columnas(sql: str, parametros=None, tipos: str = None, tamano_lote: int = TAMANO_LOTE,
+                  usar_numpy=None):
+    """
+    Ejecuta una consulta y retorna sus columnas.
+
+    Args:
+        tipos: un código por columna ('d', 'q' u 'O', ej. "qd"); por defecto todas 'd'
+        usar_numpy: None = ndarray si NumPy está instalado, si no array.array
+            (las columnas 'O' son listas); True exige NumPy; False nunca lo usa
+
+    Returns:
+        dict nombre de columna (minúsculas) -> arreglo, en el orden del SELECT
+        None si hubo error de BD
+    """
+    try:
+        with dbFunciones.sesion() as cursor:
+            return _leer(cursor, sql, parametros, tipos, tamano_lote, usar_numpy)
+    except dbFunciones.ErrorConexion:
+        print("Error: No se pudo conectar a la BD para leer las columnas")
+        return None
+    except dbFunciones.DatabaseError as e:
+        print(f"Error DB al leer columnas: {e}")
+        return None
+
+
+def _filtro_fechas(columna: str, desde, hasta, parametros: dict):
+    """Condiciones columna >= :desde AND columna < :hasta (día siguiente), solo las indicadas."""
+    condiciones = []
+    if desde is not None:
+        condiciones.append(f"{columna} >= :desde")
+        parametros['desde'] = datetime(desde.year, desde.month, desde.day)
+    if hasta is not None:
+        condiciones.append(f"{columna} < :hasta")
+        parametros['hasta'] = datetime(hasta.year, hasta.month, hasta.day) + timedelta(days=1)
+    return "".join(f" AND {c}" for c in condiciones)
+
+
+# =============================================================================
+# --- HORAS POR PROYECTO ---
+# =============================================================================
+
+def _agrupar_numpy(claves, valores):
+    ids, grupo = np.unique(claves, return_inverse=True)
+    horas = np.bincount(grupo, weights=valores, minlength=len(ids))
+    registros = np.bincount(grupo, minlength=len(ids))
+    maximo = np.full(len(ids), -np.inf)
+    np.maximum.at(maximo, grupo, valores)
+    return {'idProyecto': ids, 'horas': horas, 'registros': registros,
+            'promedio': horas / np.maximum(registros, 1), 'maximo': maximo}
+
+
+def _agrupar_arrays(claves, valores):
+    acumulado = {}  # idProyecto -> [horas, registros, maximo]
+    for clave, valor in zip(claves, valores):
+        grupo = acumulado.get(clave)
+        if grupo is None:
+            acumulado[clave] = [valor, 1, valor]
+        else:
+            grupo[0] += valor
+            grupo[1] += 1
+            if valor > grupo[2]:
+                grupo[2] = valor
+    ids = sorted(acumulado)
+    grupos = [acumulado[i] for i in ids]
+    return {'idProyecto': array.array('q', ids),
+            'horas': array.array('d', (g[0] for g in grupos)),
+            'registros': array.array('q', (g[1] for g in grupos)),
+            'promedio': array.array('d', (g[0] / g[1] for g in grupos)),
+            'maximo': array.array('d', (g[2] for g in grupos))}
+
+
+@instrumentacion.instrumentar(nombre="columnar.horas_por_proyecto")
+def horas_por_proyecto(desde: datetime = None, hasta: datetime = None, usar_numpy=None):
+    """
+    Horas por proyecto entre `desde` y `hasta` (inclusive; None = sin límite),
+    calculadas sobre las columnas (idProyecto, horasTrabajadas) de registros.
+
+    Returns:
+        dict de columnas alineadas, ordenadas por idProyecto:
+        'idProyecto', 'horas' (suma), 'registros', 'promedio' y 'maximo'
+        None si hubo error de BD
+    """
+    usar_numpy = _usa_numpy(usar_numpy)
+    parametros = {}
+    sql = f"""
+        SELECT idProyecto, horasTrabajadas
+        FROM registros
+        WHERE idProyecto IS NOT NULL AND horasTrabajadas IS NOT NULL
+        {_filtro_fechas('fechaRegistro', desde, hasta, parametros)}
+    """
+    try:
+        with dbFunciones.sesion() as cursor:
+            columnas = _leer(cursor, sql, parametros, "qd", usar_numpy=usar_numpy)
+    except dbFunciones.ErrorConexion:
+        print("Error: No se pudo conectar a la BD para las horas por proyecto")
+        return None
+    except dbFunciones.DatabaseError as e:
+        print(f"Error DB horas por proyecto: {e}")
+        return None
+
+    claves, valores = columnas['idproyecto'], columnas['horastrabajadas']
+    return _agrupar_numpy(claves, valores) if usar_numpy else _agrupar_arrays(claves, valores)
+
+
+# =============================================================================
+# --- ESTADÍSTICAS DE UN INDICADOR ---
+# =============================================================================
+
+def _estadisticas_numpy(dias, valores):
+    x = dias - dias.mean()
+    denominador = float((x * x).sum())
+    return {
+        'n': len(valores),
+        'minimo': float(valores.min()),
+        'maximo': float(valores.max()),
+        'promedio': float(valores.mean()),
+        'desviacion': float(valores.std()),
+        'primero': float(valores[0]),
+        'ultimo': float(valores[-1]),
+        'tendencia_diaria': float((x * (valores - valores.mean())).sum()) / denominador if denominador else 0.0,
+    }
+
+
+def _estadisticas_arrays(dias, valores):
+    # Una pasada con sumas; los días se centran en el primero para no perder precisión
+    n = len(valores)
+    dia0 = dias[0]
+    sx = sy = sxx = sxy = syy = 0.0
+    minimo = maximo = valores[0]
+    for dia, valor in zip(dias, valores):
+        x = dia - dia0
+        sx += x
+        sy += valor
+        sxx += x * x
+        sxy += x * valor
+        syy += valor * valor
+        if valor < minimo:
+            minimo = valor
+        elif valor > maximo:
+            maximo = valor
+    promedio = sy / n
+    denominador = sxx - sx * sx / n
+    return {
+        'n': n,
+        'minimo': minimo,
+        'maximo': maximo,
+        'promedio': promedio,
+        'desviacion': math.sqrt(max(syy / n - promedio * promedio, 0.0)),
+        'primero': valores[0],
+        'ultimo': valores[-1],
+        'tendencia_diaria': (sxy - sx * sy / n) / denominador if denominador else 0.0,
+    }
+
+
+@instrumentacion.instrumentar(nombre="columnar.estadisticas_indicador")
+def estadisticas_indicador(nombre_indicador: str, desde: datetime = None, hasta: datetime = None,
+                           usar_numpy=None):
+    """
+    Estadísticas de los valores registrados de un indicador, por fecha del valor.
+
+    Returns:
+        dict con 'n', 'minimo', 'maximo', 'promedio', 'desviacion' (poblacional),
+        'primero', 'ultimo', 'variacion' (ultimo / primero - 1, None si primero es 0),
+        'tendencia_diaria' (pendiente de mínimos cuadrados: cambio del valor por día),
+        'desde' y 'hasta' (fechas del primer y último valor).
+        Con n = 0 el resto es None. None si hubo error de BD.
+    """
+    usar_numpy = _usa_numpy(usar_numpy)
+    parametros = {'nombre': nombre_indicador}
+    dias = dbFunciones.ALMACENAMIENTO.dias_desde_epoch('fecha_valor')
+    sql = f"""
+        SELECT {dias} AS dia, valor_indicador
+        FROM indicadores_registrados
+        WHERE nombre_indicador = :nombre
+          AND valor_indicador IS NOT NULL AND fecha_valor IS NOT NULL
+        {_filtro_fechas('fecha_valor', desde, hasta, parametros)}
+        ORDER BY fecha_valor
+    """
+    try:
+        with dbFunciones.sesion() as cursor:
+            columnas = _leer(cursor, sql, parametros, "dd", usar_numpy=usar_numpy)
+    except dbFunciones.ErrorConexion:
+        print("Error: No se pudo conectar a la BD para las estadísticas del indicador")
+        return None
+    except dbFunciones.DatabaseError as e:
+        print(f"Error DB estadísticas del indicador: {e}")
+        return None
+
+    dias, valores = columnas['dia'], columnas['valor_indicador']
+    if len(valores) == 0:
+        vacio = dict.fromkeys(('minimo', 'maximo', 'promedio', 'desviacion', 'primero', 'ultimo',
+                               'variacion', 'tendencia_diaria', 'desde', 'hasta'))
+        vacio['n'] = 0
+        return vacio
+
+    estadisticas = _estadisticas_numpy(dias, valores) if usar_numpy else _estadisticas_arrays(dias, valores)
+    primero = estadisticas['primero']
+    estadisticas['variacion'] = estadisticas['ultimo'] / primero - 1 if primero else None
+    estadisticas['desde'] = EPOCH + timedelta(days=math.floor(dias[0]))
+    estadisticas['hasta'] = EPOCH + timedelta(days=math.floor(dias[-1]))
+    return estadisticas
@@ -1,5 +1,4 @@
 
-import oracledb
 import bcrypt 
 from registro import Registro
 import getpass
@@ -8,547 +7,839 @@ from proyecto import Proyecto
 import os
 from dotenv import load_dotenv
 from datetime import datetime
+import threading
+import time
+import atexit
+import sys
+import contextlib
+from contextlib import contextmanager
+from cache_entidades import MapaIdentidad
+import instrumentacion
+import almacenamiento
 
 
 load_dotenv()
 
-# Leer credenciales de entorno
+# Motor de almacenamiento: 'oracle' (por defecto) o 'sqlite' (ver almacenamiento.py)
+ALMACENAMIENTO = almacenamiento.crear_almacenamiento()
+driver = ALMACENAMIENTO.driver
+DatabaseError = driver.DatabaseError
+
+# Leer credenciales de entorno (solo Oracle)
 DB_USER = os.getenv('DB_USER')
 DB_PASSWORD = os.getenv('DB_PASSWORD')
 DB_DSN = os.getenv('DB_DSN')
 
+# Configuración del pool de sesiones (compartido por todo el proceso)
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '4'))
+DB_POOL_INCREMENT = int(os.getenv('DB_POOL_INCREMENT', '1'))
+
+# Objetos cacheados por entidad (0 desactiva el caché)
+DB_CACHE_MAX = int(os.getenv('DB_CACHE_MAX', '1000'))
+
+# Segundos que una sesión puede estar prestada antes de reportarla como posible fuga
+DB_ALERTA_SESION_SEG = float(os.getenv('DB_ALERTA_SESION_SEG', '30'))
+
+# Costo de bcrypt (log2 de las rondas) para las claves nuevas; las guardadas
+# con otro costo se rehacen al iniciar sesión (ver autenticacion.py)
+BCRYPT_COSTO = int(os.getenv('BCRYPT_COSTO', '12'))
+
+_pool = None
+_pool_lock = threading.Lock()
+_esperas_pool = {'esperas': 0, 'tiempo_espera': 0.0}
+_sesiones_prestadas = {}  # id(conn) -> {'sitio', 'desde', 'hilo', 'avisada'}
+
+
+class ErrorConexion(Exception):
+    """No se pudo obtener una sesión del pool."""
+
+
+def obtener_pool():
+    """
+    Retorna el pool de sesiones del proceso, creándolo la primera vez.
+    Si la creación falla se reintenta en la siguiente llamada.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ALMACENAMIENTO.crear_pool(
+                    DB_USER, DB_PASSWORD, DB_DSN,
+                    DB_POOL_MIN, DB_POOL_MAX, DB_POOL_INCREMENT
+                )
+    return _pool
+
 
 def get_connection():
+    """
+    Toma prestada una sesión del pool y la anota en el detector de fugas.
+    Se devuelve con devolver_conexion(conn). Las funciones db_* usan
+    sesion() / transaccion(), que la devuelven siempre.
+    """
     try:
-        return oracledb.connect(user=DB_USER, password=DB_PASSWORD, dsn=DB_DSN)
-    except oracledb.DatabaseError as e:
+        pool = obtener_pool()
+
+        # Si todas las sesiones están ocupadas y no se pueden abrir más, habrá espera
+        saturado = pool.opened >= pool.max and pool.busy >= pool.opened
+        inicio = time.perf_counter()
+        conn = pool.acquire()
+
+        if saturado:
+            with _pool_lock:
+                _esperas_pool['esperas'] += 1
+                _esperas_pool['tiempo_espera'] += time.perf_counter() - inicio
+    except DatabaseError as e:
         print(f"Error al conectar a la Base de Datos: {e}")
         return None
 
+    _registrar_prestamo(conn)
+    return conn
+
 
-def inicializar_admin_por_defecto():
+def devolver_conexion(conn):
+    """Devuelve al pool una sesión obtenida con get_connection()."""
+    with _pool_lock:
+        _sesiones_prestadas.pop(id(conn), None)
+    try:
+        conn.autocommit = False
+        conn.close()
+    except DatabaseError as e:
+        print(f"Error al devolver la sesión al pool: {e}")
+
+
+@contextmanager
+def sesion(confirmar: bool = False):
     """
-    Verifica si existe al menos un administrador en la base de datos.
-    Si no existe ninguno, crea un usuario, empleado y administrador por defecto.
-    
-    Credenciales por defecto:
-    - Usuario: admin
-    - Contraseña: admin123
+    Presta una sesión del pool y entrega un cursor:
+
+        with sesion() as cursor:
+            cursor.execute(...)
+
+    Al salir siempre cierra el cursor y devuelve la sesión. Si el bloque
+    lanza una excepción se hace rollback y la excepción se propaga. Con
+    confirmar=True (ver transaccion) se hace commit al terminar sin errores.
+    La conexión está en cursor.connection.
+
+    Raises:
+        ErrorConexion: si no se pudo obtener una sesión
     """
     conn = get_connection()
-    if not conn:
-        print("No se pudo conectar a la base de datos para verificar admin.")
-        return False
-    
-    cursor = conn.cursor()
-    
+    if conn is None:
+        raise ErrorConexion("No se pudo conectar a la base de datos")
+    # Dentro de una función instrumentada el cursor mide tiempos, filas y viajes
+    cursor = instrumentacion.envolver_cursor(conn.cursor())
+
     try:
-        # Verificar si ya existe al menos un administrador
-        cursor.execute("SELECT COUNT(*) FROM administradores")
-        count = cursor.fetchone()[0]
-        
-        if count > 0:
-            print("Ya existe al menos un administrador. No se requiere crear uno por defecto.")
-            return True
-        
-        print("No se encontró ningún administrador. Creando admin por defecto")
-        
-        # Datos del admin por defecto
-        id_usuario = 1
-        id_empleado = 1
-        id_admin = 1
-        usuario_admin = "admin"
-        clave_plana = "admin123"
-        
-        # Verificar si el usuario base ya existe
-        cursor.execute("SELECT COUNT(*) FROM usuarios WHERE idUsuario = :1", (id_usuario,))
-        if cursor.fetchone()[0] == 0:
-            # Crear usuario base
-            cursor.execute("""
-                INSERT INTO usuarios (idUsuario, nombre, direccion, telefono, correo)
-                VALUES (:1, :2, :3, :4, :5)
-            """, (id_usuario, "Administrador", "Sistema", "0000000000", "admin@sistema.com"))
-        
-        # Verificar si el empleado ya existe
-        cursor.execute("SELECT COUNT(*) FROM empleados WHERE idEmpleado = :1", (id_empleado,))
-        if cursor.fetchone()[0] == 0:
-            # Crear empleado
-            cursor.execute("""
-                INSERT INTO empleados (idEmpleado, fechaInicioContrato, salario, idUsuario, idDepartamento)
-                VALUES (:1, SYSDATE, 0, :2, NULL)
-            """, (id_empleado, id_usuario))
-        
-        # Generar hash de la contraseña
-        clave_hash = bcrypt.hashpw(clave_plana.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        
-        # Crear administrador
-        cursor.execute("""
-            INSERT INTO administradores (idAdmin, usuario, clave, idEmpleado)
-            VALUES (:1, :2, :3, :4)
-        """, (id_admin, usuario_admin, clave_hash, id_empleado))
-        
-        conn.commit()
-        print("=" * 50)
-        print("¡Administrador por defecto creado exitosamente!")
-        print("Usuario: admin")
-        print("Contraseña: admin123")
-        print("¡IMPORTANTE: Cambie la contraseña después del primer inicio de sesión!")
-        print("=" * 50)
-        return True
-        
-    except oracledb.DatabaseError as e:
-        print(f"Error al crear admin por defecto: {e}")
-        conn.rollback()
-        return False
+        yield cursor
+        # Sin cambios pendientes el commit sería un viaje a la BD de más
+        if confirmar and getattr(conn, 'transaction_in_progress', True):
+            instrumentacion.en_bd(cursor, conn.commit)
+    except BaseException:
+        try:
+            instrumentacion.en_bd(cursor, conn.rollback)
+        except DatabaseError:
+            pass
+        raise
     finally:
-        cursor.close()
-        conn.close()
+        try:
+            cursor.close()
+        except DatabaseError:
+            pass
+        devolver_conexion(conn)
 
 
-def selectUsuarios():
-    conn = get_connection()
+def transaccion():
+    """Como sesion(), pero confirma (commit) al salir del bloque sin errores."""
+    return sesion(confirmar=True)
+
+
+# --- Detector de fugas de sesiones ---
+
+# Frames que no interesan al buscar quién pidió la sesión
+_FUNCIONES_SESION = {'_sitio_llamada', '_registrar_prestamo', 'get_connection',
+                     'sesion', 'transaccion', '__enter__'}
+
 
-    if not conn: return
-    cursor = conn.cursor()
-    
-    cursor.execute("select * from registros r join empleados e on e.idEmpleado = r.idEmpleado")
-    for row in cursor:
-        print(row)
-    cursor.close()
-    conn.close()
+def _sitio_llamada():
+    """'archivo:línea en función' de quien pidió la sesión, y de quién lo llamó."""
+    frame = sys._getframe(1)
+    while frame is not None and (frame.f_code.co_name in _FUNCIONES_SESION
+                                 or frame.f_code.co_filename == contextlib.__file__):
+        frame = frame.f_back
+    if frame is None:
+        return "desconocido"
+
+    sitio = f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} en {frame.f_code.co_name}"
+    llamador = frame.f_back
+    if llamador is not None:
+        sitio += (f" (desde {os.path.basename(llamador.f_code.co_filename)}:"
+                  f"{llamador.f_lineno} en {llamador.f_code.co_name})")
+    return sitio
+
+
+def _registrar_prestamo(conn):
+    ahora = time.monotonic()
+    with _pool_lock:
+        _sesiones_prestadas[id(conn)] = {
+            'sitio': _sitio_llamada(),
+            'desde': ahora,
+            'hilo': threading.current_thread().name,
+            'avisada': False
+        }
+        # Cada préstamo revisa si alguna sesión lleva demasiado tiempo afuera
+        sospechosas = []
+        for prestamo in _sesiones_prestadas.values():
+            if not prestamo['avisada'] and ahora - prestamo['desde'] > DB_ALERTA_SESION_SEG:
+                prestamo['avisada'] = True
+                sospechosas.append(dict(prestamo))
+
+    for prestamo in sospechosas:
+        print(f"Aviso: sesión prestada hace {ahora - prestamo['desde']:.0f} s sin devolver "
+              f"(hilo {prestamo['hilo']}): {prestamo['sitio']}")
+
+
+def db_sesiones_prestadas():
+    """
+    Sesiones tomadas del pool que aún no se devuelven.
+
+    Returns:
+        lista de dict con 'sitio' (dónde se pidió), 'segundos' e 'hilo',
+        de la más antigua a la más reciente
+    """
+    ahora = time.monotonic()
+    with _pool_lock:
+        prestamos = list(_sesiones_prestadas.values())
+    return [
+        {'sitio': p['sitio'], 'segundos': ahora - p['desde'], 'hilo': p['hilo']}
+        for p in sorted(prestamos, key=lambda p: p['desde'])
+    ]
+
+
+def _reportar_sesiones_abiertas():
+    for prestamo in db_sesiones_prestadas():
+        print(f"Fuga: sesión sin devolver al salir ({prestamo['segundos']:.0f} s, "
+              f"hilo {prestamo['hilo']}): {prestamo['sitio']}")
+
+
+def cerrar_pool():
+    """Cierra el pool de sesiones (se llama automáticamente al salir)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            try:
+                _pool.close(force=True)
+            except DatabaseError as e:
+                print(f"Error al cerrar el pool: {e}")
+            _pool = None
+
+
+atexit.register(cerrar_pool)
+atexit.register(_reportar_sesiones_abiertas)  # atexit es LIFO: corre antes de cerrar el pool
+
+
+def db_estadisticas_pool():
+    """
+    Retorna las estadísticas del pool de sesiones.
+
+    Returns:
+        dict con: 'backend', 'ocupadas', 'abiertas', 'min', 'max', 'esperas' y
+        'tiempo_espera' (segundos acumulados esperando una sesión libre)
+    """
+    with _pool_lock:
+        esperas = dict(_esperas_pool)
+    esperas['backend'] = ALMACENAMIENTO.descripcion()
+
+    pool = _pool
+    if pool is None:
+        return {'ocupadas': 0, 'abiertas': 0, 'min': DB_POOL_MIN, 'max': DB_POOL_MAX, **esperas}
+
+    return {
+        'ocupadas': pool.busy,
+        'abiertas': pool.opened,
+        'min': pool.min,
+        'max': pool.max,
+        **esperas
+    }
+
+
+# =============================================================================
+# --- MAPA DE IDENTIDAD (caché de objetos) ---
+# =============================================================================
+# db_buscar_*_por_id devuelven el mismo objeto mientras no se modifique en la BD.
+# Toda función que cambia un empleado, departamento o proyecto debe llamar a
+# invalidar_empleado / invalidar_departamento / invalidar_proyecto.
+
+_cache_empleados = MapaIdentidad('empleados', DB_CACHE_MAX)
+_cache_departamentos = MapaIdentidad('departamentos', DB_CACHE_MAX)
+_cache_proyectos = MapaIdentidad('proyectos', DB_CACHE_MAX)
+_cache_ruts = MapaIdentidad('ruts', DB_CACHE_MAX)  # RUT -> idEmpleado
+
+
+def _contiene_empleado(lista, id_empleado):
+    return any(emp.idEmpleado == id_empleado for emp in lista or [])
+
+
+def invalidar_empleado(id_empleado: int):
+    """Descarta el empleado y los departamentos/proyectos que lo contienen."""
+    _cache_empleados.invalidar(id_empleado)
+    _cache_departamentos.invalidar_si(
+        lambda d: (d.gerente is not None and d.gerente.idEmpleado == id_empleado)
+        or (d.empleados_cargados() and _contiene_empleado(d.empleados, id_empleado))
+    )
+    _cache_proyectos.invalidar_si(lambda p: _contiene_empleado(p.empleados, id_empleado))
+
+
+def invalidar_empleados(ids_empleados):
+    """Como invalidar_empleado, pero recorre el caché una sola vez para toda la lista."""
+    ids = set(ids_empleados)
+    if not ids:
+        return
+    _cache_empleados.invalidar(*ids)
+    _cache_departamentos.invalidar_si(
+        lambda d: (d.gerente is not None and d.gerente.idEmpleado in ids)
+        or (d.empleados_cargados() and any(emp.idEmpleado in ids for emp in d.empleados or []))
+    )
+    _cache_proyectos.invalidar_si(lambda p: any(emp.idEmpleado in ids for emp in p.empleados or []))
+
+
+def invalidar_departamento(id_depto: int):
+    """Descarta el departamento y los empleados que lo referencian."""
+    _cache_departamentos.invalidar(id_depto)
+    _cache_empleados.invalidar_si(
+        lambda e: e.departamento is not None and e.departamento.idDepartamento == id_depto
+    )
+
+
+def invalidar_proyecto(id_proyecto: int):
+    _cache_proyectos.invalidar(id_proyecto)
+
+
+def db_limpiar_cache():
+    """Vacía el caché de objetos (p. ej. tras cambios hechos fuera de la aplicación)."""
+    for cache in (_cache_empleados, _cache_departamentos, _cache_proyectos, _cache_ruts):
+        cache.limpiar()
+
+
+def db_estadisticas_cache():
+    """Retorna aciertos, fallos y tamaño del caché de cada entidad."""
+    return [cache.estadisticas() for cache in (_cache_empleados, _cache_departamentos, _cache_proyectos)]
+
+
+def generar_hash_clave(clave_plana: str) -> str:
+    """Hash bcrypt de una clave con el costo BCRYPT_COSTO."""
+    return bcrypt.hashpw(clave_plana.encode('utf-8'), bcrypt.gensalt(BCRYPT_COSTO)).decode('utf-8')
+
+
+def selectUsuarios():
+    try:
+        with sesion() as cursor:
+            cursor.execute("select * from registros r join empleados e on e.idEmpleado = r.idEmpleado")
+            for row in cursor:
+                print(row)
+    except ErrorConexion:
+        return
 
 
 def db_cambiar_clave_admin(usuario: str, clave_actual: str, clave_nueva: str):
     """
     Cambia la contraseña de un administrador.
     Primero verifica que la clave actual sea correcta.
-    
+
     Returns:
         True si el cambio fue exitoso
         str con mensaje de error si falla
     """
-    conn = get_connection()
-    if not conn:
+    try:
+        with sesion() as cursor:
+            cursor.execute("SELECT idAdmin, clave FROM administradores WHERE usuario = :1", (usuario,))
+            resultado = cursor.fetchone()
+    except ErrorConexion:
         return "Error de conexión a la base de datos"
-    
-    cursor = conn.cursor()
-    
+    except DatabaseError as e:
+        return f"Error de base de datos: {e}"
+
+    if not resultado:
+        return "Usuario no encontrado"
+    id_admin, clave_hash_bd = resultado
+
+    # bcrypt corre con la sesión ya devuelta al pool
+    if not bcrypt.checkpw(clave_actual.encode('utf-8'), clave_hash_bd.encode('utf-8')):
+        return "La contraseña actual es incorrecta"
+
+    actualizado = db_actualizar_clave_admin(id_admin, clave_hash_bd, generar_hash_clave(clave_nueva))
+    if actualizado is False:
+        return "La contraseña cambió mientras se verificaba, intente nuevamente"
+    return actualizado
+
+
+def db_actualizar_clave_admin(id_admin: int, clave_hash_anterior: str, clave_hash_nueva: str):
+    """
+    Reemplaza el hash de la clave de un admin solo si sigue siendo
+    clave_hash_anterior: si otra sesión la cambió mientras se calculaba
+    el hash nuevo, no se pisa ese cambio.
+
+    Returns:
+        True si se actualizó
+        False si el hash guardado ya no era clave_hash_anterior
+        str con mensaje de error si falla
+    """
     try:
-        # Verificar que el usuario existe y la clave actual es correcta
-        cursor.execute("SELECT clave FROM administradores WHERE usuario = :1", (usuario,))
-        resultado = cursor.fetchone()
-        
-        if not resultado:
-            return "Usuario no encontrado"
-        
-        clave_hash_bd = resultado[0]
-        
-        # Verificar clave actual
-        if not bcrypt.checkpw(clave_actual.encode('utf-8'), clave_hash_bd.encode('utf-8')):
-            return "La contraseña actual es incorrecta"
-        
-        # Generar hash de la nueva clave
-        nueva_clave_hash = bcrypt.hashpw(clave_nueva.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        
-        # Actualizar la clave
-        cursor.execute("UPDATE administradores SET clave = :1 WHERE usuario = :2", (nueva_clave_hash, usuario))
-        conn.commit()
-        
-        return True
-        
-    except oracledb.DatabaseError as e:
-        conn.rollback()
+        with transaccion() as cursor:
+            cursor.execute("""
+                UPDATE administradores SET clave = :1
+                WHERE idAdmin = :2 AND clave = :3
+            """, (clave_hash_nueva, id_admin, clave_hash_anterior))
+            return cursor.rowcount > 0
+    except ErrorConexion:
+        return "Error de conexión a la base de datos"
+    except DatabaseError as e:
         return f"Error de base de datos: {e}"
-    finally:
-        cursor.close()
-        conn.close()
 
 
-def db_crear_nuevo_admin(id_admin: int, usuario: str, clave_plana: str, id_empleado: int):
+def db_crear_nuevo_admin(usuario: str, clave_plana: str, id_empleado: int):
     """
     Crea un nuevo administrador en la base de datos.
-    
+    El idAdmin lo asigna la secuencia seq_administradores.
+
     Args:
-        id_admin: ID único del administrador
         usuario: Nombre de usuario para login
         clave_plana: Contraseña sin encriptar
         id_empleado: ID del empleado asociado
-    
+
     Returns:
         True si se creó exitosamente
         str con mensaje de error si falla
     """
-    conn = get_connection()
-    if not conn:
-        return "Error de conexión a la base de datos"
-    
-    cursor = conn.cursor()
-    
     try:
-        # Verificar que el empleado existe
-        cursor.execute("SELECT COUNT(*) FROM empleados WHERE idEmpleado = :1", (id_empleado,))
-        if cursor.fetchone()[0] == 0:
-            return "El empleado especificado no existe"
-        
-        # Verificar que el ID de admin no existe
-        cursor.execute("SELECT COUNT(*) FROM administradores WHERE idAdmin = :1", (id_admin,))
-        if cursor.fetchone()[0] > 0:
-            return "Ya existe un administrador con ese ID"
-        
-        # Verificar que el usuario no existe
-        cursor.execute("SELECT COUNT(*) FROM administradores WHERE usuario = :1", (usuario,))
-        if cursor.fetchone()[0] > 0:
-            return "Ya existe un administrador con ese nombre de usuario"
-        
-        # Verificar que el empleado no es ya un admin
-        cursor.execute("SELECT COUNT(*) FROM administradores WHERE idEmpleado = :1", (id_empleado,))
-        if cursor.fetchone()[0] > 0:
-            return "El empleado ya es administrador"
-        
-        # Generar hash de la contraseña
-        clave_hash = bcrypt.hashpw(clave_plana.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        
-        # Insertar el nuevo admin
-        sql = "INSERT INTO administradores (idAdmin, usuario, clave, idEmpleado) VALUES (:1, :2, :3, :4)"
-        cursor.execute(sql, (id_admin, usuario, clave_hash, id_empleado))
-        conn.commit()
-        
-        return True
-        
-    except oracledb.DatabaseError as e:
-        conn.rollback()
-        return f"Error de base de datos: {e}"
-    finally:
-        cursor.close()
-        conn.close()
+        with transaccion() as cursor:
+            # Verificar que el empleado existe
+            cursor.execute("SELECT COUNT(*) FROM empleados WHERE idEmpleado = :1", (id_empleado,))
+            if cursor.fetchone()[0] == 0:
+                return "El empleado especificado no existe"
 
+            # Verificar que el usuario no existe
+            cursor.execute("SELECT COUNT(*) FROM administradores WHERE usuario = :1", (usuario,))
+            if cursor.fetchone()[0] > 0:
+                return "Ya existe un administrador con ese nombre de usuario"
 
-def db_obtener_siguiente_id_admin():
-    """
-    Obtiene el siguiente ID disponible para un nuevo administrador.
-    """
-    conn = get_connection()
-    if not conn:
-        return 1
-    
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("SELECT MAX(idAdmin) FROM administradores")
-        resultado = cursor.fetchone()
-        if resultado[0] is None:
-            return 1
-        return resultado[0] + 1
-    except oracledb.DatabaseError:
-        return 1
-    finally:
-        cursor.close()
-        conn.close()
+            # Verificar que el empleado no es ya un admin
+            cursor.execute("SELECT COUNT(*) FROM administradores WHERE idEmpleado = :1", (id_empleado,))
+            if cursor.fetchone()[0] > 0:
+                return "El empleado ya es administrador"
+
+            # Generar hash de la contraseña
+            clave_hash = generar_hash_clave(clave_plana)
+
+            # Insertar el nuevo admin
+            sql = "INSERT INTO administradores (usuario, clave, idEmpleado) VALUES (:1, :2, :3)"
+            cursor.execute(sql, (usuario, clave_hash, id_empleado))
+
+        return True
+
+    except ErrorConexion:
+        return "Error de conexión a la base de datos"
+    except DatabaseError as e:
+        return f"Error de base de datos: {e}"
 
 
 def db_obtener_usuario_admin_por_id_empleado(id_empleado: int):
     """
     Obtiene el nombre de usuario del administrador asociado a un empleado.
     """
-    conn = get_connection()
-    if not conn:
-        return None
-    
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("SELECT usuario FROM administradores WHERE idEmpleado = :1", (id_empleado,))
-        resultado = cursor.fetchone()
+        with sesion() as cursor:
+            cursor.execute("SELECT usuario FROM administradores WHERE idEmpleado = :1", (id_empleado,))
+            resultado = cursor.fetchone()
         if resultado:
             return resultado[0]
         return None
-    except oracledb.DatabaseError:
+    except (ErrorConexion, DatabaseError):
         return None
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def db_listar_administradores():
     """
     Retorna una lista de todos los administradores.
     """
-    conn = get_connection()
-    if not conn:
-        return []
-    
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("""
-            SELECT a.idAdmin, a.usuario, a.idEmpleado, u.nombre
-            FROM administradores a
-            LEFT JOIN empleados e ON a.idEmpleado = e.idEmpleado
-            LEFT JOIN usuarios u ON e.idUsuario = u.idUsuario
-            ORDER BY a.idAdmin
-        """)
-        admins = []
-        for row in cursor.fetchall():
-            admins.append({
-                'idAdmin': row[0],
-                'usuario': row[1],
-                'idEmpleado': row[2],
-                'nombreEmpleado': row[3] or "Sin nombre"
-            })
+        with sesion() as cursor:
+            cursor.execute("""
+                SELECT a.idAdmin, a.usuario, a.idEmpleado, u.nombre
+                FROM administradores a
+                LEFT JOIN empleados e ON a.idEmpleado = e.idEmpleado
+                LEFT JOIN usuarios u ON e.idUsuario = u.idUsuario
+                ORDER BY a.idAdmin
+            """)
+            admins = []
+            for row in cursor.fetchall():
+                admins.append({
+                    'idAdmin': row[0],
+                    'usuario': row[1],
+                    'idEmpleado': row[2],
+                    'nombreEmpleado': row[3] or "Sin nombre"
+                })
         return admins
-    except oracledb.DatabaseError:
+    except (ErrorConexion, DatabaseError):
         return []
-    finally:
-        cursor.close()
-        conn.close()
 
 
-def db_listar_todos_departamentos():
+# --- Listados: paginación por clave y lectura en streaming ---
+# Las páginas se piden con "WHERE id > :ultimo ORDER BY id FETCH FIRST :n",
+# que usa el índice de la PK y cuesta lo mismo en la página 1 que en la 500
+# (a diferencia de OFFSET). Los iteradores leen la tabla por lotes de
+# arraysize filas sin cargarla completa en memoria.
+
+TAMANO_PAGINA = 200
+TAMANO_LOTE = 500
+
+SQL_LISTAR_DEPARTAMENTOS = """
+    SELECT d.idDepartamento, d.nombre, u.nombre
+    FROM departamentos d
+    LEFT JOIN empleados e ON d.idgerenteresponsable = e.idEmpleado
+    LEFT JOIN usuarios u ON e.idUsuario = u.idUsuario
+"""
+
+SQL_LISTAR_EMPLEADOS = """
+    SELECT e.idEmpleado, u.nombre, u.correo, e.salario, d.nombre as depto
+    FROM empleados e
+    JOIN usuarios u ON e.idUsuario = u.idUsuario
+    LEFT JOIN departamentos d ON e.idDepartamento = d.idDepartamento
+"""
+
+SQL_LISTAR_PROYECTOS = """
+    SELECT p.idProyecto, p.nombre, p.fechaInicioProyecto, p.descripcion,
+           (SELECT COUNT(*) FROM proyecto_empleados pe WHERE pe.idProyecto = p.idProyecto) as numEmpleados
+    FROM proyectos p
+"""
+
+
+def _fila_departamento(row):
+    return {
+        'idDepartamento': row[0],
+        'nombre': row[1],
+        'gerente': row[2] or "Sin Gerente"
+    }
+
+
+def _fila_empleado(row):
+    return {
+        'idEmpleado': row[0],
+        'nombre': row[1],
+        'correo': row[2],
+        'salario': row[3],
+        'departamento': row[4] or "Sin Depto"
+    }
+
+
+def _fila_proyecto(row):
+    fecha = row[2].strftime("%Y-%m-%d") if row[2] else "N/A"
+    return {
+        'idProyecto': row[0],
+        'nombre': row[1],
+        'fechaInicio': fecha,
+        'descripcion': row[3] or "",
+        'numEmpleados': row[4] or 0
+    }
+
+
+def _consultar_pagina(sql_base: str, columna_id: str, ultimo_id: int, tamano: int, convertir, descripcion: str):
     """
-    Retorna una lista de todos los departamentos con info del gerente.
+    Retorna hasta `tamano` filas con columna_id > ultimo_id, ordenadas por columna_id.
     """
-    conn = get_connection()
-    if not conn:
-        print("Error: No se pudo conectar a la BD para listar departamentos")
-        return []
-    
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("""
-            SELECT d.idDepartamento, d.nombre, u.nombre
-            FROM departamentos d
-            LEFT JOIN empleados e ON d.idgerenteresponsable = e.idEmpleado
-            LEFT JOIN usuarios u ON e.idUsuario = u.idUsuario
-            ORDER BY d.idDepartamento
-        """)
-        departamentos = []
-        for row in cursor.fetchall():
-            departamentos.append({
-                'idDepartamento': row[0],
-                'nombre': row[1],
-                'gerente': row[2] or "Sin Gerente"
-            })
-        print(f"Departamentos encontrados: {len(departamentos)}")
-        return departamentos
-    except oracledb.DatabaseError as e:
-        print(f"Error DB departamentos: {e}")
+        with sesion() as cursor:
+            # Se sabe cuántas filas vienen: todo llega en el mismo viaje que el execute
+            cursor.arraysize = tamano
+            cursor.prefetchrows = tamano + 1
+
+            cursor.execute(
+                sql_base + f" WHERE {columna_id} > :ultimo ORDER BY {columna_id} FETCH FIRST :n ROWS ONLY",
+                {'ultimo': ultimo_id, 'n': tamano}
+            )
+            return [convertir(row) for row in cursor.fetchall()]
+    except ErrorConexion:
+        print(f"Error: No se pudo conectar a la BD para listar {descripcion}")
         return []
-    finally:
-        cursor.close()
-        conn.close()
+    except DatabaseError as e:
+        print(f"Error DB {descripcion}: {e}")
+        return []
+
+
+def _iterar_consulta(sql_base: str, columna_id: str, tamano_lote: int, convertir, descripcion: str):
+    """
+    Generador que recorre la consulta completa de a `tamano_lote` filas.
+    La sesión queda tomada mientras se itera y vuelve al pool al terminar
+    (o al cerrar el generador).
+    """
+    try:
+        with sesion() as cursor:
+            cursor.arraysize = tamano_lote
+            cursor.prefetchrows = tamano_lote
+
+            cursor.execute(sql_base + f" ORDER BY {columna_id}")
+            while True:
+                filas = cursor.fetchmany()
+                if not filas:
+                    break
+                for row in filas:
+                    yield convertir(row)
+    except ErrorConexion:
+        print(f"Error: No se pudo conectar a la BD para listar {descripcion}")
+    except DatabaseError as e:
+        print(f"Error DB {descripcion}: {e}")
+
+
+def db_listar_departamentos_pagina(ultimo_id: int = 0, tamano: int = TAMANO_PAGINA):
+    """
+    Retorna la página de departamentos siguiente a `ultimo_id`.
+    Para pedir la próxima página se pasa el idDepartamento del último elemento.
+    """
+    return _consultar_pagina(SQL_LISTAR_DEPARTAMENTOS, "d.idDepartamento", ultimo_id, tamano,
+                             _fila_departamento, "departamentos")
+
+
+def db_listar_empleados_pagina(ultimo_id: int = 0, tamano: int = TAMANO_PAGINA):
+    """
+    Retorna la página de empleados siguiente a `ultimo_id`.
+    Para pedir la próxima página se pasa el idEmpleado del último elemento.
+    """
+    return _consultar_pagina(SQL_LISTAR_EMPLEADOS, "e.idEmpleado", ultimo_id, tamano,
+                             _fila_empleado, "empleados")
+
+
+def db_listar_proyectos_pagina(ultimo_id: int = 0, tamano: int = TAMANO_PAGINA):
+    """
+    Retorna la página de proyectos siguiente a `ultimo_id`.
+    Para pedir la próxima página se pasa el idProyecto del último elemento.
+    """
+    return _consultar_pagina(SQL_LISTAR_PROYECTOS, "p.idProyecto", ultimo_id, tamano,
+                             _fila_proyecto, "proyectos")
+
+
+def db_iterar_departamentos(tamano_lote: int = TAMANO_LOTE):
+    """Generador con todos los departamentos (mismo formato que db_listar_todos_departamentos)."""
+    return _iterar_consulta(SQL_LISTAR_DEPARTAMENTOS, "d.idDepartamento", tamano_lote,
+                            _fila_departamento, "departamentos")
+
+
+def db_iterar_empleados(tamano_lote: int = TAMANO_LOTE):
+    """Generador con todos los empleados (mismo formato que db_listar_todos_empleados)."""
+    return _iterar_consulta(SQL_LISTAR_EMPLEADOS, "e.idEmpleado", tamano_lote,
+                            _fila_empleado, "empleados")
+
+
+def db_iterar_proyectos(tamano_lote: int = TAMANO_LOTE):
+    """Generador con todos los proyectos (mismo formato que db_listar_todos_proyectos)."""
+    return _iterar_consulta(SQL_LISTAR_PROYECTOS, "p.idProyecto", tamano_lote,
+                            _fila_proyecto, "proyectos")
+
+
+def db_listar_todos_departamentos():
+    """
+    Retorna una lista de todos los departamentos con info del gerente.
+    Para tablas grandes usar db_listar_departamentos_pagina o db_iterar_departamentos.
+    """
+    departamentos = list(db_iterar_departamentos())
+    print(f"Departamentos encontrados: {len(departamentos)}")
+    return departamentos
 
 
 def db_listar_todos_empleados():
     """
     Retorna una lista de todos los empleados con info del departamento.
+    Para tablas grandes usar db_listar_empleados_pagina o db_iterar_empleados.
     """
-    conn = get_connection()
-    if not conn:
-        print("Error: No se pudo conectar a la BD para listar empleados")
-        return []
-    
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
-            SELECT e.idEmpleado, u.nombre, u.correo, e.salario, d.nombre as depto
-            FROM empleados e
-            JOIN usuarios u ON e.idUsuario = u.idUsuario
-            LEFT JOIN departamentos d ON e.idDepartamento = d.idDepartamento
-            ORDER BY e.idEmpleado
-        """)
-        empleados = []
-        for row in cursor.fetchall():
-            empleados.append({
-                'idEmpleado': row[0],
-                'nombre': row[1],
-                'correo': row[2],
-                'salario': row[3],
-                'departamento': row[4] or "Sin Depto"
-            })
-        print(f"Empleados encontrados: {len(empleados)}")
-        return empleados
-    except oracledb.DatabaseError as e:
-        print(f"Error DB empleados: {e}")
-        return []
-    finally:
-        cursor.close()
-        conn.close()
+    empleados = list(db_iterar_empleados())
+    print(f"Empleados encontrados: {len(empleados)}")
+    return empleados
 
 
 def db_listar_todos_proyectos():
     """
     Retorna una lista de todos los proyectos.
+    Para tablas grandes usar db_listar_proyectos_pagina o db_iterar_proyectos.
     """
-    conn = get_connection()
-    if not conn:
-        print("Error: No se pudo conectar a la BD para listar proyectos")
-        return []
-    
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("""
-            SELECT p.idProyecto, p.nombre, p.fechaInicioProyecto, p.descripcion,
-                   (SELECT COUNT(*) FROM proyecto_empleados pe WHERE pe.idProyecto = p.idProyecto) as numEmpleados
-            FROM proyectos p
-            ORDER BY p.idProyecto
-        """)
-        proyectos = []
-        for row in cursor.fetchall():
-            fecha = row[2].strftime("%Y-%m-%d") if row[2] else "N/A"
-            proyectos.append({
-                'idProyecto': row[0],
-                'nombre': row[1],
-                'fechaInicio': fecha,
-                'descripcion': row[3] or "",
-                'numEmpleados': row[4] or 0
-            })
-        print(f"Proyectos encontrados: {len(proyectos)}")
-        return proyectos
-    except oracledb.DatabaseError as e:
-        print(f"Error DB proyectos: {e}")
-        return []
-    finally:
-        cursor.close()
-        conn.close()
+    proyectos = list(db_iterar_proyectos())
+    print(f"Proyectos encontrados: {len(proyectos)}")
+    return proyectos
 
 
 # =============================================================================
 # --- FUNCIONES DE INDICADORES ECONÓMICOS ---
 # =============================================================================
 
-def db_obtener_siguiente_id_indicador():
-    """Obtiene el siguiente ID disponible para un indicador."""
-    conn = get_connection()
-    if not conn:
-        return 1
-    
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT MAX(idIndicadorRegistro) FROM indicadores_registrados")
-        resultado = cursor.fetchone()
-        if resultado[0] is None:
-            return 1
-        return resultado[0] + 1
-    except oracledb.DatabaseError:
-        return 1
-    finally:
-        cursor.close()
-        conn.close()
+SQL_INSERTAR_INDICADOR = """
+    INSERT INTO indicadores_registrados 
+    (nombre_indicador, valor_indicador, fecha_valor, fecha_consulta, sitio_proveedor, id_admin_consulta)
+    VALUES (:1, :2, :3, :4, :5, :6)
+"""
+
+
+def _convertir_fecha_indicador(fecha_valor):
+    """Convierte la fecha de la API ("2025-12-03T03:00:00.000Z") a date."""
+    if isinstance(fecha_valor, str):
+        try:
+            return datetime.strptime(fecha_valor[:10], "%Y-%m-%d").date()
+        except ValueError:
+            return datetime.now().date()
+    return fecha_valor
 
 
 def db_registrar_indicador(nombre_indicador: str, valor: float, fecha_valor: str, id_admin: int):
     """
     Registra un indicador económico en la base de datos.
-    
+
     Args:
         nombre_indicador: Nombre del indicador (ej: "UF", "Dólar Observado")
         valor: Valor del indicador
         fecha_valor: Fecha del valor en formato string
         id_admin: ID del admin que registra
-    
+
     Returns:
         True si se registró exitosamente, str con error si falla
     """
-    conn = get_connection()
-    if not conn:
-        return "Error de conexión a la base de datos"
-    
-    cursor = conn.cursor()
-    
+    fecha_val = _convertir_fecha_indicador(fecha_valor)
+    fecha_consulta = datetime.now().date()
+
     try:
-        id_registro = db_obtener_siguiente_id_indicador()
-        
-        # Convertir fecha del indicador
-        if isinstance(fecha_valor, str):
-            # El formato viene como "2025-12-03T03:00:00.000Z" de la API
-            try:
-                fecha_val = datetime.strptime(fecha_valor[:10], "%Y-%m-%d").date()
-            except ValueError:
-                fecha_val = datetime.now().date()
-        else:
-            fecha_val = fecha_valor
-        
-        fecha_consulta = datetime.now().date()
-        
-        cursor.execute("""
-            INSERT INTO indicadores_registrados 
-            (idIndicadorRegistro, nombre_indicador, valor_indicador, fecha_valor, fecha_consulta, sitio_proveedor, id_admin_consulta)
-            VALUES (:1, :2, :3, :4, :5, :6, :7)
-        """, (id_registro, nombre_indicador, valor, fecha_val, fecha_consulta, "mindicador.cl", id_admin))
-        
-        conn.commit()
+        with transaccion() as cursor:
+            cursor.execute(SQL_INSERTAR_INDICADOR,
+                           (nombre_indicador, valor, fecha_val, fecha_consulta, "mindicador.cl", id_admin))
         return True
-        
-    except oracledb.DatabaseError as e:
-        conn.rollback()
+
+    except ErrorConexion:
+        return "Error de conexión a la base de datos"
+    except DatabaseError as e:
         return f"Error de base de datos: {e}"
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def db_registrar_multiples_indicadores(indicadores: dict, id_admin: int):
     """
     Registra múltiples indicadores de una vez.
-    
+    Usa un solo executemany con batcherrors: las filas válidas se guardan
+    en una sola transacción y las que fallan se reportan una por una.
+
     Args:
         indicadores: Diccionario con objetos Mindicador
         id_admin: ID del admin que registra
-    
+
     Returns:
         dict con resultados: {'exitosos': int, 'fallidos': int, 'errores': list}
     """
     resultados = {'exitosos': 0, 'fallidos': 0, 'errores': []}
-    
-    for nombre, indicador in indicadores.items():
-        resultado = db_registrar_indicador(
-            indicador.nombre,
-            indicador.valor,
-            indicador.fecha,
-            id_admin
-        )
-        
-        if resultado is True:
-            resultados['exitosos'] += 1
-        else:
-            resultados['fallidos'] += 1
-            resultados['errores'].append(f"{indicador.nombre}: {resultado}")
-    
+
+    lista = list(indicadores.values())
+    if not lista:
+        return resultados
+
+    fecha_consulta = datetime.now().date()
+    filas = [
+        (ind.nombre, ind.valor, _convertir_fecha_indicador(ind.fecha), fecha_consulta, "mindicador.cl", id_admin)
+        for ind in lista
+    ]
+
+    try:
+        with sesion() as cursor:
+            # Tipos fijos para que un valor None en la primera fila no cambie el tipo del bind
+            cursor.setinputsizes(50, driver.DB_TYPE_NUMBER, driver.DB_TYPE_DATE,
+                                 driver.DB_TYPE_DATE, 100, driver.DB_TYPE_NUMBER)
+
+            # Con autocommit el commit viaja junto con el lote (un solo round-trip)
+            cursor.connection.autocommit = True
+            cursor.executemany(SQL_INSERTAR_INDICADOR, filas, batcherrors=True)
+
+            errores = cursor.getbatcherrors()
+        for error in errores:
+            resultados['errores'].append(f"{lista[error.offset].nombre}: Error de base de datos: {error.message}")
+
+        resultados['fallidos'] = len(errores)
+        resultados['exitosos'] = len(filas) - len(errores)
+
+    except ErrorConexion:
+        resultados['fallidos'] = len(lista)
+        resultados['errores'].append("Error de conexión a la base de datos")
+    except DatabaseError as e:
+        resultados['fallidos'] = len(filas)
+        resultados['errores'].append(f"Error de base de datos: {e}")
+
     return resultados
 
 
 def db_obtener_historial_indicadores(limite: int = 50):
     """
     Obtiene el historial de indicadores registrados.
-    
+
     Args:
         limite: Número máximo de registros a retornar
-    
+
     Returns:
         Lista de diccionarios con los indicadores
     """
-    conn = get_connection()
-    if not conn:
+    try:
+        with sesion() as cursor:
+            cursor.execute("""
+                SELECT i.idIndicadorRegistro, i.nombre_indicador, i.valor_indicador,
+                       i.fecha_valor, i.fecha_consulta, i.sitio_proveedor,
+                       a.usuario as admin_usuario
+                FROM indicadores_registrados i
+                LEFT JOIN administradores a ON i.id_admin_consulta = a.idAdmin
+                ORDER BY i.fecha_consulta DESC, i.idIndicadorRegistro DESC
+                FETCH FIRST :1 ROWS ONLY
+            """, (limite,))
+            filas = cursor.fetchall()
+
+        indicadores = []
+        for row in filas:
+            indicadores.append({
+                'id': row[0],
+                'nombre': row[1],
+                'valor': row[2],
+                'fecha_valor': row[3],
+                'fecha_consulta': row[4],
+                'proveedor': row[5],
+                'admin': row[6] or "Desconocido"
+            })
+        return indicadores
+
+    except ErrorConexion:
         return []
-    
-    cursor = conn.cursor()
-    
+    except DatabaseError as e:
+        print(f"Error al obtener historial: {e}")
+        return []
+
+
+def db_obtener_historial_indicadores_pagina(ultimo_id: 'int|None' = None, tamano: int = TAMANO_PAGINA):
+    """
+    Página del historial de indicadores, del más reciente al más antiguo.
+    Paginación por clave sobre idIndicadorRegistro (asignado en orden de registro).
+
+    Args:
+        ultimo_id: idIndicadorRegistro del último elemento de la página anterior (None = primera página)
+        tamano: Número máximo de registros a retornar
+
+    Returns:
+        Lista de diccionarios con el mismo formato que db_obtener_historial_indicadores
+    """
     try:
-        cursor.execute("""
-            SELECT i.idIndicadorRegistro, i.nombre_indicador, i.valor_indicador, 
-                   i.fecha_valor, i.fecha_consulta, i.sitio_proveedor, 
-                   a.usuario as admin_usuario
-            FROM indicadores_registrados i
-            LEFT JOIN administradores a ON i.id_admin_consulta = a.idAdmin
-            ORDER BY i.fecha_consulta DESC, i.idIndicadorRegistro DESC
-            FETCH FIRST :1 ROWS ONLY
-        """, (limite,))
-        
+        with sesion() as cursor:
+            cursor.arraysize = tamano
+            cursor.prefetchrows = tamano + 1
+
+            cursor.execute("""
+                SELECT i.idIndicadorRegistro, i.nombre_indicador, i.valor_indicador,
+                       i.fecha_valor, i.fecha_consulta, i.sitio_proveedor,
+                       a.usuario as admin_usuario
+                FROM indicadores_registrados i
+                LEFT JOIN administradores a ON i.id_admin_consulta = a.idAdmin
+                WHERE :ultimo IS NULL OR i.idIndicadorRegistro < :ultimo
+                ORDER BY i.idIndicadorRegistro DESC
+                FETCH FIRST :n ROWS ONLY
+            """, {'ultimo': ultimo_id, 'n': tamano})
+            filas = cursor.fetchall()
+
         indicadores = []
-        for row in cursor.fetchall():
+        for row in filas:
             indicadores.append({
                 'id': row[0],
                 'nombre': row[1],
@@ -559,66 +850,52 @@ def db_obtener_historial_indicadores(limite: int = 50):
                 'admin': row[6] or "Desconocido"
             })
         return indicadores
-        
-    except oracledb.DatabaseError as e:
+
+    except ErrorConexion:
+        return []
+    except DatabaseError as e:
         print(f"Error al obtener historial: {e}")
         return []
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def db_limpiar_historial_indicadores():
     """
     Elimina todos los registros del historial de indicadores.
-    
+
     Returns:
         True si se eliminaron correctamente, mensaje de error en caso contrario
     """
-    conn = get_connection()
-    if not conn:
-        return "Error de conexión a la base de datos"
-    
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("DELETE FROM indicadores_registrados")
-        conn.commit()
+        with transaccion() as cursor:
+            cursor.execute("DELETE FROM indicadores_registrados")
         return True
-    except oracledb.DatabaseError as e:
-        conn.rollback()
+    except ErrorConexion:
+        return "Error de conexión a la base de datos"
+    except DatabaseError as e:
         return f"Error al limpiar historial: {e}"
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def db_obtener_ultimo_valor_indicador(nombre_indicador: str):
     """
     Obtiene el último valor registrado de un indicador específico.
-    
+
     Args:
         nombre_indicador: Nombre del indicador a buscar
-    
+
     Returns:
         Diccionario con los datos o None si no existe
     """
-    conn = get_connection()
-    if not conn:
-        return None
-    
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("""
-            SELECT valor_indicador, fecha_valor, fecha_consulta
-            FROM indicadores_registrados
-            WHERE nombre_indicador = :1
-            ORDER BY fecha_consulta DESC
-            FETCH FIRST 1 ROWS ONLY
-        """, (nombre_indicador,))
-        
-        row = cursor.fetchone()
+        with sesion() as cursor:
+            cursor.execute("""
+                SELECT valor_indicador, fecha_valor, fecha_consulta
+                FROM indicadores_registrados
+                WHERE nombre_indicador = :1
+                ORDER BY fecha_consulta DESC
+                FETCH FIRST 1 ROWS ONLY
+            """, (nombre_indicador,))
+            row = cursor.fetchone()
+
         if row:
             return {
                 'valor': row[0],
@@ -626,109 +903,87 @@ def db_obtener_ultimo_valor_indicador(nombre_indicador: str):
                 'fecha_consulta': row[2]
             }
         return None
-        
-    except oracledb.DatabaseError:
+
+    except (ErrorConexion, DatabaseError):
         return None
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def db_obtener_id_admin_por_id_empleado(id_empleado: int):
     """Obtiene el ID del admin asociado a un empleado."""
-    conn = get_connection()
-    if not conn:
-        return None
-    
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("SELECT idAdmin FROM administradores WHERE idEmpleado = :1", (id_empleado,))
-        resultado = cursor.fetchone()
+        with sesion() as cursor:
+            cursor.execute("SELECT idAdmin FROM administradores WHERE idEmpleado = :1", (id_empleado,))
+            resultado = cursor.fetchone()
         if resultado:
             return resultado[0]
         return None
-    except oracledb.DatabaseError:
+    except (ErrorConexion, DatabaseError):
         return None
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def crear_nuevo_admin(id_admin: int, usuario: str, clave_plana: str, id_empleado: int):
     from registro import Registro
-    id_admin = int(input("ID de Admin: "))
     usuario = input("Usuario: ")
     clave_plana = getpass.getpass("Clave: ")
     id_empleado = int(input("ID de Empleado asociado: "))
 
-    clave_plana_bytes = clave_plana.encode('utf-8')
-    salt = bcrypt.gensalt()
-    clave_hash_bytes = bcrypt.hashpw(clave_plana_bytes, salt)
-    clave_hash_para_db = clave_hash_bytes.decode('utf-8')
+    clave_hash_para_db = generar_hash_clave(clave_plana)
 
     # 2. GUARDAR EL HASH EN LA BD
-    conn = get_connection()
-    if not conn: return False
-    cursor = conn.cursor()
-    
     ### CAMBIO AQUÍ: Nombres de columnas ###
     # Usamos "idAdmin" y "idEmpleado" exactamente como en tu DDL
-    sql = "INSERT INTO administradores (idAdmin, usuario, clave, idEmpleado) VALUES (:1, :2, :3, :4)"
-    
+    # El idAdmin lo asigna la secuencia seq_administradores
+    sql = "INSERT INTO administradores (usuario, clave, idEmpleado) VALUES (:1, :2, :3) RETURNING idAdmin INTO :4"
+
     try:
-        # Los valores pasados aquí coinciden con los :1, :2, :3, :4
-        cursor.execute(sql, (id_admin, usuario, clave_hash_para_db, id_empleado))
-        conn.commit()
+        with transaccion() as cursor:
+            id_var = cursor.var(int)
+            cursor.execute(sql, (usuario, clave_hash_para_db, id_empleado, id_var))
+            id_admin = id_var.getvalue()[0]
         print(f"¡Admin '{usuario}' (ID: {id_admin}) creado exitosamente!")
         return True
-        
-    except oracledb.DatabaseError as e:
-        # Si da error de "clave única" (unique constraint), 
+
+    except ErrorConexion:
+        return False
+    except DatabaseError as e:
+        # Si da error de "clave única" (unique constraint),
         # significa que el idAdmin o el usuario ya existen.
         print(f"Error al crear admin: {e}")
-        conn.rollback()
         return False
-    finally:
-        cursor.close()
-        conn.close()
 
 
 # --- 1. Métodos de Login y Búsqueda (SELECT) ---
 
 def db_login_admin(usuario: str, clave_plana: str):
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-    
     sql = "SELECT clave, idEmpleado FROM administradores WHERE usuario = :1"
     try:
-        cursor.execute(sql, (usuario,))
-        resultado = cursor.fetchone() # (clave_hash_bd, idEmpleado)
-        
-        if resultado:
-            clave_hash_bd = resultado[0] # La clave HASH guardada
-            id_empleado_admin = resultado[1]
-            
-            # Comparamos la clave plana con el hash de la BD
-            if bcrypt.checkpw(clave_plana.encode('utf-8'), clave_hash_bd.encode('utf-8')):
-                print(f"Login exitoso para {usuario}")
-
-                return id_empleado_admin # Retornamos el ID de empleado
-            else:
-                print("Usuario o Contraseña no encontrado.")
-                return None
+        with sesion() as cursor:
+            cursor.execute(sql, (usuario,))
+            resultado = cursor.fetchone() # (clave_hash_bd, idEmpleado)
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
+        print(f"Error en login: {e}")
+        return None
+
+    # La sesión ya volvió al pool: bcrypt no la retiene mientras calcula
+    if resultado:
+        clave_hash_bd = resultado[0] # La clave HASH guardada
+        id_empleado_admin = resultado[1]
+
+        # Comparamos la clave plana con el hash de la BD
+        if bcrypt.checkpw(clave_plana.encode('utf-8'), clave_hash_bd.encode('utf-8')):
+            print(f"Login exitoso para {usuario}")
+
+            return id_empleado_admin # Retornamos el ID de empleado
         else:
             print("Usuario o Contraseña no encontrado.")
             return None
-            
-    except oracledb.DatabaseError as e:
-        print(f"Error en login: {e}")
+    else:
+        print("Usuario o Contraseña no encontrado.")
         return None
-    finally:
-        cursor.close()
-        conn.close()
-        
+
+
 def db_buscar_proyecto_por_id(id_proyecto):
     """
     Busca un proyecto por su ID y devuelve un objeto Proyecto,
@@ -736,166 +991,180 @@ def db_buscar_proyecto_por_id(id_proyecto):
     """
     from proyecto import Proyecto
     from empleado import Empleado
-    conn = get_connection()
-    if not conn:
-        return None
-    cursor = conn.cursor()
+    proyecto_obj = _cache_proyectos.obtener(id_proyecto)
+    if proyecto_obj is not None:
+        return proyecto_obj
 
     try:
-        # 1. Buscar detalles básicos del proyecto
-        cursor.execute("""
-            SELECT idProyecto, nombre, fechaInicioProyecto, descripcion
-            FROM proyectos
-            WHERE idProyecto = :1
-        """, (id_proyecto,))
-        proyecto_row = cursor.fetchone()
-        if not proyecto_row:
-            return None  # Proyecto no existe
-
-        # 2. Buscar empleados asociados al proyecto (JOIN con usuarios)
-        cursor.execute("""
-            SELECT e.idEmpleado, e.fechaInicioContrato, e.salario, u.idUsuario,
-                   u.nombre, u.direccion, u.telefono, u.correo
-            FROM proyecto_empleados pe
-            JOIN empleados e ON pe.idEmpleado = e.idEmpleado
-            JOIN usuarios u ON e.idUsuario = u.idUsuario
-            WHERE pe.idProyecto = :1
-        """, (id_proyecto,))
-        empleados_en_proyecto = []
-        for row in cursor.fetchall():
-            (idEmp, fechaInicio, salario, idUser, nombre, direccion, telefono, correo) = row
-            emp_obj = Empleado(
-                idEmpleado=idEmp,
-                fechaInicioContrato=fechaInicio,
-                salario=salario,
-                nombre=nombre,
-                direccion=direccion,
-                telefono=telefono,
-                correo=correo
-            )
-            empleados_en_proyecto.append(emp_obj)
+        with sesion() as cursor:
+            # 1. Buscar detalles básicos del proyecto
+            cursor.execute("""
+                SELECT idProyecto, nombre, fechaInicioProyecto, descripcion
+                FROM proyectos
+                WHERE idProyecto = :1
+            """, (id_proyecto,))
+            proyecto_row = cursor.fetchone()
+            if not proyecto_row:
+                return None  # Proyecto no existe
+
+            # 2. Buscar empleados asociados al proyecto (JOIN con usuarios)
+            cursor.execute("""
+                SELECT e.idEmpleado, e.fechaInicioContrato, e.salario,
+                       u.nombre, u.direccion, u.telefono, u.correo, u.idUsuario
+                FROM proyecto_empleados pe
+                JOIN empleados e ON pe.idEmpleado = e.idEmpleado
+                JOIN usuarios u ON e.idUsuario = u.idUsuario
+                WHERE pe.idProyecto = :1
+            """, (id_proyecto,))
+            filas_empleados = cursor.fetchall()
+
+        empleados_en_proyecto = [Empleado.desde_fila(row) for row in filas_empleados]
 
         # 3. Crear el objeto Proyecto, incluyendo empleados (igual que departamento)
-        proyecto_obj = Proyecto(
-            idProyecto=proyecto_row[0],
-            nombre=proyecto_row[1],
-            fechaInicioProyecto=proyecto_row[2],
-            descripcion=proyecto_row[3],
-            empleados=empleados_en_proyecto
-        )
+        proyecto_obj = Proyecto.desde_fila(proyecto_row, empleados_en_proyecto)
 
-        return proyecto_obj
+        return _cache_proyectos.guardar(id_proyecto, proyecto_obj)
 
     except Exception as e:
         print(f"Error al buscar proyecto: {e}")
         return None
-    finally:
-        cursor.close()
-        conn.close()
 
 
-def db_buscar_departamento_por_id(id_depto_buscado: int):
+def db_costo_proyecto(id_proyecto: int):
+    """
+    Horas y costo acumulados de un proyecto, leídos del resumen
+    costo_proyecto_empleado (una fila por empleado, mantenida por triggers:
+    ver PASO 5 del script SQL). Costo = horas x salario / 180.
+    No se guarda en caché: cambia con cada registro de horas.
+
+    Returns:
+        dict con 'horas', 'costo' y 'empleados' (empleados con horas),
+        en 0 si el proyecto no tiene horas; None si hubo error.
+    """
+    try:
+        with sesion() as cursor:
+            cursor.execute("""
+                SELECT NVL(SUM(horas), 0), NVL(SUM(costo), 0), COUNT(*)
+                FROM costo_proyecto_empleado
+                WHERE idProyecto = :1
+            """, (id_proyecto,))
+            horas, costo, empleados = cursor.fetchone()
+        return {'horas': float(horas), 'costo': float(costo), 'empleados': empleados}
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
+        print(f"Error DB costo del proyecto: {e}")
+        return None
+
+
+def _empleado_desde_columnas(fila):
+    """Empleado.desde_fila, o None si la fila viene de un LEFT JOIN sin empleado."""
+    if fila[0] is None:
+        return None
+    return Empleado.desde_fila(fila)
+
+
+def db_listar_empleados_departamento(id_depto: int):
+    """
+    Retorna la lista de Empleado que pertenecen al departamento
+    ([] si no tiene, None si hubo un error de BD).
+    """
+    try:
+        with sesion() as cursor:
+            cursor.execute("""
+                SELECT e.idEmpleado, e.fechaInicioContrato, e.salario,
+                       u.nombre, u.direccion, u.telefono, u.correo
+                FROM empleados e
+                JOIN usuarios u ON e.idUsuario = u.idUsuario
+                WHERE e.idDepartamento = :1
+                ORDER BY e.idEmpleado
+            """, (id_depto,))
+            return [Empleado.desde_fila(row) for row in cursor.fetchall()]
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
+        print(f"Error al buscar empleados en depto: {e}")
+        return None
+
+
+def db_buscar_departamento_por_id(id_depto_buscado: int, cargar_empleados: bool = True):
     """
     Busca un departamento por su ID en la BD y devuelve un OBJETO Departamento.
     (Necesita info de tablas 'departamentos' y 'empleados' para el gerente)
+
+    Args:
+        cargar_empleados: True trae el departamento, su gerente y sus empleados
+            en una sola consulta. False trae solo el departamento y el gerente;
+            los empleados se consultan la primera vez que se accede a .empleados
     """
     from departamento import Departamento
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-    
-    # Unimos departamentos y empleados para tener todos los datos del gerente
+    depto = _cache_departamentos.obtener(id_depto_buscado)
+    if depto is not None:
+        if cargar_empleados:
+            depto.empleados  # Completa la carga si estaba en modo perezoso
+        return depto
+
+    # Departamento + gerente (g) y, si se piden, una fila por cada empleado (e).
+    # Un departamento sin empleados sigue apareciendo gracias al LEFT JOIN.
     sql = """
-        SELECT d.idDepartamento, d.nombre, e.idEmpleado, e.fechaInicioContrato, e.salario,
-        u.idUsuario, u.nombre, u.direccion, u.telefono, u.correo
+        SELECT d.idDepartamento, d.nombre,
+               g.idEmpleado, g.fechaInicioContrato, g.salario,
+               ug.nombre, ug.direccion, ug.telefono, ug.correo
         FROM departamentos d
-        LEFT JOIN empleados e ON d.idGerenteResponsable = e.idEmpleado
-        LEFT JOIN usuarios u ON e.idUsuario = u.idUsuario
+        LEFT JOIN empleados g ON d.idGerenteResponsable = g.idEmpleado
+        LEFT JOIN usuarios ug ON g.idUsuario = ug.idUsuario
         WHERE d.idDepartamento = :1
-
     """
-    sql_2 = """
-        SELECT d.idDepartamento, d.nombre, e.idEmpleado, e.fechaInicioContrato, e.salario,
-        u.idUsuario, u.nombre, u.direccion, u.telefono, u.correo
+    sql_con_empleados = """
+        SELECT d.idDepartamento, d.nombre,
+               g.idEmpleado, g.fechaInicioContrato, g.salario,
+               ug.nombre, ug.direccion, ug.telefono, ug.correo,
+               e.idEmpleado, e.fechaInicioContrato, e.salario,
+               ue.nombre, ue.direccion, ue.telefono, ue.correo
         FROM departamentos d
-        JOIN empleados e ON d.idDepartamento = e.idDepartamento
-        JOIN usuarios u ON e.idUsuario = u.idUsuario
+        LEFT JOIN empleados g ON d.idGerenteResponsable = g.idEmpleado
+        LEFT JOIN usuarios ug ON g.idUsuario = ug.idUsuario
+        LEFT JOIN empleados e ON e.idDepartamento = d.idDepartamento
+        LEFT JOIN usuarios ue ON e.idUsuario = ue.idUsuario
         WHERE d.idDepartamento = :1
-    """    
-
-
-    empleados_en_depto = []
+        ORDER BY e.idEmpleado
+    """
 
     try:
-        cursor.execute(sql_2, (id_depto_buscado,))
-        rows = cursor.fetchall()
-
-        if not rows:
-            pass
-        for row in rows:
-            (_, _, idEmp, fechaInicio, salario, _, nombreEmp, direccion, telefono, correo) = row
-            
-
-            empleado_obj = Empleado(
-                nombre=nombreEmp,
-                direccion=direccion,
-                telefono=telefono,
-                correo=correo,
-                idEmpleado=idEmp,
-                fechaInicioContrato=fechaInicio,
-                salario=salario
-            )
-                
-            empleados_en_depto.append(empleado_obj)
-                
-    except oracledb.DatabaseError as e:
-        print(f"Error al buscar empleados en depto: {e}")
+        with sesion() as cursor:
+            cursor.execute(sql_con_empleados if cargar_empleados else sql, (id_depto_buscado,))
+            rows = cursor.fetchall()
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
+        print(f"Error al buscar departamento: {e}")
         return None
 
+    if not rows:
+        return None # No se encontró
 
-            
+    # Los datos del departamento y del gerente se repiten en cada fila
+    (idDepto, nombreDepto, *datos_gerente) = rows[0][:9]
+    gerente_obj = _empleado_desde_columnas(datos_gerente)
+
+    if cargar_empleados:
+        empleados_en_depto = [Empleado.desde_fila(row[9:]) for row in rows if row[9] is not None]
+        depto = Departamento(
+            idDepartamento=idDepto,
+            nombre=nombreDepto,
+            gerente=gerente_obj,
+            empleados=empleados_en_depto
+        )
+    else:
+        depto = Departamento(
+            idDepartamento=idDepto,
+            nombre=nombreDepto,
+            gerente=gerente_obj,
+            cargar_empleados=lambda: db_listar_empleados_departamento(idDepto)
+        )
+
+    return _cache_departamentos.guardar(idDepto, depto)
 
-    try:
-        cursor.execute(sql, (id_depto_buscado,))
-        resultado = cursor.fetchone() 
-        
-        if resultado:
-            # Desempaquetamos los datos
-            (idDepto, nombreDepto, idEmp, fecha, salario, idUser, nombreEmp, dir, tel, correo) = resultado
-            
-            # Creamos el objeto Empleado para el gerente
-
-            if idEmp is None:
-                gerente_obj = None
-                
-            else:
-                gerente_obj = Empleado(
-                    nombre=nombreEmp,
-                    direccion=dir, 
-                    telefono=tel, 
-                    correo=correo,
-                    idEmpleado=idEmp, 
-                    fechaInicioContrato=fecha, 
-                    salario=salario
-                )
-            
-            # ¡Creamos el objeto Departamento con los datos de la BD!
-            departamento_encontrado = Departamento(
-                idDepartamento=idDepto,
-                nombre=nombreDepto,
-                gerente=gerente_obj,
-                empleados=empleados_en_depto # Pendiente: podrías cargar los empleados asignados si quieres
-            )
-            return departamento_encontrado
-        else:
-            return None # No se encontró
-            
-    except oracledb.DatabaseError as e:
-        print(f"Error al buscar departamento: {e}")
-        return None
-    finally:
-        cursor.close()
-        conn.close()
 
 def db_buscar_id_empleado_por_rut(rut: str):
     """
@@ -903,39 +1172,42 @@ def db_buscar_id_empleado_por_rut(rut: str):
     El RUT se almacena como VARCHAR2 en la BD (ej: "12312-1").
     Retorna el objeto Empleado si existe, o None si no.
     """
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-    
+    id_empleado = _cache_ruts.obtener(rut)
+    if id_empleado is not None:
+        return db_buscar_empleado_por_id(id_empleado)
+
     sql = "SELECT idEmpleado FROM empleados WHERE idUsuario = :1"
-    
+
     try:
-        cursor.execute(sql, (rut,))
-        resultado = cursor.fetchone()
-        
-        if resultado:
-            emp_obj = db_buscar_empleado_por_id(resultado[0])
-            if type(emp_obj) is Empleado:
-                return emp_obj
-        else:
-            return None
-            
-    except oracledb.DatabaseError as e:
+        with sesion() as cursor:
+            cursor.execute(sql, (rut,))
+            resultado = cursor.fetchone()
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al buscar empleado por RUT: {e}")
         return None
-    finally:
-        cursor.close()
-        conn.close()
+
+    if not resultado:
+        return None
+
+    # Con la sesión ya devuelta: buscar el empleado no toma una segunda sesión del pool
+    _cache_ruts.guardar(rut, resultado[0])
+    emp_obj = db_buscar_empleado_por_id(resultado[0])
+    if type(emp_obj) is Empleado:
+        return emp_obj
+    return None
+
 
 def db_buscar_empleado_por_id(id_empleado_buscado: int):
     """
     Busca un empleado por su ID en la BD y devuelve un OBJETO Empleado.
     (Necesita info de tablas 'empleados' y 'usuarios')
     """
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-    
+    empleado_encontrado = _cache_empleados.obtener(id_empleado_buscado)
+    if empleado_encontrado is not None:
+        return empleado_encontrado
+
     # Unimos empleados y usuarios para tener todos los datos
     sql = """
         SELECT u.idusuario, e.idEmpleado, TO_CHAR(e.fechaInicioContrato, 'YYYY-MM-DD'), e.salario,
@@ -944,48 +1216,44 @@ def db_buscar_empleado_por_id(id_empleado_buscado: int):
         JOIN usuarios u ON e.idUsuario = u.idUsuario
         WHERE e.idEmpleado = :1
     """
-    
+
     try:
-        cursor.execute(sql, (id_empleado_buscado,))
-        resultado = cursor.fetchone() # (idEmp, fecha, salario, idUser, nombre, dir, tel, correo)
-        
-        if resultado:
-            # Desempaquetamos los datos
-            (idUsuario, idEmp, fecha, salario, nombre, dir, tel, correo, idDepartamento) = resultado
-            
-            # ¡Creamos el objeto Empleado con los datos de la BD!
-            # Nota: El constructor de tu clase Empleado debe coincidir
-            empleado_encontrado = Empleado(
-                rut=idUsuario,
-                nombre=nombre, 
-                direccion=dir, 
-                telefono=tel, 
-                correo=correo,
-                idEmpleado=idEmp, 
-                fechaInicioContrato=fecha, 
-                salario=salario,
-                departamento=db_buscar_departamento_por_id(idDepartamento) if idDepartamento else None)
-                # idUsuario=idUser (quizás lo necesites también)
-            return empleado_encontrado
-        else:
-            return None # No se encontró
-            
-    except oracledb.DatabaseError as e:
+        with sesion() as cursor:
+            cursor.execute(sql, (id_empleado_buscado,))
+            resultado = cursor.fetchone() # (idEmp, fecha, salario, idUser, nombre, dir, tel, correo)
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al buscar empleado: {e}")
         return None
-    finally:
-        cursor.close()
-        conn.close()
+
+    if not resultado:
+        return None # No se encontró
+
+    # Desempaquetamos los datos
+    (idUsuario, idEmp, fecha, salario, nombre, dir, tel, correo, idDepartamento) = resultado
+
+    # ¡Creamos el objeto Empleado con los datos de la BD!
+    # El departamento se busca con la sesión ya devuelta (no se retienen dos a la vez)
+    empleado_encontrado = Empleado(
+        rut=idUsuario,
+        nombre=nombre,
+        direccion=dir,
+        telefono=tel,
+        correo=correo,
+        idEmpleado=idEmp,
+        fechaInicioContrato=fecha,
+        salario=salario,
+        departamento=db_buscar_departamento_por_id(idDepartamento, cargar_empleados=False) if idDepartamento else None)
+        # idUsuario=idUser (quizás lo necesites también)
+    return _cache_empleados.guardar(idEmp, empleado_encontrado)
+
 
 def db_buscar_usuario_por_id(id_usuario_buscado: int):
     """
     Busca un empleado por su ID en la BD y devuelve un OBJETO Empleado.
     (Necesita info de tablas 'empleados' y 'usuarios')
     """
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-    
     # Unimos empleados y usuarios para tener todos los datos
     sql = """
         SELECT u.idUsuario, e.idEmpleado, e.fechaInicioContrato, e.salario,
@@ -994,90 +1262,103 @@ def db_buscar_usuario_por_id(id_usuario_buscado: int):
         JOIN usuarios u ON e.idUsuario = u.idUsuario
         WHERE u.idusuario = :1
     """
-    
+
     try:
-        cursor.execute(sql, (id_usuario_buscado,))
-        resultado = cursor.fetchone() # (idEmp, fecha, salario, idUser, nombre, dir, tel, correo)
-        
-        if resultado:
-            # Desempaquetamos los datos
-            (idUsuario, idEmp, fecha, salario, nombre, dir, tel, correo, idDepartamento) = resultado
-            
-            # ¡Creamos el objeto Empleado con los datos de la BD!
-            # Nota: El constructor de tu clase Empleado debe coincidir
-            empleado_encontrado = Empleado(
-                rut=idUsuario,
-                nombre=nombre, 
-                direccion=dir, 
-                telefono=tel, 
-                correo=correo,
-                idEmpleado=idEmp, 
-                fechaInicioContrato=fecha, 
-                salario=salario,
-                departamento=db_buscar_departamento_por_id(idDepartamento) if idDepartamento else None)
-                # idUsuario=idUser (quizás lo necesites también)
-            return empleado_encontrado
-        else:
-            return None # No se encontró
-            
-    except oracledb.DatabaseError as e:
+        with sesion() as cursor:
+            cursor.execute(sql, (id_usuario_buscado,))
+            resultado = cursor.fetchone() # (idEmp, fecha, salario, idUser, nombre, dir, tel, correo)
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al buscar empleado: {e}")
         return None
-    finally:
-        cursor.close()
-        conn.close()
-        
-def db_buscar_admin_completo(id_empleado_admin: int):
-    """
-    Busca toda la info de un admin (de 3 tablas) y devuelve
-    un OBJETO Administrador construido.
-    """
+
+    if not resultado:
+        return None # No se encontró
+
+    # Desempaquetamos los datos
+    (idUsuario, idEmp, fecha, salario, nombre, dir, tel, correo, idDepartamento) = resultado
+
+    # ¡Creamos el objeto Empleado con los datos de la BD!
+    # Nota: El constructor de tu clase Empleado debe coincidir
+    empleado_encontrado = Empleado(
+        rut=idUsuario,
+        nombre=nombre,
+        direccion=dir,
+        telefono=tel,
+        correo=correo,
+        idEmpleado=idEmp,
+        fechaInicioContrato=fecha,
+        salario=salario,
+        departamento=db_buscar_departamento_por_id(idDepartamento, cargar_empleados=False) if idDepartamento else None)
+        # idUsuario=idUser (quizás lo necesites también)
+    return empleado_encontrado
+
+
+# Une las 3 tablas para tener toda la info del admin, incluido el hash de la clave
+SQL_ADMIN_COMPLETO = """
+    SELECT
+        u.nombre, u.direccion, u.telefono, u.correo,
+        e.idEmpleado, e.fechaInicioContrato, e.salario,
+        a.idAdmin, a.usuario, a.clave
+    FROM administradores a
+    JOIN empleados e ON a.idEmpleado = e.idEmpleado
+    JOIN usuarios u ON e.idUsuario = u.idUsuario
+"""
+
+
+def _fila_a_administrador(resultado):
     from administrador import Administrador
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-    
-    # Esta SQL une las 3 tablas para tener toda la info
-    sql = """
-        SELECT 
-            u.nombre, u.direccion, u.telefono, u.correo,
-            e.idEmpleado, e.fechaInicioContrato, e.salario,
-            a.idAdmin, a.usuario, a.clave
-        FROM administradores a
-        JOIN empleados e ON a.idEmpleado = e.idEmpleado
-        JOIN usuarios u ON e.idUsuario = u.idUsuario
-        WHERE a.idEmpleado = :1
+
+    # SQL_ADMIN_COMPLETO trae las columnas en el orden de Administrador.__init__
+    return Administrador.desde_fila(resultado)
+
+
+def db_buscar_admin_completo(id_empleado_admin: int):
+    """
+    Busca toda la info de un admin (de 3 tablas) y devuelve
+    un OBJETO Administrador construido.
     """
-    
     try:
-        cursor.execute(sql, (id_empleado_admin,))
-        resultado = cursor.fetchone() 
-        
+        with sesion() as cursor:
+            cursor.execute(SQL_ADMIN_COMPLETO + " WHERE a.idEmpleado = :1", (id_empleado_admin,))
+            resultado = cursor.fetchone()
+
         if resultado:
-            # Los 10 argumentos se pasan en el orden exacto 
-            # que tu __init__ espera
-            admin_obj = Administrador(
-                resultado[0],  # nombre
-                resultado[1],  # direccion
-                resultado[2],  # telefono
-                resultado[3],  # correo
-                resultado[4],  # idEmpleado
-                resultado[5],  # fechaInicioContrato
-                resultado[6],  # salario
-                resultado[7],  # idAdmin
-                resultado[8],  # usuario
-                resultado[9]   # clave (hash)
-            )
-            return admin_obj
+            return _fila_a_administrador(resultado)
         else:
             return None # No se encontró
-            
-    except oracledb.DatabaseError as e:
+
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al buscar admin completo: {e}")
         return None
-    finally:
-        cursor.close()
-        conn.close()
+
+
+def db_buscar_admin_para_login(usuario: str):
+    """
+    Busca un admin por su usuario con toda su info y el hash de su clave,
+    en una sola consulta: el login no necesita un segundo viaje a la BD.
+
+    Returns:
+        Administrador (con clave_hash) si existe
+        None si no hay un admin con ese usuario
+        str con mensaje de error si falla la BD
+    """
+    try:
+        with sesion() as cursor:
+            cursor.execute(SQL_ADMIN_COMPLETO + " WHERE a.usuario = :1", (usuario,))
+            resultado = cursor.fetchone()
+    except ErrorConexion:
+        return "Error de conexión a la base de datos"
+    except DatabaseError as e:
+        print(f"Error al buscar admin para login: {e}")
+        return f"Error de base de datos: {e}"
+
+    return _fila_a_administrador(resultado) if resultado else None
+
+
 # (Aquí irían 'db_buscar_departamento' y 'db_buscar_proyecto' que son iguales)
 
 # --- 2. Métodos de Creación (INSERT) ---
@@ -1086,55 +1367,49 @@ def db_crear_empleado(id_usuario: str, empleado_obj, id_depto: 'int|None' = None
     """
     Crea un usuario y un empleado.
     El departamento es opcional (puede ser None).
+    El idEmpleado lo asigna la secuencia seq_empleados y se guarda en empleado_obj.
+    Retorna el idEmpleado asignado, o None si falla.
     (Método: Empleado.crearEmpleado)
     """
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-    
-    try:
-        sql_usuario = """
-        INSERT INTO usuarios (idUsuario, nombre, direccion, telefono, correo) 
-        VALUES (:1, :2, :3, :4, :5)
-        """
-        datos_usuario = (id_usuario, empleado_obj.nombre, empleado_obj.direccion, 
-                         empleado_obj.telefono, empleado_obj.correo)
-        cursor.execute(sql_usuario, datos_usuario)
-        
-        sql_empleado = """
-        INSERT INTO empleados (idEmpleado, fechaInicioContrato, salario, idUsuario, idDepartamento)
-        VALUES (:1, TO_DATE(:2, 'DD/MM/YYYY'), :3, :4, :5)
-        """
-        # id_depto puede ser None para empleados sin departamento
-        datos_empleado = (empleado_obj.idEmpleado, empleado_obj.fechaInicioContrato,
-                          empleado_obj.salario, id_usuario, id_depto)
-        cursor.execute(sql_empleado, datos_empleado)
-        
-        conn.commit()
-        print(f"Empleado '{empleado_obj.nombre}' creado.")
+    sql_usuario = """
+    INSERT INTO usuarios (idUsuario, nombre, direccion, telefono, correo)
+    VALUES (:1, :2, :3, :4, :5)
+    """
+    sql_empleado = """
+    INSERT INTO empleados (fechaInicioContrato, salario, idUsuario, idDepartamento)
+    VALUES (TO_DATE(:1, 'DD/MM/YYYY'), :2, :3, :4)
+    RETURNING idEmpleado INTO :5
+    """
 
-        return True
-    except oracledb.DatabaseError as e:
+    try:
+        with transaccion() as cursor:
+            datos_usuario = (id_usuario, empleado_obj.nombre, empleado_obj.direccion,
+                             empleado_obj.telefono, empleado_obj.correo)
+            cursor.execute(sql_usuario, datos_usuario)
+
+            # id_depto puede ser None para empleados sin departamento
+            id_var = cursor.var(int)
+            datos_empleado = (empleado_obj.fechaInicioContrato, empleado_obj.salario,
+                              id_usuario, id_depto, id_var)
+            cursor.execute(sql_empleado, datos_empleado)
+
+        empleado_obj.idEmpleado = id_var.getvalue()[0]
+        if id_depto is not None:
+            invalidar_departamento(id_depto)
+        print(f"Empleado '{empleado_obj.nombre}' creado con ID {empleado_obj.idEmpleado}.")
+
+        return empleado_obj.idEmpleado
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al crear empleado: {e}")
-        conn.rollback()
-    finally:
-        cursor.close()
-        conn.close()
-
 
-# (Aquí irían 'db_crear_departamento' y 'db_crear_proyecto')
 
 def db_registrar_horas(id_empleado, id_proyecto, fecha, horas, descripcion):
     """
     Guarda un nuevo registro de horas en la BD.
     Recibe directamente los IDs y datos necesarios.
     """
-    conn = get_connection()
-    if not conn: return "Error de conexión"
-    cursor = conn.cursor()
-    
-   
-
     sql = """
     INSERT INTO registros (fechaRegistro, horasTrabajadas, descripcionTrabajo, idEmpleado, idProyecto)
     VALUES (TO_DATE(:1, 'YYYY-MM-DD'), :2, :3, :4, :5)
@@ -1148,71 +1423,222 @@ def db_registrar_horas(id_empleado, id_proyecto, fecha, horas, descripcion):
             id_empleado,
             id_proyecto
         )
-        cursor.execute(sql, datos)
-        conn.commit()
+        with transaccion() as cursor:
+            cursor.execute(sql, datos)
         return True
-    except oracledb.DatabaseError as e:
+    except ErrorConexion:
+        return "Error de conexión"
+    except DatabaseError as e:
         print(f"Error al registrar horas: {e}")
-        conn.rollback()
         return f"Error BD: {e}"
-    finally:
-        cursor.close()
-        conn.close()
-def db_crear_proyecto(id_proyecto: int, proyecto_obj):
+
+
+SQL_INSERTAR_REGISTRO = """
+    INSERT INTO registros (fechaRegistro, horasTrabajadas, descripcionTrabajo, idEmpleado, idProyecto)
+    VALUES (:1, :2, :3, :4, :5)
+"""
+
+
+def db_registrar_horas_lote(filas: list):
+    """
+    Inserta un lote de registros de horas con un solo executemany y lo confirma.
+    Las filas que la BD rechaza (p. ej. FK inválida) no detienen al resto.
+
+    Args:
+        filas: lista de tuplas (fecha: date, horas: float, descripcion: str, id_empleado: int, id_proyecto: int)
+
+    Returns:
+        dict con: {'exitosos': int, 'errores': [(índice en filas, mensaje)], 'error': str | None}
+        Con 'error' (sin conexión o falla de todo el lote) no se guardó ninguna fila
+        y 'errores' queda vacío: el lote completo se puede reintentar.
+    """
+    resultados = {'exitosos': 0, 'errores': [], 'error': None}
+    if not filas:
+        return resultados
+
+    try:
+        with sesion() as cursor:
+            cursor.setinputsizes(driver.DB_TYPE_DATE, driver.DB_TYPE_NUMBER, 200,
+                                 driver.DB_TYPE_NUMBER, driver.DB_TYPE_NUMBER)
+
+            # Con autocommit el commit viaja junto con el lote (un solo round-trip)
+            cursor.connection.autocommit = True
+            cursor.executemany(SQL_INSERTAR_REGISTRO, filas, batcherrors=True)
+
+            errores = cursor.getbatcherrors()
+        resultados['errores'] = [(error.offset, f"Error de base de datos: {error.message}") for error in errores]
+        resultados['exitosos'] = len(filas) - len(errores)
+
+    except ErrorConexion:
+        resultados['error'] = "Error de conexión a la base de datos"
+    except DatabaseError as e:
+        print(f"Error al registrar el lote de horas: {e}")
+        resultados['error'] = f"Error de base de datos: {e}"
+
+    return resultados
+
+
+SQL_INSERTAR_REGISTRO_IDEMPOTENTE = """
+    INSERT INTO registros (fechaRegistro, horasTrabajadas, descripcionTrabajo, idEmpleado, idProyecto, claveIdempotencia)
+    VALUES (:1, :2, :3, :4, :5, :6)
+"""
+
+
+def db_registrar_horas_idempotente(filas: list):
+    """
+    Como db_registrar_horas_lote, pero cada fila trae una clave de idempotencia
+    (columna UNIQUE registros.claveIdempotencia): reenviar un lote que ya
+    llegó a la BD no duplica registros. Lo usa la cola de cola_registros.py.
+
+    Args:
+        filas: lista de tuplas (fecha: date, horas, descripcion, id_empleado, id_proyecto, clave: str)
+
+    Returns:
+        dict con: {'aplicados': [claves], 'duplicados': [claves ya guardadas antes],
+                   'rechazados': [(clave, mensaje)], 'error': str | None}
+        Con 'error' (sin conexión o falla de todo el lote) no se guardó ninguna fila.
+    """
+    resultados = {'aplicados': [], 'duplicados': [], 'rechazados': [], 'error': None}
+    if not filas:
+        return resultados
+
+    try:
+        with sesion() as cursor:
+            cursor.setinputsizes(driver.DB_TYPE_DATE, driver.DB_TYPE_NUMBER, 200,
+                                 driver.DB_TYPE_NUMBER, driver.DB_TYPE_NUMBER, 36)
+
+            # Con autocommit el commit viaja junto con el lote (un solo round-trip)
+            cursor.connection.autocommit = True
+            cursor.executemany(SQL_INSERTAR_REGISTRO_IDEMPOTENTE, filas, batcherrors=True)
+
+            errores = {error.offset: error for error in cursor.getbatcherrors()}
+    except ErrorConexion:
+        resultados['error'] = "Error de conexión a la base de datos"
+        return resultados
+    except DatabaseError as e:
+        print(f"Error al sincronizar registros de horas: {e}")
+        resultados['error'] = f"Error de base de datos: {e}"
+        return resultados
+
+    for i, fila in enumerate(filas):
+        clave = fila[5]
+        error = errores.get(i)
+        if error is None:
+            resultados['aplicados'].append(clave)
+        elif error.code == 1:
+            # ORA-00001 sobre claveIdempotencia: la fila ya se había guardado
+            resultados['duplicados'].append(clave)
+        else:
+            resultados['rechazados'].append((clave, f"Error de base de datos: {error.message}"))
+    return resultados
+
+
+def _db_ids_tabla(sql: str):
+    try:
+        with sesion() as cursor:
+            cursor.arraysize = 5000
+            cursor.execute(sql)
+            return {row[0] for row in cursor}
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
+        print(f"Error al leer IDs: {e}")
+        return None
+
+
+def db_ids_empleados():
+    """Retorna el conjunto de idEmpleado existentes (None si falla la consulta)."""
+    return _db_ids_tabla("SELECT idEmpleado FROM empleados")
+
+
+def db_ids_proyectos():
+    """Retorna el conjunto de idProyecto existentes (None si falla la consulta)."""
+    return _db_ids_tabla("SELECT idProyecto FROM proyectos")
+
+
+def db_verificar_ids_registro(id_empleado: int, id_proyecto: int):
+    """
+    Verifica que existan el empleado y el proyecto de un registro de horas.
+
+    Returns:
+        True si ambos existen
+        str con el error si falta alguno
+        None si no se pudo consultar la BD (sin conexión o error de BD)
+    """
+    try:
+        with sesion() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM empleados WHERE idEmpleado = :1", (id_empleado,))
+            if not cursor.fetchone()[0]:
+                return f"El empleado {id_empleado} no existe"
+            cursor.execute("SELECT COUNT(*) FROM proyectos WHERE idProyecto = :1", (id_proyecto,))
+            if not cursor.fetchone()[0]:
+                return f"El proyecto {id_proyecto} no existe"
+            return True
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
+        print(f"Error al verificar IDs del registro: {e}")
+        return None
+
+
+def db_crear_proyecto(proyecto_obj):
     """
     Crea un nuevo proyecto.
+    El idProyecto lo asigna la secuencia seq_proyectos y se guarda en proyecto_obj.
+    Retorna el idProyecto asignado, o None si falla.
     (Método: Administrador.crearProyecto)
     """
-    conn = get_connection()
-    if not conn: return
-    cursor = conn.cursor()
-    
+    sql_proyecto = """
+    INSERT INTO proyectos (nombre, fechaInicioProyecto, descripcion)
+    VALUES (:1, TO_DATE(:2, 'DD/MM/YYYY'), :3)
+    RETURNING idProyecto INTO :4
+    """
+
     try:
-        sql_proyecto = """
-        INSERT INTO proyectos (idProyecto, nombre, fechaInicioProyecto, descripcion) 
-        VALUES (:1, :2, TO_DATE(:3, 'DD/MM/YYYY'), :4)
-        """
-        datos_proyecto = (id_proyecto, proyecto_obj.nombre, proyecto_obj.fechaInicioProyecto,
-                          proyecto_obj.descripcion)
-        cursor.execute(sql_proyecto, datos_proyecto)
-        
-        conn.commit()
-        print(f"Proyecto '{proyecto_obj.nombre}' creado.")
-    except oracledb.DatabaseError as e:
+        with transaccion() as cursor:
+            id_var = cursor.var(int)
+            datos_proyecto = (proyecto_obj.nombre, proyecto_obj.fechaInicioProyecto,
+                              proyecto_obj.descripcion, id_var)
+            cursor.execute(sql_proyecto, datos_proyecto)
+
+        proyecto_obj.idProyecto = id_var.getvalue()[0]
+        print(f"Proyecto '{proyecto_obj.nombre}' creado con ID {proyecto_obj.idProyecto}.")
+        return proyecto_obj.idProyecto
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al crear proyecto: {e}")
-        conn.rollback()
-    finally:
-        cursor.close()
-        conn.close()
 
-def db_crear_departamento(id_depto: int, departamento_obj):
+
+def db_crear_departamento(departamento_obj):
     """
     Crea un departamento. El gerente es opcional (puede ser None).
+    El idDepartamento lo asigna la secuencia seq_departamentos y se guarda en departamento_obj.
+    Retorna el idDepartamento asignado, o False si falla.
     """
-    conn = get_connection()
-    if not conn: return
-    cursor = conn.cursor()
-    
+    sql_depto = """
+    INSERT INTO departamentos (nombre, idGerenteResponsable)
+    VALUES (:1, :2)
+    RETURNING idDepartamento INTO :3
+    """
+    # El gerente puede ser None
+    id_gerente = departamento_obj.gerente.idEmpleado if departamento_obj.gerente else None
+
     try:
-        sql_depto = """
-        INSERT INTO departamentos (idDepartamento, nombre, idGerenteResponsable) 
-        VALUES (:1, :2, :3)
-        """
-        # El gerente puede ser None
-        id_gerente = departamento_obj.gerente.idEmpleado if departamento_obj.gerente else None
-        datos_depto = (id_depto, departamento_obj.nombre, id_gerente)
-        cursor.execute(sql_depto, datos_depto)
-        
-        conn.commit()
-        return True
-    except oracledb.DatabaseError as e:
+        with transaccion() as cursor:
+            id_var = cursor.var(int)
+            datos_depto = (departamento_obj.nombre, id_gerente, id_var)
+            cursor.execute(sql_depto, datos_depto)
+
+        departamento_obj.idDepartamento = id_var.getvalue()[0]
+        return departamento_obj.idDepartamento
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al crear departamento: {e}")
-        conn.rollback()
         return False
-    finally:
-        cursor.close()
-        conn.close()
-    
+
+
 # --- 3. Métodos de Asignación (INSERT / UPDATE) ---
 
 def db_asignar_proyecto_empleado(id_empleado: int, id_proyecto: int):
@@ -1220,30 +1646,28 @@ def db_asignar_proyecto_empleado(id_empleado: int, id_proyecto: int):
     Asigna un empleado a un proyecto.
     (Método: Administrador.asignarProyectoEmpleado)
     """
-    conn = get_connection()
-    if not conn: return
-    cursor = conn.cursor()
-    
     sql_ver = "SELECT idEmpleado from empleados where idEmpleado = :1"
+    sql = "INSERT INTO proyecto_empleados (idEmpleado, idProyecto) VALUES (:1, :2)"
+
     try:
-        cursor.execute(sql_ver, (id_empleado,))
-        cursor.fetchone()
-        if cursor.rowcount == 0:
-            return "Error: El empleado especificado y/o proyecto no existe."
-    
-        sql = "INSERT INTO proyecto_empleados (idEmpleado, idProyecto) VALUES (:1, :2)"
-
-        cursor.execute(sql, (id_empleado, id_proyecto))
-        conn.commit()
+        with transaccion() as cursor:
+            cursor.execute(sql_ver, (id_empleado,))
+            cursor.fetchone()
+            if cursor.rowcount == 0:
+                return "Error: El empleado especificado y/o proyecto no existe."
+
+            cursor.execute(sql, (id_empleado, id_proyecto))
+
+        invalidar_proyecto(id_proyecto)
         return True
-    
-    except oracledb.DatabaseError as e:
+
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         error_obj, = e.args
         error_code = error_obj.code
         error_message = error_obj.message
 
-        conn.rollback()
-
         if error_code == 1:
             # Unique constraint violated (ej. duplicado)
             return "Error: Ya existe esta asignación para el empleado en el proyecto."
@@ -1257,40 +1681,35 @@ def db_asignar_proyecto_empleado(id_empleado: int, id_proyecto: int):
             # Otros errores genéricos
             return f"Error de base de datos Oracle {error_code}: {error_message}"
 
+
 def db_verificar_empleado_en_depto(id_empleado: int, id_depto: int):
     """
     Verifica si un empleado ya está asignado a un departamento.
     Retorna True si está asignado, False si no está asignado (idDepartamento es NULL o diferente).
     """
-    conn = get_connection()
-    if not conn:
-        return False
-    cursor = conn.cursor()
-
     sql = "SELECT idDepartamento FROM empleados WHERE idEmpleado = :1"
 
     try:
-        cursor.execute(sql, (id_empleado,))
-        resultado = cursor.fetchone()
-
-        if resultado is None:
-            # No existe el empleado
-            return False
-
-        id_departamento_empleado = resultado[0]  # Extraer el valor del tuple
+        with sesion() as cursor:
+            cursor.execute(sql, (id_empleado,))
+            resultado = cursor.fetchone()
+    except ErrorConexion:
+        return False
+    except DatabaseError as e:
+        print(f"Error al verificar empleado: {e}")
+        return False
 
-        if id_departamento_empleado is None:
-            # El empleado no está asignado a ningún departamento
-            return False
+    if resultado is None:
+        # No existe el empleado
+        return False
 
-        return id_departamento_empleado == id_depto
+    id_departamento_empleado = resultado[0]  # Extraer el valor del tuple
 
-    except oracledb.DatabaseError as e:
-        print(f"Error al verificar empleado: {e}")
+    if id_departamento_empleado is None:
+        # El empleado no está asignado a ningún departamento
         return False
-    finally:
-        cursor.close()
-        conn.close()
+
+    return id_departamento_empleado == id_depto
 
 
 def db_asignar_departamento_empleado(id_empleado: int, id_depto: int):
@@ -1298,182 +1717,282 @@ def db_asignar_departamento_empleado(id_empleado: int, id_depto: int):
     Asigna un empleado a un departamento (UPDATE en la tabla empleados).
     Retorna True si fue exitoso, False si falló.
     """
-    conn = get_connection()
-    if not conn: 
-        return False
-    cursor = conn.cursor()
-    
     sql = "UPDATE empleados SET idDepartamento = :1 WHERE idEmpleado = :2"
-    
+
     try:
-        cursor.execute(sql, (id_depto, id_empleado))
-        conn.commit()
+        with transaccion() as cursor:
+            cursor.execute(sql, (id_depto, id_empleado))
+        invalidar_empleado(id_empleado)
+        invalidar_departamento(id_depto)
         return True
-    except oracledb.DatabaseError as e:
+    except ErrorConexion:
+        return False
+    except DatabaseError as e:
         print(f"Error al asignar departamento: {e}")
         return False
 
 
+# --- Asignaciones masivas ---
+# Un executemany por llamada (con autocommit el commit viaja en el mismo round-trip).
+# batcherrors reporta las filas rechazadas sin detener al resto y arraydmlrowcounts
+# detecta las que no afectaron ninguna fila (empleado inexistente o sin la relación).
+# Cada función retorna {'exitosos': [ids], 'errores': [(id_empleado, mensaje)]}.
+
+def _db_asignacion_masiva(sql: str, filas: list, ids_empleados: list, mensajes: dict, descripcion: str):
+    """
+    Args:
+        filas: parámetros de cada ejecución, en el mismo orden que ids_empleados
+        mensajes: código de error ORA -> mensaje; la clave 0 es el mensaje para
+                  las filas que no afectaron ningún registro
+    """
+    resultados = {'exitosos': [], 'errores': []}
+    if not filas:
+        return resultados
+
+    try:
+        with sesion() as cursor:
+            cursor.connection.autocommit = True
+            cursor.executemany(sql, filas, batcherrors=True, arraydmlrowcounts=True)
+
+            errores = {error.offset: error for error in cursor.getbatcherrors()}
+            filas_afectadas = cursor.getarraydmlrowcounts()
+
+    except ErrorConexion:
+        resultados['errores'] = [(id_e, "Error de conexión a la base de datos") for id_e in ids_empleados]
+        return resultados
+    except DatabaseError as e:
+        print(f"Error DB {descripcion}: {e}")
+        resultados['errores'] = [(id_e, f"Error de base de datos: {e}") for id_e in ids_empleados]
+        return resultados
+
+    for i, id_empleado in enumerate(ids_empleados):
+        if i in errores:
+            error = errores[i]
+            mensaje = mensajes.get(error.code, f"Error de base de datos Oracle {error.code}: {error.message}")
+            resultados['errores'].append((id_empleado, mensaje))
+        elif filas_afectadas[i] == 0:
+            resultados['errores'].append((id_empleado, mensajes[0]))
+        else:
+            resultados['exitosos'].append(id_empleado)
+
+    return resultados
+
+
+def _ids_unicos(ids_empleados):
+    return list(dict.fromkeys(int(i) for i in ids_empleados))
+
+
+def db_asignar_proyecto_empleados(id_proyecto: int, ids_empleados: list):
+    """Asigna varios empleados a un proyecto en una sola llamada."""
+    ids = _ids_unicos(ids_empleados)
+    resultados = _db_asignacion_masiva(
+        "INSERT INTO proyecto_empleados (idEmpleado, idProyecto) VALUES (:1, :2)",
+        [(id_e, id_proyecto) for id_e in ids], ids,
+        {0: "No se pudo asignar",
+         1: "Ya estaba asignado al proyecto",
+         2291: "El empleado o el proyecto no existen"},
+        "asignación masiva a proyecto"
+    )
+    if resultados['exitosos']:
+        invalidar_proyecto(id_proyecto)
+    return resultados
+
+
+def db_quitar_proyecto_empleados(id_proyecto: int, ids_empleados: list):
+    """Quita varios empleados de un proyecto en una sola llamada."""
+    ids = _ids_unicos(ids_empleados)
+    resultados = _db_asignacion_masiva(
+        "DELETE FROM proyecto_empleados WHERE idEmpleado = :1 AND idProyecto = :2",
+        [(id_e, id_proyecto) for id_e in ids], ids,
+        {0: "No estaba asignado al proyecto"},
+        "desasignación masiva de proyecto"
+    )
+    if resultados['exitosos']:
+        invalidar_proyecto(id_proyecto)
+    return resultados
+
+
+def db_asignar_departamento_empleados(id_depto: int, ids_empleados: list):
+    """Mueve varios empleados a un departamento en una sola llamada."""
+    ids = _ids_unicos(ids_empleados)
+    resultados = _db_asignacion_masiva(
+        "UPDATE empleados SET idDepartamento = :1 WHERE idEmpleado = :2",
+        [(id_depto, id_e) for id_e in ids], ids,
+        {0: "El empleado no existe",
+         2291: "El departamento no existe"},
+        "asignación masiva a departamento"
+    )
+    if resultados['exitosos']:
+        # invalidar_empleados también descarta los departamentos de origen
+        invalidar_empleados(resultados['exitosos'])
+        invalidar_departamento(id_depto)
+    return resultados
+
+
+def db_quitar_departamento_empleados(id_depto: int, ids_empleados: list):
+    """Quita del departamento a los empleados de la lista que pertenecen a él."""
+    ids = _ids_unicos(ids_empleados)
+    resultados = _db_asignacion_masiva(
+        "UPDATE empleados SET idDepartamento = NULL WHERE idEmpleado = :1 AND idDepartamento = :2",
+        [(id_e, id_depto) for id_e in ids], ids,
+        {0: "No pertenece al departamento"},
+        "desasignación masiva de departamento"
+    )
+    if resultados['exitosos']:
+        invalidar_empleados(resultados['exitosos'])
+        invalidar_departamento(id_depto)
+    return resultados
+
+
 # --- 4. Métodos de Eliminación (DELETE / UPDATE) ---
 def db_actualizar_departamento(id_depto: int, nombre: str, id_gerente: int):
     """
     Actualiza el nombre y gerente de un departamento existente.
     Retorna True si fue exitoso, False si falló.
     """
-    conn = get_connection()
-    if not conn:
-        return False
-    cursor = conn.cursor()
-
     sql = "UPDATE departamentos SET nombre = :1, idGerenteResponsable = :2 WHERE idDepartamento = :3"
 
     try:
-        cursor.execute(sql, (nombre, id_gerente, id_depto))
-        conn.commit()
+        with transaccion() as cursor:
+            cursor.execute(sql, (nombre, id_gerente, id_depto))
+        invalidar_departamento(id_depto)
         return True
-    except oracledb.DatabaseError as e:
+    except ErrorConexion:
+        return False
+    except DatabaseError as e:
         print(f"Error al actualizar departamento: {e}")
         return False
-    finally:
-        cursor.close()
-        conn.close()
+
+
 def db_actualizar_proyecto(id_proyecto: int, nombre: str, fecha_inicio: str, descripcion: str):
     """
     Actualiza un proyecto existente.
     Verifica primero si el proyecto existe.
     Retorna True si fue exitoso, False si falló o no existe.
     """
-    conn = get_connection()
-    if not conn:
-        return False
-    cursor = conn.cursor()
-
     # ✅ VERIFICAR que el proyecto existe
     sql_verificar = "SELECT idProyecto FROM proyectos WHERE idProyecto = :1"
-    
+    sql_actualizar = """
+        UPDATE proyectos
+        SET nombre = :1, fechaInicioProyecto = TO_DATE(:2, 'DD/MM/YYYY'), descripcion = :3
+        WHERE idProyecto = :4
+    """
+
     try:
-        cursor.execute(sql_verificar, (id_proyecto,))
-        resultado = cursor.fetchone()
-        
-        if resultado is None:
-            print(f"Aviso: El proyecto {id_proyecto} no existe.")
-            cursor.close()
-            conn.close()
-            return False
-        
-        # ✅ Si existe, proceder a actualizarlo
-        sql_actualizar = """
-            UPDATE proyectos 
-            SET nombre = :1, fechaInicioProyecto = TO_DATE(:2, 'DD/MM/YYYY'), descripcion = :3
-            WHERE idProyecto = :4
-        """
-        cursor.execute(sql_actualizar, (nombre, fecha_inicio, descripcion, id_proyecto))
-        conn.commit()
+        with transaccion() as cursor:
+            cursor.execute(sql_verificar, (id_proyecto,))
+            resultado = cursor.fetchone()
+
+            if resultado is None:
+                print(f"Aviso: El proyecto {id_proyecto} no existe.")
+                return False
+
+            # ✅ Si existe, proceder a actualizarlo
+            cursor.execute(sql_actualizar, (nombre, fecha_inicio, descripcion, id_proyecto))
+
+        invalidar_proyecto(id_proyecto)
         print(f"Proyecto {id_proyecto} actualizado exitosamente.")
         return True
-        
-    except oracledb.DatabaseError as e:
+
+    except ErrorConexion:
+        return False
+    except DatabaseError as e:
         print(f"Error al actualizar proyecto: {e}")
-        conn.rollback()
         return False
-    finally:
-        cursor.close()
-        conn.close()
+
+
 def db_eliminar_proyecto(id_proyecto: int):
     """
-    Elimina un proyecto de la base de datos.
-    Primero elimina:
-    1. Los registros asociados al proyecto (tabla registros)
-    2. Las relaciones con empleados (tabla proyecto_empleados)
-    3. Finalmente el proyecto (tabla proyectos)
+    Elimina un proyecto de la base de datos junto con sus registros de horas
+    y sus relaciones con empleados, en una sola transacción.
     Retorna True si fue exitoso, False si falló o no existe.
     """
-    conn = get_connection()
-    if not conn:
-        return False
-    cursor = conn.cursor()
-
-    # ✅ VERIFICAR que el proyecto existe
-    sql_verificar = "SELECT idProyecto FROM proyectos WHERE idProyecto = :1"
-    
     try:
-        cursor.execute(sql_verificar, (id_proyecto,))
-        resultado = cursor.fetchone()
-        
-        if resultado is None:
-            print(f"Aviso: El proyecto {id_proyecto} no existe.")
-            cursor.close()
-            conn.close()
-            return False
-        
-        # ✅ Primero eliminar los registros asociados al proyecto
-        sql_eliminar_registros = "DELETE FROM registros WHERE idProyecto = :1"
-        cursor.execute(sql_eliminar_registros, (id_proyecto,))
-        conn.commit()
-        print(f"Registros del proyecto {id_proyecto} eliminados.")
-        
-        # ✅ Luego eliminar las relaciones con empleados en tabla intermedia
-        sql_eliminar_relaciones = "DELETE FROM proyecto_empleados WHERE idProyecto = :1"
-        cursor.execute(sql_eliminar_relaciones, (id_proyecto,))
-        conn.commit()
-        print(f"Relaciones del proyecto {id_proyecto} eliminadas.")
-        
-        # ✅ Finalmente eliminar el proyecto
-        sql_eliminar = "DELETE FROM proyectos WHERE idProyecto = :1"
-        cursor.execute(sql_eliminar, (id_proyecto,))
-        conn.commit()
-        print(f"Proyecto {id_proyecto} eliminado exitosamente.")
-        return True
-        
-    except oracledb.DatabaseError as e:
+        # Oracle lo hace en un bloque PL/SQL (un viaje); el COMMIT va dentro de eliminar_proyecto
+        with sesion() as cursor:
+            eliminados = ALMACENAMIENTO.eliminar_proyecto(cursor, id_proyecto)
+    except ErrorConexion:
+        return False
+    except DatabaseError as e:
         print(f"Error al eliminar proyecto: {e}")
-        conn.rollback()
         return False
-    finally:
-        cursor.close()
-        conn.close()
+
+    if not eliminados:
+        print(f"Aviso: El proyecto {id_proyecto} no existe.")
+        return False
+
+    invalidar_proyecto(id_proyecto)
+    print(f"Proyecto {id_proyecto} eliminado exitosamente.")
+    return True
+
+
+def db_eliminar_proyectos(ids_proyectos: list):
+    """
+    Elimina varios proyectos (con sus registros y relaciones) en una sola
+    llamada y una sola transacción: o se eliminan todos los existentes o ninguno.
+
+    Returns:
+        dict con: {'eliminados': [ids], 'no_encontrados': [ids]}, o None si hubo error.
+    """
+    ids = list(dict.fromkeys(int(i) for i in ids_proyectos))
+    if not ids:
+        return {'eliminados': [], 'no_encontrados': []}
+
+    try:
+        with sesion() as cursor:
+            ids_eliminados = ALMACENAMIENTO.eliminar_proyectos(cursor, ids)
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
+        print(f"Error al eliminar proyectos: {e}")
+        return None
+
+    for id_proyecto in ids_eliminados:
+        invalidar_proyecto(id_proyecto)
+
+    encontrados = set(ids_eliminados)
+    return {
+        'eliminados': ids_eliminados,
+        'no_encontrados': [i for i in ids if i not in encontrados]
+    }
+
+
 def db_eliminar_proyecto_empleado(id_proyecto: int, id_empleado: int):
     """
     Quita un empleado de un proyecto.
     """
-    conn = get_connection()
-    if not conn: return None # Retornar False si falla conexión
-    cursor = conn.cursor()
-    
     # Eliminamos la f-string innecesaria, el string normal basta
     sql = "DELETE FROM proyecto_empleados WHERE idProyecto = :1 AND idEmpleado = :2"
-    
-    try:
-        cursor.execute(sql, (id_proyecto, id_empleado))
-        
-        # --- AQUÍ ESTÁ LA MAGIA ---
-        # Verificamos cuántas filas se borraron ANTES de hacer commit
-        filas_afectadas = cursor.rowcount
-        
-        conn.commit()
-        
-        # Cerramos todo
-        cursor.close()
-        conn.close()
-        
-        if filas_afectadas > 0:
-            print(f"Éxito: Se eliminó la relación Proyecto {id_proyecto} - Empleado {id_empleado}")
-            return True
-        else:
-            print(f"Aviso: No se encontró la relación Proyecto {id_proyecto} - Empleado {id_empleado}. No se borró nada.")
-            return None
 
-    except oracledb.DatabaseError as e:
+    try:
+        with transaccion() as cursor:
+            cursor.execute(sql, (id_proyecto, id_empleado))
+
+            # --- AQUÍ ESTÁ LA MAGIA ---
+            # Verificamos cuántas filas se borraron ANTES de hacer commit
+            filas_afectadas = cursor.rowcount
+    except ErrorConexion:
+        return None # Retornar None si falla conexión
+    except DatabaseError as e:
         print(f"Error crítico al quitar de proyecto: {e}")
-        conn.rollback()
-        cursor.close()
-        conn.close()
         return None
+
+    invalidar_proyecto(id_proyecto)
+
+    if filas_afectadas > 0:
+        print(f"Éxito: Se eliminó la relación Proyecto {id_proyecto} - Empleado {id_empleado}")
+        return True
+    else:
+        print(f"Aviso: No se encontró la relación Proyecto {id_proyecto} - Empleado {id_empleado}. No se borró nada.")
+        return None
+
+
 def db_actualizar_empleado(id_empleado, nombre, direccion, telefono, correo, salario, rut=None):
     """
     Actualiza SOLO los datos del usuario (nombre, dirección, teléfono, correo, salario).
     NO actualiza: fecha de inicio de contrato, departamento.
-    
+    Ambas tablas se actualizan en una sola transacción.
+
     Args:
         id_empleado: ID del empleado a actualizar
         nombre: Nuevo nombre
@@ -1482,79 +2001,73 @@ def db_actualizar_empleado(id_empleado, nombre, direccion, telefono, correo, sal
         correo: Nuevo correo
         salario: Nuevo salario
         rut: RUT del usuario (para actualizar en tabla usuarios)
-    
+
     Returns:
         True si la actualización fue exitosa, False en caso contrario
     """
+    # Actualizar solo salario en empleados (los demás datos están en usuarios)
+    query = """
+        UPDATE empleados
+        SET salario = :1
+        WHERE idEmpleado = :2
+    """
+
+    # Actualizar datos en la tabla usuarios
+    query2 = """
+        UPDATE usuarios
+        SET nombre = :1,
+            direccion = :2,
+            telefono = :3,
+            correo = :4
+        WHERE idUsuario = :5
+    """
+
     try:
-        conexion = get_connection()
-        if not conexion: return
-        cursor = conexion.cursor()
-        
-        # Actualizar solo salario en empleados (los demás datos están en usuarios)
-        query = """
-            UPDATE empleados
-            SET salario = :1
-            WHERE idEmpleado = :2
-        """
-        
-        # Actualizar datos en la tabla usuarios
-        query2 = """
-            UPDATE usuarios
-            SET nombre = :1,
-                direccion = :2, 
-                telefono = :3, 
-                correo = :4
-            WHERE idUsuario = :5
-        """
-        
-        cursor.execute(query, (salario, id_empleado))
-        conexion.commit()
-        
-        if rut:
-            cursor.execute(query2, (nombre, direccion, telefono, correo, rut))
-            conexion.commit()
-        
-        cursor.close()
-        conexion.close()
-        
+        with transaccion() as cursor:
+            cursor.execute(query, (salario, id_empleado))
+
+            if rut:
+                cursor.execute(query2, (nombre, direccion, telefono, correo, rut))
+
+        invalidar_empleado(id_empleado)
         return True
-        
+
+    except ErrorConexion:
+        return None
     except Exception as e:
         print(f"Error al actualizar empleado: {e}")
         return False
+
+
 def db_eliminar_departamento_empleado(id_empleado: int):
     """
     Quita un empleado de su departamento (lo deja NULO).
     (Método: Administrador.eliminarDepartamentoEmpleado)
     """
-    conn = get_connection()
-    if not conn: return
-    cursor = conn.cursor()
-
     sql_verificar = "SELECT idDepartamento FROM empleados WHERE idEmpleado = :1"
-
-    cursor.execute(sql_verificar, (id_empleado,))
-    resultado = cursor.fetchone()
-
-    if resultado is None or resultado[0] is None:
-        print("El empleado no está asignado a ningún departamento.")
-        cursor.close()
-        conn.close()
-        return f"Aviso: El empleado {id_empleado} no existe o no está asignado a ningún departamento."
-    
     sql = "UPDATE empleados SET idDepartamento = NULL WHERE idEmpleado = :1"
 
     try:
-        cursor.execute(sql, (id_empleado,))
+        with transaccion() as cursor:
+            cursor.execute(sql_verificar, (id_empleado,))
+            resultado = cursor.fetchone()
+
+            if resultado is None or resultado[0] is None:
+                print("El empleado no está asignado a ningún departamento.")
+                return f"Aviso: El empleado {id_empleado} no existe o no está asignado a ningún departamento."
+
+            cursor.execute(sql, (id_empleado,))
         print("Eliminacion exitosa")
-        conn.commit()
+        invalidar_departamento(resultado[0])
+        invalidar_empleado(id_empleado)
         return True
-    except oracledb.DatabaseError as e:
+    except ErrorConexion:
+        return None
+    except DatabaseError as e:
         print(f"Error al quitar de depto: {e}")
-        conn.rollback()
         return e
-        
+
+
 def db_eliminar_departamento(id_depto: int):
     """
     1. Verifica si el departamento existe.
@@ -1562,63 +2075,56 @@ def db_eliminar_departamento(id_depto: int):
     3. Elimina el departamento.
     Retorna True si fue exitoso, False si falló o no existía.
     """
-    conn = get_connection()
-    if not conn:
-        return False
-    
-    cursor = conn.cursor()
-
     # Consultas SQL
     sql_verificar = "SELECT COUNT(*) FROM departamentos WHERE idDepartamento = :1"
     sql_desvincular = "UPDATE empleados SET idDepartamento = NULL WHERE idDepartamento = :1"
     sql_eliminar = "DELETE FROM departamentos WHERE idDepartamento = :1"
 
     try:
-        # PASO 1: Verificar existencia
-        cursor.execute(sql_verificar, (id_depto,))
-        resultado = cursor.fetchone()
-        
-        # resultado[0] contiene el conteo. Si es 0, no existe.
-        if resultado[0] == 0:
-            print(f"Error: El departamento con ID {id_depto} no existe.")
-            return False
-
-        # PASO 2: Desvincular empleados (Poner en NULL)
-        # Esto cumple tu requisito de NO borrar a los empleados
-        cursor.execute(sql_desvincular, (id_depto,))
-
-        # PASO 3: Eliminar el departamento
-        cursor.execute(sql_eliminar, (id_depto,))
-
-        # Si todo salió bien, guardamos los cambios
-        conn.commit()
+        # Si algo falla, transaccion() deshace cualquier cambio pendiente
+        with transaccion() as cursor:
+            # PASO 1: Verificar existencia
+            cursor.execute(sql_verificar, (id_depto,))
+            resultado = cursor.fetchone()
+
+            # resultado[0] contiene el conteo. Si es 0, no existe.
+            if resultado[0] == 0:
+                print(f"Error: El departamento con ID {id_depto} no existe.")
+                return False
+
+            # PASO 2: Desvincular empleados (Poner en NULL)
+            # Esto cumple tu requisito de NO borrar a los empleados
+            cursor.execute(sql_desvincular, (id_depto,))
+
+            # PASO 3: Eliminar el departamento
+            cursor.execute(sql_eliminar, (id_depto,))
+
+        invalidar_departamento(id_depto)
         print(f"Departamento {id_depto} eliminado y empleados liberados.")
         return True
 
-    except oracledb.DatabaseError as e:
-        # Si algo falla, deshacemos cualquier cambio pendiente
-        conn.rollback()
+    except ErrorConexion:
+        return False
+    except DatabaseError as e:
         print(f"Error al eliminar departamento: {e}")
         return False
-        
-    finally:
-        cursor.close()
-        conn.close()
 
 
 def get_lista_datos_tabla(tabla, dato):
-    conn = get_connection()
-    if not conn: return None
-    cursor = conn.cursor()
-
     sql = f"SELECT {dato} FROM {tabla}"
 
-    cursor.execute(sql)
-
-    listaDato = []
-    for row in cursor:
-        listaDato.append(row[0])
+    try:
+        with sesion() as cursor:
+            cursor.execute(sql)
+            listaDato = []
+            for row in cursor:
+                listaDato.append(row[0])
+    except ErrorConexion:
+        return None
 
     return listaDato
 
 
+# Cada db_* registra tiempo, tiempo en BD, filas, viajes y SQL (ver instrumentacion.py)
+instrumentacion.instrumentar_funciones(globals(), prefijo="db_",
+                                       excluir={'db_estadisticas_pool', 'db_sesiones_prestadas'})
@@ -1,13 +1,43 @@
 # Arreglo recursivo de importacion
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from empleado import Empleado
 # Arreglo recursivo de importacion
 class Departamento:
-    def __init__(self, idDepartamento:int, nombre:str, gerente:'Empleado|None' = None, empleados:'list[Empleado]' = []):
+    __slots__ = ('idDepartamento', 'nombre', 'gerente', '_empleados', '_cargar_empleados')
+
+    def __init__(self, idDepartamento:int, nombre:str, gerente:'Empleado|None' = None, empleados:'list[Empleado]|None' = None,
+                 cargar_empleados:'Callable[[], list[Empleado]]|None' = None):
         self.idDepartamento = idDepartamento
         self.nombre = nombre
         self.gerente = gerente
-        self.empleados = empleados
\ No newline at end of file
+        # Carga perezosa: si no se entregan los empleados, se piden a
+        # cargar_empleados la primera vez que se accede a self.empleados
+        self._empleados = empleados
+        self._cargar_empleados = cargar_empleados
+        if empleados is None and cargar_empleados is None:
+            self._empleados = []
+
+    @property
+    def empleados(self) -> 'list[Empleado]':
+        if self._empleados is None:
+            empleados = self._cargar_empleados()
+            if empleados is None:
+                return []  # Falló la carga: se reintenta en el próximo acceso
+            self._empleados = empleados
+        return self._empleados
+
+    @empleados.setter
+    def empleados(self, empleados: 'list[Empleado]'):
+        self._empleados = empleados
+
+    def empleados_cargados(self) -> bool:
+        return self._empleados is not None
+
+    @classmethod
+    def desde_fila(cls, fila, gerente:'Empleado|None' = None, empleados:'list[Empleado]|None' = None,
+                   cargar_empleados:'Callable[[], list[Empleado]]|None' = None) -> 'Departamento':
+        """fila: (idDepartamento, nombre)"""
+        return cls(fila[0], fila[1], gerente, empleados, cargar_empleados)
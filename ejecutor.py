@@ -0,0 +1,162 @@
+"""
+Ejecutor de tareas en segundo plano para la interfaz Tkinter.
+
+Las llamadas a la base de datos y a la API corren en un pool de hilos;
+los resultados vuelven al hilo de Tkinter mediante ventana.after, que es
+el único lugar donde se tocan los widgets.
+"""
+import queue
+import tkinter as tk
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Tarea:
+    """Una llamada en curso. Se puede cancelar antes de que entregue su resultado."""
+
+    def __init__(self, clave=None):
+        self.clave = clave
+        self.cancelada = False
+        self.future = None
+
+    def cancelar(self):
+        # Si aún no empezó no se ejecuta; si ya está corriendo su resultado se descarta
+        self.cancelada = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class EjecutorTareas:
+    INTERVALO_MS = 50  # Cada cuánto se revisan los resultados pendientes
+
+    def __init__(self, ventana, max_hilos: int = 4, color_espera="blue", color_error="red"):
+        self.ventana = ventana
+        self.color_espera = color_espera
+        self.color_error = color_error
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="tarea")
+        self._resultados = queue.Queue()
+        self._pendientes = {}   # Tarea -> (al_terminar, al_error, etiqueta)
+        self._por_clave = {}    # clave -> Tarea
+        self._revisando = False
+
+    def ejecutar(self, funcion, *args, al_terminar=None, al_error=None, clave=None,
+                 etiqueta=None, texto_espera="Procesando..."):
+        """
+        Ejecuta funcion(*args) en un hilo del pool.
+
+        Args:
+            al_terminar: callback(resultado), se llama en el hilo de Tkinter
+            al_error: callback(excepcion); por defecto se muestra en la etiqueta
+            clave: si ya hay una tarea con la misma clave, se cancela (la nueva la reemplaza)
+            etiqueta: Label donde mostrar texto_espera mientras la tarea corre
+
+        Returns:
+            La Tarea creada (permite cancelarla)
+        """
+        if clave is not None and clave in self._por_clave:
+            self.cancelar(clave)
+
+        tarea = Tarea(clave)
+        if clave is not None:
+            self._por_clave[clave] = tarea
+        self._pendientes[tarea] = (al_terminar, al_error, etiqueta)
+
+        if etiqueta is not None:
+            etiqueta.config(text=texto_espera, fg=self.color_espera)
+        self._actualizar_indicador()
+
+        tarea.future = self._pool.submit(self._correr, tarea, funcion, args)
+        self._programar_revision()
+        return tarea
+
+    def cancelar(self, clave):
+        """Cancela la tarea asociada a una clave (si existe)."""
+        tarea = self._por_clave.pop(clave, None)
+        if tarea is not None:
+            tarea.cancelar()
+            self._descartar(tarea, limpiar_etiqueta=True)
+
+    def cancelar_todas(self):
+        for tarea in list(self._pendientes):
+            tarea.cancelar()
+            self._descartar(tarea, limpiar_etiqueta=True)
+        self._por_clave.clear()
+
+    def cerrar(self):
+        """Cancela lo pendiente y libera los hilos (al cerrar la aplicación)."""
+        self.cancelar_todas()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def ocupado(self):
+        return bool(self._pendientes)
+
+    # --- Internos ---
+
+    def _correr(self, tarea, funcion, args):
+        # Corre en un hilo del pool: no debe tocar widgets
+        if tarea.cancelada:
+            return
+        try:
+            resultado = funcion(*args)
+            self._resultados.put((tarea, True, resultado))
+        except Exception as e:
+            traceback.print_exc()
+            self._resultados.put((tarea, False, e))
+
+    def _programar_revision(self):
+        if not self._revisando:
+            self._revisando = True
+            self.ventana.after(self.INTERVALO_MS, self._revisar)
+
+    def _revisar(self):
+        # Corre en el hilo de Tkinter
+        self._revisando = False
+
+        while True:
+            try:
+                tarea, exito, valor = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            if tarea.cancelada or tarea not in self._pendientes:
+                continue
+
+            al_terminar, al_error, etiqueta = self._pendientes[tarea]
+            self._descartar(tarea)
+
+            try:
+                if etiqueta is not None:
+                    etiqueta.config(text="")
+
+                if exito:
+                    if al_terminar:
+                        al_terminar(valor)
+                elif al_error:
+                    al_error(valor)
+                elif etiqueta is not None:
+                    etiqueta.config(text=f"Error: {valor}", fg=self.color_error)
+                else:
+                    print(f"Error en tarea en segundo plano: {valor}")
+            except Exception:
+                traceback.print_exc()
+
+        if self._pendientes:
+            self._programar_revision()
+
+    def _descartar(self, tarea, limpiar_etiqueta=False):
+        _, _, etiqueta = self._pendientes.pop(tarea, (None, None, None))
+        if limpiar_etiqueta and etiqueta is not None:
+            try:
+                etiqueta.config(text="")
+            except tk.TclError:
+                pass  # El widget ya fue destruido
+        if tarea.clave is not None and self._por_clave.get(tarea.clave) is tarea:
+            del self._por_clave[tarea.clave]
+        self._actualizar_indicador()
+
+    def _actualizar_indicador(self):
+        # Cursor de espera mientras haya tareas en curso
+        try:
+            self.ventana.config(cursor="watch" if self._pendientes else "")
+        except tk.TclError:
+            pass  # La ventana ya fue destruida
@@ -7,10 +7,30 @@ if TYPE_CHECKING:
     from departamento import Departamento
 # Arreglo recursivo de importacion
 class Empleado(Usuario):
+    __slots__ = ('idEmpleado', 'fechaInicioContrato', 'salario', 'departamento')
+
     def __init__(self, nombre:str, direccion:str, telefono:str, correo:str, idEmpleado:int, fechaInicioContrato:str, salario:float, departamento:'Departamento|None' = None, rut = None):
         super().__init__(nombre, direccion, telefono, correo, rut=rut)
 
         self.idEmpleado = idEmpleado
         self.fechaInicioContrato = fechaInicioContrato
         self.salario = salario
-        self.departamento = departamento
\ No newline at end of file
+        self.departamento = departamento
+
+    @classmethod
+    def desde_fila(cls, fila, departamento:'Departamento|None' = None) -> 'Empleado':
+        """
+        Empleado desde una fila del cursor, sin pasar por __init__.
+        fila: (idEmpleado, fechaInicioContrato, salario, nombre, direccion,
+        telefono, correo) y opcionalmente rut (idUsuario) al final.
+        """
+        emp = cls.__new__(cls)
+        if len(fila) == 8:
+            (emp.idEmpleado, emp.fechaInicioContrato, emp.salario,
+             emp.nombre, emp.direccion, emp.telefono, emp.correo, emp.rut) = fila
+        else:
+            (emp.idEmpleado, emp.fechaInicioContrato, emp.salario,
+             emp.nombre, emp.direccion, emp.telefono, emp.correo) = fila
+            emp.rut = None
+        emp.departamento = departamento
+        return emp
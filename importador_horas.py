@@ -0,0 +1,283 @@
+"""
+Importación masiva de registros de horas desde CSV o JSONL.
+
+El archivo se lee en streaming (nunca completo en memoria), cada fila se
+valida contra los IDs de empleados y proyectos cargados una sola vez al
+inicio, y las filas válidas se insertan por lotes con executemany.
+Después de cada lote se guarda un checkpoint: si la importación se
+interrumpe, al volver a ejecutarla continúa desde el último lote guardado.
+Si la BD rechaza un lote completo (sin conexión, error que no es de una
+fila), la importación se detiene sin avanzar el checkpoint: la siguiente
+ejecución reintenta ese lote.
+
+Formato (CSV con encabezado, o una línea JSON por registro):
+    idEmpleado,idProyecto,fecha,horas,descripcion
+    12,3,2025-03-01,8,Desarrollo módulo X
+
+Uso:
+    python importador_horas.py horas.csv [--lote 1000] [--errores errores.csv] [--desde-cero]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+
+import database as dbFunciones
+
+TAMANO_LOTE = 1000
+MAX_ERRORES_EN_MEMORIA = 1000   # El detalle completo va al archivo de errores
+MAX_DESCRIPCION = 200           # registros.descripcionTrabajo VARCHAR2(200)
+MAX_HORAS_DIA = 24
+
+
+def leer_filas(ruta: str):
+    """
+    Generador de (número de línea, dict) para un archivo CSV o JSONL.
+    El formato se decide por la extensión (.jsonl / .json = JSON por línea).
+    """
+    with open(ruta, encoding='utf-8-sig', newline='') as archivo:
+        if ruta.lower().endswith(('.jsonl', '.json')):
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except ValueError as e:
+                    yield numero, {'_error': f"JSON inválido: {e}"}
+                    continue
+                # Un JSON válido que no es objeto (5, [1, 2], "x") se rechaza como una fila más
+                yield numero, fila if isinstance(fila, dict) else {'_error': "Se esperaba un objeto JSON"}
+        else:
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                # line_num es la línea física (el encabezado es la 1)
+                yield lector.line_num, fila
+
+
+def validar_fila(fila: dict, ids_empleados: set, ids_proyectos: set):
+    """
+    Retorna (tupla lista para insertar, None) o (None, mensaje de error).
+    """
+    if '_error' in fila:
+        return None, fila['_error']
+
+    try:
+        id_empleado = int(fila.get('idEmpleado'))
+        id_proyecto = int(fila.get('idProyecto'))
+    except (TypeError, ValueError):
+        return None, "idEmpleado e idProyecto deben ser números"
+
+    try:
+        fecha = datetime.strptime(str(fila.get('fecha', '')).strip(), "%Y-%m-%d")
+    except ValueError:
+        return None, "Fecha inválida (se espera YYYY-MM-DD)"
+
+    try:
+        horas = float(fila.get('horas'))
+    except (TypeError, ValueError):
+        return None, "Horas debe ser un número"
+    if not 0 < horas <= MAX_HORAS_DIA:
+        return None, f"Horas fuera de rango (0 - {MAX_HORAS_DIA})"
+
+    descripcion = str(fila.get('descripcion') or '').strip()
+    if not descripcion:
+        return None, "La descripción es obligatoria"
+    if len(descripcion) > MAX_DESCRIPCION:
+        return None, f"La descripción supera {MAX_DESCRIPCION} caracteres"
+
+    if id_empleado not in ids_empleados:
+        return None, f"El empleado {id_empleado} no existe"
+    if id_proyecto not in ids_proyectos:
+        return None, f"El proyecto {id_proyecto} no existe"
+
+    return (fecha, horas, descripcion, id_empleado, id_proyecto), None
+
+
+# --- Checkpoint ---
+
+def _ruta_checkpoint(ruta: str):
+    return ruta + ".checkpoint"
+
+
+def _leer_checkpoint(ruta: str):
+    """Retorna el checkpoint guardado para este archivo, o None si no hay o no corresponde."""
+    try:
+        with open(_ruta_checkpoint(ruta), encoding='utf-8') as archivo:
+            checkpoint = json.load(archivo)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Checkpoint ilegible, se ignora: {e}")
+        return None
+
+    # Si el archivo cambió desde la última ejecución el checkpoint no sirve
+    if checkpoint.get('tamano') != os.path.getsize(ruta):
+        print("El archivo cambió desde la última importación: se empieza desde el inicio.")
+        return None
+    return checkpoint
+
+
+def _guardar_checkpoint(ruta: str, resultados: dict):
+    checkpoint = {
+        'tamano': os.path.getsize(ruta),
+        'linea': resultados['ultima_linea'],
+        'exitosos': resultados['exitosos'],
+        'fallidos': resultados['fallidos']
+    }
+    temporal = _ruta_checkpoint(ruta) + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(checkpoint, archivo)
+    os.replace(temporal, _ruta_checkpoint(ruta))
+
+
+# --- Importación ---
+
+class LoteNoEnviado(Exception):
+    """La BD rechazó un lote completo; el checkpoint quedó en el lote anterior."""
+
+def importar_horas(ruta: str, tamano_lote: int = TAMANO_LOTE, ruta_errores: 'str|None' = None,
+                   reanudar: bool = True, al_progresar=None):
+    """
+    Importa los registros de horas de un archivo CSV/JSONL.
+
+    Args:
+        ruta: archivo a importar
+        tamano_lote: filas por executemany (y por commit)
+        ruta_errores: si se indica, CSV con (linea, error) de cada fila rechazada
+        reanudar: continuar desde el checkpoint si existe
+        al_progresar: callback(resultados) después de cada lote
+
+    Returns:
+        dict con: 'exitosos', 'fallidos', 'leidos', 'ultima_linea' y 'errores'
+        (lista de (linea, mensaje), hasta MAX_ERRORES_EN_MEMORIA).
+        str con el error si no se pudieron leer los IDs de la BD o si la BD
+        rechazó un lote completo; en ese caso el checkpoint se conserva y la
+        siguiente ejecución con reanudar=True reintenta ese lote.
+
+    Nota: el checkpoint se guarda después de confirmar cada lote. Si el proceso
+    muere entre el commit y el guardado, ese último lote se vuelve a insertar.
+    """
+    ids_empleados = dbFunciones.db_ids_empleados()
+    ids_proyectos = dbFunciones.db_ids_proyectos()
+    if ids_empleados is None or ids_proyectos is None:
+        return "Error: No se pudieron leer los empleados/proyectos de la BD"
+
+    resultados = {'exitosos': 0, 'fallidos': 0, 'leidos': 0, 'ultima_linea': 0, 'errores': []}
+
+    checkpoint = _leer_checkpoint(ruta) if reanudar else None
+    if checkpoint:
+        resultados['ultima_linea'] = checkpoint['linea']
+        resultados['exitosos'] = checkpoint['exitosos']
+        resultados['fallidos'] = checkpoint['fallidos']
+        print(f"Reanudando después de la línea {checkpoint['linea']}.")
+
+    archivo_errores = None
+    escritor_errores = None
+    if ruta_errores:
+        # Al reanudar se agregan al final los errores de esta ejecución
+        modo = 'a' if checkpoint else 'w'
+        archivo_errores = open(ruta_errores, modo, encoding='utf-8', newline='')
+        escritor_errores = csv.writer(archivo_errores)
+        if modo == 'w':
+            escritor_errores.writerow(['linea', 'error'])
+
+    def registrar_error(linea, mensaje):
+        resultados['fallidos'] += 1
+        if len(resultados['errores']) < MAX_ERRORES_EN_MEMORIA:
+            resultados['errores'].append((linea, mensaje))
+        if escritor_errores:
+            escritor_errores.writerow([linea, mensaje])
+
+    lote = []               # Tuplas para executemany
+    lineas_lote = []        # Línea de origen de cada tupla (para reportar errores de la BD)
+    errores_lote = []       # Errores de validación del lote: se cuentan recién cuando el lote se guarda
+    linea_desde = resultados['ultima_linea']
+
+    def enviar_lote(ultima_linea):
+        if lote:
+            respuesta = dbFunciones.db_registrar_horas_lote(lote)
+            if respuesta['error']:
+                # Sin avanzar el checkpoint: al reanudar se vuelve a leer este lote
+                raise LoteNoEnviado(respuesta['error'])
+            resultados['exitosos'] += respuesta['exitosos']
+            errores_lote.extend((lineas_lote[indice], mensaje) for indice, mensaje in respuesta['errores'])
+            lote.clear()
+            lineas_lote.clear()
+
+        for linea, mensaje in sorted(errores_lote):
+            registrar_error(linea, mensaje)
+        errores_lote.clear()
+
+        resultados['ultima_linea'] = ultima_linea
+        _guardar_checkpoint(ruta, resultados)
+        if archivo_errores:
+            archivo_errores.flush()
+        if al_progresar:
+            al_progresar(resultados)
+
+    try:
+        numero = linea_desde
+        pendientes = 0  # Filas leídas desde el último checkpoint (válidas o no)
+        for numero, fila in leer_filas(ruta):
+            if numero <= linea_desde:
+                continue
+
+            resultados['leidos'] += 1
+            pendientes += 1
+            datos, error = validar_fila(fila, ids_empleados, ids_proyectos)
+            if error:
+                errores_lote.append((numero, error))
+            else:
+                lote.append(datos)
+                lineas_lote.append(numero)
+
+            if pendientes >= tamano_lote:
+                enviar_lote(numero)
+                pendientes = 0
+
+        enviar_lote(numero)
+    except LoteNoEnviado as e:
+        return (f"Error: {e}. Importación detenida después de la línea {resultados['ultima_linea']} "
+                f"({resultados['exitosos']} insertados); vuelva a ejecutarla para reanudar.")
+    finally:
+        if archivo_errores:
+            archivo_errores.close()
+
+    # Importación completa: el checkpoint ya no hace falta
+    try:
+        os.remove(_ruta_checkpoint(ruta))
+    except OSError:
+        pass
+
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa registros de horas desde CSV o JSONL.")
+    parser.add_argument('archivo')
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="filas por lote (default %(default)s)")
+    parser.add_argument('--errores', help="CSV donde guardar las filas rechazadas")
+    parser.add_argument('--desde-cero', action='store_true', help="ignorar el checkpoint existente")
+    args = parser.parse_args()
+
+    def mostrar_progreso(resultados):
+        print(f"  línea {resultados['ultima_linea']}: {resultados['exitosos']} insertados, "
+              f"{resultados['fallidos']} rechazados")
+
+    resultados = importar_horas(args.archivo, args.lote, args.errores,
+                                reanudar=not args.desde_cero, al_progresar=mostrar_progreso)
+    if isinstance(resultados, str):
+        print(resultados)
+        sys.exit(1)
+
+    print(f"Importación terminada: {resultados['exitosos']} insertados, {resultados['fallidos']} rechazados.")
+    for linea, mensaje in resultados['errores'][:20]:
+        print(f"  Línea {linea}: {mensaje}")
+    if resultados['fallidos'] > 20:
+        print("  ...")
+
+
+if __name__ == "__main__":
+    main()
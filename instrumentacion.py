@@ -0,0 +1,508 @@
+"""
+Instrumentación de las llamadas a la base de datos.
+
+Cada función db_* instrumentada registra por llamada: tiempo total (reloj
+de pared), tiempo en la BD, filas leídas, viajes a la BD (round-trips) y
+las sentencias SQL ejecutadas. Los tiempos se agregan por función en
+histogramas de buckets fijos (de ahí salen p50/p95/p99) y se pueden
+exportar como JSON o en el formato de texto de Prometheus.
+
+Cómo se mide:
+    - instrumentar(funcion) envuelve la función y deja la llamada en curso
+      en una pila por hilo. Si la función retorna un generador, la llamada
+      sigue abierta mientras se consume y se registra al terminar o cerrarse.
+    - database.sesion() envuelve su cursor con envolver_cursor(): el cursor
+      anota en la llamada en curso el tiempo de execute/fetch/commit y las
+      filas leídas.
+    - Los viajes son una estimación: uno por execute/executemany/commit/
+      rollback, más los que hacen falta para leer las filas que no llegaron
+      con el prefetch (de a cursor.arraysize).
+
+Variables de entorno:
+    DB_INSTRUMENTACION   '0' desactiva la instrumentación (por defecto activa)
+    DB_METRICAS_ARCHIVO  si se indica, las métricas se escriben ahí al salir
+                         (JSON si termina en .json, si no formato Prometheus)
+"""
+import atexit
+import functools
+import heapq
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+ACTIVA = os.getenv('DB_INSTRUMENTACION', '1') != '0'
+DB_METRICAS_ARCHIVO = os.getenv('DB_METRICAS_ARCHIVO')
+
+# Límites superiores de los buckets en segundos (como los de Prometheus por defecto)
+LIMITES_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PERCENTILES = (50, 95, 99)
+MAX_LENTAS = 50         # Llamadas individuales más lentas que se conservan
+MAX_RECIENTES = 200     # Últimas llamadas que se conservan
+MAX_SENTENCIAS = 5      # Sentencias SQL distintas guardadas por llamada
+MAX_LARGO_SQL = 300
+
+_lock = threading.Lock()
+_local = threading.local()
+_estadisticas = {}                          # nombre de función -> EstadisticaFuncion
+_lentas = []                                # heap de (segundos, n, Llamada)
+_recientes = deque(maxlen=MAX_RECIENTES)
+_contador = itertools.count()               # Desempate del heap
+
+
+class Llamada:
+    """Lo medido en una llamada a una función instrumentada."""
+
+    def __init__(self, funcion: str):
+        self.funcion = funcion
+        self.fecha = datetime.now()
+        self.hilo = threading.current_thread().name
+        self.segundos = 0.0
+        self.segundos_bd = 0.0
+        self.filas = 0
+        self.viajes = 0
+        self.sentencias = []
+        self.error = None
+
+    def agregar_sentencia(self, sql):
+        if not isinstance(sql, str):
+            return
+        sql = " ".join(sql.split())[:MAX_LARGO_SQL]
+        if sql not in self.sentencias and len(self.sentencias) < MAX_SENTENCIAS:
+            self.sentencias.append(sql)
+
+    def como_dict(self):
+        return {
+            'funcion': self.funcion,
+            'fecha': self.fecha.isoformat(timespec='seconds'),
+            'hilo': self.hilo,
+            'segundos': self.segundos,
+            'segundos_bd': self.segundos_bd,
+            'filas': self.filas,
+            'viajes': self.viajes,
+            'sql': list(self.sentencias),
+            'error': self.error
+        }
+
+
+class Histograma:
+    def __init__(self):
+        self.cuentas = [0] * (len(LIMITES_BUCKETS) + 1)  # El último es +Inf
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def agregar(self, valor: float):
+        for i, limite in enumerate(LIMITES_BUCKETS):
+            if valor <= limite:
+                self.cuentas[i] += 1
+                break
+        else:
+            self.cuentas[-1] += 1
+        self.total += 1
+        self.suma += valor
+        self.maximo = max(self.maximo, valor)
+
+    def percentil(self, p: float):
+        """
+        Estimación del percentil p (0-100) interpolando dentro del bucket,
+        igual que histogram_quantile de Prometheus. None si no hay datos.
+        """
+        if not self.total:
+            return None
+        objetivo = self.total * p / 100
+        acumulado = 0
+        for i, cuenta in enumerate(self.cuentas):
+            if cuenta and acumulado + cuenta >= objetivo:
+                if i == len(LIMITES_BUCKETS):
+                    return self.maximo
+                inferior = LIMITES_BUCKETS[i - 1] if i else 0.0
+                superior = min(LIMITES_BUCKETS[i], self.maximo)
+                return inferior + (superior - inferior) * (objetivo - acumulado) / cuenta
+            acumulado += cuenta
+        return self.maximo
+
+    def acumulados(self):
+        """Cuentas acumuladas por bucket (el formato 'le' de Prometheus)."""
+        return list(itertools.accumulate(self.cuentas))
+
+
+class EstadisticaFuncion:
+    def __init__(self, funcion: str):
+        self.funcion = funcion
+        self.tiempo = Histograma()
+        self.tiempo_bd = Histograma()
+        self.filas = 0
+        self.viajes = 0
+        self.errores = 0
+
+    def agregar(self, llamada: Llamada):
+        self.tiempo.agregar(llamada.segundos)
+        self.tiempo_bd.agregar(llamada.segundos_bd)
+        self.filas += llamada.filas
+        self.viajes += llamada.viajes
+        if llamada.error:
+            self.errores += 1
+
+    def como_dict(self):
+        datos = {
+            'funcion': self.funcion,
+            'llamadas': self.tiempo.total,
+            'segundos_total': self.tiempo.suma,
+            'segundos_bd_total': self.tiempo_bd.suma,
+            'segundos_max': self.tiempo.maximo,
+            'filas': self.filas,
+            'viajes': self.viajes,
+            'errores': self.errores
+        }
+        for p in PERCENTILES:
+            datos[f'p{p}'] = self.tiempo.percentil(p)
+            datos[f'p{p}_bd'] = self.tiempo_bd.percentil(p)
+        return datos
+
+
+# --- Registro de llamadas ---
+
+def _pila():
+    pila = getattr(_local, 'pila', None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+def llamada_actual():
+    """La llamada instrumentada en curso en este hilo, o None."""
+    pila = _pila()
+    return pila[-1] if pila else None
+
+
+def _registrar(llamada: Llamada):
+    with _lock:
+        estadistica = _estadisticas.get(llamada.funcion)
+        if estadistica is None:
+            estadistica = _estadisticas[llamada.funcion] = EstadisticaFuncion(llamada.funcion)
+        estadistica.agregar(llamada)
+        _recientes.append(llamada)
+
+        entrada = (llamada.segundos, next(_contador), llamada)
+        if len(_lentas) < MAX_LENTAS:
+            heapq.heappush(_lentas, entrada)
+        elif entrada[0] > _lentas[0][0]:
+            heapq.heapreplace(_lentas, entrada)
+
+
+def instrumentar(funcion=None, nombre: 'str|None' = None):
+    """
+    Decorador que mide cada llamada a la función. Se puede usar como
+    @instrumentar o @instrumentar(nombre="modulo.funcion").
+    Con DB_INSTRUMENTACION=0 retorna la función sin cambios.
+    """
+    if funcion is None:
+        return lambda f: instrumentar(f, nombre)
+    if not ACTIVA:
+        return funcion
+    nombre = nombre or funcion.__name__
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        llamada = Llamada(nombre)
+        pila = _pila()
+        pila.append(llamada)
+        inicio = time.perf_counter()
+        try:
+            resultado = funcion(*args, **kwargs)
+        except BaseException as e:
+            llamada.error = llamada.error or repr(e)
+            llamada.segundos += time.perf_counter() - inicio
+            pila.pop()
+            _registrar(llamada)
+            raise
+        llamada.segundos += time.perf_counter() - inicio
+        pila.pop()
+
+        if inspect.isgenerator(resultado):
+            return _medir_generador(llamada, resultado)
+        _registrar(llamada)
+        return resultado
+
+    envoltura.instrumentada = True
+    return envoltura
+
+
+def _medir_generador(llamada: Llamada, generador):
+    """
+    Consume el generador dejando la llamada en la pila solo mientras produce
+    cada elemento: lo que haga quien lo consume entre elementos no se suma.
+    """
+    try:
+        while True:
+            pila = _pila()
+            pila.append(llamada)
+            inicio = time.perf_counter()
+            try:
+                valor = next(generador)
+            except StopIteration:
+                return
+            except BaseException as e:
+                llamada.error = llamada.error or repr(e)
+                raise
+            finally:
+                llamada.segundos += time.perf_counter() - inicio
+                pila.pop()
+            yield valor
+    finally:
+        # Cerrar el generador devuelve su sesión al pool: también es parte de la llamada
+        inicio = time.perf_counter()
+        generador.close()
+        llamada.segundos += time.perf_counter() - inicio
+        _registrar(llamada)
+
+
+def instrumentar_funciones(espacio: dict, prefijo: str = "db_", excluir=()):
+    """
+    Instrumenta todas las funciones de `espacio` (los globals() de un módulo)
+    cuyo nombre empieza con `prefijo`. Las llamadas entre funciones del mismo
+    módulo pasan por la versión instrumentada.
+    """
+    if not ACTIVA:
+        return
+    for nombre, valor in list(espacio.items()):
+        if (nombre.startswith(prefijo) and nombre not in excluir and inspect.isfunction(valor)
+                and not getattr(valor, 'instrumentada', False)):
+            espacio[nombre] = instrumentar(valor)
+
+
+# --- Cursor instrumentado ---
+
+class CursorInstrumentado:
+    """
+    Envuelve un cursor de oracledb y anota en la llamada el tiempo de cada
+    operación, las filas leídas, los viajes estimados y las sentencias.
+    El resto de los atributos (var, rowcount, connection, arraysize...)
+    se delegan al cursor real.
+    """
+
+    def __init__(self, cursor, llamada: Llamada):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_llamada', llamada)
+        object.__setattr__(self, '_prefetch', 0)
+        object.__setattr__(self, '_filas_sentencia', 0)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._cursor, nombre, valor)
+
+    def _medir(self, funcion, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        except Exception as e:
+            self._llamada.error = self._llamada.error or str(e)[:200]
+            raise
+        finally:
+            self._llamada.segundos_bd += time.perf_counter() - inicio
+
+    def _fin_sentencia(self):
+        # Las filas que no llegaron con el prefetch se piden de a arraysize
+        extra = self._filas_sentencia - self._prefetch
+        if extra > 0:
+            self._llamada.viajes += -(-extra // max(self._cursor.arraysize, 1))
+        object.__setattr__(self, '_filas_sentencia', 0)
+
+    def _contar_filas(self, n: int):
+        object.__setattr__(self, '_filas_sentencia', self._filas_sentencia + n)
+        self._llamada.filas += n
+
+    def execute(self, sql, *args, **kwargs):
+        self._fin_sentencia()
+        self._llamada.agregar_sentencia(sql)
+        self._llamada.viajes += 1
+        object.__setattr__(self, '_prefetch', getattr(self._cursor, 'prefetchrows', 0))
+        resultado = self._medir(self._cursor.execute, sql, *args, **kwargs)
+        # Un execute que no es SELECT no retorna filas (ni las prefetchea)
+        if getattr(self._cursor, 'description', None) is None:
+            object.__setattr__(self, '_prefetch', 0)
+        return resultado
+
+    def executemany(self, sql, *args, **kwargs):
+        self._fin_sentencia()
+        self._llamada.agregar_sentencia(sql)
+        self._llamada.viajes += 1
+        object.__setattr__(self, '_prefetch', 0)
+        return self._medir(self._cursor.executemany, sql, *args, **kwargs)
+
+    def callproc(self, nombre, *args, **kwargs):
+        self._fin_sentencia()
+        self._llamada.agregar_sentencia(f"CALL {nombre}")
+        self._llamada.viajes += 1
+        return self._medir(self._cursor.callproc, nombre, *args, **kwargs)
+
+    def fetchone(self):
+        fila = self._medir(self._cursor.fetchone)
+        if fila is not None:
+            self._contar_filas(1)
+        return fila
+
+    def fetchmany(self, *args, **kwargs):
+        filas = self._medir(self._cursor.fetchmany, *args, **kwargs)
+        self._contar_filas(len(filas))
+        return filas
+
+    def fetchall(self):
+        filas = self._medir(self._cursor.fetchall)
+        self._contar_filas(len(filas))
+        return filas
+
+    def __iter__(self):
+        iterador = iter(self._cursor)
+        while True:
+            try:
+                fila = self._medir(next, iterador)
+            except StopIteration:
+                return
+            self._contar_filas(1)
+            yield fila
+
+    def close(self):
+        self._fin_sentencia()
+        self._cursor.close()
+
+
+def envolver_cursor(cursor):
+    """Cursor instrumentado si hay una llamada en curso en este hilo; si no, el mismo cursor."""
+    llamada = llamada_actual() if ACTIVA else None
+    if llamada is None:
+        return cursor
+    return CursorInstrumentado(cursor, llamada)
+
+
+def en_bd(cursor, funcion, *args):
+    """
+    Ejecuta funcion(*args) (commit, rollback...) contándola como un viaje a
+    la BD de la llamada dueña del cursor.
+    """
+    if not isinstance(cursor, CursorInstrumentado):
+        return funcion(*args)
+    cursor._llamada.viajes += 1
+    return cursor._medir(funcion, *args)
+
+
+# --- Consulta y exportación ---
+
+def resumen():
+    """Estadísticas por función (ver EstadisticaFuncion.como_dict), de la más lenta (p95) a la más rápida."""
+    with _lock:
+        datos = [e.como_dict() for e in _estadisticas.values()]
+    return sorted(datos, key=lambda d: d['p95'] or 0, reverse=True)
+
+
+def llamadas_lentas(n: int = MAX_LENTAS):
+    """Las n llamadas individuales más lentas registradas (ver Llamada.como_dict)."""
+    with _lock:
+        lentas = heapq.nlargest(n, _lentas)
+    return [llamada.como_dict() for _, _, llamada in lentas]
+
+
+def llamadas_recientes():
+    with _lock:
+        return [llamada.como_dict() for llamada in _recientes]
+
+
+def reiniciar():
+    """Descarta todo lo registrado."""
+    with _lock:
+        _estadisticas.clear()
+        _lentas.clear()
+        _recientes.clear()
+
+
+def _escribir(ruta: str, texto: str):
+    # Se escribe a un temporal y se reemplaza: quien lea el archivo nunca ve uno a medias
+    temporal = ruta + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        archivo.write(texto)
+    os.replace(temporal, ruta)
+
+
+def exportar_json(ruta: 'str|None' = None):
+    """Retorna las métricas como JSON y, si se indica ruta, las escribe ahí."""
+    texto = json.dumps({
+        'generado': datetime.now().isoformat(timespec='seconds'),
+        'buckets': list(LIMITES_BUCKETS),
+        'funciones': resumen(),
+        'lentas': llamadas_lentas()
+    }, ensure_ascii=False, indent=2)
+    if ruta:
+        _escribir(ruta, texto)
+    return texto
+
+
+def _etiqueta(valor: str):
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _lineas_histograma(lineas: list, metrica: str, ayuda: str, histogramas: dict):
+    lineas.append(f"# HELP {metrica} {ayuda}")
+    lineas.append(f"# TYPE {metrica} histogram")
+    for funcion, histograma in histogramas.items():
+        etiqueta = f'funcion="{_etiqueta(funcion)}"'
+        acumulados = histograma.acumulados()
+        for limite, cuenta in zip(LIMITES_BUCKETS, acumulados):
+            lineas.append(f'{metrica}_bucket{{{etiqueta},le="{limite}"}} {cuenta}')
+        lineas.append(f'{metrica}_bucket{{{etiqueta},le="+Inf"}} {acumulados[-1]}')
+        lineas.append(f"{metrica}_sum{{{etiqueta}}} {histograma.suma}")
+        lineas.append(f"{metrica}_count{{{etiqueta}}} {histograma.total}")
+
+
+def exportar_prometheus(ruta: 'str|None' = None):
+    """
+    Retorna las métricas en el formato de texto de Prometheus y, si se indica
+    ruta, las escribe ahí (sirve para el textfile collector de node_exporter).
+    """
+    with _lock:
+        estadisticas = sorted(_estadisticas.items())
+        tiempos = {f: e.tiempo for f, e in estadisticas}
+        tiempos_bd = {f: e.tiempo_bd for f, e in estadisticas}
+        contadores = {
+            'db_filas_total': ("Filas leídas de la BD.", {f: e.filas for f, e in estadisticas}),
+            'db_viajes_total': ("Viajes a la BD (estimados).", {f: e.viajes for f, e in estadisticas}),
+            'db_errores_total': ("Llamadas con error de BD.", {f: e.errores for f, e in estadisticas}),
+        }
+        lineas = []
+        _lineas_histograma(lineas, "db_llamada_segundos", "Duración de cada llamada (reloj de pared).", tiempos)
+        _lineas_histograma(lineas, "db_tiempo_bd_segundos", "Tiempo de cada llamada dentro de la BD.", tiempos_bd)
+
+    for metrica, (ayuda, valores) in contadores.items():
+        lineas.append(f"# HELP {metrica} {ayuda}")
+        lineas.append(f"# TYPE {metrica} counter")
+        for funcion, valor in valores.items():
+            lineas.append(f'{metrica}{{funcion="{_etiqueta(funcion)}"}} {valor}')
+
+    texto = "\n".join(lineas) + "\n"
+    if ruta:
+        _escribir(ruta, texto)
+    return texto
+
+
+def exportar(ruta: str):
+    """Exporta a `ruta` en JSON si termina en .json; si no, en formato Prometheus."""
+    if ruta.lower().endswith('.json'):
+        return exportar_json(ruta)
+    return exportar_prometheus(ruta)
+
+
+def _exportar_al_salir():
+    try:
+        exportar(DB_METRICAS_ARCHIVO)
+    except OSError as e:
+        print(f"No se pudieron guardar las métricas en {DB_METRICAS_ARCHIVO}: {e}")
+
+
+if ACTIVA and DB_METRICAS_ARCHIVO:
+    atexit.register(_exportar_al_salir)
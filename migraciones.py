@@ -0,0 +1,187 @@
+"""
+Migraciones versionadas de la base de datos.
+
+La tabla schema_version anota cada migración aplicada. aplicar_migraciones()
+se llama al arrancar la aplicación:
+
+- Si la base ya está al día, cuesta una sola consulta (MAX(version)) y el
+  resultado queda en caché para el resto del proceso.
+- Si faltan migraciones, bloquea schema_version (bloquear_versiones del
+  almacenamiento), vuelve a leer la versión por si otro cliente las aplicó
+  mientras tanto, y aplica las pendientes en una sola transacción junto con
+  sus filas en schema_version.
+
+Los datos iniciales se cargan con MERGE (en SQLite, INSERT ... WHERE NOT
+EXISTS): volver a ejecutar una migración no duplica nada. Una migración nueva
+se agrega al final de MIGRACIONES con el siguiente número de versión.
+"""
+import re
+
+import database as dbFunciones
+from database import ErrorConexion, DatabaseError
+
+ORA_TABLA_INEXISTENTE = 942
+
+
+class Migracion:
+    """
+    Args:
+        sentencias: backend -> lista de sentencias SQL (ver almacenamiento.BACKENDS)
+        parametros: función que retorna los binds; se llama solo si la migración se aplica
+        aviso: texto que se muestra si la migración insertó o modificó filas
+    """
+
+    def __init__(self, version: int, descripcion: str, sentencias: dict, parametros=None, aviso=None):
+        self.version = version
+        self.descripcion = descripcion
+        self.sentencias = sentencias
+        self.parametros = parametros
+        self.aviso = aviso
+
+
+# --- 1: admin por defecto ---
+# Solo si no hay ningún administrador: usuario base (RUT 1), su empleado y el admin.
+SEMILLA_ADMIN_ORACLE = [
+    """
+    MERGE INTO usuarios u
+    USING (SELECT 1 AS idUsuario FROM dual WHERE NOT EXISTS (SELECT 1 FROM administradores)) s
+    ON (u.idUsuario = s.idUsuario)
+    WHEN NOT MATCHED THEN
+        INSERT (idUsuario, nombre, direccion, telefono, correo)
+        VALUES (s.idUsuario, 'Administrador', 'Sistema', '0000000000', 'admin@sistema.com')
+    """,
+    """
+    MERGE INTO empleados e
+    USING (SELECT 1 AS idUsuario FROM dual WHERE NOT EXISTS (SELECT 1 FROM administradores)) s
+    ON (e.idUsuario = s.idUsuario)
+    WHEN NOT MATCHED THEN
+        INSERT (fechaInicioContrato, salario, idUsuario, idDepartamento)
+        VALUES (SYSDATE, 0, s.idUsuario, NULL)
+    """,
+    """
+    MERGE INTO administradores a
+    USING (
+        SELECT :usuario AS usuario, :clave AS clave,
+               (SELECT MIN(idEmpleado) FROM empleados WHERE idUsuario = 1) AS idEmpleado
+        FROM dual WHERE NOT EXISTS (SELECT 1 FROM administradores)
+    ) s
+    ON (a.usuario = s.usuario)
+    WHEN NOT MATCHED THEN
+        INSERT (usuario, clave, idEmpleado) VALUES (s.usuario, s.clave, s.idEmpleado)
+    """,
+]
+
+# SQLite no tiene MERGE: la misma condición con INSERT ... SELECT ... WHERE NOT EXISTS
+SEMILLA_ADMIN_SQLITE = [
+    """
+    INSERT INTO usuarios (idUsuario, nombre, direccion, telefono, correo)
+    SELECT 1, 'Administrador', 'Sistema', '0000000000', 'admin@sistema.com'
+    WHERE NOT EXISTS (SELECT 1 FROM administradores)
+      AND NOT EXISTS (SELECT 1 FROM usuarios WHERE idUsuario = 1)
+    """,
+    """
+    INSERT INTO empleados (fechaInicioContrato, salario, idUsuario, idDepartamento)
+    SELECT SYSDATE, 0, 1, NULL
+    WHERE NOT EXISTS (SELECT 1 FROM administradores)
+      AND NOT EXISTS (SELECT 1 FROM empleados WHERE idUsuario = 1)
+    """,
+    """
+    INSERT INTO administradores (usuario, clave, idEmpleado)
+    SELECT :usuario, :clave, (SELECT MIN(idEmpleado) FROM empleados WHERE idUsuario = 1)
+    WHERE NOT EXISTS (SELECT 1 FROM administradores)
+    """,
+]
+
+MIGRACIONES = [
+    Migracion(
+        1, "Admin por defecto si no existe ninguno",
+        {'oracle': SEMILLA_ADMIN_ORACLE, 'sqlite': SEMILLA_ADMIN_SQLITE},
+        parametros=lambda: {'usuario': "admin", 'clave': dbFunciones.generar_hash_clave("admin123")},
+        aviso=("¡Administrador por defecto creado!\n"
+               "Usuario: admin\n"
+               "Contraseña: admin123\n"
+               "¡IMPORTANTE: Cambie la contraseña después del primer inicio de sesión!"),
+    ),
+]
+
+VERSION_ACTUAL = MIGRACIONES[-1].version
+
+_version_bd = None  # Última versión leída o aplicada en este proceso
+
+
+def _leer_version(cursor):
+    cursor.execute("SELECT NVL(MAX(version), 0) FROM schema_version")
+    return int(cursor.fetchone()[0])
+
+
+def _binds(sql: str, parametros: dict):
+    """Solo los binds que usa la sentencia (oracledb rechaza los que sobran)."""
+    return {nombre: valor for nombre, valor in parametros.items() if re.search(rf":{nombre}\b", sql)}
+
+
+def _aplicar(cursor, migracion: Migracion):
+    sentencias = migracion.sentencias[dbFunciones.ALMACENAMIENTO.nombre]
+    parametros = migracion.parametros() if migracion.parametros else {}
+
+    filas = 0
+    for sql in sentencias:
+        cursor.execute(sql, _binds(sql, parametros))
+        filas += max(cursor.rowcount, 0)
+
+    cursor.execute("INSERT INTO schema_version (version, descripcion) VALUES (:1, :2)",
+                   (migracion.version, migracion.descripcion))
+    print(f"Migración {migracion.version} aplicada: {migracion.descripcion}")
+    if filas and migracion.aviso:
+        print("=" * 50)
+        print(migracion.aviso)
+        print("=" * 50)
+
+
+def aplicar_migraciones():
+    """
+    Lleva la base a VERSION_ACTUAL. Reemplaza a inicializar_admin_por_defecto:
+    el admin por defecto es la migración 1.
+
+    Returns:
+        True si la base quedó al día
+        False si no se pudo (sin conexión o error de BD); se reintenta en la próxima llamada
+    """
+    global _version_bd
+    if _version_bd is not None and _version_bd >= VERSION_ACTUAL:
+        return True
+
+    try:
+        with dbFunciones.sesion() as cursor:
+            try:
+                version = _leer_version(cursor)
+            except DatabaseError as e:
+                error, = e.args
+                if error.code != ORA_TABLA_INEXISTENTE:
+                    raise
+                # Base creada antes de las migraciones
+                dbFunciones.ALMACENAMIENTO.crear_tabla_versiones(cursor)
+                version = 0
+
+        if version < VERSION_ACTUAL:
+            with dbFunciones.transaccion() as cursor:
+                dbFunciones.ALMACENAMIENTO.bloquear_versiones(cursor)
+                version = _leer_version(cursor)  # Otro cliente pudo aplicarlas mientras tanto
+                for migracion in MIGRACIONES:
+                    if migracion.version > version:
+                        _aplicar(cursor, migracion)
+                        version = migracion.version
+
+        _version_bd = version
+        return True
+
+    except ErrorConexion:
+        print("No se pudo conectar a la base de datos para aplicar las migraciones.")
+        return False
+    except DatabaseError as e:
+        print(f"Error al aplicar las migraciones: {e}")
+        return False
+
+
+def version_esquema():
+    """Versión de la base leída por aplicar_migraciones() en este proceso (None si aún no se leyó)."""
+    return _version_bd
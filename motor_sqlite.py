@@ -0,0 +1,393 @@
+"""
+Driver SQLite con la API de python-oracledb que usa database.py.
+
+Es el motor del backend 'sqlite' de almacenamiento.py: database.py ejecuta
+las mismas sentencias y usa los mismos objetos (pool, conexión, cursor, var,
+executemany con batcherrors y arraydmlrowcounts) que con Oracle, y aquí se
+traduce el SQL de Oracle que aparece en el proyecto al dialecto de SQLite:
+
+    :1, :2 ...                  -> ?1, ?2 ...
+    FETCH FIRST n ROWS ONLY     -> LIMIT n
+    RETURNING col INTO :var     -> RETURNING col (el valor se deja en la var)
+    SYSDATE, NVL, TO_DATE, TO_CHAR, TRUNC -> equivalentes registrados en SQLite
+
+Los bloques PL/SQL no se traducen: lanzan NotSupportedError. Lo que en
+Oracle se hace con PL/SQL tiene su versión SQLite en almacenamiento.py.
+
+Las conexiones usan WAL (los lectores no bloquean al escritor) y claves
+foráneas activas. Las fechas se guardan como texto 'YYYY-MM-DD HH:MM:SS'.
+Solo las columnas declaradas DATE se leen como datetime (PARSE_DECLTYPES);
+una expresión que retorna fecha (p. ej. TRUNC) se lee como datetime si su
+alias lleva el tipo: AS "clave [DATE]" (PARSE_COLNAMES). El resto del texto
+se entrega tal cual, aunque parezca una fecha.
+"""
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+POOL_GETMODE_WAIT = 1
+DB_TYPE_NUMBER = 'NUMBER'
+DB_TYPE_DATE = 'DATE'
+DB_TYPE_VARCHAR = 'VARCHAR'
+
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+_RE_FECHA = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+
+# Códigos ORA equivalentes a los errores de integridad de SQLite
+_CODIGOS_INTEGRIDAD = (
+    ("UNIQUE constraint failed", 1),
+    ("PRIMARY KEY", 1),
+    ("FOREIGN KEY constraint failed", 2291),
+    ("NOT NULL constraint failed", 1400),
+)
+
+
+class _Error:
+    """Lo que oracledb entrega en e.args[0]: código ORA, mensaje y offset (batcherrors)."""
+
+    def __init__(self, code: int, message: str, offset: int = 0, full_code: str = None):
+        self.code = code
+        self.message = message
+        self.offset = offset
+        self.full_code = full_code or f"ORA-{code:05d}"
+
+    def __str__(self):
+        return f"{self.full_code}: {self.message}"
+
+
+class Error(Exception):
+    def __str__(self):
+        return str(self.args[0]) if self.args else ""
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+def _traducir_error(e: sqlite3.Error):
+    mensaje = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        for texto, codigo in _CODIGOS_INTEGRIDAD:
+            if texto in mensaje:
+                return IntegrityError(_Error(codigo, mensaje))
+        return IntegrityError(_Error(2290, mensaje))
+    return DatabaseError(_Error(20000, mensaje))
+
+
+# --- Traducción de SQL ---
+
+def _formato_python(formato: str):
+    for oracle, python in (("YYYY", "%Y"), ("MM", "%m"), ("DD", "%d"),
+                           ("HH24", "%H"), ("MI", "%M"), ("SS", "%S")):
+        formato = formato.replace(oracle, python)
+    return formato
+
+
+def _a_fecha(valor):
+    if valor is None or isinstance(valor, datetime):
+        return valor
+    return datetime.strptime(str(valor)[:19], FORMATO_FECHA)
+
+
+def _to_date(texto, formato):
+    if texto is None:
+        return None
+    return datetime.strptime(texto, _formato_python(formato)).strftime(FORMATO_FECHA)
+
+
+def _to_char(valor, formato=None):
+    if valor is None:
+        return None
+    if formato is None or not _RE_FECHA.match(str(valor)):
+        return str(valor)
+    return _a_fecha(valor).strftime(_formato_python(formato))
+
+
+def _trunc(valor, formato='DD'):
+    fecha = _a_fecha(valor)
+    if fecha is None:
+        return None
+    if formato == 'MM':
+        fecha = fecha.replace(day=1)
+    elif formato == 'IW':
+        fecha = datetime.fromordinal(fecha.toordinal() - fecha.weekday())
+    return fecha.replace(hour=0, minute=0, second=0).strftime(FORMATO_FECHA)
+
+
+@lru_cache(maxsize=512)
+def _traducir(sql: str):
+    """Retorna (sql para SQLite, nombre de la var del RETURNING o None)."""
+    destino = None
+    m = re.search(r"\bRETURNING\s+(\w+)\s+INTO\s+:(\w+)", sql, re.I)
+    if m:
+        destino = m.group(2)
+        sql = sql[:m.start()] + f"RETURNING {m.group(1)}" + sql[m.end():]
+
+    sql = re.sub(r"\bFETCH\s+FIRST\s+(:?\w+)\s+ROWS?\s+ONLY", r"LIMIT \1", sql, flags=re.I)
+    sql = re.sub(r"\bSYSDATE\b", "strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')", sql, flags=re.I)
+    sql = re.sub(r"(?<![:\w]):(\d+)\b", r"?\1", sql)
+    return sql, destino
+
+
+def _valor_sqlite(valor):
+    if isinstance(valor, datetime):
+        return valor.strftime(FORMATO_FECHA)
+    if isinstance(valor, date):
+        return valor.strftime("%Y-%m-%d 00:00:00")
+    return valor
+
+
+def _convertir_fecha(valor: bytes):
+    """Conversor de las columnas DATE: texto 'YYYY-MM-DD HH:MM:SS' -> datetime."""
+    texto = valor.decode()
+    try:
+        return datetime.fromisoformat(texto)
+    except ValueError:
+        return texto  # Un valor que no es fecha se entrega como está
+
+
+sqlite3.register_converter("DATE", _convertir_fecha)
+
+
+# --- Variables y colecciones ---
+
+class Var:
+    def __init__(self, tipo=None):
+        self.tipo = tipo
+        self._valor = None
+
+    def getvalue(self, pos: int = 0):
+        return self._valor
+
+    def setvalue(self, pos: int, valor):
+        self._valor = valor
+
+
+class Coleccion:
+    def __init__(self, valores=()):
+        self._valores = list(valores)
+
+    def aslist(self):
+        return list(self._valores)
+
+
+class TipoColeccion:
+    def __init__(self, nombre: str):
+        self.name = nombre
+
+    def newobject(self, valores=()):
+        return Coleccion(valores)
+
+
+# --- Cursor, conexión y pool ---
+
+class Cursor:
+    def __init__(self, conexion):
+        self.connection = conexion
+        self._cursor = conexion._sqlite.cursor()
+        self._errores = []
+        self._cuentas = []
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rowcount = 0
+        self.description = None
+
+    def _separar_binds(self, parametros, kwargs):
+        """Devuelve (parámetros para SQLite, vars que reciben valores)."""
+        if kwargs:
+            parametros = dict(kwargs)
+        if parametros is None:
+            return (), {}
+        if isinstance(parametros, dict):
+            vars_salida = {k: v for k, v in parametros.items() if isinstance(v, Var)}
+            return {k: _valor_sqlite(v) for k, v in parametros.items() if k not in vars_salida}, vars_salida
+        vars_salida = {str(i + 1): v for i, v in enumerate(parametros) if isinstance(v, Var)}
+        return [_valor_sqlite(v) for v in parametros if not isinstance(v, Var)], vars_salida
+
+    def execute(self, sql, parametros=None, **kwargs):
+        if sql.lstrip().upper().startswith(("BEGIN", "DECLARE")):
+            raise NotSupportedError(_Error(6550, "PL/SQL no disponible en el backend SQLite"))
+
+        sql_sqlite, destino = _traducir(sql)
+        binds, vars_salida = self._separar_binds(parametros, kwargs)
+        try:
+            self._cursor.execute(sql_sqlite, binds)
+            if destino is not None:
+                devueltos = [fila[0] for fila in self._cursor.fetchall()]
+                vars_salida[destino].setvalue(0, devueltos)
+                self.description = None
+            else:
+                self.description = self._cursor.description
+            self.rowcount = self._cursor.rowcount
+        except sqlite3.Error as e:
+            raise _traducir_error(e) from None
+        self.connection._despues_de_ejecutar()
+        return self if self.description else None
+
+    def executemany(self, sql, filas, batcherrors=False, arraydmlrowcounts=False):
+        sql_sqlite, _ = _traducir(sql)
+        self._errores = []
+        self._cuentas = []
+        filas = [[_valor_sqlite(v) for v in fila] for fila in filas]
+        if not batcherrors and not arraydmlrowcounts:
+            try:
+                self._cursor.executemany(sql_sqlite, filas)
+                self.rowcount = self._cursor.rowcount
+            except sqlite3.Error as e:
+                raise _traducir_error(e) from None
+        else:
+            # Fila por fila, como hace Oracle con batcherrors: las que fallan no detienen al resto
+            total = 0
+            for i, fila in enumerate(filas):
+                try:
+                    self._cursor.execute(sql_sqlite, fila)
+                    self._cuentas.append(self._cursor.rowcount)
+                    total += self._cursor.rowcount
+                except sqlite3.Error as e:
+                    if not batcherrors:
+                        raise _traducir_error(e) from None
+                    error = _traducir_error(e).args[0]
+                    error.offset = i
+                    self._errores.append(error)
+                    self._cuentas.append(0)
+            self.rowcount = total
+        self.connection._despues_de_ejecutar()
+
+    def getbatcherrors(self):
+        return list(self._errores)
+
+    def getarraydmlrowcounts(self):
+        return list(self._cuentas)
+
+    def setinputsizes(self, *args, **kwargs):
+        pass
+
+    def var(self, tipo=None, *args, **kwargs):
+        return Var(tipo)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, tamano=None):
+        return self._cursor.fetchmany(tamano or self.arraysize)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def close(self):
+        self._cursor.close()
+
+
+class Connection:
+    def __init__(self, pool, ruta: str):
+        self._pool = pool
+        self._sqlite = sqlite3.connect(ruta, check_same_thread=False, timeout=30,
+                                       detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        self._sqlite.execute("PRAGMA foreign_keys = ON")
+        self._sqlite.execute("PRAGMA journal_mode = WAL")
+        # Con WAL, NORMAL no pierde consistencia ante un corte: solo las últimas transacciones
+        self._sqlite.execute("PRAGMA synchronous = NORMAL")
+        for nombre, n, funcion in (("NVL", 2, lambda a, b: b if a is None else a),
+                                   ("TO_DATE", 2, _to_date),
+                                   ("TO_CHAR", 1, _to_char), ("TO_CHAR", 2, _to_char),
+                                   ("TRUNC", 1, _trunc), ("TRUNC", 2, _trunc)):
+            self._sqlite.create_function(nombre, n, funcion, deterministic=True)
+        self.autocommit = False
+        self._prestada = False  # True mientras está fuera del pool (la marca Pool)
+
+    @property
+    def transaction_in_progress(self):
+        return self._sqlite.in_transaction
+
+    def _despues_de_ejecutar(self):
+        if self.autocommit and self._sqlite.in_transaction:
+            self._sqlite.commit()
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        self._sqlite.commit()
+
+    def rollback(self):
+        self._sqlite.rollback()
+
+    def gettype(self, nombre: str):
+        return TipoColeccion(nombre)
+
+    def close(self):
+        # Igual que en oracledb: cerrar una conexión del pool la devuelve, y cerrarla
+        # de nuevo lanza InterfaceError (DPY-1001)
+        self._pool._devolver(self)
+
+
+class Pool:
+    def __init__(self, ruta: str, minimo: int, maximo: int, incremento: int):
+        self._ruta = ruta
+        self.min = minimo
+        self.max = maximo
+        self.increment = incremento
+        self._libres = []
+        self._ocupadas = 0
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+
+    @property
+    def busy(self):
+        return self._ocupadas
+
+    @property
+    def opened(self):
+        return self._abiertas
+
+    def acquire(self):
+        with self._condicion:
+            while not self._libres and self._abiertas >= self.max:
+                self._condicion.wait()
+            if self._libres:
+                conexion = self._libres.pop()
+            else:
+                conexion = Connection(self, self._ruta)
+                self._abiertas += 1
+            self._ocupadas += 1
+            conexion._prestada = True
+            return conexion
+
+    def _devolver(self, conexion):
+        with self._condicion:
+            # Sin esta marca, un segundo close() la contaría y la dejaría libre dos veces
+            if not conexion._prestada:
+                raise InterfaceError(_Error(1001, "not connected to database", full_code="DPY-1001"))
+            conexion._prestada = False
+            conexion._sqlite.rollback()
+            self._ocupadas -= 1
+            self._libres.append(conexion)
+            self._condicion.notify()
+
+    def close(self, force: bool = False):
+        with self._condicion:
+            for conexion in self._libres:
+                conexion._sqlite.close()
+            self._libres.clear()
+
+
+def create_pool(user=None, password=None, dsn=None, min=1, max=4, increment=1, getmode=None, **kwargs):
+    """Misma firma que oracledb.create_pool. El dsn es la ruta del archivo; usuario y contraseña se ignoran."""
+    return Pool(dsn, min, max, increment)
@@ -1,9 +1,17 @@
 from empleado import Empleado
 
 class Proyecto:
-    def __init__(self,idProyecto:int,nombre:str,fechaInicioProyecto:str,descripcion:str,empleados:list[Empleado] = []):
+    __slots__ = ('idProyecto', 'nombre', 'fechaInicioProyecto', 'descripcion', 'empleados')
+
+    def __init__(self,idProyecto:int,nombre:str,fechaInicioProyecto:str,descripcion:str,empleados:'list[Empleado]|None' = None):
         self.idProyecto = idProyecto
         self.nombre = nombre
         self.fechaInicioProyecto = fechaInicioProyecto
         self.descripcion = descripcion
-        self.empleados = empleados
\ No newline at end of file
+        # Una lista nueva por proyecto (un default [] se compartiría entre todos)
+        self.empleados = [] if empleados is None else empleados
+
+    @classmethod
+    def desde_fila(cls, fila, empleados:'list[Empleado]|None' = None) -> 'Proyecto':
+        """fila: (idProyecto, nombre, fechaInicioProyecto, descripcion)"""
+        return cls(*fila, empleados)
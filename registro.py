@@ -3,6 +3,8 @@ from proyecto import Proyecto
 
 
 class Registro:
+    __slots__ = ('empleado', 'proyecto', 'fechaRegistro', 'horasTrabajadas', 'descripcionTrabajo')
+
     def __init__(self, empleado:Empleado, proyecto:Proyecto, fechaRegistro:str, horasTrabajadas:float, descripcionTrabajo:str):
         self.empleado = empleado
         self.proyecto = proyecto
@@ -10,3 +12,7 @@ class Registro:
         self.horasTrabajadas = horasTrabajadas
         self.descripcionTrabajo = descripcionTrabajo
 
+    @classmethod
+    def desde_fila(cls, fila, empleado:Empleado, proyecto:Proyecto) -> 'Registro':
+        """fila: (fechaRegistro, horasTrabajadas, descripcionTrabajo)"""
+        return cls(empleado, proyecto, *fila)
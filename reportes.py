@@ -0,0 +1,199 @@
+"""
+Reportes de horas trabajadas.
+
+La agregación se hace en la BD (GROUP BY ROLLUP en Oracle; en SQLite, que
+no tiene ROLLUP, un UNION ALL con la fila de total): al cliente solo llega
+una fila por grupo más la fila de total, nunca los registros individuales.
+Como son pocas filas, se leen todas dentro de la sesión, que vuelve al
+pool de inmediato; la tabla las pagina desde memoria. Así un reporte en
+pantalla no retiene una sesión del pool ni un cursor abierto.
+
+Agrupaciones disponibles: empleado, proyecto, departamento, semana y mes.
+Cada fila es un diccionario con:
+    'clave'     -> ID del grupo (o fecha de inicio de la semana/mes)
+    'grupo'     -> texto a mostrar ("TOTAL" en la fila del ROLLUP)
+    'horas'     -> suma de horas del grupo
+    'registros' -> cantidad de registros sumados
+    'total'     -> True solo en la fila de total general
+"""
+import threading
+from datetime import datetime, timedelta
+from itertools import islice
+
+import database as dbFunciones
+import instrumentacion
+
+TAMANO_LOTE = 500
+
+# Cada agrupación define: columnas del SELECT/GROUP BY, columna de la clave y JOINs extra
+# ('fecha': True si la clave es una fecha).
+# El rango de fechas se aplica como fechaRegistro >= :desde AND < :hasta (día siguiente),
+# así la condición puede usar un índice sobre la fecha.
+_AGRUPACIONES = {
+    'empleado': {
+        'clave': "e.idEmpleado",
+        'grupo': "u.nombre",
+        'joins': """JOIN empleados e ON e.idEmpleado = r.idEmpleado
+                    JOIN usuarios u ON u.idUsuario = e.idUsuario""",
+        'orden': "u.nombre"
+    },
+    'proyecto': {
+        'clave': "p.idProyecto",
+        'grupo': "p.nombre",
+        'joins': "JOIN proyectos p ON p.idProyecto = r.idProyecto",
+        'orden': "p.nombre"
+    },
+    'departamento': {
+        'clave': "d.idDepartamento",
+        'grupo': "d.nombre",
+        'joins': """JOIN empleados e ON e.idEmpleado = r.idEmpleado
+                    LEFT JOIN departamentos d ON d.idDepartamento = e.idDepartamento""",
+        'orden': "d.nombre"
+    },
+    'semana': {
+        # IW = lunes de la semana ISO
+        'clave': "TRUNC(r.fechaRegistro, 'IW')",
+        'grupo': None,
+        'joins': "",
+        'orden': "TRUNC(r.fechaRegistro, 'IW')",
+        'fecha': True
+    },
+    'mes': {
+        'clave': "TRUNC(r.fechaRegistro, 'MM')",
+        'grupo': None,
+        'joins': "",
+        'orden': "TRUNC(r.fechaRegistro, 'MM')",
+        'fecha': True
+    },
+}
+
+AGRUPACIONES = tuple(_AGRUPACIONES)
+
+
+def _sql_reporte(agrupacion: str, rollup: bool = True):
+    definicion = _AGRUPACIONES[agrupacion]
+    clave = definicion['clave']
+    # Clave y nombre van juntos en el ROLLUP: un solo nivel de subtotal (el total general)
+    columnas = f"{clave}, {definicion['grupo']}" if definicion['grupo'] else clave
+    grupo = definicion['grupo'] or "NULL"
+
+    if not rollup:
+        # Mismas filas que el ROLLUP: los grupos y luego el total (columna 5 = 1).
+        # En SQLite TRUNC retorna texto: el alias con [DATE] lo hace leer como datetime.
+        alias = ' AS "clave [DATE]"' if definicion.get('fecha') else ""
+        return f"""
+            SELECT {clave}{alias}, {grupo}, SUM(r.horasTrabajadas), COUNT(*), 0
+            FROM registros r
+            {definicion['joins']}
+            WHERE r.fechaRegistro >= :desde AND r.fechaRegistro < :hasta
+            GROUP BY {columnas}
+            UNION ALL
+            SELECT NULL, NULL, SUM(r.horasTrabajadas), COUNT(*), 1
+            FROM registros r
+            {definicion['joins']}
+            WHERE r.fechaRegistro >= :desde AND r.fechaRegistro < :hasta
+            ORDER BY 5, {2 if definicion['grupo'] else 1}
+        """
+
+    return f"""
+        SELECT {clave}, {grupo},
+               SUM(r.horasTrabajadas), COUNT(*),
+               GROUPING({clave})
+        FROM registros r
+        {definicion['joins']}
+        WHERE r.fechaRegistro >= :desde AND r.fechaRegistro < :hasta
+        GROUP BY ROLLUP(({columnas}))
+        ORDER BY GROUPING({clave}), {definicion['orden']}
+    """
+
+
+def _texto_grupo(agrupacion: str, clave, grupo):
+    if agrupacion == 'semana':
+        fin = clave + timedelta(days=6)
+        return f"{clave.strftime('%Y-%m-%d')} al {fin.strftime('%Y-%m-%d')}"
+    if agrupacion == 'mes':
+        return clave.strftime('%Y-%m')
+    if clave is None:
+        # Solo pasa en departamento: empleados sin departamento asignado
+        return "Sin Departamento"
+    return grupo
+
+
+def _fila_reporte(agrupacion: str, row):
+    clave, grupo, horas, registros, es_total = row
+    return {
+        'clave': clave,
+        'grupo': "TOTAL" if es_total else _texto_grupo(agrupacion, clave, grupo),
+        'horas': float(horas or 0),
+        'registros': registros,
+        'total': bool(es_total)
+    }
+
+
+@instrumentacion.instrumentar
+def reporte_horas(agrupacion: str, desde: datetime, hasta: datetime, tamano_lote: int = TAMANO_LOTE):
+    """
+    Generador con las horas trabajadas entre `desde` y `hasta` (ambos inclusive),
+    agrupadas según `agrupacion`. La última fila es el total general.
+
+    La consulta corre al pedir la primera fila (en el hilo que itera): se
+    leen todas las filas y la sesión vuelve al pool antes de entregarlas.
+    """
+    if agrupacion not in _AGRUPACIONES:
+        raise ValueError(f"Agrupación desconocida: {agrupacion}")
+
+    try:
+        with dbFunciones.sesion() as cursor:
+            cursor.arraysize = tamano_lote
+            cursor.prefetchrows = tamano_lote
+
+            cursor.execute(_sql_reporte(agrupacion, dbFunciones.ALMACENAMIENTO.soporta_rollup), {
+                'desde': datetime(desde.year, desde.month, desde.day),
+                'hasta': datetime(hasta.year, hasta.month, hasta.day) + timedelta(days=1)
+            })
+            filas = cursor.fetchall()
+    except dbFunciones.ErrorConexion:
+        print("Error: No se pudo conectar a la BD para el reporte de horas")
+        return
+    except dbFunciones.DatabaseError as e:
+        print(f"Error DB reporte de horas por {agrupacion}: {e}")
+        return
+
+    for row in filas:
+        yield _fila_reporte(agrupacion, row)
+
+
+class LectorPaginado:
+    """
+    Consume un generador de a páginas para la TablaVirtual.
+
+    Las páginas se piden desde los hilos del ejecutor (una a la vez) y el
+    lector se puede cerrar desde cualquier hilo: cerrar() espera a que
+    termine la página en curso y cierra el generador. Con reporte_horas la
+    sesión ya volvió al pool tras la primera página; el resto sale de memoria.
+    """
+    def __init__(self, generador, tamano_pagina: int = TAMANO_LOTE):
+        self._generador = generador
+        self._tamano = tamano_pagina
+        self._lock = threading.Lock()
+        self._cerrado = False
+
+    def siguiente_pagina(self):
+        """Retorna (filas, hay_mas), el formato que espera TablaVirtual.cargar_pagina."""
+        with self._lock:
+            if self._cerrado:
+                return [], False
+            filas = list(islice(self._generador, self._tamano))
+            hay_mas = len(filas) == self._tamano
+            if not hay_mas:
+                self._cerrar()
+            return filas, hay_mas
+
+    def cerrar(self):
+        with self._lock:
+            self._cerrar()
+
+    def _cerrar(self):
+        if not self._cerrado:
+            self._cerrado = True
+            self._generador.close()
@@ -0,0 +1,337 @@
+"""
+Tabla virtualizada para Tkinter.
+
+Los datos viven en una lista de Python y el Canvas solo dibuja las filas
+que caben en pantalla; al hacer scroll se redibuja esa ventana. Abrir la
+tabla cuesta lo mismo con 50 filas que con 100.000. Si se entrega una
+función de carga, las filas se piden por páginas cuando el scroll se
+acerca al final. Un clic en el encabezado ordena por esa columna.
+
+Con clave_seleccion las filas se pueden seleccionar como en un Listbox
+(clic, Ctrl+clic y Shift+clic). La selección se guarda por clave, así que
+se mantiene al ordenar y al llegar nuevas páginas.
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class Columna:
+    def __init__(self, clave, titulo, ancho=100, formato=None, alinear="w"):
+        """
+        Args:
+            clave: llave del diccionario de la fila
+            titulo: texto del encabezado
+            ancho: ancho en píxeles
+            formato: función valor -> str (por defecto str, None se muestra como "N/A")
+            alinear: "w" (izquierda) o "e" (derecha, para números)
+        """
+        self.clave = clave
+        self.titulo = titulo
+        self.ancho = ancho
+        self.formato = formato
+        self.alinear = alinear
+
+    def texto(self, fila):
+        valor = fila.get(self.clave)
+        if self.formato:
+            return self.formato(valor)
+        return "N/A" if valor is None else str(valor)
+
+
+class TablaVirtual(tk.Frame):
+    MARGEN = 6              # Espacio interno de cada celda (px)
+    UMBRAL_CARGA = 20       # Filas restantes bajo la vista que disparan la siguiente página
+    COLOR_ENCABEZADO = "#dcdcdc"
+    COLOR_ALTERNO = "#f4f4f4"
+    COLOR_SELECCION = "#cce4ff"
+
+    def __init__(self, padre, columnas, filas=None, cargar_pagina=None, ejecutor=None,
+                 fuente=("Consolas", 10), texto_vacio="No hay datos para mostrar.",
+                 clave_seleccion=None, al_seleccionar=None, **kwargs):
+        """
+        Args:
+            columnas: lista de Columna
+            filas: filas iniciales (lista de diccionarios)
+            cargar_pagina: función sin argumentos que retorna (filas, hay_mas);
+                           se llama cada vez que hace falta la página siguiente
+            ejecutor: EjecutorTareas para correr cargar_pagina fuera del hilo de Tkinter
+            clave_seleccion: llave de la fila que la identifica; si se entrega,
+                             las filas se pueden seleccionar
+            al_seleccionar: función sin argumentos que se llama al cambiar la selección
+        """
+        super().__init__(padre, **kwargs)
+        self.columnas = columnas
+        self.cargar_pagina = cargar_pagina
+        self.ejecutor = ejecutor
+        self.texto_vacio = texto_vacio
+
+        self._filas = list(filas or [])
+        self._inicio = 0                    # Índice de la primera fila visible
+        self._hay_mas = cargar_pagina is not None
+        self._cargando = False
+        self._orden = None                  # (índice de columna, descendente)
+        self._clave_tarea = f"tabla_{id(self)}"
+        self.clave_seleccion = clave_seleccion
+        self.al_seleccionar = al_seleccionar
+        self._seleccion = set()             # Valores de clave_seleccion de las filas marcadas
+        self._ancla = None                  # Índice del último clic, para Shift+clic
+
+        self.fuente = tkfont.Font(root=self, font=fuente)
+        self.fuente_encabezado = self.fuente.copy()
+        self.fuente_encabezado.configure(weight="bold")
+        self.alto_fila = self.fuente.metrics("linespace") + 4
+        self.ancho_caracter = max(self.fuente.measure("0"), 1)
+        self.ancho_total = sum(col.ancho for col in columnas)
+
+        # Encabezado y cuerpo comparten el scroll horizontal
+        self.encabezado = tk.Canvas(self, height=self.alto_fila + 2, bg=self.COLOR_ENCABEZADO,
+                                    highlightthickness=0)
+        self.cuerpo = tk.Canvas(self, bg="white", highlightthickness=0)
+        self.scroll_y = tk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.scroll_x = tk.Scrollbar(self, orient="horizontal", command=self._xview)
+        self.lbl_estado = tk.Label(self, text="", font=("Arial", 9), fg="gray", anchor="w")
+
+        for canvas in (self.encabezado, self.cuerpo):
+            canvas.config(scrollregion=(0, 0, self.ancho_total, 0), xscrollcommand=self.scroll_x.set)
+
+        self.encabezado.grid(row=0, column=0, sticky="ew")
+        self.cuerpo.grid(row=1, column=0, sticky="nsew")
+        self.scroll_y.grid(row=1, column=1, sticky="ns")
+        self.scroll_x.grid(row=2, column=0, sticky="ew")
+        self.lbl_estado.grid(row=3, column=0, columnspan=2, sticky="ew")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.encabezado.bind("<Button-1>", self._clic_encabezado)
+        self.cuerpo.bind("<Configure>", lambda e: self._redibujar())
+        for widget in (self.cuerpo, self.encabezado):
+            widget.bind("<MouseWheel>", self._rueda)
+            widget.bind("<Button-4>", lambda e: self._desplazar(-3))
+            widget.bind("<Button-5>", lambda e: self._desplazar(3))
+        if clave_seleccion is not None:
+            self.cuerpo.bind("<Button-1>", lambda e: self._clic_fila(e, "unica"))
+            self.cuerpo.bind("<Control-Button-1>", lambda e: self._clic_fila(e, "alternar"))
+            self.cuerpo.bind("<Shift-Button-1>", lambda e: self._clic_fila(e, "rango"))
+
+        self._dibujar_encabezado()
+        self._actualizar_estado()
+        if self._hay_mas:
+            self._pedir_pagina()
+
+    # --- API pública ---
+
+    def agregar_filas(self, filas):
+        self._filas.extend(filas)
+        if self._orden is not None:
+            self._ordenar()
+        self._redibujar()
+        self._actualizar_estado()
+
+    def cantidad(self):
+        return len(self._filas)
+
+    def filas(self):
+        """Las filas cargadas, en el orden en que se muestran."""
+        return self._filas
+
+    def seleccionados(self):
+        """Claves de las filas seleccionadas, en el orden en que se muestran."""
+        clave = self.clave_seleccion
+        return [f[clave] for f in self._filas if f[clave] in self._seleccion]
+
+    def filas_seleccionadas(self):
+        clave = self.clave_seleccion
+        return [f for f in self._filas if f[clave] in self._seleccion]
+
+    def limpiar_seleccion(self):
+        self._seleccion.clear()
+        self._ancla = None
+        self.refrescar()
+
+    def refrescar(self):
+        """Vuelve a dibujar las filas (p. ej. tras modificar sus diccionarios)."""
+        self._redibujar()
+        self._actualizar_estado()
+
+    def destroy(self):
+        if self.ejecutor is not None:
+            self.ejecutor.cancelar(self._clave_tarea)
+        super().destroy()
+
+    # --- Carga por páginas ---
+
+    def _pedir_pagina(self):
+        if self._cargando or not self._hay_mas:
+            return
+        self._cargando = True
+
+        if self.ejecutor is None:
+            try:
+                self._pagina_recibida(self.cargar_pagina())
+            except Exception as e:
+                self._pagina_fallida(e)
+            return
+
+        self.ejecutor.ejecutar(self.cargar_pagina, al_terminar=self._pagina_recibida,
+                               al_error=self._pagina_fallida, clave=self._clave_tarea,
+                               etiqueta=self.lbl_estado, texto_espera="Cargando...")
+
+    def _pagina_recibida(self, resultado):
+        filas, hay_mas = resultado
+        self._cargando = False
+        self._hay_mas = hay_mas
+        self.agregar_filas(filas)
+
+    def _pagina_fallida(self, error):
+        self._cargando = False
+        self._hay_mas = False
+        self.lbl_estado.config(text=f"Error al cargar: {error}", fg="red")
+
+    # --- Dibujo ---
+
+    def _filas_visibles(self):
+        return max(self.cuerpo.winfo_height() // self.alto_fila, 1)
+
+    def _recortar(self, texto, ancho):
+        maximo = (ancho - 2 * self.MARGEN) // self.ancho_caracter
+        if len(texto) > maximo:
+            return texto[:max(maximo - 1, 0)] + "…"
+        return texto
+
+    def _dibujar_encabezado(self):
+        self.encabezado.delete("all")
+        x = 0
+        for i, col in enumerate(self.columnas):
+            titulo = col.titulo
+            if self._orden and self._orden[0] == i:
+                titulo += " ▼" if self._orden[1] else " ▲"
+            self._dibujar_celda(self.encabezado, x, 0, col, titulo, self.fuente_encabezado)
+            self.encabezado.create_line(x + col.ancho - 1, 0, x + col.ancho - 1, self.alto_fila + 2, fill="gray")
+            x += col.ancho
+
+    def _dibujar_celda(self, canvas, x, y, col, texto, fuente, tags=()):
+        texto = self._recortar(texto, col.ancho)
+        centro_y = y + self.alto_fila // 2 + 1
+        if col.alinear == "e":
+            canvas.create_text(x + col.ancho - self.MARGEN, centro_y, text=texto, anchor="e", font=fuente, tags=tags)
+        else:
+            canvas.create_text(x + self.MARGEN, centro_y, text=texto, anchor="w", font=fuente, tags=tags)
+
+    def _redibujar(self):
+        cuerpo = self.cuerpo
+        cuerpo.delete("fila")
+
+        visibles = self._filas_visibles()
+        total = len(self._filas)
+        self._inicio = max(0, min(self._inicio, total - visibles))
+        fin = min(self._inicio + visibles + 1, total)
+
+        if total == 0 and not self._hay_mas:
+            cuerpo.create_text(self.MARGEN, self.alto_fila // 2, text=self.texto_vacio, anchor="w",
+                               font=self.fuente, fill="gray", tags="fila")
+
+        # Solo se crean ítems para las filas en pantalla
+        for i in range(self._inicio, fin):
+            y = (i - self._inicio) * self.alto_fila
+            fila = self._filas[i]
+            if self._seleccion and fila[self.clave_seleccion] in self._seleccion:
+                cuerpo.create_rectangle(0, y, self.ancho_total, y + self.alto_fila,
+                                        fill=self.COLOR_SELECCION, outline="", tags="fila")
+            elif i % 2:
+                cuerpo.create_rectangle(0, y, self.ancho_total, y + self.alto_fila,
+                                        fill=self.COLOR_ALTERNO, outline="", tags="fila")
+            x = 0
+            for col in self.columnas:
+                self._dibujar_celda(cuerpo, x, y, col, col.texto(fila), self.fuente, tags="fila")
+                x += col.ancho
+
+        if total:
+            self.scroll_y.set(self._inicio / total, min((self._inicio + visibles) / total, 1.0))
+        else:
+            self.scroll_y.set(0.0, 1.0)
+
+        if self._hay_mas and fin >= total - self.UMBRAL_CARGA:
+            self._pedir_pagina()
+
+    def _actualizar_estado(self):
+        if self._cargando:
+            return
+        texto = f"Mostrando {len(self._filas)} registros"
+        if self._seleccion:
+            texto += f", {len(self._seleccion)} seleccionados"
+        if self._hay_mas:
+            texto += " (baje para ver más)"
+        self.lbl_estado.config(text=texto, fg="gray")
+
+    # --- Scroll ---
+
+    def _yview(self, *args):
+        visibles = self._filas_visibles()
+        if args[0] == "moveto":
+            self._inicio = int(float(args[1]) * len(self._filas))
+        elif args[0] == "scroll":
+            paso = int(args[1])
+            self._inicio += paso * visibles if args[2] == "pages" else paso
+        self._redibujar()
+
+    def _xview(self, *args):
+        self.encabezado.xview(*args)
+        self.cuerpo.xview(*args)
+
+    def _desplazar(self, filas):
+        self._inicio += filas
+        self._redibujar()
+
+    def _rueda(self, event):
+        # Windows entrega múltiplos de 120; macOS valores pequeños
+        paso = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self._desplazar(-3 * paso)
+
+    # --- Selección ---
+
+    def _clic_fila(self, event, modo):
+        indice = self._inicio + int(event.y // self.alto_fila)
+        if indice >= len(self._filas):
+            return
+        clave = self.clave_seleccion
+        valor = self._filas[indice][clave]
+
+        if modo == "rango" and self._ancla is not None:
+            desde, hasta = sorted((min(self._ancla, len(self._filas) - 1), indice))
+            self._seleccion.update(f[clave] for f in self._filas[desde:hasta + 1])
+        elif modo == "alternar":
+            self._seleccion.symmetric_difference_update((valor,))
+            self._ancla = indice
+        else:
+            self._seleccion = {valor}
+            self._ancla = indice
+
+        self.refrescar()
+        if self.al_seleccionar:
+            self.al_seleccionar()
+
+    # --- Orden ---
+
+    def _clic_encabezado(self, event):
+        x = self.encabezado.canvasx(event.x)
+        borde = 0
+        for i, col in enumerate(self.columnas):
+            borde += col.ancho
+            if x < borde:
+                descendente = self._orden is not None and self._orden[0] == i and not self._orden[1]
+                self._orden = (i, descendente)
+                self._ordenar()
+                self._inicio = 0
+                self._ancla = None
+                self._dibujar_encabezado()
+                self._redibujar()
+                return
+
+    def _ordenar(self):
+        indice, descendente = self._orden
+        clave = self.columnas[indice].clave
+        # Los valores nulos quedan siempre al final
+        con_valor = [f for f in self._filas if f.get(clave) is not None]
+        sin_valor = [f for f in self._filas if f.get(clave) is None]
+        con_valor.sort(key=lambda f: f[clave], reverse=descendente)
+        self._filas = con_valor + sin_valor
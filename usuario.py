@@ -1,7 +1,10 @@
 class Usuario:
+    # Sin __dict__ por instancia: ver benchmarks/memoria_modelos.py
+    __slots__ = ('rut', 'nombre', 'direccion', 'telefono', 'correo')
+
     def __init__(self, nombre:str, direccion:str, telefono:str, correo:str, rut = None):
         self.rut = rut
         self.nombre = nombre
         self.direccion = direccion
         self.telefono = telefono
-        self.correo = correo
\ No newline at end of file
+        self.correo = correo